@@ -0,0 +1,65 @@
+//Microbenchmark: cat costa evaluarea regulilor de alerta pe un esantion
+//
+//  bench_alerts [rules] [iterations]
+//
+//Compileaza `rules` reguli (implicit ALERT_MAX_RULES) pe campuri diferite si le
+//evalueaza pe un SystemMetrics real, cu valori care trec mereu pragul si inapoi,
+//ca fiecare regula sa treaca prin PENDING / FIRING / OK. Evenimentele merg in /dev/null.
+
+#include "alerts.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+static double now_sec(void){
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec + ts.tv_nsec / 1e9;
+}
+
+int main(int argc, char **argv){
+    int rules = argc > 1 ? atoi(argv[1]) : ALERT_MAX_RULES;
+    long iterations = argc > 2 ? atol(argv[2]) : 1000000;
+    if (rules < 1 || rules > ALERT_MAX_RULES || iterations < 1){
+        fprintf(stderr, "usage: %s [rules (1..%d)] [iterations]\n", argv[0], ALERT_MAX_RULES);
+        return 1;
+    }
+
+    AlertEngine *engine = alerts_open("/dev/null");
+    if (engine == NULL){
+        return 1;
+    }
+
+    char rule[LEN_LINE];
+    alerts_add_rule(engine, "cpu_hot: cpu_usage_percent > 50 for 2s clear 40");
+    alerts_add_rule(engine, "ram_full: ram_usage_percent >= 50 clear 45");
+    alerts_add_rule(engine, "many_procs: process_count > 100000");
+    for (int i = engine->rule_count; i < rules; i = i + 1){
+        snprintf(rule, sizeof(rule), "core%d: cpu_cores_usage.%d > 50 for 1s clear 30", i, i);
+        alerts_add_rule(engine, rule);
+    }
+
+    static SystemMetrics metrics;
+    get_system_metrics(&metrics);
+
+    //timp simulat: 10 ms intre esantioane, valorile urca si coboara cu perioada de 4s
+    long events = 0;
+    double start = now_sec();
+    for (long n = 0; n < iterations; n = n + 1){
+        double value = (n / 200) % 2 ? 90.0 : 10.0;
+        metrics.cpu_usage_percent = value;
+        metrics.ram_usage_percent = value;
+        for (int core = 0; core < rules; core = core + 1){
+            metrics.cpu_cores_usage[core] = value;
+        }
+        events += alerts_evaluate(engine, &metrics, n * 0.01);
+    }
+    double elapsed = now_sec() - start;
+
+    printf("%d rules, %ld samples, %ld events\n", engine->rule_count, iterations, events);
+    printf("%.3f us per sample (%.1f ns per rule, including the test writes)\n",
+           elapsed / iterations * 1e6, elapsed / iterations / engine->rule_count * 1e9);
+
+    alerts_close(engine);
+    return 0;
+}
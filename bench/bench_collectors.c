@@ -0,0 +1,592 @@
+//Benchmark si test de regresie pentru colectori, pe un /proc si /sys fals
+//
+//  bench_collectors [-c cores] [-p procs] [-i ifaces] [-g cgroups] [-n samples] [-b baseline [-w]] [-t tolerance]
+//
+//Construieste in /tmp un arbore cu `cores` nuclee, `procs` procese, `ifaces` interfete si `cgroups`
+//cgroup-uri v2 (slice-uri cu cate 8 unitati) si
+//il da bibliotecii prin set_system_root. Apoi ruleaza fiecare colector separat (run_collector)
+//si get_system_metrics complet (toate perioadele puse pe 0), `samples` esantioane fiecare, si
+//raporteaza pe esantion:
+//  - latenta p50/p90/p99/max
+//  - apelurile de sistem, numarate cu ptrace intr-un proces copil (intre doua getppid-uri marker)
+//  - alocarile, numarate de malloc/calloc/realloc definite mai jos (le inlocuiesc pe cele din libc)
+//Cu -b compara cu baseline-ul salvat si iese cu 1 cand p50 a crescut peste toleranta (implicit 30%)
+//sau cand un colector face mai multe apeluri de sistem / alocari; cu -w scrie baseline-ul din nou.
+//Latentele depind de masina: baseline-ul din repo e doar un punct de plecare, -w pe masina ta.
+
+#define _GNU_SOURCE
+#include "core.h"
+#include <errno.h>
+#include <signal.h>
+#include <stdarg.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/ptrace.h>
+#include <sys/stat.h>
+#include <sys/syscall.h>
+#include <sys/wait.h>
+#include <time.h>
+#include <unistd.h>
+
+#define SECTION_COUNT (COLLECTOR_COUNT + 1) //colectorii, plus get_system_metrics complet
+#define SECTION_ALL COLLECTOR_COUNT
+#define MIN_REGRESSION_US 2.0 //sub atat diferentele de p50 sunt zgomot
+
+static const char *section_names[SECTION_COUNT] = {
+    [COLLECTOR_CPU] = "cpu",
+    [COLLECTOR_MEMORY] = "memory",
+    [COLLECTOR_DISK] = "disk",
+    [COLLECTOR_NETWORK] = "network",
+    [COLLECTOR_PROCESSES] = "processes",
+    [COLLECTOR_GPU] = "gpu",
+    [COLLECTOR_SYSINFO] = "sysinfo",
+    [COLLECTOR_DISK_IO] = "disk_io",
+    [COLLECTOR_PRESSURE] = "pressure",
+    [COLLECTOR_CGROUPS] = "cgroups",
+    [SECTION_ALL] = "all",
+};
+
+typedef struct{
+    double p50_us;
+    double p90_us;
+    double p99_us;
+    double max_us;
+    double syscalls; //pe esantion, -1 daca ptrace nu e permis
+    double allocs;   //pe esantion
+}SectionResult;
+
+typedef struct{
+    int cores;
+    int procs;
+    int ifaces;
+    int cgroups;
+}FixtureSize;
+
+//alocarile: doar cat timp counting e setat, ca sa nu prindem bench-ul insusi
+extern void *__libc_malloc(size_t size);
+extern void *__libc_calloc(size_t count, size_t size);
+extern void *__libc_realloc(void *ptr, size_t size);
+
+static volatile int counting = 0;
+static long allocations = 0;
+
+void *malloc(size_t size){
+    if (counting){
+        allocations = allocations + 1;
+    }
+    return __libc_malloc(size);
+}
+
+void *calloc(size_t count, size_t size){
+    if (counting){
+        allocations = allocations + 1;
+    }
+    return __libc_calloc(count, size);
+}
+
+void *realloc(void *ptr, size_t size){
+    if (counting){
+        allocations = allocations + 1;
+    }
+    return __libc_realloc(ptr, size);
+}
+
+static double now_us(void){
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1e6 + ts.tv_nsec / 1e3;
+}
+
+//fixture-ul: fisiere mici scrise cu printf
+static int write_file(const char *root, const char *path, const char *format, ...){
+    char full[PROCFS_PATH_LEN];
+    snprintf(full, sizeof(full), "%s%s", root, path);
+    FILE *fout = fopen(full, "w");
+    if (fout == NULL){
+        fprintf(stderr, "Could not create %s\n", full);
+        return 0;
+    }
+
+    va_list args;
+    va_start(args, format);
+    vfprintf(fout, format, args);
+    va_end(args);
+    return fclose(fout) == 0;
+}
+
+static int make_dirs(const char *root, const char *path){
+    char full[PROCFS_PATH_LEN];
+    snprintf(full, sizeof(full), "%s%s", root, path);
+    for (char *slash = strchr(full + strlen(root) + 1, '/'); slash != NULL; slash = strchr(slash + 1, '/')){
+        *slash = '\0';
+        if (mkdir(full, 0755) != 0 && errno != EEXIST){
+            return 0;
+        }
+        *slash = '/';
+    }
+    return mkdir(full, 0755) == 0 || errno == EEXIST;
+}
+
+static int build_stat(const char *root, int cores){
+    char full[PROCFS_PATH_LEN];
+    snprintf(full, sizeof(full), "%s/proc/stat", root);
+    FILE *fout = fopen(full, "w");
+    if (fout == NULL){
+        return 0;
+    }
+
+    fprintf(fout, "cpu  %d %d %d %d %d 0 %d 0 0 0\n", 400 * cores, 3 * cores, 150 * cores, 9000 * cores, 20 * cores, 7 * cores);
+    for (int i = 0; i < cores; i = i + 1){
+        fprintf(fout, "cpu%d %d 3 %d 9000 20 0 7 0 0 0\n", i, 400 + i, 150 + i);
+    }
+    fprintf(fout, "intr 123456789 0 9 0 0 0 0 0 0 0 0 0 0 0 0 0 0\n"
+                  "ctxt 987654321\nbtime 1700000000\nprocesses 123456\n"
+                  "procs_running 2\nprocs_blocked 0\nsoftirq 1234 5 6 7 8 9 10 11 12 13 14\n");
+    return fclose(fout) == 0;
+}
+
+static int build_cpuinfo(const char *root, int cores){
+    char full[PROCFS_PATH_LEN];
+    snprintf(full, sizeof(full), "%s/proc/cpuinfo", root);
+    FILE *fout = fopen(full, "w");
+    if (fout == NULL){
+        return 0;
+    }
+
+    for (int i = 0; i < cores; i = i + 1){
+        fprintf(fout, "processor\t: %d\nvendor_id\t: GenuineIntel\ncpu family\t: 6\nmodel\t\t: 85\n"
+                      "model name\t: Fixture CPU @ 2.50GHz\ncpu MHz\t\t: 2500.000\ncache size\t: 36608 KB\n"
+                      "flags\t\t: fpu vme de pse tsc msr pae mce cx8 apic sep mtrr pge mca cmov\n\n", i);
+    }
+    return fclose(fout) == 0;
+}
+
+static int build_net_dev(const char *root, int ifaces){
+    char full[PROCFS_PATH_LEN];
+    snprintf(full, sizeof(full), "%s/proc/net/dev", root);
+    FILE *fout = fopen(full, "w");
+    if (fout == NULL){
+        return 0;
+    }
+
+    fprintf(fout, "Inter-|   Receive                                                |  Transmit\n"
+                  " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n"
+                  "    lo: 123456 1000 0 0 0 0 0 0 123456 1000 0 0 0 0 0 0\n");
+    for (int i = 0; i < ifaces; i = i + 1){
+        fprintf(fout, "  eth%d: %d 9000 0 0 0 0 0 0 %d 8000 0 0 0 0 0 0\n", i, 1000000 + i, 500000 + i);
+    }
+    return fclose(fout) == 0;
+}
+
+static int build_procs(const char *root, int procs){
+    char path[PROCFS_PATH_LEN];
+    for (int pid = 1; pid <= procs; pid = pid + 1){
+        snprintf(path, sizeof(path), "/proc/%d", pid);
+        if (!make_dirs(root, path)){
+            return 0;
+        }
+        snprintf(path, sizeof(path), "/proc/%d/stat", pid);
+        if (!write_file(root, path, "%d (worker %d) S 1 %d %d 0 -1 4194560 120 0 0 0 %d %d 0 0 20 0 1 0 100 "
+                                    "12345678 %d 18446744073709551615 1 1 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0 0\n",
+                        pid, pid, pid, pid, pid * 7, pid * 3, 100 + pid % 5000)){
+            return 0;
+        }
+    }
+    return 1;
+}
+
+//cgroup2: slice-uri cu cate 8 unitati, ca sub systemd; la unitati fisierele de baza
+static int build_cgroups(const char *root, int cgroups){
+    if (!make_dirs(root, "/sys/fs/cgroup") ||
+        !write_file(root, "/sys/fs/cgroup/cgroup.controllers", "cpuset cpu io memory pids\n")){
+        return 0;
+    }
+
+    char dir[PROCFS_PATH_LEN / 2];
+    char path[PROCFS_PATH_LEN];
+    for (int i = 0; i < cgroups; i = i + 1){
+        if (i % 8 == 0){
+            snprintf(dir, sizeof(dir), "/sys/fs/cgroup/slice%d.slice", i / 8);
+        }else{
+            snprintf(dir, sizeof(dir), "/sys/fs/cgroup/slice%d.slice/unit%d.service", i / 8, i);
+        }
+        if (!make_dirs(root, dir)){
+            return 0;
+        }
+        snprintf(path, sizeof(path), "%s/cpu.stat", dir);
+        if (!write_file(root, path, "usage_usec %d\nuser_usec %d\nsystem_usec %d\nnr_periods 0\nnr_throttled 0\n"
+                                    "throttled_usec 0\n", 1000000 + i * 997, 700000 + i * 600, 300000 + i * 397)){
+            return 0;
+        }
+        snprintf(path, sizeof(path), "%s/memory.current", dir);
+        if (!write_file(root, path, "%d\n", 4096 * (1000 + i))){
+            return 0;
+        }
+        snprintf(path, sizeof(path), "%s/memory.max", dir);
+        if (!write_file(root, path, i % 3 == 0 ? "max\n" : "536870912\n")){
+            return 0;
+        }
+    }
+    return 1;
+}
+
+static int build_fixture(char *root, const FixtureSize *size){
+    if (mkdtemp(root) == NULL){
+        perror("mkdtemp");
+        return 0;
+    }
+
+    return make_dirs(root, "/proc/net") && make_dirs(root, "/proc/self") && make_dirs(root, "/proc/pressure") &&
+           make_dirs(root, "/data") && make_dirs(root, "/sys/devices/system/cpu/cpu0/cpufreq") &&
+           build_stat(root, size->cores) && build_cpuinfo(root, size->cores) &&
+           build_net_dev(root, size->ifaces) && build_procs(root, size->procs) &&
+           build_cgroups(root, size->cgroups) &&
+           write_file(root, "/proc/pressure/cpu",
+                      "some avg10=1.25 avg60=0.80 avg300=0.50 total=123456789\n"
+                      "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n") &&
+           write_file(root, "/proc/pressure/memory",
+                      "some avg10=0.10 avg60=0.05 avg300=0.01 total=2345678\n"
+                      "full avg10=0.05 avg60=0.02 avg300=0.00 total=1234567\n") &&
+           write_file(root, "/proc/pressure/io",
+                      "some avg10=2.50 avg60=1.75 avg300=1.00 total=34567890\n"
+                      "full avg10=1.50 avg60=1.00 avg300=0.75 total=23456789\n") &&
+           write_file(root, "/proc/loadavg", "1.52 1.18 0.97 3/%d 123456\n", size->procs) &&
+           write_file(root, "/proc/vmstat",
+                      "nr_free_pages 2048000\nnr_zone_inactive_anon 12345\nnr_zone_active_anon 67890\n"
+                      "nr_dirty 32\nnr_writeback 0\npgpgin 12345678\npgpgout 23456789\npswpin 12\npswpout 34\n"
+                      "pgalloc_normal 987654321\npgfree 987000000\npgactivate 1234567\npgfault 456789012\n"
+                      "pgmajfault 12345\npgrefill 0\npgsteal_kswapd 0\n") &&
+           write_file(root, "/proc/meminfo",
+                      "MemTotal:       32768000 kB\nMemFree:         8192000 kB\nMemAvailable:   16384000 kB\n"
+                      "Buffers:          512000 kB\nCached:          6144000 kB\nSwapCached:            0 kB\n"
+                      "Active:         12000000 kB\nInactive:        6000000 kB\nSwapTotal:       2097148 kB\n"
+                      "SwapFree:        2097148 kB\nDirty:               128 kB\nShmem:            256000 kB\n") &&
+           write_file(root, "/proc/self/mountinfo",
+                      "22 1 253:1 / / rw,relatime shared:1 - ext4 /dev/vda1 rw\n"
+                      "23 22 0:21 / /proc rw,nosuid,nodev,noexec - proc proc rw\n"
+                      "24 22 0:5 / /dev rw,nosuid - devtmpfs udev rw,size=4096k\n"
+                      "25 24 0:26 / /dev/shm rw,nosuid,nodev - tmpfs tmpfs rw\n"
+                      "26 22 253:16 / /data rw,relatime shared:2 - ext4 /dev/vdb rw\n") &&
+           write_file(root, "/proc/diskstats",
+                      "   7       0 loop0 50 0 400 10 0 0 0 0 0 20 10 0 0 0 0 0 0\n"
+                      " 253       0 vda 120000 3000 9000000 45000 80000 60000 7000000 90000 0 70000 135000 0 0 0 0 0 0\n"
+                      " 253       1 vda1 119000 3000 8900000 44000 79000 60000 6900000 89000 0 69000 133000 0 0 0 0 0 0\n"
+                      " 253      16 vdb 5000 10 400000 2000 3000 100 200000 4000 0 5000 6000 0 0 0 0 0 0\n") &&
+           write_file(root, "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq", "2500000\n");
+}
+
+static void remove_fixture(const char *root){
+    char cmd[PROCFS_PATH_LEN + 16];
+    snprintf(cmd, sizeof(cmd), "rm -rf '%s'", root);
+    if (system(cmd) != 0){
+        fprintf(stderr, "Could not remove %s\n", root);
+    }
+}
+
+static void run_section(int section, SystemMetrics *metrics){
+    if (section == SECTION_ALL){
+        get_system_metrics(metrics);
+    }else{
+        run_collector(section);
+    }
+}
+
+static int compare_doubles(const void *a, const void *b){
+    double x = *(const double *)a;
+    double y = *(const double *)b;
+    return (x > y) - (x < y);
+}
+
+static double percentile(const double *sorted, int count, double p){
+    int index = (int)(p * (count - 1) + 0.5);
+    return sorted[index];
+}
+
+static void measure_latency(int samples, SectionResult *results, SystemMetrics *metrics){
+    double *times = malloc(sizeof(double) * (size_t)samples);
+    if (times == NULL){
+        return;
+    }
+
+    for (int section = 0; section < SECTION_COUNT; section = section + 1){
+        allocations = 0;
+        for (int s = 0; s < samples; s = s + 1){
+            counting = 1;
+            double start = now_us();
+            run_section(section, metrics);
+            times[s] = now_us() - start;
+            counting = 0;
+        }
+
+        qsort(times, (size_t)samples, sizeof(double), compare_doubles);
+        SectionResult *result = &results[section];
+        result->p50_us = percentile(times, samples, 0.50);
+        result->p90_us = percentile(times, samples, 0.90);
+        result->p99_us = percentile(times, samples, 0.99);
+        result->max_us = times[samples - 1];
+        result->allocs = (double)allocations / samples;
+    }
+    free(times);
+}
+
+//copilul: aceleasi sectiuni, fiecare esantion precedat de un getppid care ii spune parintelui unde suntem
+static void traced_child(int samples, SystemMetrics *metrics){
+    if (ptrace(PTRACE_TRACEME, 0, NULL, NULL) != 0){
+        _exit(2);
+    }
+    raise(SIGSTOP);
+
+    for (int section = 0; section < SECTION_COUNT; section = section + 1){
+        for (int s = 0; s < samples; s = s + 1){
+            syscall(SYS_getppid);
+            run_section(section, metrics);
+        }
+    }
+    syscall(SYS_getppid);
+    _exit(0);
+}
+
+//intoarce 0 daca nu avem voie la ptrace (container, yama), atunci coloana ramane n/a
+static int count_syscalls(int samples, SectionResult *results, SystemMetrics *metrics){
+    fflush(stdout);
+    pid_t pid = fork();
+    if (pid < 0){
+        return 0;
+    }
+    if (pid == 0){
+        traced_child(samples, metrics);
+    }
+
+    int status;
+    if (waitpid(pid, &status, 0) < 0 || !WIFSTOPPED(status)){
+        return 0;
+    }
+    if (ptrace(PTRACE_SETOPTIONS, pid, NULL, (void *)(long)(PTRACE_O_TRACESYSGOOD | PTRACE_O_EXITKILL)) != 0){
+        kill(pid, SIGKILL);
+        waitpid(pid, &status, 0);
+        return 0;
+    }
+
+    long counts[SECTION_COUNT] = {0};
+    long marks = -1;
+    int deliver = 0;
+    while (ptrace(PTRACE_SYSCALL, pid, NULL, (void *)(long)deliver) == 0 && waitpid(pid, &status, 0) == pid){
+        if (WIFEXITED(status) || WIFSIGNALED(status)){
+            break;
+        }
+
+        deliver = 0;
+        if (WSTOPSIG(status) != (SIGTRAP | 0x80)){
+            //un semnal adevarat (de ex. SIGCHLD), il lasam sa ajunga la copil
+            deliver = WSTOPSIG(status) == SIGSTOP ? 0 : WSTOPSIG(status);
+            continue;
+        }
+
+        struct __ptrace_syscall_info info;
+        if (ptrace(PTRACE_GET_SYSCALL_INFO, pid, (void *)sizeof(info), &info) <= 0 ||
+            info.op != PTRACE_SYSCALL_INFO_ENTRY){
+            continue;
+        }
+        if (info.entry.nr == SYS_getppid){
+            marks = marks + 1;
+        }else if (marks >= 0 && marks / samples < SECTION_COUNT){
+            counts[marks / samples] = counts[marks / samples] + 1;
+        }
+    }
+
+    if (!WIFEXITED(status) || WEXITSTATUS(status) != 0){
+        return 0;
+    }
+    for (int section = 0; section < SECTION_COUNT; section = section + 1){
+        results[section].syscalls = (double)counts[section] / samples;
+    }
+    return 1;
+}
+
+static int find_section(const char *name){
+    for (int section = 0; section < SECTION_COUNT; section = section + 1){
+        if (strcmp(section_names[section], name) == 0){
+            return section;
+        }
+    }
+    return -1;
+}
+
+//prima linie spune pe ce fixture a fost facut; apoi "sectiune p50 p99 syscalls allocs"
+static int save_baseline(const char *path, const FixtureSize *size, int samples, const SectionResult *results){
+    FILE *fout = fopen(path, "w");
+    if (fout == NULL){
+        fprintf(stderr, "Could not write %s\n", path);
+        return 0;
+    }
+
+    fprintf(fout, "# bench_collectors baseline: cores=%d procs=%d ifaces=%d cgroups=%d samples=%d\n",
+            size->cores, size->procs, size->ifaces, size->cgroups, samples);
+    fprintf(fout, "# section p50_us p99_us syscalls allocs\n");
+    for (int section = 0; section < SECTION_COUNT; section = section + 1){
+        const SectionResult *result = &results[section];
+        fprintf(fout, "%s %.2f %.2f %.2f %.2f\n", section_names[section],
+                result->p50_us, result->p99_us, result->syscalls, result->allocs);
+    }
+    return fclose(fout) == 0;
+}
+
+//intoarce cate regresii a gasit sau -1 daca baseline-ul lipseste / e pe alt fixture
+static int check_baseline(const char *path, const FixtureSize *size, double tolerance, const SectionResult *results){
+    FILE *fin = fopen(path, "r");
+    if (fin == NULL){
+        fprintf(stderr, "Could not open baseline %s (run with -w to create it)\n", path);
+        return -1;
+    }
+
+    char line[LEN_LINE];
+    FixtureSize saved = {0};
+    if (fgets(line, sizeof(line), fin) == NULL ||
+        sscanf(line, "# bench_collectors baseline: cores=%d procs=%d ifaces=%d cgroups=%d",
+               &saved.cores, &saved.procs, &saved.ifaces, &saved.cgroups) != 4){
+        fprintf(stderr, "%s is not a bench_collectors baseline\n", path);
+        fclose(fin);
+        return -1;
+    }
+    if (saved.cores != size->cores || saved.procs != size->procs || saved.ifaces != size->ifaces ||
+        saved.cgroups != size->cgroups){
+        fprintf(stderr, "Baseline was taken with -c %d -p %d -i %d -g %d\n", saved.cores, saved.procs, saved.ifaces, saved.cgroups);
+        fclose(fin);
+        return -1;
+    }
+
+    int regressions = 0;
+    while (fgets(line, sizeof(line), fin) != NULL){
+        char name[32];
+        SectionResult base;
+        if (line[0] == '#' || sscanf(line, "%31s %lf %lf %lf %lf", name, &base.p50_us, &base.p99_us, &base.syscalls, &base.allocs) != 5){
+            continue;
+        }
+        int section = find_section(name);
+        if (section < 0){
+            continue;
+        }
+
+        const SectionResult *now = &results[section];
+        if (now->p50_us > base.p50_us * (1.0 + tolerance) && now->p50_us - base.p50_us > MIN_REGRESSION_US){
+            printf("REGRESSION %-10s p50 %.1f us > baseline %.1f us (+%.0f%%)\n",
+                   name, now->p50_us, base.p50_us, (now->p50_us / base.p50_us - 1.0) * 100.0);
+            regressions = regressions + 1;
+        }
+        //1%: rescanarea cgroup-urilor (la 10 s) poate cadea sau nu in esantioanele numarate
+        if (now->syscalls >= 0 && base.syscalls >= 0 && now->syscalls > base.syscalls * 1.01 + 0.5){
+            printf("REGRESSION %-10s %.1f syscalls/sample > baseline %.1f\n", name, now->syscalls, base.syscalls);
+            regressions = regressions + 1;
+        }
+        if (now->allocs > base.allocs + 0.5){
+            printf("REGRESSION %-10s %.1f allocations/sample > baseline %.1f\n", name, now->allocs, base.allocs);
+            regressions = regressions + 1;
+        }
+    }
+    fclose(fin);
+    return regressions;
+}
+
+static void usage(const char *name){
+    fprintf(stderr, "usage: %s [-c cores] [-p procs] [-i ifaces] [-g cgroups] [-n samples] [-b baseline [-w]] [-t tolerance]\n", name);
+}
+
+int main(int argc, char **argv){
+    FixtureSize size = {8, 500, 4, 200};
+    int samples = 200;
+    const char *baseline = NULL;
+    int write_baseline = 0;
+    double tolerance = 0.3;
+
+    int opt;
+    while ((opt = getopt(argc, argv, "c:p:i:g:n:b:wt:")) != -1){
+        switch (opt){
+            case 'c': size.cores = atoi(optarg); break;
+            case 'p': size.procs = atoi(optarg); break;
+            case 'i': size.ifaces = atoi(optarg); break;
+            case 'g': size.cgroups = atoi(optarg); break;
+            case 'n': samples = atoi(optarg); break;
+            case 'b': baseline = optarg; break;
+            case 'w': write_baseline = 1; break;
+            case 't': tolerance = atof(optarg); break;
+            default: usage(argv[0]); return 1;
+        }
+    }
+    if (size.cores < 1 || size.cores > MAX_CORES || size.procs < 1 || size.ifaces < 0 || size.cgroups < 0 ||
+        size.ifaces > MAX_INTERFACES - 1 || samples < 1 || tolerance < 0 || (write_baseline && baseline == NULL)){
+        usage(argv[0]);
+        return 1;
+    }
+
+    char root[] = "/tmp/sysmon-fixture-XXXXXX";
+    if (!build_fixture(root, &size)){
+        fprintf(stderr, "Could not build the fixture in %s\n", root);
+        remove_fixture(root);
+        return 1;
+    }
+
+    //fara nvidia-smi adevarat: colectorul GPU merge pe ramura "absent", la fel pe orice masina
+    setenv("MONITOR_NVIDIA_SMI", "sysmon-no-such-nvidia-smi", 0);
+    set_system_root(root);
+    for (int i = 0; i < COLLECTOR_COUNT; i = i + 1){
+        set_collector_period(i, 0.0);
+    }
+
+    static SystemMetrics metrics;
+    get_system_metrics(&metrics); //deschide sursele si face prima citire, ca sa nu intre in masuratori
+    if (metrics.core_count != size.cores || metrics.net_interface_count < size.ifaces){
+        fprintf(stderr, "The collectors did not read the fixture (%d cores, %d interfaces)\n",
+                metrics.core_count, metrics.net_interface_count);
+        remove_fixture(root);
+        return 1;
+    }
+
+    SectionResult results[SECTION_COUNT];
+    for (int section = 0; section < SECTION_COUNT; section = section + 1){
+        results[section].syscalls = -1;
+    }
+    measure_latency(samples, results, &metrics);
+    int traced = count_syscalls(samples, results, &metrics);
+    remove_fixture(root);
+
+    printf("fixture: %d cores, %d processes, %d interfaces, %d cgroups; %d samples per collector\n",
+           size.cores, size.procs, size.ifaces, size.cgroups, samples);
+    printf("%-10s %9s %9s %9s %9s %9s %9s\n", "collector", "p50 us", "p90 us", "p99 us", "max us", "syscalls", "allocs");
+    for (int section = 0; section < SECTION_COUNT; section = section + 1){
+        const SectionResult *result = &results[section];
+        char syscalls[16];
+        if (traced){
+            snprintf(syscalls, sizeof(syscalls), "%.1f", result->syscalls);
+        }else{
+            snprintf(syscalls, sizeof(syscalls), "n/a");
+        }
+        printf("%-10s %9.1f %9.1f %9.1f %9.1f %9s %9.1f\n", section_names[section],
+               result->p50_us, result->p90_us, result->p99_us, result->max_us, syscalls, result->allocs);
+    }
+    if (!traced){
+        printf("(syscall counts need ptrace on a child process, which is not allowed here)\n");
+    }
+
+    if (baseline == NULL){
+        return 0;
+    }
+    if (write_baseline){
+        if (!save_baseline(baseline, &size, samples, results)){
+            return 1;
+        }
+        printf("baseline written to %s\n", baseline);
+        return 0;
+    }
+
+    int regressions = check_baseline(baseline, &size, tolerance, results);
+    if (regressions < 0){
+        return 1;
+    }
+    if (regressions > 0){
+        printf("FAIL: %d regression(s) against %s (tolerance %.0f%%)\n", regressions, baseline, tolerance * 100.0);
+        return 1;
+    }
+    printf("OK: no regressions against %s (tolerance %.0f%%)\n", baseline, tolerance * 100.0);
+    return 0;
+}
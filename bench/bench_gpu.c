@@ -0,0 +1,91 @@
+//Benchmark: canalul persistent nvidia-smi --loop-ms vs vechiul popen la fiecare esantion
+//
+//  bench_gpu [command] [samples]
+//
+//Implicit command = bench/fake_nvidia_smi.sh, ca sa mearga si fara placa NVIDIA.
+//Pentru varianta "fara GPU": FAKE_GPUS=0 bench_gpu
+
+#include "gpu.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#define LOOP_MS 100
+
+static double now_ms(void){
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1000.0 + ts.tv_nsec / 1e6;
+}
+
+static void sleep_ms(int ms){
+    struct timespec ts = {ms / 1000, (long)(ms % 1000) * 1000000L};
+    nanosleep(&ts, NULL);
+}
+
+//implementarea veche (doar primul GPU), pastrata ca referinta
+static int popen_get_gpu(const char *command, GpuData *gpu){
+    char cmd[BUFFER_SIZE];
+    snprintf(cmd, sizeof(cmd), "%s --query-gpu=name,utilization.gpu,memory.total,memory.used "
+                               "--format=csv,noheader,nounits 2>/dev/null", command);
+    FILE *fin = popen(cmd, "r");
+    if (fin == NULL){
+        return 0;
+    }
+
+    char buffer[BUFFER_SIZE];
+    int found = 0;
+    if (fgets(buffer, BUFFER_SIZE, fin) != NULL){
+        found = sscanf(buffer, "%*d, %95[^,], %lf, %lf, %lf", gpu->name, &gpu->usage_percent,
+                       &gpu->memory_total_mb, &gpu->memory_used_mb) == 4;
+    }
+    pclose(fin);
+    return found;
+}
+
+int main(int argc, char **argv){
+    const char *command = argc > 1 ? argv[1] : "bench/fake_nvidia_smi.sh";
+    int samples = argc > 2 ? atoi(argv[2]) : 20;
+    if (samples < 1){
+        fprintf(stderr, "usage: %s [command] [samples]\n", argv[0]);
+        return 1;
+    }
+
+    GpuData gpus[MAX_GPUS];
+    double start = now_ms();
+    int found = 0;
+    for (int i = 0; i < samples; i = i + 1){
+        found = popen_get_gpu(command, &gpus[0]);
+    }
+    printf("%-30s %10.3f ms/sample  (%d GPU)\n", "popen per sample", (now_ms() - start) / samples, found);
+
+    //canalul: masuram doar timpul petrecut in poll, nu asteptarea dintre esantioane
+    GpuChannel channel;
+    gpu_channel_init(&channel, command, LOOP_MS);
+    double in_poll = 0.0;
+    double worst = 0.0;
+    int count = 0;
+    for (int i = 0; i < samples; i = i + 1){
+        double t = now_ms();
+        count = gpu_channel_poll(&channel, gpus, MAX_GPUS);
+        double elapsed = now_ms() - t;
+        in_poll = in_poll + elapsed;
+        if (elapsed > worst){
+            worst = elapsed;
+        }
+        sleep_ms(LOOP_MS);
+    }
+    printf("%-30s %10.3f ms/sample  (max %.3f ms, %d GPU)\n", "persistent --loop-ms channel",
+           in_poll / samples, worst, count);
+
+    const char *states[] = {"stopped", "running", "absent"};
+    printf("channel state after %d samples: %s\n", samples, states[channel.state]);
+    for (int i = 0; i < count; i = i + 1){
+        printf("  GPU%d %-20s %5.1f%%  %.0f / %.0f MB\n", i, gpus[i].name, gpus[i].usage_percent,
+               gpus[i].memory_used_mb, gpus[i].memory_total_mb);
+    }
+
+    gpu_channel_close(&channel);
+    return 0;
+}
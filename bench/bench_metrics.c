@@ -0,0 +1,166 @@
+//Microbenchmark: cate apeluri pe secunda
+//
+//  bench_metrics [seconds]
+//
+//Masoara get_system_metrics complet, cu toate colectoarele pe perioada 0 (fiecare apel
+//colecteaza din nou, nu doar copiaza esantionul din cache), apoi doar citirea
+//fisierelor /proc/stat, /proc/meminfo si /proc/net/dev: vechea varianta
+//fopen/fgets/sscanf fata de ProcSource + pread.
+
+#include "core.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+static double now_sec(void){
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec + ts.tv_nsec / 1e9;
+}
+
+//cititorii vechi, pastrati doar ca referinta
+static int fopen_cpu_raw(CpuRawData *total, CpuRawData *cores, int num_cores){
+    FILE *fin = fopen("/proc/stat", "r");
+    if (fin == NULL){
+        return 0;
+    }
+
+    char buffer[LEN_LINE];
+    int core_index = 0;
+    while (fgets(buffer, LEN_LINE, fin) != NULL){
+        if (strncmp(buffer, "cpu ", 4) == 0){
+            sscanf(buffer, "cpu  %lu %lu %lu %lu %lu %lu %lu %lu",
+                &total->user, &total->nice, &total->system, &total->idle,
+                &total->iowait, &total->irq, &total->softirq, &total->steal);
+        }else if (strncmp(buffer, "cpu", 3) == 0 && buffer[3] >= '0' && buffer[3] <= '9'){
+            if (core_index < num_cores){
+                sscanf(buffer, "cpu%*d %lu %lu %lu %lu %lu %lu %lu %lu",
+                    &cores[core_index].user, &cores[core_index].nice,
+                    &cores[core_index].system, &cores[core_index].idle,
+                    &cores[core_index].iowait, &cores[core_index].irq,
+                    &cores[core_index].softirq, &cores[core_index].steal);
+            }
+            core_index = core_index + 1;
+        }
+    }
+
+    fclose(fin);
+    return 1;
+}
+
+static int fopen_memory(uint64_t *mem_total, uint64_t *mem_available){
+    FILE *fin = fopen("/proc/meminfo", "r");
+    if (fin == NULL){
+        return 0;
+    }
+
+    char line[SIZE];
+    while (fgets(line, sizeof(line), fin) != NULL){
+        if (strncmp(line, "MemTotal:", 9) == 0){
+            sscanf(line, "MemTotal: %lu kB", mem_total);
+        }else if (strncmp(line, "MemAvailable:", 13) == 0){
+            sscanf(line, "MemAvailable: %lu kB", mem_available);
+        }
+
+        if (*mem_total > 0 && *mem_available > 0){
+            break;
+        }
+    }
+
+    fclose(fin);
+    return 1;
+}
+
+static int fopen_network(unsigned long long *total_rx, unsigned long long *total_tx){
+    FILE *fin = fopen("/proc/net/dev", "r");
+    if (!fin) return 0;
+
+    char line[512];
+    if (!fgets(line, sizeof(line), fin) || !fgets(line, sizeof(line), fin)) {
+        fclose(fin);
+        return 0;
+    }
+
+    while (fgets(line, sizeof(line), fin)) {
+        char iface[32];
+        unsigned long long rx_bytes, tx_bytes, dummy;
+
+        char *colon = strchr(line, ':');
+        if (colon) {
+            *colon = ' ';
+            if (sscanf(line, "%31s %llu %llu %llu %llu %llu %llu %llu %llu %llu", iface, &rx_bytes, &dummy, &dummy, &dummy, &dummy, &dummy, &dummy, &dummy, &tx_bytes) >= 10) {
+                if (strcmp(iface, "lo") != 0) {
+                    *total_rx += rx_bytes;
+                    *total_tx += tx_bytes;
+                }
+            }
+        }
+    }
+    fclose(fin);
+    return 1;
+}
+
+static void report(const char *label, int calls, double elapsed){
+    printf("%-34s %12.0f calls/s\n", label, calls / elapsed);
+}
+
+int main(int argc, char **argv){
+    double seconds = argc > 1 ? atof(argv[1]) : 2.0;
+    if (seconds <= 0){
+        fprintf(stderr, "usage: %s [seconds]\n", argv[0]);
+        return 1;
+    }
+
+    static SystemMetrics metrics;
+    static CpuRawData cores[MAX_CORES];
+    CpuRawData total;
+    int num_cores = cpu_get_core_count(NULL);
+
+    //altfel planificatorul ar rula colectoarele doar o data pe perioada
+    for (int i = 0; i < COLLECTOR_COUNT; i = i + 1){
+        set_collector_period(i, 0.0);
+    }
+
+    double start = now_sec();
+    int calls = 0;
+    while (now_sec() - start < seconds){
+        get_system_metrics(&metrics);
+        calls = calls + 1;
+    }
+    report("get_system_metrics", calls, now_sec() - start);
+
+    start = now_sec();
+    calls = 0;
+    while (now_sec() - start < seconds){
+        uint64_t mem_total = 0, mem_available = 0;
+        unsigned long long rx = 0, tx = 0;
+        fopen_cpu_raw(&total, cores, num_cores);
+        fopen_memory(&mem_total, &mem_available);
+        fopen_network(&rx, &tx);
+        calls = calls + 1;
+    }
+    report("stat+meminfo+net/dev, fopen", calls, now_sec() - start);
+
+    ProcSource stat, meminfo, net_dev;
+    procfs_source_init(&stat, "/proc/stat");
+    procfs_source_init(&meminfo, "/proc/meminfo");
+    procfs_source_init(&net_dev, "/proc/net/dev");
+    MemoryData mem;
+    NetworkData net;
+
+    start = now_sec();
+    calls = 0;
+    while (now_sec() - start < seconds){
+        cpu_get_raw_data(&stat, &total, cores, num_cores);
+        memory_get_data(&meminfo, &mem);
+        network_get_data(&net_dev, &net);
+        calls = calls + 1;
+    }
+    report("stat+meminfo+net/dev, pread", calls, now_sec() - start);
+
+    procfs_source_close(&stat);
+    procfs_source_close(&meminfo);
+    procfs_source_close(&net_dev);
+    return 0;
+}
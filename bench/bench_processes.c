@@ -0,0 +1,143 @@
+//Benchmark: scannerul nativ din processes.c vs vechiul popen("ps | head")
+//
+//  bench_processes [num_procs] [iterations]
+//
+//Scannerul nativ ruleaza pe un /proc sintetic cu num_procs procese si pe /proc
+//real. ps citeste mereu /proc real, asa ca varianta popen ruleaza doar acolo.
+
+#include "processes.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/stat.h>
+
+//implementarea veche, pastrata doar ca referinta
+static int popen_get_top(ProcessData *procs, int max_count){
+    FILE *fin = popen("ps -eo pid,comm,%cpu,%mem,user --sort=-%cpu | head -n 31", "r");
+    if (fin == NULL){
+        return 0;
+    }
+
+    char line[LINE_LEN];
+    int count = 0;
+    int is_header = 1;
+    while (fgets(line, LINE_LEN, fin) != NULL && count < max_count){
+        if (is_header){
+            is_header = 0;
+            continue;
+        }
+
+        if (sscanf(line, "%d %15s %lf %lf %31s",
+            &procs[count].pid, procs[count].name, &procs[count].cpu_percent,
+            &procs[count].ram_percent, procs[count].user) == 5) {
+            count++;
+        }
+    }
+
+    if (pclose(fin) != 0){
+        return 0;
+    }
+    return count;
+}
+
+static double now_ms(void){
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1000.0 + ts.tv_nsec / 1e6;
+}
+
+static int write_stat(const char *root, int pid, uint64_t utime){
+    char path[LINE_LEN];
+    snprintf(path, sizeof(path), "%s/%d", root, pid);
+    if (mkdir(path, 0755) != 0){
+        return 0;
+    }
+
+    snprintf(path, sizeof(path), "%s/%d/stat", root, pid);
+    FILE *fout = fopen(path, "w");
+    if (fout == NULL){
+        return 0;
+    }
+    fprintf(fout, "%d (worker %d) S 1 %d %d 0 -1 4194560 120 0 0 0 %lu %lu 0 0 20 0 1 0 100 "
+                  "12345678 %d 18446744073709551615 1 1 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0 0\n",
+            pid, pid, pid, pid, (unsigned long)utime, (unsigned long)(utime / 2), 100 + pid % 5000);
+    fclose(fout);
+    return 1;
+}
+
+static int build_fake_proc(char *root, int num_procs){
+    if (mkdtemp(root) == NULL){
+        perror("mkdtemp");
+        return 0;
+    }
+
+    for (int pid = 1; pid <= num_procs; pid = pid + 1){
+        if (!write_stat(root, pid, (uint64_t)pid * 7)){
+            fprintf(stderr, "Could not create fake pid %d\n", pid);
+            return 0;
+        }
+    }
+    return 1;
+}
+
+static void remove_fake_proc(const char *root, int num_procs){
+    char cmd[LINE_LEN];
+    snprintf(cmd, sizeof(cmd), "rm -rf '%s'", root);
+    if (system(cmd) != 0){
+        fprintf(stderr, "Could not remove %s (%d pids)\n", root, num_procs);
+    }
+}
+
+static void run_native(const char *label, int iterations){
+    ProcessData procs[MAX_PROCESSES];
+    CpuRawData total = {0};
+    double start = now_ms();
+    int count = 0;
+
+    for (int i = 0; i < iterations; i = i + 1){
+        total.user = total.user + 400;
+        total.idle = total.idle + 400;
+        count = processes_get_top(procs, MAX_PROCESSES, &total, 8);
+    }
+
+    printf("%-28s %10.3f ms/call  (%d rows)\n", label, (now_ms() - start) / iterations, count);
+}
+
+static void run_popen(const char *label, int iterations){
+    ProcessData procs[MAX_PROCESSES];
+    double start = now_ms();
+    int count = 0;
+
+    for (int i = 0; i < iterations; i = i + 1){
+        count = popen_get_top(procs, MAX_PROCESSES);
+    }
+
+    printf("%-28s %10.3f ms/call  (%d rows)\n", label, (now_ms() - start) / iterations, count);
+}
+
+int main(int argc, char **argv){
+    int num_procs = argc > 1 ? atoi(argv[1]) : 20000;
+    int iterations = argc > 2 ? atoi(argv[2]) : 20;
+    if (num_procs < 1 || iterations < 1){
+        fprintf(stderr, "usage: %s [num_procs] [iterations]\n", argv[0]);
+        return 1;
+    }
+
+    char root[] = "/tmp/fake_procXXXXXX";
+    if (!build_fake_proc(root, num_procs)){
+        return 1;
+    }
+
+    char label[64];
+    snprintf(label, sizeof(label), "native, fake /proc (%d)", num_procs);
+    processes_set_proc_root(root);
+    run_native(label, iterations);
+    remove_fake_proc(root, num_procs);
+
+    processes_set_proc_root("/proc");
+    run_native("native, real /proc", iterations);
+    run_popen("popen ps|head, real /proc", iterations);
+    return 0;
+}
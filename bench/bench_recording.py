@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Session recording benchmark: file size per sample, append cost and seek latency.
+
+    bench_recording.py [--samples N] [--interval-ms MS] [--keyframe-every K] [--max-seek-ms MS]
+
+Records N live samples (get_system_metrics + the full process list, as
+`main.py --record` does) to a temporary session, then reopens it and
+replays it frame by frame and in random order. Reports bytes per keyframe
+and per delta frame against the raw size, append p50/p99, the time to open
+the recording, and sequential/random seek p50/p99. With --max-seek-ms the
+script exits non-zero when the random seek p99 is slower.
+
+Needs build/libmonitor.so (see the README).
+"""
+import argparse
+import ctypes
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "frontend")))
+
+from bridge import SystemMetrics, ProcessSnapshot, load_monitor_lib   # noqa: E402
+from recording import (SessionRecorder, SessionReader, FRAME_KEYFRAME, FRAME_HEADER,   # noqa: E402
+                       RECORD_SIZE, METRICS_SIZE)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=600)
+    parser.add_argument("--interval-ms", type=float, default=20.0)
+    parser.add_argument("--keyframe-every", type=int, default=60)
+    parser.add_argument("--max-seek-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    lib = load_monitor_lib()
+    metrics = SystemMetrics()
+    procs = ProcessSnapshot()
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-recording-"), "session.smrec")
+
+    recorder = SessionRecorder(path, keyframe_every=args.keyframe_every)
+    append_us = []
+    raw_bytes = 0
+    for _ in range(args.samples):
+        time.sleep(args.interval_ms / 1000.0)
+        lib.get_system_metrics(ctypes.byref(metrics))
+        procs.fill()
+        raw_bytes += METRICS_SIZE + procs.count * RECORD_SIZE
+        start = time.perf_counter()
+        recorder.append(time.time(), 0.0, metrics, procs)
+        append_us.append((time.perf_counter() - start) * 1e6)
+    recorder.close()
+
+    start = time.perf_counter()
+    reader = SessionReader(path)
+    open_ms = (time.perf_counter() - start) * 1000.0
+
+    sizes = {True: [], False: []}
+    with open(path, "rb") as data:
+        for offset, kind in zip(reader.index["offset"].tolist(), reader.index["kind"].tolist()):
+            data.seek(offset)
+            length = FRAME_HEADER.unpack(data.read(FRAME_HEADER.size))[0]
+            sizes[kind == FRAME_KEYFRAME].append(FRAME_HEADER.size + length)
+
+    def seeks(frames):
+        times = []
+        for frame in frames:
+            start = time.perf_counter()
+            reader.seek(frame)
+            times.append((time.perf_counter() - start) * 1e6)
+        return times
+
+    sequential = seeks(range(len(reader)))
+    frames = [random.randrange(len(reader)) for _ in range(len(reader))]
+    random_us = seeks(frames)
+    reader.close()
+
+    file_bytes = os.path.getsize(path) + os.path.getsize(path + ".idx")
+    print(f"{args.samples} samples, {procs.count} processes, keyframe every {args.keyframe_every}")
+    print(f"size        {file_bytes / args.samples:8.0f} B/sample   raw {raw_bytes / args.samples:8.0f} B/sample"
+          f"   ({raw_bytes / file_bytes:.0f}x smaller)")
+    print(f"frames      keyframe {statistics.mean(sizes[True]):8.0f} B   delta {statistics.mean(sizes[False]):8.0f} B")
+    print(f"append      p50 {percentile(append_us, 0.5):8.0f} us   p99 {percentile(append_us, 0.99):8.0f} us")
+    print(f"open        {open_ms:8.2f} ms")
+    print(f"seek next   p50 {percentile(sequential, 0.5):8.0f} us   p99 {percentile(sequential, 0.99):8.0f} us")
+    print(f"seek random p50 {percentile(random_us, 0.5):8.0f} us   p99 {percentile(random_us, 0.99):8.0f} us")
+    os.remove(path)
+    os.remove(path + ".idx")
+    os.rmdir(os.path.dirname(path))
+
+    if args.max_seek_ms is not None and percentile(random_us, 0.99) > args.max_seek_ms * 1000.0:
+        print(f"FAIL: random seek p99 above {args.max_seek_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Startup benchmark: time from launching the dashboard to its first real frame.
+
+    bench_startup.py [--runs N] [--max-first-frame-ms MS] [--ring NAME]
+
+Every run is a fresh interpreter (cold imports, cold library load) on the
+offscreen Qt platform. The child reports, on CLOCK_MONOTONIC (shared with
+the parent), when the imports finished, when the window was shown, and
+when the first sample was painted, plus the CPU% in that frame. The
+medians are printed; with --max-first-frame-ms the script exits non-zero
+when the median first frame is slower, so it can gate a regression check.
+
+Needs build/libmonitor.so (see the README).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+FRONTEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "frontend"))
+
+# Runs inside the child; prints one JSON line with the milestones
+CHILD = r"""
+import json, sys, time
+marks = {}
+import main
+marks["imported"] = time.monotonic()
+from PyQt6.QtWidgets import QApplication
+
+# Wrapped on the class, before the window connects to it, so the first sample is never missed
+paint = main.MainWindow.on_sample_ready
+def first_frame(self, sample_ms):
+    paint(self, sample_ms)
+    if "first_frame" not in marks:
+        marks["first_frame"] = time.monotonic()
+        marks["cpu_percent"] = self.sampler.front.cpu_usage_percent
+        self.close()
+        app.quit()
+main.MainWindow.on_sample_ready = first_frame
+
+app = QApplication([sys.argv[0], "-platform", "offscreen"])
+window = main.MainWindow(ring_name=RING)
+window.show()
+marks["shown"] = time.monotonic()
+app.exec()
+print(json.dumps(marks))
+"""
+
+
+def run_once(ring):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    start = time.monotonic()
+    result = subprocess.run([sys.executable, "-c", CHILD.replace("RING", repr(ring))],
+                            cwd=FRONTEND_DIR, env=env, capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"child exited with {result.returncode}")
+    marks = json.loads(result.stdout.strip().splitlines()[-1])
+    return {
+        "imports": (marks["imported"] - start) * 1000.0,
+        "window shown": (marks["shown"] - start) * 1000.0,
+        "first frame": (marks["first_frame"] - start) * 1000.0,
+        "cpu_percent": marks["cpu_percent"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-first-frame-ms", type=float, default=None)
+    parser.add_argument("--ring", default=None, help="attach to a running monitord ring instead of sampling")
+    args = parser.parse_args()
+
+    runs = [run_once(args.ring) for _ in range(args.runs)]
+    for key in ("imports", "window shown", "first frame"):
+        values = [run[key] for run in runs]
+        print(f"{key:<14} median {statistics.median(values):8.1f} ms   "
+              f"min {min(values):8.1f}   max {max(values):8.1f}")
+    zero_frames = sum(1 for run in runs if run["cpu_percent"] == 0.0)
+    print(f"first frames with CPU 0.0%: {zero_frames}/{len(runs)}")
+
+    first_frame = statistics.median(run["first frame"] for run in runs)
+    if args.max_first_frame_ms is not None and first_frame > args.max_first_frame_ms:
+        print(f"FAIL: first frame {first_frame:.1f} ms > {args.max_first_frame_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
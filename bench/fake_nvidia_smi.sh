@@ -0,0 +1,46 @@
+#!/bin/sh
+# Stand-in for nvidia-smi --query-gpu ... --loop-ms=N, for testing the GPU channel
+# without NVIDIA hardware:
+#
+#   MONITOR_NVIDIA_SMI=bench/fake_nvidia_smi.sh python3 src/frontend/main.py
+#
+# FAKE_GPUS     number of GPUs to report (default 2; 0 = behave like a box without a GPU)
+# FAKE_SAMPLES  exit after this many loops (default: never), to exercise restarts
+# FAKE_HANG     1 = after FAKE_SAMPLES loops stop writing and ignore SIGTERM instead of
+#               exiting, like an nvidia-smi stuck in the driver
+
+gpus=${FAKE_GPUS:-2}
+samples=${FAKE_SAMPLES:-0}
+hang=${FAKE_HANG:-0}
+loop_ms=0   # without --loop-ms, print one sample and exit like nvidia-smi
+for arg in "$@"; do
+    case "$arg" in
+        --loop-ms=*) loop_ms=${arg#--loop-ms=} ;;
+    esac
+done
+
+if [ "$gpus" -eq 0 ]; then
+    echo "No devices were found"
+    exit 6
+fi
+
+if [ "$loop_ms" -eq 0 ]; then
+    samples=1
+    hang=0
+fi
+interval=$(awk "BEGIN { print $loop_ms / 1000 }")
+n=0
+while [ "$samples" -eq 0 ] || [ "$n" -lt "$samples" ]; do
+    i=0
+    while [ "$i" -lt "$gpus" ]; do
+        echo "$i, Fake GPU $i, $(( (n * 7 + i * 30) % 101 )), 8192, $(( 1024 + (n * 64 + i * 512) % 7000 ))"
+        i=$((i + 1))
+    done
+    n=$((n + 1))
+    sleep "$interval"
+done
+
+if [ "$hang" -eq 1 ]; then
+    trap '' TERM
+    while :; do sleep 1; done
+fi
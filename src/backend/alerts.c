@@ -0,0 +1,357 @@
+#include "include/alerts.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <stddef.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/socket.h>
+#include <sys/un.h>
+
+static const char *op_names[] = {">", ">=", "<", "<="};
+
+//─── campuri ───────────────────────────────────────────────────────────────
+
+//"prefix.N" sau "prefix.N.rest": intoarce N si pointerul dupa el, sau NULL
+static const char *parse_index(const char *field, const char *prefix, long limit, long *index){
+    size_t len = strlen(prefix);
+    if (strncmp(field, prefix, len) != 0 || field[len] != '.'){
+        return NULL;
+    }
+    char *end;
+    errno = 0;
+    long value = strtol(field + len + 1, &end, 10);
+    if (end == field + len + 1 || errno != 0 || value < 0 || value >= limit){
+        return NULL;
+    }
+    *index = value;
+    return end;
+}
+
+//campurile scalare, cpu_cores_usage.N, gpu.N.usage_percent si gpu.N.memory_used_mb au acelasi nume
+//ca seriile din history; mounts.N.usage_percent exista doar aici (history nu are serii pe mount,
+//iar disk.<dev>.* sunt contoare de I/O cautate dupa nume, nu la un offset fix)
+static int resolve_field(const char *field, size_t *offset, char *type){
+    for (size_t i = 0; i < metric_scalar_field_count; i = i + 1){
+        if (strcmp(field, metric_scalar_fields[i].name) == 0){
+            *offset = metric_scalar_fields[i].offset;
+            *type = metric_scalar_fields[i].type;
+            return 1;
+        }
+    }
+
+    long index;
+    const char *rest;
+    *type = 'd';
+    if ((rest = parse_index(field, "cpu_cores_usage", MAX_CORES, &index)) != NULL && *rest == '\0'){
+        *offset = offsetof(SystemMetrics, cpu_cores_usage) + (size_t)index * sizeof(double);
+        return 1;
+    }
+    if ((rest = parse_index(field, "mounts", MAX_MOUNTS, &index)) != NULL && strcmp(rest, ".usage_percent") == 0){
+        *offset = offsetof(SystemMetrics, mounts) + (size_t)index * sizeof(MountData) + offsetof(MountData, usage_percent);
+        return 1;
+    }
+    if ((rest = parse_index(field, "gpu", MAX_GPUS, &index)) != NULL){
+        size_t base = offsetof(SystemMetrics, gpus) + (size_t)index * sizeof(GpuData);
+        if (strcmp(rest, ".usage_percent") == 0){
+            *offset = base + offsetof(GpuData, usage_percent);
+            return 1;
+        }
+        if (strcmp(rest, ".memory_used_mb") == 0){
+            *offset = base + offsetof(GpuData, memory_used_mb);
+            return 1;
+        }
+    }
+    return 0;
+}
+
+static double read_field(const SystemMetrics *metrics, const AlertRule *rule){
+    const char *field = (const char *)metrics + rule->offset;
+    if (rule->type == 'd'){
+        return *(const double *)field;
+    }else if (rule->type == 'l'){
+        return (double)*(const long *)field;
+    }
+    return (double)*(const int *)field;
+}
+
+static int compare(AlertOp op, double value, double limit){
+    switch (op){
+        case ALERT_OP_GT: return value > limit;
+        case ALERT_OP_GE: return value >= limit;
+        case ALERT_OP_LT: return value < limit;
+        case ALERT_OP_LE: return value <= limit;
+    }
+    return 0;
+}
+
+//─── evenimente ────────────────────────────────────────────────────────────
+
+AlertEngine *alerts_open(const char *sink){
+    AlertEngine *engine = calloc(1, sizeof(AlertEngine));
+    if (engine == NULL){
+        fprintf(stderr, "Could not allocate alert engine\n");
+        return NULL;
+    }
+
+    if (sink == NULL){
+        engine->fd = STDERR_FILENO;
+    }else if (strncmp(sink, ALERT_SOCKET_PREFIX, strlen(ALERT_SOCKET_PREFIX)) == 0){
+        const char *path = sink + strlen(ALERT_SOCKET_PREFIX);
+        if (strlen(path) >= sizeof(engine->socket_path)){
+            fprintf(stderr, "Alert socket path too long: %s\n", path);
+            free(engine);
+            return NULL;
+        }
+        //datagrame fara conexiune: daca nu asculta nimeni, evenimentul se pierde, nu blocam
+        engine->fd = socket(AF_UNIX, SOCK_DGRAM | SOCK_CLOEXEC, 0);
+        engine->is_socket = 1;
+        strcpy(engine->socket_path, path);
+    }else{
+        engine->fd = open(sink, O_WRONLY | O_CREAT | O_APPEND | O_CLOEXEC, 0644);
+    }
+
+    if (engine->fd < 0){
+        fprintf(stderr, "Could not open alert sink %s: %s\n", sink, strerror(errno));
+        free(engine);
+        return NULL;
+    }
+    return engine;
+}
+
+void alerts_close(AlertEngine *engine){
+    if (engine == NULL){
+        return;
+    }
+    if (engine->fd != STDERR_FILENO){
+        close(engine->fd);
+    }
+    free(engine);
+}
+
+//un rand de text pe eveniment; un singur write(), ca randurile sa nu se amestece
+static void emit_event(AlertEngine *engine, const AlertRule *rule, const char *kind, double duration){
+    char stamp[32];
+    struct timespec wall;
+    struct tm tm;
+    clock_gettime(CLOCK_REALTIME, &wall);
+    gmtime_r(&wall.tv_sec, &tm);
+    strftime(stamp, sizeof(stamp), "%Y-%m-%dT%H:%M:%SZ", &tm);
+
+    char line[LEN_LINE];
+    int len = snprintf(line, sizeof(line), "%s %s %s %s=%.2f (%s %g, %.0fs)\n",
+                       stamp, kind, rule->name, rule->field, rule->value,
+                       op_names[rule->op], rule->threshold, duration);
+    if (len <= 0){
+        return;
+    }
+    if (len >= (int)sizeof(line)){
+        len = sizeof(line) - 1;
+    }
+
+    if (engine->is_socket){
+        struct sockaddr_un addr = {0};
+        addr.sun_family = AF_UNIX;
+        strcpy(addr.sun_path, engine->socket_path);
+        sendto(engine->fd, line, (size_t)len, MSG_DONTWAIT | MSG_NOSIGNAL, (struct sockaddr *)&addr, sizeof(addr));
+    }else if (write(engine->fd, line, (size_t)len) < 0){
+        //nu avem unde raporta altfel; evaluarea continua
+    }
+}
+
+//─── reguli ────────────────────────────────────────────────────────────────
+
+//"30", "30s", "5m", "1h"
+static int parse_duration(const char *text, double *seconds){
+    char *end;
+    double value = strtod(text, &end);
+    if (end == text || value < 0.0){
+        return 0;
+    }
+    if (*end == '\0' || strcmp(end, "s") == 0){
+        *seconds = value;
+    }else if (strcmp(end, "m") == 0){
+        *seconds = value * 60.0;
+    }else if (strcmp(end, "h") == 0){
+        *seconds = value * 3600.0;
+    }else{
+        return 0;
+    }
+    return 1;
+}
+
+static int parse_number(const char *text, double *value){
+    char *end;
+    *value = strtod(text, &end);
+    return end != text && *end == '\0';
+}
+
+int alerts_add_rule(AlertEngine *engine, const char *text){
+    if (engine->rule_count >= ALERT_MAX_RULES){
+        fprintf(stderr, "Too many alert rules (max %d)\n", ALERT_MAX_RULES);
+        return 0;
+    }
+
+    char buffer[LEN_LINE];
+    snprintf(buffer, sizeof(buffer), "%s", text);
+    AlertRule rule = {0};
+
+    //numele e optional: fara "nume:" regula se numeste dupa camp
+    char *body = buffer;
+    char *colon = strchr(buffer, ':');
+    if (colon != NULL){
+        *colon = '\0';
+        body = colon + 1;
+        char *name = buffer;
+        while (*name == ' ' || *name == '\t') name++;
+        char *tail = name + strlen(name);
+        while (tail > name && (tail[-1] == ' ' || tail[-1] == '\t')) *--tail = '\0';
+        if (strlen(name) >= sizeof(rule.name)){
+            fprintf(stderr, "Alert rule name too long: %s\n", name);
+            return 0;
+        }
+        strcpy(rule.name, name);
+    }
+
+    char *save = NULL;
+    char *field = strtok_r(body, " \t\r\n", &save);
+    char *op = strtok_r(NULL, " \t\r\n", &save);
+    char *threshold = strtok_r(NULL, " \t\r\n", &save);
+    if (field == NULL || op == NULL || threshold == NULL){
+        fprintf(stderr, "Alert rule needs 'field op value': %s\n", text);
+        return 0;
+    }
+
+    if (strlen(field) >= sizeof(rule.field) || !resolve_field(field, &rule.offset, &rule.type)){
+        fprintf(stderr, "Unknown alert field '%s'\n", field);
+        return 0;
+    }
+    strcpy(rule.field, field);
+    if (rule.name[0] == '\0'){
+        strcpy(rule.name, field);
+    }
+
+    int op_found = 0;
+    for (int i = 0; i < 4; i = i + 1){
+        if (strcmp(op, op_names[i]) == 0){
+            rule.op = (AlertOp)i;
+            op_found = 1;
+        }
+    }
+    if (!op_found || !parse_number(threshold, &rule.threshold)){
+        fprintf(stderr, "Bad comparison in alert rule: %s\n", text);
+        return 0;
+    }
+    rule.clear = rule.threshold;
+
+    for (char *word = strtok_r(NULL, " \t\r\n", &save); word != NULL; word = strtok_r(NULL, " \t\r\n", &save)){
+        char *value = strtok_r(NULL, " \t\r\n", &save);
+        int ok = 0;
+        if (value != NULL && strcmp(word, "for") == 0){
+            ok = parse_duration(value, &rule.for_seconds);
+        }else if (value != NULL && strcmp(word, "clear") == 0){
+            ok = parse_number(value, &rule.clear);
+        }
+        if (!ok){
+            fprintf(stderr, "Bad option '%s' in alert rule: %s\n", word, text);
+            return 0;
+        }
+    }
+
+    //pragul de stingere trebuie sa fie de partea "sanatoasa" a pragului de pornire
+    int upward = rule.op == ALERT_OP_GT || rule.op == ALERT_OP_GE;
+    if ((upward && rule.clear > rule.threshold) || (!upward && rule.clear < rule.threshold)){
+        fprintf(stderr, "Alert clear level must be on the other side of the threshold: %s\n", text);
+        return 0;
+    }
+
+    engine->rules[engine->rule_count++] = rule;
+    return 1;
+}
+
+int alerts_load_rules(AlertEngine *engine, const char *path){
+    FILE *file = fopen(path, "r");
+    if (file == NULL){
+        fprintf(stderr, "Could not open alert rules %s: %s\n", path, strerror(errno));
+        return -1;
+    }
+
+    char line[LEN_LINE];
+    int added = 0;
+    int line_number = 0;
+    while (fgets(line, sizeof(line), file) != NULL){
+        line_number = line_number + 1;
+        line[strcspn(line, "#\r\n")] = '\0'; //comentariul si sfarsitul de rand
+        char *start = line;
+        while (*start == ' ' || *start == '\t') start++;
+        if (*start == '\0'){
+            continue;
+        }
+        if (!alerts_add_rule(engine, start)){
+            fprintf(stderr, "  (%s:%d)\n", path, line_number);
+            continue;
+        }
+        added = added + 1;
+    }
+
+    fclose(file);
+    return added;
+}
+
+//─── evaluare ──────────────────────────────────────────────────────────────
+
+int alerts_evaluate(AlertEngine *engine, const SystemMetrics *metrics, double now){
+    int events = 0;
+
+    for (int i = 0; i < engine->rule_count; i = i + 1){
+        AlertRule *rule = &engine->rules[i];
+        rule->value = read_field(metrics, rule);
+
+        switch (rule->state){
+            case ALERT_OK:
+                if (!compare(rule->op, rule->value, rule->threshold)){
+                    break;
+                }
+                rule->since = now;
+                rule->state = ALERT_PENDING;
+                //fara "for" porneste din prima
+                /* fall through */
+            case ALERT_PENDING:
+                if (!compare(rule->op, rule->value, rule->threshold)){
+                    rule->state = ALERT_OK;
+                }else if (now - rule->since >= rule->for_seconds){
+                    emit_event(engine, rule, "FIRING", now - rule->since);
+                    rule->state = ALERT_FIRING;
+                    rule->since = now;
+                    events = events + 1;
+                }
+                break;
+            case ALERT_FIRING:
+                //ramane pornita cat timp valoarea e inca dincolo de clear
+                if (!compare(rule->op, rule->value, rule->clear)){
+                    emit_event(engine, rule, "RESOLVED", now - rule->since);
+                    rule->state = ALERT_OK;
+                    rule->since = now;
+                    events = events + 1;
+                }
+                break;
+        }
+    }
+    return events;
+}
+
+int alerts_get_status(const AlertEngine *engine, AlertStatus *out, int max_rules){
+    int count = engine->rule_count < max_rules ? engine->rule_count : max_rules;
+    for (int i = 0; i < count; i = i + 1){
+        const AlertRule *rule = &engine->rules[i];
+        memcpy(out[i].name, rule->name, sizeof(out[i].name));
+        memcpy(out[i].field, rule->field, sizeof(out[i].field));
+        out[i].state = rule->state;
+        out[i].value = rule->value;
+        out[i].threshold = rule->threshold;
+        out[i].since = rule->since;
+    }
+    return count;
+}
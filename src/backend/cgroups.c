@@ -0,0 +1,437 @@
+#include "include/cgroups.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <dirent.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <limits.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/resource.h>
+#include <sys/stat.h>
+
+#define CGROUP_LIST_MIN 256
+#define CGROUP_MAX_DEPTH 16
+#define CGROUP_FILE_LEN 1024 //cpu.stat are sub 300 de octeti
+#define CGROUP_MAX_OPEN_FDS 256 //directoare tinute deschise; restul se deschid pe cale
+
+typedef struct{
+    char *path;                 //calea intreaga (malloc); NULL = mutata deja in lista noua (la rescanare)
+    int depth;
+    int dir_fd;                 //directorul tinut deschis; -1 = peste buget, il deschidem pe cale
+    ino_t ino;                  //inode-ul directorului: alt inode pe aceeasi cale = cgroup recreat
+    int has_prev;
+    int gone;                   //a disparut intre doua rescanari
+    uint64_t usage_usec;
+    uint64_t throttled_usec;
+    uint64_t memory_current;
+    uint64_t memory_max;        //0 = "max"
+    double cpu_percent;
+    double throttled_percent;
+}CgroupEntry;
+
+typedef struct{
+    CgroupEntry *entries;
+    int count;
+    int capacity;
+}CgroupList;
+
+//doua liste, ca la procese: rescanarea o umple pe cealalta si muta in ea ce exista deja
+static CgroupList lists[2];
+static int current = 0;
+
+//cale -> index in lista curenta, tabela hash cu adresare deschisa (putere a lui 2, -1 = liber)
+static int *slots = NULL;
+static size_t slot_capacity = 0;
+
+static int root_fd = -1;
+static int available = -1;   //-1 = neverificat, 0 = fara cgroup v2
+static int fd_budget = 0;    //cate directoare tinem deschise (CGROUP_MAX_OPEN_FDS, mai putin la RLIMIT_NOFILE mic)
+static int cached_fds = 0;
+static int needs_rescan = 1;
+static double last_scan = 0.0;
+static double prev_time = 0.0;
+
+static double monotonic_seconds(void){
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+}
+
+//FNV-1a pe cale
+static size_t path_hash(const char *path, size_t capacity){
+    uint32_t hash = 2166136261u;
+    while (*path){
+        hash = (hash ^ (unsigned char)*path) * 16777619u;
+        path = path + 1;
+    }
+    return hash & (capacity - 1);
+}
+
+static int slots_rebuild(const CgroupList *list){
+    size_t capacity = slot_capacity ? slot_capacity : CGROUP_LIST_MIN;
+    while (capacity < (size_t)list->count * 2){
+        capacity = capacity * 2;
+    }
+    if (capacity != slot_capacity){
+        int *grown = realloc(slots, capacity * sizeof(int));
+        if (grown == NULL){
+            fprintf(stderr, "Could not allocate cgroup index\n");
+            return 0;
+        }
+        slots = grown;
+        slot_capacity = capacity;
+    }
+
+    memset(slots, 0xff, slot_capacity * sizeof(int));
+    for (int i = 0; i < list->count; i = i + 1){
+        size_t slot = path_hash(list->entries[i].path, slot_capacity);
+        while (slots[slot] >= 0){
+            slot = (slot + 1) & (slot_capacity - 1);
+        }
+        slots[slot] = i;
+    }
+    return 1;
+}
+
+static CgroupEntry *slots_find(CgroupList *list, const char *path){
+    if (slot_capacity == 0){
+        return NULL;
+    }
+
+    size_t slot = path_hash(path, slot_capacity);
+    while (slots[slot] >= 0){
+        CgroupEntry *entry = &list->entries[slots[slot]];
+        if (entry->path != NULL && strcmp(entry->path, path) == 0){
+            return entry;
+        }
+        slot = (slot + 1) & (slot_capacity - 1);
+    }
+    return NULL;
+}
+
+static CgroupEntry *list_append(CgroupList *list){
+    if (list->count == list->capacity){
+        int capacity = list->capacity ? list->capacity * 2 : CGROUP_LIST_MIN;
+        CgroupEntry *grown = realloc(list->entries, (size_t)capacity * sizeof(CgroupEntry));
+        if (grown == NULL){
+            fprintf(stderr, "Could not grow cgroup list\n");
+            return NULL;
+        }
+        list->entries = grown;
+        list->capacity = capacity;
+    }
+
+    list->count = list->count + 1;
+    return &list->entries[list->count - 1];
+}
+
+//citeste un fisier mic din directorul cgroup-ului; -1 daca nu exista (sau cgroup-ul a disparut)
+static ssize_t read_cgroup_file(const CgroupEntry *entry, const char *name, char *buffer, size_t size){
+    int fd;
+    if (entry->dir_fd >= 0){
+        fd = openat(entry->dir_fd, name, O_RDONLY | O_CLOEXEC);
+    }else{
+        char relative[PATH_MAX];
+        if (snprintf(relative, sizeof(relative), "%s/%s", entry->path + 1, name) >= (int)sizeof(relative)){
+            return -1;
+        }
+        fd = openat(root_fd, relative, O_RDONLY | O_CLOEXEC);
+    }
+    if (fd < 0){
+        return -1;
+    }
+
+    ssize_t len = read(fd, buffer, size - 1);
+    close(fd);
+    if (len < 0){
+        return -1;
+    }
+    buffer[len] = '\0';
+    return len;
+}
+
+//"max\n" = fara limita
+static void read_memory_max(CgroupEntry *entry){
+    char buffer[64];
+    entry->memory_max = 0;
+    if (read_cgroup_file(entry, "memory.max", buffer, sizeof(buffer)) > 0 && buffer[0] != 'm'){
+        procfs_parse_u64(buffer, &entry->memory_max);
+    }
+}
+
+//intrarea veche nu mai e valabila: inchidem directorul si o scoatem din lista veche
+static void cgroups_retire(CgroupEntry *entry){
+    if (entry->dir_fd >= 0){
+        close(entry->dir_fd);
+        cached_fds = cached_fds - 1;
+    }
+    free(entry->path);
+    entry->path = NULL;
+    entry->dir_fd = -1;
+}
+
+static void cgroups_add(CgroupList *list, CgroupList *old, const char *path, int depth, int walk_fd){
+    struct stat st;
+    if (fstat(walk_fd, &st) != 0){
+        return;
+    }
+
+    //sters si recreat pe aceeasi cale: fd-ul vechi arata spre directorul sters
+    //si contoarele sunt ale altui cgroup, deci pornim o intrare noua
+    CgroupEntry *previous = slots_find(old, path);
+    if (previous != NULL && (previous->gone || previous->ino != st.st_ino)){
+        cgroups_retire(previous);
+        previous = NULL;
+    }
+
+    char *owned = previous != NULL ? NULL : strdup(path);
+    if (previous == NULL && owned == NULL){
+        return;
+    }
+    CgroupEntry *entry = list_append(list);
+    if (entry == NULL){
+        free(owned);
+        return;
+    }
+
+    if (previous != NULL){
+        //calea, directorul deschis si contoarele trec in lista noua
+        *entry = *previous;
+        previous->path = NULL;
+        previous->dir_fd = -1;
+        entry->depth = depth;
+        entry->gone = 0;
+    }else{
+        memset(entry, 0, sizeof(*entry));
+        entry->path = owned;
+        entry->depth = depth;
+        entry->dir_fd = -1;
+        entry->ino = st.st_ino;
+        if (cached_fds < fd_budget){
+            entry->dir_fd = fcntl(walk_fd, F_DUPFD_CLOEXEC, 0);
+            if (entry->dir_fd >= 0){
+                cached_fds = cached_fds + 1;
+            }
+        }
+    }
+
+    //limitele se schimba rar: le recitim doar la rescanare
+    read_memory_max(entry);
+}
+
+//parcurgere in adancime; fd e directorul lui path si este inchis la final
+static void cgroups_walk(CgroupList *list, CgroupList *old, int fd, char *path, size_t path_len, int depth){
+    DIR *dir = fdopendir(fd);
+    if (dir == NULL){
+        close(fd);
+        return;
+    }
+
+    struct dirent *dirent;
+    while ((dirent = readdir(dir)) != NULL){
+        if (dirent->d_type != DT_DIR && dirent->d_type != DT_UNKNOWN){
+            continue; //fisierele de control (cpu.stat, memory.current...)
+        }
+        if (strcmp(dirent->d_name, ".") == 0 || strcmp(dirent->d_name, "..") == 0){
+            continue;
+        }
+
+        size_t len = strlen(dirent->d_name);
+        if (path_len + 1 + len >= PATH_MAX){
+            continue; //nici kernelul nu l-ar putea deschide pe cale
+        }
+        int child = openat(dirfd(dir), dirent->d_name, O_RDONLY | O_DIRECTORY | O_CLOEXEC);
+        if (child < 0){
+            continue;
+        }
+
+        path[path_len] = '/';
+        memcpy(path + path_len + 1, dirent->d_name, len + 1);
+        cgroups_add(list, old, path, depth, child);
+        if (depth < CGROUP_MAX_DEPTH){
+            cgroups_walk(list, old, child, path, path_len + 1 + len, depth + 1);
+        }else{
+            close(child);
+        }
+        path[path_len] = '\0';
+    }
+    closedir(dir);
+}
+
+static int cgroups_open_root(void){
+    char root[PROCFS_PATH_LEN];
+    procfs_path(root, sizeof(root), "/sys/fs/cgroup");
+    root_fd = open(root, O_RDONLY | O_DIRECTORY | O_CLOEXEC);
+    if (root_fd < 0){
+        return 0;
+    }
+
+    //cgroup.controllers exista doar in ierarhia v2 (unificata)
+    if (faccessat(root_fd, "cgroup.controllers", F_OK, 0) != 0){
+        close(root_fd);
+        root_fd = -1;
+        return 0;
+    }
+
+    //un numar fix: restul procesului (GUI, history, sockets) are nevoie de fd-uri
+    //chiar daca masina are mii de cgroup-uri
+    struct rlimit limit;
+    fd_budget = CGROUP_MAX_OPEN_FDS;
+    if (getrlimit(RLIMIT_NOFILE, &limit) == 0 && limit.rlim_cur != RLIM_INFINITY
+        && limit.rlim_cur / 4 < (rlim_t)fd_budget){
+        fd_budget = (int)(limit.rlim_cur / 4);
+    }
+    return 1;
+}
+
+static void cgroups_rescan(double now){
+    CgroupList *old = &lists[current];
+    CgroupList *list = &lists[1 - current];
+    list->count = 0;
+
+    //deschidere noua, nu dup: un dup ar imparti pozitia din director cu root_fd
+    int fd = openat(root_fd, ".", O_RDONLY | O_DIRECTORY | O_CLOEXEC);
+    if (fd >= 0){
+        //caile din Kubernetes trec usor de 128 de caractere: doar CgroupData.path e scurtat
+        char path[PATH_MAX] = "";
+        cgroups_walk(list, old, fd, path, 0, 1);
+    }
+
+    //ce n-a fost mutat a disparut
+    for (int i = 0; i < old->count; i = i + 1){
+        if (old->entries[i].path != NULL){
+            cgroups_retire(&old->entries[i]);
+        }
+    }
+    old->count = 0;
+
+    current = 1 - current;
+    slots_rebuild(list);
+    needs_rescan = 0;
+    last_scan = now;
+}
+
+static uint64_t parse_key(const char *text, const char *key){
+    const char *found = strstr(text, key);
+    uint64_t value = 0;
+    if (found != NULL){
+        procfs_parse_u64(found + strlen(key), &value);
+    }
+    return value;
+}
+
+static void cgroups_update(CgroupEntry *entry, double elapsed){
+    char buffer[CGROUP_FILE_LEN];
+    if (read_cgroup_file(entry, "cpu.stat", buffer, sizeof(buffer)) < 0){
+        //cpu.stat exista in orice cgroup v2: daca lipseste, cgroup-ul a fost sters
+        entry->gone = 1;
+        entry->cpu_percent = 0.0;
+        entry->throttled_percent = 0.0;
+        needs_rescan = 1;
+        return;
+    }
+
+    uint64_t usage = parse_key(buffer, "usage_usec ");
+    uint64_t throttled = parse_key(buffer, "throttled_usec ");
+    if (entry->has_prev && elapsed > 0.0 && usage >= entry->usage_usec && throttled >= entry->throttled_usec){
+        entry->cpu_percent = (double)(usage - entry->usage_usec) / (elapsed * 1e6) * 100.0;
+        entry->throttled_percent = (double)(throttled - entry->throttled_usec) / (elapsed * 1e6) * 100.0;
+    }else{
+        entry->cpu_percent = 0.0;
+        entry->throttled_percent = 0.0;
+    }
+    entry->usage_usec = usage;
+    entry->throttled_usec = throttled;
+    entry->has_prev = 1;
+
+    //fara controlerul memory activat in parinte fisierul lipseste
+    entry->memory_current = 0;
+    if (read_cgroup_file(entry, "memory.current", buffer, sizeof(buffer)) > 0){
+        procfs_parse_u64(buffer, &entry->memory_current);
+    }
+}
+
+//o cale prea lunga pentru CgroupData.path pastreaza finalul (containerul, serviciul): "...<coada>"
+static void copy_path_tail(char *out, size_t size, const char *path){
+    size_t len = strlen(path);
+    if (len < size){
+        memcpy(out, path, len + 1);
+        return;
+    }
+    size_t keep = size - 4;
+    memcpy(out, "...", 3);
+    memcpy(out + 3, path + len - keep, keep + 1);
+}
+
+static int cgroup_less(const CgroupEntry *a, const CgroupEntry *b){
+    if (a->cpu_percent != b->cpu_percent){
+        return a->cpu_percent < b->cpu_percent;
+    }
+    return a->memory_current < b->memory_current;
+}
+
+int cgroups_get_top(CgroupData *cgroups, int max_count, int *total){
+    if (total != NULL){
+        *total = 0;
+    }
+    if (available < 0){
+        available = cgroups_open_root();
+    }
+    if (!available || max_count <= 0){
+        return 0;
+    }
+
+    double now = monotonic_seconds();
+    if (needs_rescan || now - last_scan >= CGROUP_RESCAN_SECONDS){
+        cgroups_rescan(now);
+    }
+    double elapsed = prev_time > 0.0 ? now - prev_time : 0.0;
+    prev_time = now;
+
+    //topul dupa CPU, tinut sortat descrescator prin insertie (max_count e mic)
+    CgroupList *list = &lists[current];
+    const CgroupEntry *top[MAX_CGROUPS];
+    if (max_count > MAX_CGROUPS){
+        max_count = MAX_CGROUPS;
+    }
+    int count = 0;
+    int alive = 0;
+    for (int i = 0; i < list->count; i = i + 1){
+        CgroupEntry *entry = &list->entries[i];
+        cgroups_update(entry, elapsed);
+        if (entry->gone){
+            continue;
+        }
+        alive = alive + 1;
+
+        if (count == max_count && !cgroup_less(top[count - 1], entry)){
+            continue;
+        }
+        int position = count < max_count ? count : count - 1;
+        while (position > 0 && cgroup_less(top[position - 1], entry)){
+            top[position] = top[position - 1];
+            position = position - 1;
+        }
+        top[position] = entry;
+        if (count < max_count){
+            count = count + 1;
+        }
+    }
+
+    for (int i = 0; i < count; i = i + 1){
+        CgroupData *out = &cgroups[i];
+        copy_path_tail(out->path, sizeof(out->path), top[i]->path);
+        out->depth = top[i]->depth;
+        out->cpu_percent = top[i]->cpu_percent;
+        out->cpu_throttled_percent = top[i]->throttled_percent;
+        out->memory_mb = (double)top[i]->memory_current / (1024.0 * 1024.0);
+        out->memory_limit_mb = (double)top[i]->memory_max / (1024.0 * 1024.0);
+    }
+
+    if (total != NULL){
+        *total = alive;
+    }
+    return count;
+}
@@ -1,27 +1,168 @@
 #include "include/core.h"
 #include <stdio.h>
+#include <stdlib.h>
 #include <string.h>
+#include <time.h>
+#include <stddef.h>
 
+//tabela comuna pentru history si alerte; o serie noua se adauga doar aici
+#define FIELD(name, type) {#name, offsetof(SystemMetrics, name), type}
+const MetricField metric_scalar_fields[] = {
+    FIELD(cpu_freq_mhz, 'd'),
+    FIELD(cpu_usage_percent, 'd'),
+    FIELD(ram_total_gb, 'd'),
+    FIELD(ram_used_gb, 'd'),
+    FIELD(ram_usage_percent, 'd'),
+    FIELD(disk_total_gb, 'd'),
+    FIELD(disk_used_gb, 'd'),
+    FIELD(disk_usage_percent, 'd'),
+    FIELD(uptime_seconds, 'l'),
+    FIELD(gpu_usage_percent, 'd'),
+    FIELD(gpu_memory_total_gb, 'd'),
+    FIELD(gpu_memory_used_gb, 'd'),
+    FIELD(process_count, 'i'),
+    FIELD(net_rx_kbps, 'd'),
+    FIELD(net_tx_kbps, 'd'),
+    FIELD(load_avg_1, 'd'),
+    FIELD(load_avg_5, 'd'),
+    FIELD(load_avg_15, 'd'),
+    FIELD(tasks_runnable, 'i'),
+    FIELD(tasks_blocked, 'i'),
+    FIELD(cpu_pressure.some_avg10, 'd'),
+    FIELD(memory_pressure.some_avg10, 'd'),
+    FIELD(memory_pressure.full_avg10, 'd'),
+    FIELD(io_pressure.some_avg10, 'd'),
+    FIELD(io_pressure.full_avg10, 'd'),
+    FIELD(context_switches_per_sec, 'd'),
+    FIELD(interrupts_per_sec, 'd'),
+    FIELD(forks_per_sec, 'd'),
+    FIELD(page_faults_per_sec, 'd'),
+    FIELD(major_faults_per_sec, 'd'),
+    FIELD(swap_in_per_sec, 'd'),
+    FIELD(swap_out_per_sec, 'd'),
+    FIELD(swap_used_gb, 'd'),
+    FIELD(swap_usage_percent, 'd'),
+};
+#undef FIELD
+const size_t metric_scalar_field_count = sizeof(metric_scalar_fields) / sizeof(metric_scalar_fields[0]);
+
+//sursele din /proc si /sys raman deschise intre apeluri, plus faptele statice
+typedef struct{
+    int initialized;
+    ProcSource stat;
+    ProcSource meminfo;
+    ProcSource net_dev;
+    ProcSource cpu_freq;
+    ProcSource mountinfo;
+    ProcSource diskstats;
+    PressureSources pressure;
+    GpuChannel gpu;
+
+    char cpu_model[LEN_LINE];
+    int core_count;
+    SysInfoData sys_data;
+
+    //ultimele valori; colectorii care nu sunt la rand le lasa neatinse
+    SystemMetrics cache;
+    CpuRawData curr_total; //randul "cpu " citit in runda curenta (pentru procese)
+    int cpu_read_this_round;
+    CpuActivityRaw prev_activity; //restul din /proc/stat la citirea trecuta
+    double prev_activity_time;    //CLOCK_MONOTONIC, 0 = inca nu avem baza
+    int primed;
+
+    CollectorTimings timings;
+}CollectorContext;
+
+typedef void (*CollectorFn)(SystemMetrics *metrics);
+
+typedef struct{
+    CollectorFn collect;
+    double period_seconds;
+    double last_run; //CLOCK_MONOTONIC, 0 = niciodata
+}CollectorSlot;
+
+#define GPU_LOOP_MS 1000 //cat de des scrie nvidia-smi; colectorul ia ultimele valori
+
+static const char *collector_names[COLLECTOR_COUNT] = {
+    [COLLECTOR_CPU] = "cpu",
+    [COLLECTOR_MEMORY] = "memory",
+    [COLLECTOR_DISK] = "disk",
+    [COLLECTOR_NETWORK] = "network",
+    [COLLECTOR_PROCESSES] = "processes",
+    [COLLECTOR_GPU] = "gpu",
+    [COLLECTOR_SYSINFO] = "sysinfo",
+    [COLLECTOR_DISK_IO] = "disk_io",
+    [COLLECTOR_PRESSURE] = "pressure",
+    [COLLECTOR_CGROUPS] = "cgroups",
+};
+
+static CollectorContext ctx = {0};
 static CpuRawData prev_total = {0};
 static CpuRawData prev_cores[MAX_CORES] = {0};
 static int is_first_run = 1;
 
-void get_system_metrics(SystemMetrics *metrics){
-    //preluam datele
-    if (cpu_get_model_name(metrics->cpu_model,sizeof(metrics->cpu_model)) == 0){
+static double monotonic_seconds(void){
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+}
+
+static void collector_init(void){
+    procfs_source_init(&ctx.stat, "/proc/stat");
+    procfs_source_init(&ctx.meminfo, "/proc/meminfo");
+    procfs_source_init(&ctx.net_dev, "/proc/net/dev");
+    procfs_source_init(&ctx.cpu_freq, "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq");
+    procfs_source_init(&ctx.mountinfo, "/proc/self/mountinfo");
+    procfs_source_init(&ctx.diskstats, "/proc/diskstats");
+    pressure_sources_init(&ctx.pressure);
+
+    //MONITOR_NVIDIA_SMI poate inlocui nvidia-smi (de ex. cu bench/fake_nvidia_smi.sh)
+    gpu_channel_init(&ctx.gpu, getenv("MONITOR_NVIDIA_SMI"), GPU_LOOP_MS);
+
+    //informatii care nu se schimba: le citim o singura data
+    if (cpu_get_model_name(ctx.cpu_model, sizeof(ctx.cpu_model)) == 0){
         fprintf(stderr, "Could not get model name\n");
-        strncpy(metrics->cpu_model, "Unknown CPU", sizeof(metrics->cpu_model) - 1);
-        metrics->cpu_model[sizeof(metrics->cpu_model) - 1] = '\0';
+        strncpy(ctx.cpu_model, "Unknown CPU", sizeof(ctx.cpu_model) - 1);
+        ctx.cpu_model[sizeof(ctx.cpu_model) - 1] = '\0';
+    }
+    ctx.core_count = cpu_get_core_count(&ctx.stat);
+
+    if (!sysinfo_get_data(&ctx.sys_data)) {
+        strncpy(ctx.sys_data.os_name, "Unknown", STR_LEN - 1);
+        strncpy(ctx.sys_data.kernel_version, "Unknown", STR_LEN - 1);
+    }
+
+    SystemMetrics *metrics = &ctx.cache;
+    strncpy(metrics->cpu_model, ctx.cpu_model, sizeof(metrics->cpu_model) - 1);
+    metrics->cpu_model[sizeof(metrics->cpu_model) - 1] = '\0';
+    metrics->core_count = ctx.core_count;
+
+    strncpy(metrics->os_name, ctx.sys_data.os_name, sizeof(metrics->os_name) - 1);
+    metrics->os_name[sizeof(metrics->os_name) - 1] = '\0';
+    strncpy(metrics->kernel_version, ctx.sys_data.kernel_version, sizeof(metrics->kernel_version) - 1);
+    metrics->kernel_version[sizeof(metrics->kernel_version) - 1] = '\0';
+
+    ctx.initialized = 1;
+}
+
+//un contor care scade (sau prima citire) da 0
+static double counter_rate(uint64_t now, uint64_t prev, double elapsed){
+    if (elapsed <= 0.0 || now < prev){
+        return 0.0;
     }
-    metrics->core_count = cpu_get_core_count();
-    metrics->cpu_freq_mhz = cpu_get_current_freq_mhz();
+    return (double)(now - prev) / elapsed;
+}
 
-    //pregatim stucturile pentru noile citiri
+static void collect_cpu(SystemMetrics *metrics){
+    metrics->cpu_freq_mhz = cpu_get_current_freq_mhz(&ctx.cpu_freq);
+
+    //pregatim stucturile pentru noile citiri (statice: cu MAX_CORES mare nu le vrem pe stiva)
+    static CpuRawData curr_cores[MAX_CORES];
     CpuRawData curr_total = {0};
-    CpuRawData curr_cores[MAX_CORES] = {0};
+    memset(curr_cores, 0, sizeof(CpuRawData) * (size_t)metrics->core_count);
 
     //citim datele acum
-    cpu_get_raw_data(&curr_total, curr_cores,metrics->core_count);
+    cpu_get_raw_data(&ctx.stat, &curr_total, curr_cores,metrics->core_count);
     if (is_first_run){
         metrics->cpu_usage_percent = 0.0;
         for (int i = 0; i < metrics->core_count; i = i + 1){
@@ -42,20 +183,53 @@ void get_system_metrics(SystemMetrics *metrics){
         prev_cores[i] = curr_cores[i];
     }
 
+    ctx.curr_total = curr_total;
+    ctx.cpu_read_this_round = 1;
+
+    //comutarile de context, intreruperile si fork-urile sunt in acelasi text, dupa randurile cpu
+    CpuActivityRaw activity = {0};
+    if (cpu_get_activity(&ctx.stat, &activity)){
+        double now = monotonic_seconds();
+        double elapsed = ctx.prev_activity_time > 0.0 ? now - ctx.prev_activity_time : 0.0;
+        const CpuActivityRaw *prev = &ctx.prev_activity;
+        metrics->context_switches_per_sec = counter_rate(activity.context_switches, prev->context_switches, elapsed);
+        metrics->interrupts_per_sec = counter_rate(activity.interrupts, prev->interrupts, elapsed);
+        metrics->forks_per_sec = counter_rate(activity.forks, prev->forks, elapsed);
+        metrics->tasks_blocked = activity.procs_blocked;
+        ctx.prev_activity = activity;
+        ctx.prev_activity_time = now;
+    }
+}
+
+static void collect_memory(SystemMetrics *metrics){
     MemoryData ram_data = {0};
-    if (memory_get_data(&ram_data)) {
+    if (memory_get_data(&ctx.meminfo, &ram_data)) {
         metrics->ram_total_gb = ram_data.total_gb;
         metrics->ram_used_gb = ram_data.used_gb;
         metrics->ram_usage_percent = ram_data.usage_percent;
+        metrics->swap_total_gb = ram_data.swap_total_gb;
+        metrics->swap_used_gb = ram_data.swap_used_gb;
+        metrics->swap_usage_percent = ram_data.swap_usage_percent;
     } else {
         metrics->ram_total_gb = 0.0;
         metrics->ram_used_gb = 0.0;
         metrics->ram_usage_percent = 0.0;
+        metrics->swap_total_gb = 0.0;
+        metrics->swap_used_gb = 0.0;
+        metrics->swap_usage_percent = 0.0;
     }
+}
+
+//capacitatea se schimba incet: statvfs pe toate montarile, pe perioada lunga
+static void collect_disk(SystemMetrics *metrics){
+    metrics->mount_count = disk_get_mounts(&ctx.mountinfo, &ctx.diskstats, metrics->mounts, MAX_MOUNTS);
 
-    //pentru disk
     DiskData disk_data = {0};
-    if (disk_get_data("/", &disk_data)) {
+    if (metrics->mount_count > 0 && strcmp(metrics->mounts[0].mount_point, "/") == 0) {
+        metrics->disk_total_gb = metrics->mounts[0].total_gb;
+        metrics->disk_used_gb = metrics->mounts[0].used_gb;
+        metrics->disk_usage_percent = metrics->mounts[0].usage_percent;
+    } else if (disk_get_data("/", &disk_data)) {
         metrics->disk_total_gb = disk_data.total_gb;
         metrics->disk_used_gb = disk_data.used_gb;
         metrics->disk_usage_percent = disk_data.usage_percent;
@@ -64,45 +238,211 @@ void get_system_metrics(SystemMetrics *metrics){
         metrics->disk_used_gb = 0.0;
         metrics->disk_usage_percent = 0.0;
     }
+}
 
-    // System Info
-    SysInfoData sys_data = {0};
-    if (sysinfo_get_data(&sys_data)) {
-        metrics->uptime_seconds = sys_data.uptime_seconds;
-        strncpy(metrics->os_name, sys_data.os_name, sizeof(metrics->os_name) - 1);
-        metrics->os_name[sizeof(metrics->os_name) - 1] = '\0';
+//debitul si %util pe dispozitiv, la fiecare runda
+static void collect_disk_io(SystemMetrics *metrics){
+    metrics->disk_io_count = disk_get_io(&ctx.diskstats, metrics->disk_io, MAX_DISK_DEVICES);
+}
 
-        strncpy(metrics->kernel_version, sys_data.kernel_version, sizeof(metrics->kernel_version) - 1);
-        metrics->kernel_version[sizeof(metrics->kernel_version) - 1] = '\0';
+static void collect_network(SystemMetrics *metrics){
+    static NetworkData net_data;
+    if (network_get_data(&ctx.net_dev, &net_data)) {
+        metrics->net_rx_kbps = net_data.rx_speed_kbps;
+        metrics->net_tx_kbps = net_data.tx_speed_kbps;
+        metrics->net_interface_count = net_data.interface_count;
+        memcpy(metrics->net_interfaces, net_data.interfaces, sizeof(InterfaceRates) * (size_t)net_data.interface_count);
+    } else {
+        metrics->net_rx_kbps = 0.0;
+        metrics->net_tx_kbps = 0.0;
+        metrics->net_interface_count = 0;
     }
+}
 
-    // GPU
-    GpuData gpu_data = {0};
-    if (gpu_get_data(&gpu_data)) {
-        strncpy(metrics->gpu_name, gpu_data.name, sizeof(metrics->gpu_name) - 1);
+static void collect_processes(SystemMetrics *metrics){
+    //procesele au nevoie de totalul din /proc/stat din aceeasi runda
+    if (!ctx.cpu_read_this_round){
+        cpu_get_raw_data(&ctx.stat, &ctx.curr_total, NULL, 0);
+    }
+    metrics->process_count = processes_get_top(metrics->processes, MAX_PROCESSES, &ctx.curr_total, metrics->core_count);
+}
+
+static void collect_gpu(SystemMetrics *metrics){
+    //nu blocheaza: doar citeste ce a scris intre timp nvidia-smi
+    metrics->gpu_count = gpu_channel_poll(&ctx.gpu, metrics->gpus, MAX_GPUS);
+    if (metrics->gpu_count > 0) {
+        const GpuData *gpu_data = &metrics->gpus[0];
+        strncpy(metrics->gpu_name, gpu_data->name, sizeof(metrics->gpu_name) - 1);
         metrics->gpu_name[sizeof(metrics->gpu_name) - 1] = '\0';
-        metrics->gpu_usage_percent = gpu_data.usage_percent;
+        metrics->gpu_usage_percent = gpu_data->usage_percent;
 
         // MB -> GB
-        metrics->gpu_memory_total_gb = gpu_data.memory_total_mb / 1024.0;
-        metrics->gpu_memory_used_gb = gpu_data.memory_used_mb / 1024.0;
+        metrics->gpu_memory_total_gb = gpu_data->memory_total_mb / 1024.0;
+        metrics->gpu_memory_used_gb = gpu_data->memory_used_mb / 1024.0;
     } else {
-        strncpy(metrics->gpu_name, "NVIDIA GPU Not Found", sizeof(metrics->gpu_name) - 1);
+        const char *name = ctx.gpu.state == GPU_CHANNEL_ABSENT ? "NVIDIA GPU Not Found" : "Waiting for nvidia-smi";
+        strncpy(metrics->gpu_name, name, sizeof(metrics->gpu_name) - 1);
         metrics->gpu_usage_percent = 0.0;
         metrics->gpu_memory_total_gb = 0.0;
         metrics->gpu_memory_used_gb = 0.0;
     }
+}
 
-    //Processes
-    metrics->process_count = processes_get_top(metrics->processes, MAX_PROCESSES);
+static void collect_sysinfo(SystemMetrics *metrics){
+    //numele OS-ului si kernelul sunt deja in cache, aici doar uptime-ul
+    metrics->uptime_seconds = sysinfo_get_uptime();
+}
 
-    // Retea
-    NetworkData net_data = {0};
-    if (network_get_data(&net_data)) {
-        metrics->net_rx_kbps = net_data.rx_speed_kbps;
-        metrics->net_tx_kbps = net_data.tx_speed_kbps;
-    } else {
-        metrics->net_rx_kbps = 0.0;
-        metrics->net_tx_kbps = 0.0;
+static void collect_pressure(SystemMetrics *metrics){
+    PressureData pressure = {0};
+    pressure_get_data(&ctx.pressure, &pressure);
+    metrics->psi_available = pressure.psi_available;
+    metrics->cpu_pressure = pressure.cpu;
+    metrics->memory_pressure = pressure.memory;
+    metrics->io_pressure = pressure.io;
+    metrics->load_avg_1 = pressure.load_1;
+    metrics->load_avg_5 = pressure.load_5;
+    metrics->load_avg_15 = pressure.load_15;
+    metrics->tasks_runnable = pressure.tasks_runnable;
+    metrics->tasks_total = pressure.tasks_total;
+    metrics->page_faults_per_sec = pressure.page_faults_per_sec;
+    metrics->major_faults_per_sec = pressure.major_faults_per_sec;
+    metrics->swap_in_per_sec = pressure.swap_in_per_sec;
+    metrics->swap_out_per_sec = pressure.swap_out_per_sec;
+}
+
+static void collect_cgroups(SystemMetrics *metrics){
+    metrics->cgroup_count = cgroups_get_top(metrics->cgroups, MAX_CGROUPS, &metrics->cgroup_total);
+}
+
+static void record_timing(int collector, double started){
+    double elapsed_us = (monotonic_seconds() - started) * 1e6;
+    ctx.timings.last_us[collector] = elapsed_us;
+    ctx.timings.total_us[collector] = ctx.timings.total_us[collector] + elapsed_us;
+    ctx.timings.runs[collector] = ctx.timings.runs[collector] + 1;
+}
+
+//ordinea conteaza: CPU inaintea proceselor, ca sa refolosim /proc/stat
+static CollectorSlot collectors[COLLECTOR_COUNT] = {
+    [COLLECTOR_CPU]       = {collect_cpu,       1.0,  0.0},
+    [COLLECTOR_MEMORY]    = {collect_memory,    1.0,  0.0},
+    [COLLECTOR_DISK]      = {collect_disk,      10.0, 0.0},
+    [COLLECTOR_NETWORK]   = {collect_network,   1.0,  0.0},
+    [COLLECTOR_PROCESSES] = {collect_processes, 1.0,  0.0},
+    [COLLECTOR_GPU]       = {collect_gpu,       2.0,  0.0},
+    [COLLECTOR_SYSINFO]   = {collect_sysinfo,   1.0,  0.0},
+    [COLLECTOR_DISK_IO]   = {collect_disk_io,   1.0,  0.0},
+    [COLLECTOR_PRESSURE]  = {collect_pressure,  1.0,  0.0},
+    [COLLECTOR_CGROUPS]   = {collect_cgroups,   1.0,  0.0},
+};
+
+int set_collector_period(int collector, double period_seconds){
+    if (collector < 0 || collector >= COLLECTOR_COUNT || period_seconds < 0.0){
+        return 0;
+    }
+
+    collectors[collector].period_seconds = period_seconds;
+    return 1;
+}
+
+int set_system_root(const char *root){
+    //sursele sunt deja deschise pe vechile cai
+    if (ctx.initialized){
+        return 0;
+    }
+
+    procfs_set_root(root);
+    char proc_dir[PROCFS_PATH_LEN];
+    procfs_path(proc_dir, sizeof(proc_dir), "/proc");
+    processes_set_proc_root(proc_dir);
+    return 1;
+}
+
+int run_collector(int collector){
+    if (collector < 0 || collector >= COLLECTOR_COUNT){
+        return 0;
+    }
+    if (!ctx.initialized){
+        collector_init();
+    }
+
+    //fiecare apel e o runda separata: procesele isi citesc singure /proc/stat
+    ctx.cpu_read_this_round = 0;
+    double now = monotonic_seconds();
+    collectors[collector].collect(&ctx.cache);
+    record_timing(collector, now);
+    collectors[collector].last_run = now;
+    ctx.cache.updated_at[collector] = now;
+    return 1;
+}
+
+void prime_system_metrics(void){
+    if (!ctx.initialized){
+        collector_init();
+    }
+    if (ctx.primed){
+        return;
+    }
+
+    //doar contoarele cumulative (si pornirea nvidia-smi); last_run ramane 0,
+    //asa ca primul get_system_metrics le reciteste pe toate fata de aceasta baza
+    ctx.cpu_read_this_round = 0;
+    collect_cpu(&ctx.cache);
+    collect_network(&ctx.cache);
+    collect_disk_io(&ctx.cache);
+    collect_pressure(&ctx.cache);
+    collect_cgroups(&ctx.cache);
+    collect_processes(&ctx.cache);
+    collect_gpu(&ctx.cache);
+    ctx.primed = 1;
+}
+
+void get_system_metrics(SystemMetrics *metrics){
+    if (!ctx.initialized){
+        collector_init();
+    }
+
+    double now = monotonic_seconds();
+    ctx.cpu_read_this_round = 0;
+
+    for (int i = 0; i < COLLECTOR_COUNT; i = i + 1){
+        CollectorSlot *slot = &collectors[i];
+
+        //10% toleranta, ca un timer care vine putin mai devreme sa nu sara o runda
+        int is_due = slot->last_run == 0.0 || now - slot->last_run >= slot->period_seconds * 0.9;
+        if (is_due){
+            double started = monotonic_seconds();
+            slot->collect(&ctx.cache);
+            record_timing(i, started);
+            slot->last_run = now;
+            ctx.cache.updated_at[i] = now;
+        }
+    }
+
+    *metrics = ctx.cache;
+
+    double elapsed_us = (monotonic_seconds() - now) * 1e6;
+    ctx.timings.sample_last_us = elapsed_us;
+    ctx.timings.sample_total_us = ctx.timings.sample_total_us + elapsed_us;
+    ctx.timings.samples = ctx.timings.samples + 1;
+}
+
+void get_collector_timings(CollectorTimings *timings){
+    *timings = ctx.timings;
+}
+
+void reset_collector_timings(void){
+    memset(&ctx.timings, 0, sizeof(ctx.timings));
+}
+
+void print_collector_timings(FILE *out){
+    const CollectorTimings *t = &ctx.timings;
+    fprintf(out, "%-10s %8s %10s %10s\n", "collector", "runs", "avg us", "last us");
+    for (int i = 0; i < COLLECTOR_COUNT; i = i + 1){
+        double avg = t->runs[i] > 0 ? t->total_us[i] / t->runs[i] : 0.0;
+        fprintf(out, "%-10s %8ld %10.1f %10.1f\n", collector_names[i], t->runs[i], avg, t->last_us[i]);
     }
-}
\ No newline at end of file
+    double avg = t->samples > 0 ? t->sample_total_us / t->samples : 0.0;
+    fprintf(out, "%-10s %8ld %10.1f %10.1f\n", "sample", t->samples, avg, t->sample_last_us);
+    fflush(out);
+}
@@ -4,9 +4,21 @@
 #include <string.h>
 #include <unistd.h> // Pentru sysconf()
 
-//pentru numarul de coruri logice
-int cpu_get_core_count(void){
-    long core = sysconf(_SC_NPROCESSORS_ONLN);//Numarul de procese disponibile
+//pentru numarul de coruri logice: randurile "cpuN" din /proc/stat (sunt exact cele online),
+//iar daca nu le gasim, sysconf
+int cpu_get_core_count(ProcSource *src){
+    long core = 0;
+    const char *line = src ? procfs_source_read(src) : NULL;
+    while (line != NULL && strncmp(line, "cpu", 3) == 0){
+        if (line[3] >= '0' && line[3] <= '9'){
+            core = core + 1;
+        }
+        line = procfs_next_line(line);
+    }
+
+    if (core == 0){
+        core = sysconf(_SC_NPROCESSORS_ONLN);//Numarul de procese disponibile
+    }
     if (core < 1){
         return 1;
     }
@@ -18,11 +30,13 @@ int cpu_get_core_count(void){
     return (int)core;
 }
 
-//obtine medelul procesorului
+//obtine medelul procesorului (informatie statica, core.c o citeste o singura data)
 int cpu_get_model_name(char *buffer, size_t size){
-    FILE *fin = fopen("/proc/cpuinfo", "r");
+    char path[PROCFS_PATH_LEN];
+    procfs_path(path, sizeof(path), "/proc/cpuinfo");
+    FILE *fin = fopen(path, "r");
     if (fin == NULL){
-        fprintf(stderr, "Could not open /proc/cpuinfo\n");
+        fprintf(stderr, "Could not open %s\n", path);
         return 0;
     }
 
@@ -48,7 +62,7 @@ int cpu_get_model_name(char *buffer, size_t size){
     }
 
     if (fclose(fin) != 0){
-        fprintf(stderr, "Could not close /proc/cpuinfo\n");
+        fprintf(stderr, "Could not close %s\n", path);
         return 0;
     }
 
@@ -56,66 +70,88 @@ int cpu_get_model_name(char *buffer, size_t size){
 }
 
 //optine freceventa curenta a primului nucleu in MHz
-double cpu_get_current_freq_mhz(void){
-    FILE *fin = fopen("/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq", "r");
-    if (fin == NULL){
-        fprintf(stderr, "Could not open /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq\n");
+double cpu_get_current_freq_mhz(ProcSource *src){
+    const char *text = procfs_source_read(src);
+    if (text == NULL){
         return 0.0;
     }
 
-    long freq_khz = 0;
-    if (fscanf(fin,"%ld",&freq_khz) == 1){
-        if (fclose(fin) != 0){
-            fprintf(stderr,"Could not close /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freqss\n");
-            return 0.0;
-        }
-
-        return (double)freq_khz / 1000.0;
-    }
+    uint64_t freq_khz = 0;
+    procfs_parse_u64(text, &freq_khz);
+    return (double)freq_khz / 1000.0;
+}
 
-    if (fclose(fin) != 0){
-        fprintf(stderr,"Could not close /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freqss\n");
-        return 0.0;
+//citeste cele 8 contoare de dupa eticheta "cpu" / "cpuN"
+static const char *cpu_parse_counters(const char *p, CpuRawData *data){
+    while (*p != ' ' && *p != '\0'){
+        p = p + 1;
     }
 
-    return 0.0;
+    p = procfs_parse_u64(p, &data->user);
+    p = procfs_parse_u64(p, &data->nice);
+    p = procfs_parse_u64(p, &data->system);
+    p = procfs_parse_u64(p, &data->idle);
+    p = procfs_parse_u64(p, &data->iowait);
+    p = procfs_parse_u64(p, &data->irq);
+    p = procfs_parse_u64(p, &data->softirq);
+    p = procfs_parse_u64(p, &data->steal);
+    return p;
 }
 
 //citirea datelor brute pentru total și per-nucleu
-int cpu_get_raw_data(CpuRawData *total_data, CpuRawData *cores_data, int num_cores){
-    FILE *fin = fopen("/proc/stat", "r");
-    if (fin == NULL){
-        fprintf(stderr, "Could not open /proc/stat\n");
+int cpu_get_raw_data(ProcSource *src, CpuRawData *total_data, CpuRawData *cores_data, int num_cores){
+    const char *line = procfs_source_read(src);
+    if (line == NULL){
         return 0;
     }
 
-    char buffer[LEN_LINE];
     int core_index = 0;
-    while (fgets(buffer, LEN_LINE, fin) != NULL){
+    while (line != NULL && strncmp(line, "cpu", 3) == 0){
         //citim CPU ul total
-        if (strncmp(buffer, "cpu ", 4) == 0){
-            sscanf(buffer, "cpu  %lu %lu %lu %lu %lu %lu %lu %lu",
-                &total_data->user, &total_data->nice,
-                &total_data->system,&total_data->idle,
-                &total_data->iowait, &total_data->irq,
-                &total_data->softirq, &total_data->steal);
-        }else if (strncmp(buffer, "cpu", 3) == 0 && buffer[3] >= '0' && buffer[3] <= '9' ){//citim per nucleu
+        if (line[3] == ' '){
+            cpu_parse_counters(line, total_data);
+        }else if (line[3] >= '0' && line[3] <= '9'){//citim per nucleu
             if (core_index < num_cores){
-                sscanf(buffer, "cpu%*d %lu %lu %lu %lu %lu %lu %lu %lu",
-                    &cores_data[core_index].user, &cores_data[core_index].nice,
-                    &cores_data[core_index].system,&cores_data[core_index].idle,
-                    &cores_data[core_index].iowait,&cores_data[core_index].irq,
-                    &cores_data[core_index].softirq,&cores_data[core_index].steal);
+                cpu_parse_counters(line, &cores_data[core_index]);
             }
             core_index = core_index + 1;
         }
+
+        //randurile cpu sunt primele din /proc/stat, restul nu ne intereseaza aici
+        line = procfs_next_line(line);
     }
 
-    if (fclose(fin) != 0){
-        fprintf(stderr, "Could not close /proc/stat\n");
+    return 1;
+}
+
+int cpu_get_activity(const ProcSource *src, CpuActivityRaw *activity){
+    if (src->buffer == NULL || src->length == 0){
         return 0;
     }
 
+    const char *line = src->buffer;
+    while (line != NULL && strncmp(line, "cpu", 3) == 0){
+        line = procfs_next_line(line);
+    }
+
+    uint64_t value = 0;
+    while (line != NULL){
+        //randul intr are cate un numar pe fiecare intrerupere, dar ne trebuie doar totalul de la inceput
+        if (strncmp(line, "intr ", 5) == 0){
+            procfs_parse_u64(line + 5, &activity->interrupts);
+        }else if (strncmp(line, "ctxt ", 5) == 0){
+            procfs_parse_u64(line + 5, &activity->context_switches);
+        }else if (strncmp(line, "processes ", 10) == 0){
+            procfs_parse_u64(line + 10, &activity->forks);
+        }else if (strncmp(line, "procs_running ", 14) == 0){
+            procfs_parse_u64(line + 14, &value);
+            activity->procs_running = (int)value;
+        }else if (strncmp(line, "procs_blocked ", 14) == 0){
+            procfs_parse_u64(line + 14, &value);
+            activity->procs_blocked = (int)value;
+        }
+        line = procfs_next_line(line);
+    }
     return 1;
 }
 
@@ -1,12 +1,55 @@
 #include "include/disk.h"
 #include <sys/statvfs.h>
+#include <sys/stat.h>
+#include <sys/sysmacros.h>
 #include <stdio.h>
+#include <string.h>
+#include <time.h>
 
-int disk_get_data(const char *path, DiskData *disk){
+#define MAX_TRACKED_DEVICES 256
+#define SECTOR_SIZE 512.0 //diskstats numara mereu in sectoare de 512 octeti
+#define GB (1024.0 * 1024.0 * 1024.0)
+
+//contoarele din diskstats de care avem nevoie
+enum { IO_READS, IO_SECTORS_READ, IO_WRITES, IO_SECTORS_WRITTEN, IO_TICKS_MS, IO_COUNTERS };
+
+typedef struct {
+    unsigned int major;
+    unsigned int minor;
+    char name[DEVICE_NAME_LEN];
+    uint64_t counters[IO_COUNTERS];
+} DeviceCounters;
+
+//doua tablouri: runda trecuta si cea curenta
+static DeviceCounters device_rounds[2][MAX_TRACKED_DEVICES];
+static int device_counts[2] = {0, 0};
+static int prev_round = 0;
+static double prev_io_time = 0.0;
+
+//lista de montari ramane in cache pana se schimba mountinfo
+typedef struct {
+    MountData data;
+    unsigned int major;
+    unsigned int minor;
+    char source[MOUNT_PATH_LEN]; //"/dev/nvme0n1p3", "tmpfs", "server:/export"...
+} CachedMount;
+
+static CachedMount cached_mounts[MAX_MOUNTS];
+static int cached_mount_count = 0;
+static uint64_t mountinfo_hash = 0;
+
+static double monotonic_seconds(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+}
+
+static int statvfs_fill(const char *path, double *total_gb, double *used_gb, double *free_gb, double *usage_percent) {
     struct statvfs stat;
+    char full_path[PROCFS_PATH_LEN];
+    procfs_path(full_path, sizeof(full_path), path); //montarile sunt luate fata de radacina
 
-    if (statvfs(path, &stat) != 0) {
-        fprintf(stderr, "Could not get stats for path: %s\n", path);
+    if (statvfs(full_path, &stat) != 0) {
         return 0;
     }
 
@@ -14,15 +57,276 @@ int disk_get_data(const char *path, DiskData *disk){
     double free_bytes = (double)stat.f_bfree * stat.f_frsize;
     double used_bytes = total_bytes - free_bytes;
 
-    disk->total_gb = total_bytes / (1024.0 * 1024.0 * 1024.0);
-    disk->free_gb = free_bytes / (1024.0 * 1024.0 * 1024.0);
-    disk->used_gb = used_bytes / (1024.0 * 1024.0 * 1024.0);
+    *total_gb = total_bytes / GB;
+    *free_gb = free_bytes / GB;
+    *used_gb = used_bytes / GB;
+    *usage_percent = total_bytes > 0 ? (used_bytes / total_bytes) * 100.0 : 0.0;
+    return 1;
+}
+
+int disk_get_data(const char *path, DiskData *disk){
+    if (!statvfs_fill(path, &disk->total_gb, &disk->used_gb, &disk->free_gb, &disk->usage_percent)) {
+        fprintf(stderr, "Could not get stats for path: %s\n", path);
+        return 0;
+    }
+    return 1;
+}
+
+//"major minor name" de la inceputul unui rand din diskstats
+static const char *parse_device(const char *p, unsigned int *major, unsigned int *minor, char *name) {
+    uint64_t value;
+    p = procfs_parse_u64(p, &value);
+    *major = (unsigned int)value;
+    p = procfs_parse_u64(p, &value);
+    *minor = (unsigned int)value;
+
+    p = procfs_skip_spaces(p);
+    size_t len = 0;
+    while (p[len] != ' ' && p[len] != '\n' && p[len] != '\0') {
+        len++;
+    }
+    size_t copy = len < DEVICE_NAME_LEN - 1 ? len : DEVICE_NAME_LEN - 1;
+    memcpy(name, p, copy);
+    name[copy] = '\0';
+    return p + len;
+}
+
+//numele din diskstats pentru major:minor; "" daca nu e acolo
+static void lookup_device_name(const char *diskstats, unsigned int major, unsigned int minor, char *name) {
+    name[0] = '\0';
+    for (const char *line = diskstats; line; line = procfs_next_line(line)) {
+        unsigned int dev_major, dev_minor;
+        char dev_name[DEVICE_NAME_LEN];
+        parse_device(line, &dev_major, &dev_minor, dev_name);
+        if (dev_major == major && dev_minor == minor) {
+            memcpy(name, dev_name, DEVICE_NAME_LEN);
+            return;
+        }
+    }
+}
 
-    if (total_bytes > 0) {
-        disk->usage_percent = (used_bytes / total_bytes) * 100.0;
-    } else {
-        disk->usage_percent = 0.0;
+//mountinfo scrie spatiile si alte caractere speciale ca \040
+static void unescape_path(const char *src, size_t len, char *dst, size_t size) {
+    size_t out = 0;
+    for (size_t i = 0; i < len && out < size - 1; i++) {
+        if (src[i] == '\\' && i + 3 < len &&
+            src[i + 1] >= '0' && src[i + 1] <= '7' && src[i + 2] >= '0' && src[i + 2] <= '7' &&
+            src[i + 3] >= '0' && src[i + 3] <= '7') {
+            dst[out++] = (char)((src[i + 1] - '0') * 64 + (src[i + 2] - '0') * 8 + (src[i + 3] - '0'));
+            i += 3;
+        } else {
+            dst[out++] = src[i];
+        }
     }
+    dst[out] = '\0';
+}
 
+//campurile: id parinte major:minor radacina punct_montare optiuni [...] - tip sursa optiuni
+static int parse_mount_line(const char *line, CachedMount *mount) {
+    uint64_t value;
+    const char *p = procfs_parse_u64(line, &value); //id
+    p = procfs_parse_u64(p, &value);                //parinte
+    p = procfs_parse_u64(p, &value);
+    mount->major = (unsigned int)value;
+    if (*p != ':') return 0;
+    p = procfs_parse_u64(p + 1, &value);
+    mount->minor = (unsigned int)value;
+
+    p = procfs_skip_spaces(p);
+    while (*p != ' ' && *p != '\n' && *p != '\0') p++; //radacina din sistemul de fisiere
+    p = procfs_skip_spaces(p);
+    const char *mount_point = p;
+    while (*p != ' ' && *p != '\n' && *p != '\0') p++;
+    unescape_path(mount_point, (size_t)(p - mount_point), mount->data.mount_point, MOUNT_PATH_LEN);
+
+    const char *newline = strchr(p, '\n');
+    const char *separator = strstr(p, " - ");
+    if (!separator || (newline && separator > newline)) return 0;
+
+    p = separator + 3;
+    size_t len = 0;
+    while (p[len] != ' ' && p[len] != '\n' && p[len] != '\0') len++;
+    size_t copy = len < FS_TYPE_LEN - 1 ? len : FS_TYPE_LEN - 1;
+    memcpy(mount->data.fs_type, p, copy);
+    mount->data.fs_type[copy] = '\0';
+
+    p = procfs_skip_spaces(p + len);
+    const char *source = p;
+    while (*p != ' ' && *p != '\n' && *p != '\0') p++;
+    unescape_path(source, (size_t)(p - source), mount->source, MOUNT_PATH_LEN);
     return 1;
-}
\ No newline at end of file
+}
+
+//btrfs (si subvolumele lui) raporteaza un dispozitiv anonim 0:N: ajungem la disc prin sursa
+static int source_is_block(const CachedMount *mount) {
+    return strncmp(mount->source, "/dev/", 5) == 0;
+}
+
+//numele din diskstats pentru sursa unei montari: dupa major:minor-ul nodului din /dev
+//(/dev/mapper/x -> dm-N), altfel dupa numele lui (/dev/nvme0n1p3 -> nvme0n1p3)
+static void lookup_source_name(const char *diskstats, const char *source, char *name) {
+    char full_path[PROCFS_PATH_LEN];
+    struct stat st;
+    procfs_path(full_path, sizeof(full_path), source);
+    if (stat(full_path, &st) == 0 && S_ISBLK(st.st_mode)) {
+        lookup_device_name(diskstats, major(st.st_rdev), minor(st.st_rdev), name);
+        if (name[0] != '\0') return;
+    }
+
+    const char *base = strrchr(source, '/') + 1;
+    name[0] = '\0';
+    for (const char *line = diskstats; line; line = procfs_next_line(line)) {
+        unsigned int dev_major, dev_minor;
+        char dev_name[DEVICE_NAME_LEN];
+        parse_device(line, &dev_major, &dev_minor, dev_name);
+        if (strcmp(dev_name, base) == 0) {
+            memcpy(name, dev_name, DEVICE_NAME_LEN);
+            return;
+        }
+    }
+}
+
+static void rebuild_mounts(const char *mountinfo, const char *diskstats, int max_mounts) {
+    cached_mount_count = 0;
+    if (max_mounts > MAX_MOUNTS) max_mounts = MAX_MOUNTS;
+
+    //"/" mereu primul; ultima aparitie e cea vizibila (montarile de deasupra o ascund pe cea veche)
+    CachedMount mount;
+    for (const char *line = mountinfo; line; line = procfs_next_line(line)) {
+        if (parse_mount_line(line, &mount) && strcmp(mount.data.mount_point, "/") == 0) {
+            cached_mounts[0] = mount;
+            cached_mount_count = 1;
+        }
+    }
+
+    //restul: doar ce sta pe un dispozitiv bloc (major != 0, sau btrfs cu sursa in /dev),
+    //cate o montare pe dispozitiv; asa sarim si peste tmpfs/cgroup si peste NFS, unde statvfs poate bloca
+    for (const char *line = mountinfo; line && cached_mount_count < max_mounts; line = procfs_next_line(line)) {
+        if (!parse_mount_line(line, &mount) || (mount.major == 0 && !source_is_block(&mount)) ||
+            strcmp(mount.data.mount_point, "/") == 0) {
+            continue;
+        }
+
+        int duplicate = 0;
+        for (int i = 0; i < cached_mount_count; i++) {
+            if (cached_mounts[i].major == mount.major && cached_mounts[i].minor == mount.minor) {
+                duplicate = 1;
+                break;
+            }
+        }
+        if (!duplicate) {
+            cached_mounts[cached_mount_count++] = mount;
+        }
+    }
+
+    //overlay, tmpfs, nfs...: fara dispozitiv
+    for (int i = 0; i < cached_mount_count; i++) {
+        CachedMount *cached = &cached_mounts[i];
+        cached->data.device[0] = '\0';
+        if (!diskstats) continue;
+        if (cached->major != 0) {
+            lookup_device_name(diskstats, cached->major, cached->minor, cached->data.device);
+        } else if (source_is_block(cached)) {
+            lookup_source_name(diskstats, cached->source, cached->data.device);
+        }
+    }
+}
+
+int disk_get_mounts(ProcSource *mountinfo, ProcSource *diskstats, MountData *mounts, int max_mounts) {
+    const char *text = procfs_source_read(mountinfo);
+    if (!text) return 0;
+
+    //FNV-1a pe tot fisierul: refacem lista doar cand s-a montat/demontat ceva
+    uint64_t hash = 14695981039346656037ULL;
+    for (const char *c = text; *c; c++) {
+        hash = (hash ^ (unsigned char)*c) * 1099511628211ULL;
+    }
+    if (hash != mountinfo_hash) {
+        const char *stats = procfs_source_read(diskstats);
+        rebuild_mounts(text, stats, max_mounts);
+        mountinfo_hash = hash;
+    }
+
+    int count = 0;
+    for (int i = 0; i < cached_mount_count && count < max_mounts; i++) {
+        MountData *out = &mounts[count];
+        *out = cached_mounts[i].data;
+        if (statvfs_fill(out->mount_point, &out->total_gb, &out->used_gb, &out->free_gb, &out->usage_percent)) {
+            count++;
+        }
+    }
+    return count;
+}
+
+static const DeviceCounters *find_device(const DeviceCounters *devices, int count, unsigned int major, unsigned int minor) {
+    for (int i = 0; i < count; i++) {
+        if (devices[i].major == major && devices[i].minor == minor) {
+            return &devices[i];
+        }
+    }
+    return NULL;
+}
+
+static double counter_rate(uint64_t now, uint64_t before, double elapsed) {
+    return now >= before ? (double)(now - before) / elapsed : 0.0;
+}
+
+int disk_get_io(ProcSource *diskstats, DiskIoData *devices, int max_devices) {
+    const char *line = procfs_source_read(diskstats);
+    if (!line) return 0;
+
+    double now = monotonic_seconds();
+    double elapsed = prev_io_time > 0.0 ? now - prev_io_time : 0.0;
+    DeviceCounters *prev = device_rounds[prev_round];
+    DeviceCounters *curr = device_rounds[1 - prev_round];
+    int prev_count = device_counts[prev_round];
+    int curr_count = 0;
+    int count = 0;
+
+    for (; line && curr_count < MAX_TRACKED_DEVICES; line = procfs_next_line(line)) {
+        DeviceCounters *device = &curr[curr_count];
+        const char *p = parse_device(line, &device->major, &device->minor, device->name);
+        if (device->name[0] == '\0') continue;
+
+        //reads merged sectors ms_reading writes merged sectors ms_writing in_flight io_ms
+        uint64_t fields[10];
+        for (int i = 0; i < 10; i++) {
+            p = procfs_parse_u64(p, &fields[i]);
+        }
+        device->counters[IO_READS] = fields[0];
+        device->counters[IO_SECTORS_READ] = fields[2];
+        device->counters[IO_WRITES] = fields[4];
+        device->counters[IO_SECTORS_WRITTEN] = fields[6];
+        device->counters[IO_TICKS_MS] = fields[9];
+        curr_count++;
+
+        if (strncmp(device->name, "loop", 4) == 0 || strncmp(device->name, "ram", 3) == 0) continue;
+        if (fields[0] == 0 && fields[4] == 0) continue;
+        if (count >= max_devices) continue;
+
+        DiskIoData *out = &devices[count++];
+        memcpy(out->name, device->name, sizeof(out->name));
+        const DeviceCounters *old = find_device(prev, prev_count, device->major, device->minor);
+        if (old && elapsed > 0.0) {
+            out->read_bytes_per_sec = counter_rate(device->counters[IO_SECTORS_READ], old->counters[IO_SECTORS_READ], elapsed) * SECTOR_SIZE;
+            out->write_bytes_per_sec = counter_rate(device->counters[IO_SECTORS_WRITTEN], old->counters[IO_SECTORS_WRITTEN], elapsed) * SECTOR_SIZE;
+            out->read_iops = counter_rate(device->counters[IO_READS], old->counters[IO_READS], elapsed);
+            out->write_iops = counter_rate(device->counters[IO_WRITES], old->counters[IO_WRITES], elapsed);
+
+            //io_ms creste cu timpul in care dispozitivul a avut macar o cerere in lucru
+            double util = counter_rate(device->counters[IO_TICKS_MS], old->counters[IO_TICKS_MS], elapsed) / 10.0;
+            out->util_percent = util > 100.0 ? 100.0 : util;
+        } else {
+            out->read_bytes_per_sec = 0.0;
+            out->write_bytes_per_sec = 0.0;
+            out->read_iops = 0.0;
+            out->write_iops = 0.0;
+            out->util_percent = 0.0;
+        }
+    }
+
+    device_counts[1 - prev_round] = curr_count;
+    prev_round = 1 - prev_round;
+    prev_io_time = now;
+    return count;
+}
@@ -2,53 +2,251 @@
 #include <stdio.h>
 #include <string.h>
 #include <stdlib.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <signal.h>
+#include <spawn.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/wait.h>
 
-int gpu_get_data(GpuData* gpu){
-    strncpy(gpu->name, "Unknown GPU", STR_LEN - 1);
-    gpu->usage_percent = 0.0;
-    gpu->memory_total_mb = 0.0;
-    gpu->memory_used_mb = 0.0;
+#define GPU_RESTART_DELAY 5.0  //secunde intre un nvidia-smi mort si urmatorul
+#define GPU_START_TIMEOUT 15.0 //fara nicio linie in atat timp: consideram ca nu exista GPU
+#define GPU_STALL_LOOPS 5      //perioade fara linii dupa care repornim procesul
 
-    FILE *fin = popen("nvidia-smi --query-gpu=name,utilization.gpu,memory.total,memory.used --format=csv,noheader,nounits", "r");
-    if (fin == NULL){
+extern char **environ;
+
+static double monotonic_seconds(void){
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+}
+
+void gpu_channel_init(GpuChannel *channel, const char *command, int loop_ms){
+    memset(channel, 0, sizeof(*channel));
+    strncpy(channel->command, command != NULL ? command : GPU_DEFAULT_COMMAND, sizeof(channel->command) - 1);
+    channel->loop_ms = loop_ms > 0 ? loop_ms : 1000;
+    channel->state = GPU_CHANNEL_STOPPED;
+    channel->pid = -1;
+    channel->unreaped = -1;
+    channel->fd = -1;
+}
+
+//culege fara blocare procesul omorat; 1 daca nu mai avem niciunul de asteptat
+static int channel_reap(GpuChannel *channel){
+    if (channel->unreaped > 0){
+        pid_t result = waitpid(channel->unreaped, NULL, WNOHANG);
+        if (result == 0 || (result < 0 && errno == EINTR)){
+            return 0;
+        }
+        channel->unreaped = -1;
+    }
+    return 1;
+}
+
+static int channel_start(GpuChannel *channel, double now){
+    int pipe_fds[2];
+    if (pipe(pipe_fds) != 0){
         return 0;
     }
+    //capatul de citire nu trebuie mostenit de alte procese pornite din aplicatie
+    fcntl(pipe_fds[0], F_SETFD, FD_CLOEXEC);
+    fcntl(pipe_fds[1], F_SETFD, FD_CLOEXEC);
+
+    char loop_arg[32];
+    snprintf(loop_arg, sizeof(loop_arg), "--loop-ms=%d", channel->loop_ms);
+    char *argv[] = {
+        channel->command,
+        "--query-gpu=index,name,utilization.gpu,memory.total,memory.used",
+        "--format=csv,noheader,nounits",
+        loop_arg,
+        NULL
+    };
+
+    //stdout in pipe, stdin si stderr la /dev/null (fara mesaje in consola noastra)
+    posix_spawn_file_actions_t actions;
+    posix_spawn_file_actions_init(&actions);
+    posix_spawn_file_actions_addopen(&actions, STDIN_FILENO, "/dev/null", O_RDONLY, 0);
+    posix_spawn_file_actions_adddup2(&actions, pipe_fds[1], STDOUT_FILENO);
+    posix_spawn_file_actions_addopen(&actions, STDERR_FILENO, "/dev/null", O_WRONLY, 0);
+
+    pid_t pid;
+    int error = posix_spawnp(&pid, channel->command, &actions, NULL, argv, environ);
+    posix_spawn_file_actions_destroy(&actions);
+    close(pipe_fds[1]);
+
+    if (error != 0){
+        close(pipe_fds[0]);
+        if (error == ENOENT || error == EACCES){
+            channel->state = GPU_CHANNEL_ABSENT;
+        }
+        return 0;
+    }
+
+    fcntl(pipe_fds[0], F_SETFL, fcntl(pipe_fds[0], F_GETFL) | O_NONBLOCK);
+    channel->pid = pid;
+    channel->fd = pipe_fds[0];
+    channel->length = 0;
+    channel->produced = 0;
+    channel->last_line = now;
+    channel->state = GPU_CHANNEL_RUNNING;
+    return 1;
+}
+
+static void channel_stop(GpuChannel *channel){
+    if (channel->fd >= 0){
+        close(channel->fd);
+        channel->fd = -1;
+    }
+    if (channel->pid > 0){
+        //SIGKILL si fara asteptare: un nvidia-smi blocat in driver ignora SIGTERM si poate
+        //ramane si dupa SIGKILL pana iese din kernel; il culegem la urmatoarele apeluri
+        kill(channel->pid, SIGKILL);
+        channel->unreaped = channel->pid;
+        channel->pid = -1;
+        channel_reap(channel);
+    }
+    channel->length = 0;
+}
+
+//procesul s-a oprit (sau s-a blocat): il repornim doar daca a mers macar o data
+static void channel_lost(GpuChannel *channel, double now){
+    channel_stop(channel);
+    channel->gpu_count = 0;
+
+    if (channel->produced){
+        channel->state = GPU_CHANNEL_STOPPED;
+        channel->next_start = now + GPU_RESTART_DELAY;
+    }else{
+        fprintf(stderr, "%s produced no GPU data, GPU monitoring disabled\n", channel->command);
+        channel->state = GPU_CHANNEL_ABSENT;
+    }
+}
+
+static char *trim(char *text){
+    while (*text == ' '){
+        text = text + 1;
+    }
+    size_t len = strlen(text);
+    while (len > 0 && (text[len - 1] == ' ' || text[len - 1] == '\r')){
+        len = len - 1;
+    }
+    text[len] = '\0';
+    return text;
+}
 
-    char buffer[BUFFER_SIZE];
-    if (fgets(buffer, BUFFER_SIZE, fin) != NULL){
-        //extragen numele
-        char *token = strtok(buffer, ",");
-        if (token){
-            strncpy(gpu->name, token, STR_LEN - 1);
-            gpu->name[STR_LEN - 1] = '\0';
+//un rand: "index, name, utilization.gpu, memory.total, memory.used"
+static int parse_line(GpuChannel *channel, char *line){
+    char *fields[5];
+    int count = 0;
+    char *p = line;
+    while (count < 5){
+        fields[count] = p;
+        count = count + 1;
+        char *comma = strchr(p, ',');
+        if (comma == NULL){
+            break;
         }
+        *comma = '\0';
+        p = comma + 1;
+    }
+    if (count != 5){
+        return 0;
+    }
+
+    char *end;
+    long index = strtol(trim(fields[0]), &end, 10);
+    if (*end != '\0' || end == fields[0] || index < 0 || index >= MAX_GPUS){
+        return 0;
+    }
+
+    //"[N/A]" sau "[Not Supported]" pe unele placi: ramane 0
+    GpuData *gpu = &channel->gpus[index];
+    strncpy(gpu->name, trim(fields[1]), sizeof(gpu->name) - 1);
+    gpu->name[sizeof(gpu->name) - 1] = '\0';
+    gpu->usage_percent = atof(trim(fields[2]));
+    gpu->memory_total_mb = atof(trim(fields[3]));
+    gpu->memory_used_mb = atof(trim(fields[4]));
+
+    if (index >= channel->gpu_count){
+        channel->gpu_count = (int)index + 1;
+    }
+    return 1;
+}
 
-        //extragem utilizarea
-        token = strtok(NULL, ",");
-        if (token){
-            gpu->usage_percent = atof(token);
+//tot ce e in pipe acum; intoarce 0 la EOF
+static int channel_drain(GpuChannel *channel, double now){
+    while (1){
+        size_t space = sizeof(channel->buffer) - 1 - channel->length;
+        ssize_t len = read(channel->fd, channel->buffer + channel->length, space);
+        if (len == 0){
+            return 0;
+        }
+        if (len < 0){
+            if (errno == EINTR){
+                continue;
+            }
+            return errno == EAGAIN || errno == EWOULDBLOCK;
         }
 
-        //extragem memoria total
-        token = strtok(NULL, ",");
-        if (token){
-            gpu->memory_total_mb = atof(token);
+        channel->length = channel->length + (size_t)len;
+        channel->buffer[channel->length] = '\0';
+
+        char *line = channel->buffer;
+        char *newline;
+        while ((newline = strchr(line, '\n')) != NULL){
+            *newline = '\0';
+            if (parse_line(channel, line)){
+                channel->produced = 1;
+                channel->last_line = now;
+            }
+            line = newline + 1;
         }
 
-        //extragem memoria folosita
-        token = strtok(NULL, ",");
-        if (token){
-            gpu->memory_used_mb = atof(token);
+        //pastram doar bucata de linie neterminata; o linie prea lunga o aruncam
+        size_t rest = channel->length - (size_t)(line - channel->buffer);
+        if (rest == sizeof(channel->buffer) - 1){
+            rest = 0;
         }
+        memmove(channel->buffer, line, rest);
+        channel->length = rest;
+    }
+}
+
+int gpu_channel_poll(GpuChannel *channel, GpuData *gpus, int max_gpus){
+    int reaped = channel_reap(channel);
+    if (channel->state == GPU_CHANNEL_ABSENT){
+        return 0;
+    }
 
-        if (pclose(fin) != 0){
+    double now = monotonic_seconds();
+    if (channel->state == GPU_CHANNEL_STOPPED){
+        //nu pornim altul cat timp cel vechi n-a fost cules
+        if (!reaped || now < channel->next_start || !channel_start(channel, now)){
             return 0;
         }
-        return 1;
     }
 
-    if (pclose(fin) != 0){
+    if (!channel_drain(channel, now)){
+        channel_lost(channel, now);
         return 0;
     }
-    return 0;
-}
\ No newline at end of file
+
+    //un nvidia-smi care nu mai scrie nimic nu ne blocheaza, dar nici nu-l pastram
+    double limit = channel->produced ? GPU_STALL_LOOPS * channel->loop_ms / 1000.0 : GPU_START_TIMEOUT;
+    if (now - channel->last_line > limit){
+        channel_lost(channel, now);
+        return 0;
+    }
+
+    int count = channel->gpu_count < max_gpus ? channel->gpu_count : max_gpus;
+    memcpy(gpus, channel->gpus, (size_t)count * sizeof(GpuData));
+    return count;
+}
+
+void gpu_channel_close(GpuChannel *channel){
+    channel_stop(channel);
+    if (channel->state == GPU_CHANNEL_RUNNING){
+        channel->state = GPU_CHANNEL_STOPPED;
+    }
+}
@@ -0,0 +1,1036 @@
+#include "include/history.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <stddef.h>
+#include <errno.h>
+#include <math.h>
+#include <dirent.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <time.h>
+#include <sys/mman.h>
+#include <sys/file.h>
+#include <sys/stat.h>
+
+#define BLOCK_MAGIC 0x4B4C4248u // "HBLK"
+#define REGISTRY_FILE "series.idx"
+#define PROC_PREFIX "proc."
+#define REGISTRY_COMPACT_APPENDS 3600 //cam o ora la 1 Hz: cat de vechi poate fi last_ms din registru
+
+//un bloc pe disc: antetul urmat de nbytes de bitstream
+typedef struct{
+    uint32_t magic;
+    uint32_t series_id;
+    uint32_t count;
+    uint32_t nbytes;
+    uint32_t columns;
+    uint32_t reserved;
+    int64_t first_ms;
+    int64_t last_ms;
+}BlockHeader;
+
+typedef struct{
+    const uint8_t *data;
+    size_t bit_len;
+    size_t pos;
+}BitReader;
+
+//bucket-ul fiecarui nivel, marimea unui segment si cat pastram
+static const int64_t level_bucket_ms[HISTORY_LEVELS] = {0, 10000, 60000, 3600000};
+static const int64_t level_window_ms[HISTORY_LEVELS] = {3600000LL, 6 * 3600000LL, 86400000LL, 30 * 86400000LL};
+static const int64_t level_retention_ms[HISTORY_LEVELS] = {86400000LL, 7 * 86400000LL, 30 * 86400000LL, 365 * 86400000LL};
+static const int64_t level_seal_ms[HISTORY_LEVELS] = {60000LL, 600000LL, 3600000LL, 86400000LL};
+
+
+//─── bitstream ─────────────────────────────────────────────────────────────
+
+static int bits_write(BitWriter *bw, uint64_t value, int nbits){
+    size_t needed = (bw->bit_len + (size_t)nbits + 7) / 8;
+    if (needed > bw->capacity){
+        size_t capacity = bw->capacity ? bw->capacity * 2 : 256;
+        while (capacity < needed){
+            capacity = capacity * 2;
+        }
+        uint8_t *data = realloc(bw->data, capacity);
+        if (data == NULL){
+            return 0;
+        }
+        memset(data + bw->capacity, 0, capacity - bw->capacity);
+        bw->data = data;
+        bw->capacity = capacity;
+    }
+
+    //de la bitul cel mai semnificativ, cate un octet odata
+    while (nbits > 0){
+        size_t byte = bw->bit_len / 8;
+        int room = 8 - (int)(bw->bit_len % 8);
+        int take = nbits < room ? nbits : room;
+        uint8_t chunk = (uint8_t)((value >> (nbits - take)) & ((1u << take) - 1));
+        bw->data[byte] |= (uint8_t)(chunk << (room - take));
+        bw->bit_len = bw->bit_len + (size_t)take;
+        nbits = nbits - take;
+    }
+    return 1;
+}
+
+static uint64_t bits_read(BitReader *br, int nbits){
+    uint64_t value = 0;
+    while (nbits > 0){
+        if (br->pos >= br->bit_len){
+            //bitstream corupt sau trunchiat: completam cu zerouri
+            br->pos = br->pos + (size_t)nbits;
+            return nbits >= 64 ? 0 : value << nbits;
+        }
+
+        size_t byte = br->pos / 8;
+        int offset = (int)(br->pos % 8);
+        int avail = 8 - offset;
+        int take = nbits < avail ? nbits : avail;
+        uint8_t bits = (uint8_t)(br->data[byte] << offset) >> (8 - take);
+        value = (value << take) | bits;
+        br->pos = br->pos + (size_t)take;
+        nbits = nbits - take;
+    }
+    return value;
+}
+
+static uint64_t double_bits(double value){
+    uint64_t bits;
+    memcpy(&bits, &value, sizeof(bits));
+    return bits;
+}
+
+static double bits_double(uint64_t bits){
+    double value;
+    memcpy(&value, &bits, sizeof(value));
+    return value;
+}
+
+//─── codare: delta-of-delta pentru timp, XOR (Gorilla) pentru valori ────────
+
+static int encode_timestamp(OpenBlock *block, int64_t t_ms){
+    BitWriter *bw = &block->bits;
+    if (block->count == 0){
+        return bits_write(bw, (uint64_t)t_ms, 64);
+    }
+
+    int64_t delta = t_ms - block->last_ms;
+    int64_t dod = delta - block->prev_delta;
+    block->prev_delta = delta;
+
+    if (dod == 0){
+        return bits_write(bw, 0, 1);
+    }else if (dod >= -63 && dod <= 64){
+        return bits_write(bw, 0x2, 2) && bits_write(bw, (uint64_t)(dod + 63), 7);
+    }else if (dod >= -255 && dod <= 256){
+        return bits_write(bw, 0x6, 3) && bits_write(bw, (uint64_t)(dod + 255), 9);
+    }else if (dod >= -2047 && dod <= 2048){
+        return bits_write(bw, 0xE, 4) && bits_write(bw, (uint64_t)(dod + 2047), 12);
+    }
+    return bits_write(bw, 0xF, 4) && bits_write(bw, (uint64_t)dod, 64);
+}
+
+static int encode_value(OpenBlock *block, int column, double value){
+    BitWriter *bw = &block->bits;
+    uint64_t bits = double_bits(value);
+
+    if (block->count == 0){
+        block->prev_values[column] = bits;
+        block->prev_leading[column] = -1;
+        return bits_write(bw, bits, 64);
+    }
+
+    uint64_t xor_bits = bits ^ block->prev_values[column];
+    block->prev_values[column] = bits;
+    if (xor_bits == 0){
+        return bits_write(bw, 0, 1);
+    }
+
+    int leading = __builtin_clzll(xor_bits);
+    int trailing = __builtin_ctzll(xor_bits);
+    if (leading > 31){
+        leading = 31;
+    }
+
+    int prev_leading = block->prev_leading[column];
+    int prev_trailing = block->prev_trailing[column];
+    if (prev_leading >= 0 && leading >= prev_leading && trailing >= prev_trailing){
+        //incape in fereastra valorii anterioare
+        int significant = 64 - prev_leading - prev_trailing;
+        return bits_write(bw, 0x2, 2) && bits_write(bw, xor_bits >> prev_trailing, significant);
+    }
+
+    int significant = 64 - leading - trailing;
+    block->prev_leading[column] = leading;
+    block->prev_trailing[column] = trailing;
+    return bits_write(bw, 0x3, 2) && bits_write(bw, (uint64_t)leading, 5) &&
+           bits_write(bw, (uint64_t)(significant - 1), 6) && bits_write(bw, xor_bits >> trailing, significant);
+}
+
+typedef struct{
+    int64_t t_ms;
+    int64_t prev_delta;
+    uint64_t values[3];
+    int leading[3];
+    int trailing[3];
+}DecodeState;
+
+static int64_t decode_timestamp(BitReader *br, DecodeState *state, uint32_t index){
+    if (index == 0){
+        state->t_ms = (int64_t)bits_read(br, 64);
+        state->prev_delta = 0;
+        return state->t_ms;
+    }
+
+    int64_t dod;
+    if (bits_read(br, 1) == 0){
+        dod = 0;
+    }else if (bits_read(br, 1) == 0){
+        dod = (int64_t)bits_read(br, 7) - 63;
+    }else if (bits_read(br, 1) == 0){
+        dod = (int64_t)bits_read(br, 9) - 255;
+    }else if (bits_read(br, 1) == 0){
+        dod = (int64_t)bits_read(br, 12) - 2047;
+    }else{
+        dod = (int64_t)bits_read(br, 64);
+    }
+
+    state->prev_delta = state->prev_delta + dod;
+    state->t_ms = state->t_ms + state->prev_delta;
+    return state->t_ms;
+}
+
+static double decode_value(BitReader *br, DecodeState *state, int column, uint32_t index){
+    if (index == 0){
+        state->values[column] = bits_read(br, 64);
+        return bits_double(state->values[column]);
+    }
+
+    if (bits_read(br, 1) == 1){
+        uint64_t xor_bits;
+        if (bits_read(br, 1) == 0){
+            int significant = 64 - state->leading[column] - state->trailing[column];
+            xor_bits = bits_read(br, significant) << state->trailing[column];
+        }else{
+            int leading = (int)bits_read(br, 5);
+            int significant = (int)bits_read(br, 6) + 1;
+            state->leading[column] = leading;
+            state->trailing[column] = 64 - leading - significant;
+            xor_bits = bits_read(br, significant) << state->trailing[column];
+        }
+        state->values[column] = state->values[column] ^ xor_bits;
+    }
+    return bits_double(state->values[column]);
+}
+
+//decodeaza un bloc si pastreaza doar punctele din [from_ms, to_ms]
+static int decode_block(const uint8_t *data, size_t nbytes, uint32_t count, uint32_t columns,
+                        int64_t from_ms, int64_t to_ms, HistoryPoint *out, int room){
+    BitReader br = {data, nbytes * 8, 0};
+    DecodeState state = {0};
+    int written = 0;
+
+    for (uint32_t i = 0; i < count && written < room; i = i + 1){
+        int64_t t_ms = decode_timestamp(&br, &state, i);
+        double values[3] = {0.0, 0.0, 0.0};
+        for (uint32_t c = 0; c < columns; c = c + 1){
+            values[c] = decode_value(&br, &state, (int)c, i);
+        }
+
+        if (t_ms < from_ms || t_ms > to_ms){
+            continue;
+        }
+
+        out[written].timestamp = (double)t_ms / 1000.0;
+        out[written].avg = values[0];
+        out[written].min = columns == 3 ? values[1] : values[0];
+        out[written].max = columns == 3 ? values[2] : values[0];
+        written = written + 1;
+    }
+    return written;
+}
+
+//─── segmente si registrul de serii ────────────────────────────────────────
+
+static int64_t window_start(int level, int64_t t_ms){
+    return t_ms - t_ms % level_window_ms[level];
+}
+
+static void segment_path(const HistoryStore *store, int level, int64_t window, char *path, size_t size){
+    snprintf(path, size, "%s/L%d-%lld.seg", store->dir, level, (long long)window);
+}
+
+static void remove_expired_segments(HistoryStore *store, int level, int64_t now_ms){
+    DIR *dir = opendir(store->dir);
+    if (dir == NULL){
+        return;
+    }
+
+    char prefix[8];
+    snprintf(prefix, sizeof(prefix), "L%d-", level);
+    struct dirent *entry;
+    while ((entry = readdir(dir)) != NULL){
+        if (strncmp(entry->d_name, prefix, strlen(prefix)) != 0){
+            continue;
+        }
+
+        long long window = atoll(entry->d_name + strlen(prefix));
+        if (window + level_window_ms[level] < now_ms - level_retention_ms[level]){
+            char path[LEN_LINE * 2];
+            snprintf(path, sizeof(path), "%s/%s", store->dir, entry->d_name);
+            unlink(path);
+        }
+    }
+    closedir(dir);
+}
+
+static int segment_fd(HistoryStore *store, int level, int64_t window){
+    if (store->segment_fd[level] >= 0 && store->segment_window[level] == window){
+        return store->segment_fd[level];
+    }
+
+    if (store->segment_fd[level] >= 0){
+        close(store->segment_fd[level]);
+    }
+
+    char path[LEN_LINE * 2];
+    segment_path(store, level, window, path, sizeof(path));
+    store->segment_fd[level] = open(path, O_WRONLY | O_CREAT | O_APPEND | O_CLOEXEC, 0644);
+    store->segment_window[level] = window;
+    if (store->segment_fd[level] < 0){
+        fprintf(stderr, "Could not open %s\n", path);
+        return -1;
+    }
+
+    //un segment nou: momentul potrivit sa aplicam retentia
+    remove_expired_segments(store, level, window);
+    return store->segment_fd[level];
+}
+
+static uint32_t name_hash(const char *name){
+    uint32_t hash = 2166136261u;
+    while (*name){
+        hash = (hash ^ (uint8_t)*name) * 16777619u;
+        name = name + 1;
+    }
+    return hash;
+}
+
+static int index_insert(HistoryStore *store, size_t position){
+    if ((store->series_count + 1) * 2 > store->index_capacity){
+        size_t capacity = store->index_capacity ? store->index_capacity * 2 : 1024;
+        uint32_t *index = calloc(capacity, sizeof(uint32_t));
+        if (index == NULL){
+            return 0;
+        }
+        for (size_t i = 0; i < store->series_count; i = i + 1){
+            if (i == position){
+                continue;
+            }
+            size_t slot = name_hash(store->series[i].name) & (capacity - 1);
+            while (index[slot] != 0){
+                slot = (slot + 1) & (capacity - 1);
+            }
+            index[slot] = (uint32_t)i + 1;
+        }
+        free(store->index);
+        store->index = index;
+        store->index_capacity = capacity;
+    }
+
+    size_t slot = name_hash(store->series[position].name) & (store->index_capacity - 1);
+    while (store->index[slot] != 0){
+        slot = (slot + 1) & (store->index_capacity - 1);
+    }
+    store->index[slot] = (uint32_t)position + 1;
+    return 1;
+}
+
+static HistorySeries *series_find(HistoryStore *store, const char *name){
+    if (store->index_capacity == 0){
+        return NULL;
+    }
+
+    size_t slot = name_hash(name) & (store->index_capacity - 1);
+    while (store->index[slot] != 0){
+        HistorySeries *series = &store->series[store->index[slot] - 1];
+        if (strcmp(series->name, name) == 0){
+            return series;
+        }
+        slot = (slot + 1) & (store->index_capacity - 1);
+    }
+    return NULL;
+}
+
+static HistorySeries *series_add(HistoryStore *store, const char *name, uint32_t id){
+    if (store->series_count >= HISTORY_MAX_SERIES){
+        return NULL;
+    }
+
+    if (store->series_count == store->series_capacity){
+        size_t capacity = store->series_capacity ? store->series_capacity * 2 : 256;
+        HistorySeries *series = realloc(store->series, capacity * sizeof(HistorySeries));
+        if (series == NULL){
+            return NULL;
+        }
+        store->series = series;
+        store->series_capacity = capacity;
+    }
+
+    HistorySeries *series = &store->series[store->series_count];
+    memset(series, 0, sizeof(*series));
+    strncpy(series->name, name, HISTORY_NAME_LEN - 1);
+    series->id = id;
+    store->series_count = store->series_count + 1;
+
+    if (!index_insert(store, store->series_count - 1)){
+        store->series_count = store->series_count - 1;
+        return NULL;
+    }
+    if (strncmp(name, PROC_PREFIX, strlen(PROC_PREFIX)) == 0){
+        store->proc_series = store->proc_series + 1;
+    }
+    if (id >= store->next_id){
+        store->next_id = id + 1;
+    }
+    return series;
+}
+
+static void index_rebuild(HistoryStore *store){
+    if (store->index_capacity == 0){
+        return;
+    }
+    memset(store->index, 0, store->index_capacity * sizeof(uint32_t));
+    for (size_t i = 0; i < store->series_count; i = i + 1){
+        size_t slot = name_hash(store->series[i].name) & (store->index_capacity - 1);
+        while (store->index[slot] != 0){
+            slot = (slot + 1) & (store->index_capacity - 1);
+        }
+        store->index[slot] = (uint32_t)i + 1;
+    }
+}
+
+//un cititor uita tot cand registrul a fost rescris (seriile scoase nu mai apar in el)
+static void series_clear(HistoryStore *store){
+    for (size_t i = 0; i < store->series_count; i = i + 1){
+        for (int level = 0; level < HISTORY_LEVELS; level = level + 1){
+            free(store->series[i].blocks[level].bits.data);
+        }
+    }
+    store->series_count = 0;
+    store->proc_series = 0;
+    store->registry_loaded = 0;
+    index_rebuild(store);
+}
+
+static int64_t realtime_ms(void){
+    struct timespec ts;
+    clock_gettime(CLOCK_REALTIME, &ts);
+    return (int64_t)ts.tv_sec * 1000 + ts.tv_nsec / 1000000;
+}
+
+//citeste randurile noi din series.idx (cititorii il recitesc cand nu gasesc o serie)
+//un rand: "id nume last_ms", last_ms = ultima scriere cunoscuta (lipseste in registrele vechi)
+static void registry_load(HistoryStore *store){
+    char path[LEN_LINE * 2];
+    snprintf(path, sizeof(path), "%s/%s", store->dir, REGISTRY_FILE);
+    FILE *fin = fopen(path, "r");
+    if (fin == NULL){
+        return;
+    }
+
+    struct stat st;
+    if (fstat(fileno(fin), &st) == 0 && st.st_ino != store->registry_ino){
+        if (!store->writable){
+            series_clear(store);
+        }
+        store->registry_ino = st.st_ino;
+    }
+
+    char line[HISTORY_NAME_LEN + 48];
+    size_t line_number = 0;
+    while (fgets(line, sizeof(line), fin) != NULL){
+        line_number = line_number + 1;
+        if (line_number <= store->registry_loaded){
+            continue;
+        }
+
+        char *space = strchr(line, ' ');
+        char *newline = strchr(line, '\n');
+        if (space == NULL || newline == NULL){
+            break; //rand scris pe jumatate
+        }
+        *newline = '\0';
+        char *name = space + 1;
+        int64_t last_ms = 0;
+        char *field = strchr(name, ' ');
+        if (field != NULL){
+            *field = '\0';
+            last_ms = strtoll(field + 1, NULL, 10);
+        }else{
+            last_ms = realtime_ms(); //registru vechi: nu stim, o pastram inca o retentie
+        }
+
+        HistorySeries *series = series_find(store, name);
+        if (series == NULL){
+            series = series_add(store, name, (uint32_t)strtoul(line, NULL, 10));
+        }
+        if (series != NULL && last_ms > series->last_update_ms){
+            series->last_update_ms = last_ms;
+        }
+        store->registry_loaded = line_number;
+    }
+    fclose(fin);
+}
+
+static int compare_ms(const void *a, const void *b){
+    int64_t x = *(const int64_t *)a;
+    int64_t y = *(const int64_t *)b;
+    return (x > y) - (x < y);
+}
+
+//scoate seriile fara date ramase (nescrise de mai mult decat cea mai lunga retentie) si, peste
+//plafon, seriile proc.* inactive cele mai vechi; rescrie series.idx (cu last_ms la zi) prin rename
+static void registry_compact(HistoryStore *store, int64_t now_ms){
+    int64_t expired_before = now_ms - level_retention_ms[HISTORY_LEVELS - 1];
+
+    //peste plafon coboram la 3/4 din el, ca sa nu compactam la fiecare proces nou
+    size_t proc_drop = 0;
+    int64_t proc_before = INT64_MIN;
+    if (store->proc_series >= HISTORY_MAX_PROC_SERIES){
+        int64_t *ages = malloc(store->proc_series * sizeof(int64_t));
+        size_t inactive = 0;
+        for (size_t i = 0; ages != NULL && i < store->series_count; i = i + 1){
+            const HistorySeries *series = &store->series[i];
+            if (!series->active && strncmp(series->name, PROC_PREFIX, strlen(PROC_PREFIX)) == 0){
+                ages[inactive] = series->last_update_ms;
+                inactive = inactive + 1;
+            }
+        }
+        proc_drop = store->proc_series - HISTORY_MAX_PROC_SERIES * 3 / 4;
+        if (proc_drop > inactive){
+            proc_drop = inactive;
+        }
+        if (proc_drop > 0){
+            qsort(ages, inactive, sizeof(int64_t), compare_ms);
+            proc_before = ages[proc_drop - 1];
+        }
+        free(ages);
+    }
+
+    size_t kept = 0;
+    for (size_t i = 0; i < store->series_count; i = i + 1){
+        HistorySeries *series = &store->series[i];
+        int is_proc = strncmp(series->name, PROC_PREFIX, strlen(PROC_PREFIX)) == 0;
+        int drop = !series->active && series->last_update_ms < expired_before;
+        if (!drop && is_proc && proc_drop > 0 && !series->active && series->last_update_ms <= proc_before){
+            drop = 1;
+            proc_drop = proc_drop - 1;
+        }
+
+        if (drop){
+            for (int level = 0; level < HISTORY_LEVELS; level = level + 1){
+                free(series->blocks[level].bits.data);
+            }
+            if (is_proc){
+                store->proc_series = store->proc_series - 1;
+            }
+            continue;
+        }
+        if (kept != i){
+            store->series[kept] = *series;
+        }
+        kept = kept + 1;
+    }
+    store->series_count = kept;
+    index_rebuild(store);
+
+    char path[LEN_LINE * 2];
+    char temp[LEN_LINE * 2 + 8];
+    snprintf(path, sizeof(path), "%s/%s", store->dir, REGISTRY_FILE);
+    snprintf(temp, sizeof(temp), "%s.tmp", path);
+    FILE *fout = fopen(temp, "w");
+    if (fout == NULL){
+        return;
+    }
+    for (size_t i = 0; i < store->series_count; i = i + 1){
+        const HistorySeries *series = &store->series[i];
+        fprintf(fout, "%u %s %lld\n", series->id, series->name, (long long)series->last_update_ms);
+    }
+
+    struct stat st;
+    int ok = fflush(fout) == 0 && fstat(fileno(fout), &st) == 0;
+    ok = fclose(fout) == 0 && ok;
+    if (!ok || rename(temp, path) != 0){
+        fprintf(stderr, "Could not rewrite %s\n", path);
+        unlink(temp);
+        return;
+    }
+    store->registry_loaded = store->series_count;
+    store->registry_ino = st.st_ino;
+}
+
+static HistorySeries *series_get_or_create(HistoryStore *store, const char *name, int64_t t_ms){
+    HistorySeries *series = series_find(store, name);
+    if (series != NULL){
+        return series;
+    }
+
+    int is_proc = strncmp(name, PROC_PREFIX, strlen(PROC_PREFIX)) == 0;
+    if ((is_proc && store->proc_series >= HISTORY_MAX_PROC_SERIES) || store->series_count >= HISTORY_MAX_SERIES){
+        registry_compact(store, t_ms);
+    }
+    if (is_proc && store->proc_series >= HISTORY_MAX_PROC_SERIES){
+        return NULL;
+    }
+
+    series = series_add(store, name, store->next_id);
+    if (series == NULL){
+        return NULL;
+    }
+    series->last_update_ms = t_ms;
+
+    char path[LEN_LINE * 2];
+    snprintf(path, sizeof(path), "%s/%s", store->dir, REGISTRY_FILE);
+    FILE *fout = fopen(path, "a");
+    if (fout != NULL){
+        fprintf(fout, "%u %s %lld\n", series->id, series->name, (long long)t_ms);
+        fclose(fout);
+        store->registry_loaded = store->registry_loaded + 1;
+    }
+    return series;
+}
+
+//─── scriere ───────────────────────────────────────────────────────────────
+
+static void block_reset(OpenBlock *block){
+    if (block->bits.data != NULL){
+        memset(block->bits.data, 0, block->bits.capacity);
+    }
+    block->bits.bit_len = 0;
+    block->count = 0;
+    block->prev_delta = 0;
+}
+
+static int block_seal(HistoryStore *store, HistorySeries *series, int level){
+    OpenBlock *block = &series->blocks[level];
+    if (block->count == 0){
+        return 1;
+    }
+
+    int fd = segment_fd(store, level, block->window_start);
+    if (fd < 0){
+        block_reset(block);
+        return 0;
+    }
+
+    BlockHeader header = {
+        BLOCK_MAGIC, series->id, block->count, (uint32_t)((block->bits.bit_len + 7) / 8),
+        level == 0 ? 1u : 3u, 0, block->first_ms, block->last_ms
+    };
+
+    //antet + date intr-un singur write, ca un cititor sa nu vada blocul pe jumatate
+    size_t total = sizeof(header) + header.nbytes;
+    uint8_t *record = malloc(total);
+    int ok = 0;
+    if (record != NULL){
+        memcpy(record, &header, sizeof(header));
+        memcpy(record + sizeof(header), block->bits.data, header.nbytes);
+        ok = write(fd, record, total) == (ssize_t)total;
+        free(record);
+    }
+
+    block_reset(block);
+    return ok;
+}
+
+static void block_append(HistoryStore *store, HistorySeries *series, int level, int64_t t_ms,
+                         const double *values, int columns){
+    OpenBlock *block = &series->blocks[level];
+    int64_t window = window_start(level, t_ms);
+
+    if (block->count > 0 && (block->window_start != window || block->count >= HISTORY_BLOCK_POINTS ||
+                             t_ms - block->first_ms >= level_seal_ms[level] || t_ms <= block->last_ms)){
+        block_seal(store, series, level);
+    }
+
+    if (block->count == 0){
+        block->window_start = window;
+        block->first_ms = t_ms;
+    }
+
+    encode_timestamp(block, t_ms);
+    for (int c = 0; c < columns; c = c + 1){
+        encode_value(block, c, values[c]);
+    }
+    block->last_ms = t_ms;
+    block->count = block->count + 1;
+}
+
+static void bucket_emit(HistoryStore *store, HistorySeries *series, int level){
+    RollupBucket *bucket = &series->buckets[level];
+    if (bucket->count == 0){
+        return;
+    }
+
+    double values[3] = {bucket->sum / bucket->count, bucket->min, bucket->max};
+    block_append(store, series, level, bucket->start_ms, values, 3);
+    bucket->count = 0;
+}
+
+static void series_put(HistoryStore *store, const char *name, int64_t t_ms, double value){
+    HistorySeries *series = series_get_or_create(store, name, t_ms);
+    if (series == NULL){
+        return;
+    }
+    series->active = 1;
+    series->last_update_ms = t_ms;
+
+    block_append(store, series, 0, t_ms, &value, 1);
+
+    //agregarile se construiesc din valorile brute, pe masura ce vin
+    for (int level = 1; level < HISTORY_LEVELS; level = level + 1){
+        RollupBucket *bucket = &series->buckets[level];
+        int64_t start = t_ms - t_ms % level_bucket_ms[level];
+        if (bucket->count > 0 && bucket->start_ms != start){
+            bucket_emit(store, series, level);
+        }
+
+        if (bucket->count == 0){
+            bucket->start_ms = start;
+            bucket->sum = 0.0;
+            bucket->min = value;
+            bucket->max = value;
+        }
+        bucket->sum = bucket->sum + value;
+        bucket->min = value < bucket->min ? value : bucket->min;
+        bucket->max = value > bucket->max ? value : bucket->max;
+        bucket->count = bucket->count + 1;
+    }
+}
+
+static void series_release(HistoryStore *store, HistorySeries *series){
+    for (int level = 1; level < HISTORY_LEVELS; level = level + 1){
+        bucket_emit(store, series, level);
+    }
+    for (int level = 0; level < HISTORY_LEVELS; level = level + 1){
+        block_seal(store, series, level);
+        free(series->blocks[level].bits.data);
+        memset(&series->blocks[level], 0, sizeof(OpenBlock));
+    }
+    series->active = 0;
+}
+
+//─── API ───────────────────────────────────────────────────────────────────
+
+static int make_dirs(const char *path){
+    char buffer[LEN_LINE];
+    strncpy(buffer, path, sizeof(buffer) - 1);
+    buffer[sizeof(buffer) - 1] = '\0';
+
+    for (char *p = buffer + 1; *p; p = p + 1){
+        if (*p == '/'){
+            *p = '\0';
+            if (mkdir(buffer, 0755) != 0 && errno != EEXIST){
+                return 0;
+            }
+            *p = '/';
+        }
+    }
+    return mkdir(buffer, 0755) == 0 || errno == EEXIST;
+}
+
+HistoryStore *history_open(const char *dir, int writable){
+    if (writable && !make_dirs(dir)){
+        fprintf(stderr, "Could not create %s\n", dir);
+        return NULL;
+    }
+
+    //un singur scriitor: lock-ul ramane pe fd pana la history_close (sau pana moare procesul)
+    int lock_fd = -1;
+    if (writable){
+        lock_fd = open(dir, O_RDONLY | O_DIRECTORY | O_CLOEXEC);
+        if (lock_fd < 0){
+            fprintf(stderr, "Could not open %s\n", dir);
+            return NULL;
+        }
+        if (flock(lock_fd, LOCK_EX | LOCK_NB) != 0){
+            if (errno == EWOULDBLOCK){
+                fprintf(stderr, "History store %s is already written by another process\n", dir);
+            } else {
+                fprintf(stderr, "Could not lock %s\n", dir);
+            }
+            close(lock_fd);
+            return NULL;
+        }
+    }
+
+    HistoryStore *store = calloc(1, sizeof(HistoryStore));
+    if (store == NULL){
+        if (lock_fd >= 0){
+            close(lock_fd);
+        }
+        return NULL;
+    }
+
+    strncpy(store->dir, dir, sizeof(store->dir) - 1);
+    store->writable = writable;
+    store->lock_fd = lock_fd;
+    pthread_mutex_init(&store->lock, NULL);
+    for (int level = 0; level < HISTORY_LEVELS; level = level + 1){
+        store->segment_fd[level] = -1;
+        store->segment_window[level] = -1;
+    }
+
+    registry_load(store);
+    if (writable){
+        registry_compact(store, realtime_ms());
+    }
+    return store;
+}
+
+int history_flush(HistoryStore *store){
+    if (!store->writable){
+        return 0;
+    }
+
+    pthread_mutex_lock(&store->lock);
+    for (size_t i = 0; i < store->series_count; i = i + 1){
+        HistorySeries *series = &store->series[i];
+        for (int level = 0; level < HISTORY_LEVELS; level = level + 1){
+            block_seal(store, series, level);
+        }
+    }
+    pthread_mutex_unlock(&store->lock);
+    return 1;
+}
+
+void history_close(HistoryStore *store){
+    if (store == NULL){
+        return;
+    }
+
+    pthread_mutex_lock(&store->lock);
+    if (store->writable){
+        int64_t last_ms = 0;
+        for (size_t i = 0; i < store->series_count; i = i + 1){
+            if (store->series[i].active){
+                series_release(store, &store->series[i]);
+            }
+            if (store->series[i].last_update_ms > last_ms){
+                last_ms = store->series[i].last_update_ms;
+            }
+        }
+        //last_ms la zi in registru pentru urmatoarea deschidere
+        if (last_ms > 0){
+            registry_compact(store, last_ms);
+        }
+    }
+    for (size_t i = 0; i < store->series_count; i = i + 1){
+        for (int level = 0; level < HISTORY_LEVELS; level = level + 1){
+            free(store->series[i].blocks[level].bits.data);
+        }
+    }
+    for (int level = 0; level < HISTORY_LEVELS; level = level + 1){
+        if (store->segment_fd[level] >= 0){
+            close(store->segment_fd[level]);
+        }
+    }
+    pthread_mutex_unlock(&store->lock);
+
+    //dupa ultimul seal: urmatorul scriitor vede registrul complet
+    if (store->lock_fd >= 0){
+        close(store->lock_fd);
+    }
+    pthread_mutex_destroy(&store->lock);
+    free(store->series);
+    free(store->index);
+    free(store);
+}
+
+int history_append(HistoryStore *store, double timestamp, const SystemMetrics *metrics){
+    if (!store->writable){
+        return 0;
+    }
+
+    int64_t t_ms = (int64_t)llround(timestamp * 1000.0);
+    char name[HISTORY_NAME_LEN];
+
+    pthread_mutex_lock(&store->lock);
+    for (size_t i = 0; i < metric_scalar_field_count; i = i + 1){
+        const char *field = (const char *)metrics + metric_scalar_fields[i].offset;
+        double value;
+        if (metric_scalar_fields[i].type == 'd'){
+            memcpy(&value, field, sizeof(double));
+        }else if (metric_scalar_fields[i].type == 'l'){
+            long number;
+            memcpy(&number, field, sizeof(long));
+            value = (double)number;
+        }else{
+            int number;
+            memcpy(&number, field, sizeof(int));
+            value = (double)number;
+        }
+        series_put(store, metric_scalar_fields[i].name, t_ms, value);
+    }
+
+    for (int i = 0; i < metrics->core_count && i < MAX_CORES; i = i + 1){
+        snprintf(name, sizeof(name), "cpu_cores_usage.%d", i);
+        series_put(store, name, t_ms, metrics->cpu_cores_usage[i]);
+    }
+
+    for (int i = 0; i < metrics->disk_io_count && i < MAX_DISK_DEVICES; i = i + 1){
+        const DiskIoData *io = &metrics->disk_io[i];
+        snprintf(name, sizeof(name), "disk.%s.read_bytes_per_sec", io->name);
+        series_put(store, name, t_ms, io->read_bytes_per_sec);
+        snprintf(name, sizeof(name), "disk.%s.write_bytes_per_sec", io->name);
+        series_put(store, name, t_ms, io->write_bytes_per_sec);
+        snprintf(name, sizeof(name), "disk.%s.util_percent", io->name);
+        series_put(store, name, t_ms, io->util_percent);
+    }
+
+    for (int i = 0; i < metrics->gpu_count && i < MAX_GPUS; i = i + 1){
+        snprintf(name, sizeof(name), "gpu.%d.usage_percent", i);
+        series_put(store, name, t_ms, metrics->gpus[i].usage_percent);
+        snprintf(name, sizeof(name), "gpu.%d.memory_used_mb", i);
+        series_put(store, name, t_ms, metrics->gpus[i].memory_used_mb);
+    }
+
+    for (int i = 0; i < metrics->process_count && i < MAX_PROCESSES; i = i + 1){
+        const ProcessData *proc = &metrics->processes[i];
+        //pid + starttime: un pid refolosit incepe o serie noua
+        snprintf(name, sizeof(name), PROC_PREFIX "%d.%u.cpu_percent", proc->pid, proc->start_ticks);
+        series_put(store, name, t_ms, proc->cpu_percent);
+        snprintf(name, sizeof(name), PROC_PREFIX "%d.%u.ram_percent", proc->pid, proc->start_ticks);
+        series_put(store, name, t_ms, proc->ram_percent);
+    }
+
+    //procesele iesite din top nu mai tin blocuri deschise in memorie
+    store->append_count = store->append_count + 1;
+    if (store->append_count % 60 == 0){
+        for (size_t i = 0; i < store->series_count; i = i + 1){
+            HistorySeries *series = &store->series[i];
+            if (series->active && t_ms - series->last_update_ms > 120000){
+                series_release(store, series);
+            }
+        }
+    }
+    if (store->append_count % REGISTRY_COMPACT_APPENDS == 0){
+        registry_compact(store, t_ms);
+    }
+    pthread_mutex_unlock(&store->lock);
+    return 1;
+}
+
+static int pick_level(double from, double to, int max_points){
+    double span_ms = (to - from) * 1000.0;
+    for (int level = 0; level < HISTORY_LEVELS; level = level + 1){
+        //nivelul brut e esantionat cam o data pe secunda
+        double step = level == 0 ? 1000.0 : (double)level_bucket_ms[level];
+        if (span_ms / step <= max_points){
+            return level;
+        }
+    }
+    return HISTORY_LEVELS - 1;
+}
+
+//antetul vine din fisier: columns si count indexeaza tablouri fixe la decodare
+static int block_header_valid(const BlockHeader *header){
+    if (header->columns != 1 && header->columns != 3){
+        return 0;
+    }
+    if (header->count == 0 || header->count > HISTORY_BLOCK_POINTS){
+        return 0;
+    }
+    //cel mai mic bloc posibil: primul punct intreg (64 de biti pe coloana, plus timpul),
+    //apoi cate un bit pentru timp si pentru fiecare coloana
+    uint64_t min_bits = 64 * (1 + (uint64_t)header->columns) +
+                        (uint64_t)(header->count - 1) * (1 + header->columns);
+    return (uint64_t)header->nbytes * 8 >= min_bits;
+}
+
+//parcurge blocurile unui segment mapat in memorie
+static int query_segment(const char *path, uint32_t series_id, int64_t from_ms, int64_t to_ms,
+                         HistoryPoint *out, int room){
+    int fd = open(path, O_RDONLY | O_CLOEXEC);
+    if (fd < 0){
+        return 0;
+    }
+
+    struct stat st;
+    if (fstat(fd, &st) != 0 || st.st_size < (off_t)sizeof(BlockHeader)){
+        close(fd);
+        return 0;
+    }
+
+    size_t size = (size_t)st.st_size;
+    const uint8_t *base = mmap(NULL, size, PROT_READ, MAP_SHARED, fd, 0);
+    close(fd);
+    if (base == MAP_FAILED){
+        return 0;
+    }
+
+    int written = 0;
+    size_t offset = 0;
+    while (offset + sizeof(BlockHeader) <= size && written < room){
+        BlockHeader header;
+        memcpy(&header, base + offset, sizeof(header));
+        if (header.magic != BLOCK_MAGIC || offset + sizeof(header) + header.nbytes > size ||
+            !block_header_valid(&header)){
+            break; //segment corupt sau scris de altceva: ne oprim aici
+        }
+
+        if (header.series_id == series_id && header.last_ms >= from_ms && header.first_ms <= to_ms){
+            written = written + decode_block(base + offset + sizeof(header), header.nbytes, header.count,
+                                             header.columns, from_ms, to_ms, out + written, room - written);
+        }
+        offset = offset + sizeof(header) + header.nbytes;
+    }
+
+    munmap((void *)base, size);
+    return written;
+}
+
+int history_query(HistoryStore *store, const char *series_name, double from, double to, int level,
+                  HistoryPoint *out, int max_points){
+    if (max_points <= 0 || to < from){
+        return 0;
+    }
+    if (level < 0 || level >= HISTORY_LEVELS){
+        level = pick_level(from, to, max_points);
+    }
+
+    pthread_mutex_lock(&store->lock);
+    HistorySeries *series = series_find(store, series_name);
+    if (series == NULL){
+        registry_load(store);
+        series = series_find(store, series_name);
+    }
+    if (series == NULL){
+        pthread_mutex_unlock(&store->lock);
+        return 0;
+    }
+
+    int64_t from_ms = (int64_t)llround(from * 1000.0);
+    int64_t to_ms = (int64_t)llround(to * 1000.0);
+    int written = 0;
+
+    //numele segmentelor sunt deterministe, nu avem nevoie sa listam directorul
+    char path[LEN_LINE * 2];
+    for (int64_t window = window_start(level, from_ms); window <= to_ms && written < max_points;
+         window = window + level_window_ms[level]){
+        segment_path(store, level, window, path, sizeof(path));
+        written = written + query_segment(path, series->id, from_ms, to_ms, out + written, max_points - written);
+    }
+
+    //si ce e inca in memorie, nescris pe disc
+    OpenBlock *block = &series->blocks[level];
+    if (block->count > 0 && written < max_points && block->last_ms >= from_ms && block->first_ms <= to_ms){
+        written = written + decode_block(block->bits.data, (block->bits.bit_len + 7) / 8, block->count,
+                                         level == 0 ? 1u : 3u, from_ms, to_ms, out + written, max_points - written);
+    }
+
+    pthread_mutex_unlock(&store->lock);
+    return written;
+}
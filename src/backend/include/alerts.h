@@ -0,0 +1,76 @@
+#ifndef ALERTS_H
+#define ALERTS_H
+
+#include <stddef.h>
+#include "core.h"
+
+#define ALERT_MAX_RULES 64
+#define ALERT_NAME_LEN 64
+#define ALERT_SOCKET_PREFIX "unix:"
+
+//regula, dupa compilare: doar offset-ul campului si comparatiile
+typedef enum{
+    ALERT_OP_GT = 0,
+    ALERT_OP_GE,
+    ALERT_OP_LT,
+    ALERT_OP_LE
+}AlertOp;
+
+typedef enum{
+    ALERT_OK = 0,
+    ALERT_PENDING, //conditia e adevarata, dar nu de destul timp
+    ALERT_FIRING
+}AlertState;
+
+typedef struct{
+    char name[ALERT_NAME_LEN];
+    char field[ALERT_NAME_LEN];
+    size_t offset;          //in SystemMetrics
+    char type;              //'d' double, 'l' long, 'i' int
+    AlertOp op;
+    double threshold;
+    double clear;           //histerezis: alerta se stinge abia cand valoarea trece de clear
+    double for_seconds;     //cat trebuie sa tina conditia inainte sa porneasca alerta
+
+    AlertState state;
+    double since;           //CLOCK_MONOTONIC: de cand e PENDING sau FIRING
+    double value;           //ultima valoare citita
+}AlertRule;
+
+//starea unei reguli, pentru interfata
+typedef struct{
+    char name[ALERT_NAME_LEN];
+    char field[ALERT_NAME_LEN];
+    int state;
+    double value;
+    double threshold;
+    double since;
+}AlertStatus;
+
+typedef struct{
+    AlertRule rules[ALERT_MAX_RULES];
+    int rule_count;
+
+    //evenimentele merg intr-un fisier (append) sau pe un socket unix datagram
+    int fd;
+    int is_socket;
+    char socket_path[108]; //sizeof(sun_path)
+}AlertEngine;
+
+//sink: o cale de fisier, "unix:/cale/socket" sau NULL pentru stderr
+AlertEngine *alerts_open(const char *sink);
+void alerts_close(AlertEngine *engine);
+
+//"nume: camp > 90 for 30s clear 85"; 0 si mesaj pe stderr daca regula e gresita
+int alerts_add_rule(AlertEngine *engine, const char *rule);
+
+//o regula pe rand; liniile goale si cele cu # sunt sarite. intoarce cate reguli a adaugat sau -1;
+//apelantii (monitord, bridge.open_alerts) trateaza si 0 ca esec
+int alerts_load_rules(AlertEngine *engine, const char *path);
+
+//now = CLOCK_MONOTONIC in secunde; intoarce cate evenimente a emis
+int alerts_evaluate(AlertEngine *engine, const SystemMetrics *metrics, double now);
+
+int alerts_get_status(const AlertEngine *engine, AlertStatus *out, int max_rules);
+
+#endif
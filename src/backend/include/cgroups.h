@@ -0,0 +1,27 @@
+#ifndef CGROUPS_H
+#define CGROUPS_H
+
+#include <stdint.h>
+#include "procfs.h"
+
+#define MAX_CGROUPS 16
+#define CGROUP_PATH_LEN 128
+#define CGROUP_RESCAN_SECONDS 10.0 //cat de des recitim arborele (cgroup-uri noi, limite schimbate)
+
+//un cgroup din topul pus in SystemMetrics; valorile includ si descendentii, ca in kernel
+typedef struct{
+    char path[CGROUP_PATH_LEN];  //fata de radacina cgroup2, de ex. "/system.slice/nginx.service"
+                                 //o cale mai lunga e scurtata la "..." + finalul ei
+    int depth;                   //1 = copil direct al radacinii
+    double cpu_percent;          //100 = un nucleu intreg (ca la procese)
+    double cpu_throttled_percent;//cat din interval a fost oprit de cpu.max
+    double memory_mb;            //memory.current
+    double memory_limit_mb;      //memory.max, 0 = fara limita
+}CgroupData;
+
+//parcurge ierarhia cgroup v2 de sub <radacina>/sys/fs/cgroup (fara radacina insasi)
+//si intoarce primele max_count dupa CPU; *total primeste numarul tuturor cgroup-urilor
+//0 cgroup-uri daca sistemul nu are cgroup v2
+int cgroups_get_top(CgroupData *cgroups, int max_count, int *total);
+
+#endif
@@ -1,6 +1,7 @@
 #ifndef CORE_H
 #define CORE_H
 
+#include <stdio.h>
 #include "cpu.h"
 #include "memory.h"
 #include "disk.h"
@@ -8,6 +9,23 @@
 #include "gpu.h"
 #include "processes.h"
 #include "network.h"
+#include "pressure.h"
+#include "cgroups.h"
+
+//colectorii programati de get_system_metrics, fiecare cu perioada lui
+typedef enum{
+    COLLECTOR_CPU = 0,
+    COLLECTOR_MEMORY,
+    COLLECTOR_DISK,
+    COLLECTOR_NETWORK,
+    COLLECTOR_PROCESSES,
+    COLLECTOR_GPU,
+    COLLECTOR_SYSINFO,
+    COLLECTOR_DISK_IO,
+    COLLECTOR_PRESSURE,
+    COLLECTOR_CGROUPS,
+    COLLECTOR_COUNT
+}CollectorId;
 
 typedef struct{
     char cpu_model[LEN_LINE];
@@ -25,6 +43,10 @@ typedef struct{
     double disk_total_gb;
     double disk_used_gb;
     double disk_usage_percent;
+    int mount_count;
+    MountData mounts[MAX_MOUNTS]; // mounts[0] este "/"
+    int disk_io_count;
+    DiskIoData disk_io[MAX_DISK_DEVICES];
 
     //detalii OS
     long uptime_seconds;
@@ -44,8 +66,85 @@ typedef struct{
     // Retea
     double net_rx_kbps;
     double net_tx_kbps;
+    int net_interface_count;
+    InterfaceRates net_interfaces[MAX_INTERFACES];
+
+    // Prospetime: CLOCK_MONOTONIC (secunde) la ultima rulare a fiecarui colector
+    double updated_at[COLLECTOR_COUNT];
+
+    // Toate GPU-urile (gpu_name/gpu_usage_percent de mai sus sunt GPU 0)
+    int gpu_count;
+    GpuData gpus[MAX_GPUS];
+
+    //Saturatie: cand CPU% si RAM% nu spun tot (containere, swap, I/O)
+    int psi_available; //0 = kernel fara /proc/pressure, campurile *_pressure raman 0
+    PsiData cpu_pressure;
+    PsiData memory_pressure;
+    PsiData io_pressure;
+    double load_avg_1;
+    double load_avg_5;
+    double load_avg_15;
+    int tasks_runnable;
+    int tasks_total;
+    int tasks_blocked;               //in asteptare dupa I/O, din /proc/stat
+    double context_switches_per_sec; //din /proc/stat (colectorul CPU)
+    double interrupts_per_sec;
+    double forks_per_sec;
+    double page_faults_per_sec;      //din /proc/vmstat
+    double major_faults_per_sec;
+    double swap_in_per_sec;          //pagini/s
+    double swap_out_per_sec;
+    double swap_total_gb;            //din /proc/meminfo (colectorul memoriei)
+    double swap_used_gb;
+    double swap_usage_percent;
+
+    //cgroup v2: toate sunt parcurse, primele MAX_CGROUPS dupa CPU ajung aici
+    int cgroup_total;
+    int cgroup_count;
+    CgroupData cgroups[MAX_CGROUPS];
 }SystemMetrics;
 
+//cat costa monitorul insusi: timpul fiecarui colector din get_system_metrics, in microsecunde
+typedef struct{
+    double last_us[COLLECTOR_COUNT];  //ultima rulare a colectorului
+    double total_us[COLLECTOR_COUNT]; //suma de la pornire (sau de la ultimul reset)
+    long runs[COLLECTOR_COUNT];
+    double sample_last_us;            //tot apelul get_system_metrics, cu copierea in metrics
+    double sample_total_us;
+    long samples;
+}CollectorTimings;
+
+//campurile scalare din SystemMetrics, cu numele folosit de history si de alerte
+typedef struct{
+    const char *name;
+    size_t offset;
+    char type; //'d' double, 'l' long, 'i' int
+}MetricField;
+
+extern const MetricField metric_scalar_fields[];
+extern const size_t metric_scalar_field_count;
+
 void get_system_metrics(SystemMetrics *metrics);
 
+//contoarele se actualizeaza in get_system_metrics: citite din acelasi fir, dupa esantion
+void get_collector_timings(CollectorTimings *timings);
+void reset_collector_timings(void);
+
+//un rand pe colector (rulari, medie, ultima), pentru sesiunile de profiling
+void print_collector_timings(FILE *out);
+
+//citeste o data contoarele (CPU, retea, disc, procese) si porneste nvidia-smi;
+//primul get_system_metrics de dupa are deja o baza si da valori reale in loc de 0
+void prime_system_metrics(void);
+
+//citeste /proc si /sys de sub root (de ex. un /proc fals pentru bench); NULL sau "" = sistemul real.
+//trebuie apelat inainte de primul esantion, altfel intoarce 0
+int set_system_root(const char *root);
+
+//ruleaza acum un singur colector in cache, indiferent de perioada; 0 daca id-ul e invalid
+int run_collector(int collector);
+
+//perioada in secunde pentru un colector (0 = la fiecare apel); 0 daca id-ul e invalid
+int set_collector_period(int collector, double period_seconds);
+
 #endif
\ No newline at end of file
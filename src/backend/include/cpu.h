@@ -3,8 +3,10 @@
 
 #include <stdint.h>
 #include <stddef.h>
+#include "procfs.h"
 
-#define MAX_CORES 64
+//destul pentru masinile mari (128+ fire); SystemMetrics creste cu 8 octeti per nucleu
+#define MAX_CORES 1024
 #define LEN_LINE 512
 
 typedef struct{
@@ -18,13 +20,25 @@ typedef struct{
     uint64_t steal;
 }CpuRawData;
 
+//contoarele de dupa randurile cpu din /proc/stat
+typedef struct{
+    uint64_t interrupts;      //primul numar din "intr"
+    uint64_t context_switches;
+    uint64_t forks;           //"processes": procese create de la boot
+    int procs_running;
+    int procs_blocked;        //in asteptare dupa I/O (starea D)
+}CpuActivityRaw;
+
 //functii pentru informatii staticii
 int cpu_get_model_name(char *buffer, size_t size);
-int cpu_get_core_count(void);
-double cpu_get_current_freq_mhz(void);
+int cpu_get_core_count(ProcSource *src); //src = /proc/stat (poate fi NULL)
+double cpu_get_current_freq_mhz(ProcSource *src);
 
 //functia pentru citirea si calcularea utilizatrii
-int cpu_get_raw_data(CpuRawData *total_data, CpuRawData *cores_data, int num_cores);
+int cpu_get_raw_data(ProcSource *src, CpuRawData *total_data, CpuRawData *cores_data, int num_cores);
+
+//parseaza restul textului citit de ultimul cpu_get_raw_data (fara inca o citire)
+int cpu_get_activity(const ProcSource *src, CpuActivityRaw *activity);
 
 //functia pentru procentaj
 double cpu_calculate_usage(CpuRawData *prev, CpuRawData *curr);
@@ -1,6 +1,14 @@
 #ifndef DISK_H
 #define DISK_H
 
+#include "procfs.h"
+
+#define MAX_MOUNTS 16
+#define MAX_DISK_DEVICES 16
+#define MOUNT_PATH_LEN 128
+#define DEVICE_NAME_LEN 32
+#define FS_TYPE_LEN 16
+
 typedef struct {
     double total_gb;
     double used_gb;
@@ -8,6 +16,34 @@ typedef struct {
     double usage_percent;
 } DiskData;
 
+//un sistem de fisiere montat, cu ocuparea din statvfs
+typedef struct {
+    char mount_point[MOUNT_PATH_LEN];
+    char device[DEVICE_NAME_LEN]; //numele din /proc/diskstats, "" daca nu e pe un bloc (overlay, nfs...)
+    char fs_type[FS_TYPE_LEN];
+    double total_gb;
+    double used_gb;
+    double free_gb;
+    double usage_percent;
+} MountData;
+
+//activitatea unui dispozitiv, din diferentele /proc/diskstats
+typedef struct {
+    char name[DEVICE_NAME_LEN];
+    double read_bytes_per_sec;
+    double write_bytes_per_sec;
+    double read_iops;
+    double write_iops;
+    double util_percent; //cat din timp a avut cereri in lucru
+} DiskIoData;
+
 int disk_get_data(const char *path, DiskData *disk);
 
-#endif
\ No newline at end of file
+//montarile reale (plus "/" mereu), fara duplicate pe acelasi dispozitiv
+//lista si maparea la dispozitive se refac doar cand se schimba mountinfo; statvfs la fiecare apel
+int disk_get_mounts(ProcSource *mountinfo, ProcSource *diskstats, MountData *mounts, int max_mounts);
+
+//rate pe dispozitiv (fara loop/ram si fara dispozitivele pe care nu s-a facut niciodata I/O)
+int disk_get_io(ProcSource *diskstats, DiskIoData *devices, int max_devices);
+
+#endif
@@ -1,16 +1,55 @@
 #ifndef GPU_H
 #define GPU_H
 
+#include <sys/types.h>
+
 #define STR_LEN 256
 #define BUFFER_SIZE 512
+#define MAX_GPUS 8
+#define GPU_NAME_LEN 96
+#define GPU_DEFAULT_COMMAND "nvidia-smi"
 
 typedef struct{
-    char name[STR_LEN];
+    char name[GPU_NAME_LEN];
     double usage_percent;
     double memory_total_mb;
     double memory_used_mb;
 }GpuData;
 
-int gpu_get_data(GpuData* gpu);
+typedef enum{
+    GPU_CHANNEL_STOPPED = 0, //inca nu a pornit sau asteapta repornirea
+    GPU_CHANNEL_RUNNING,
+    GPU_CHANNEL_ABSENT       //nu exista GPU / nvidia-smi: nu mai incercam
+}GpuChannelState;
+
+//un singur nvidia-smi --loop-ms care ruleaza cat traieste biblioteca
+//si scrie CSV intr-un pipe citit fara blocare
+typedef struct{
+    char command[STR_LEN];
+    int loop_ms;
+    GpuChannelState state;
+    pid_t pid;
+    pid_t unreaped;       //omorat cu SIGKILL dar inca neculeas (blocat in driver); -1 = niciunul
+    int fd;
+
+    char buffer[BUFFER_SIZE * 4]; //linii incomplete intre doua citiri
+    size_t length;
+
+    GpuData gpus[MAX_GPUS]; //ultimele valori, dupa indexul GPU-ului
+    int gpu_count;
+    int produced;         //a scris procesul curent macar o linie valida?
+    double next_start;    //CLOCK_MONOTONIC, pentru repornirea cu pauza
+    double last_line;
+}GpuChannel;
+
+//command = NULL foloseste GPU_DEFAULT_COMMAND; orice program cu aceleasi argumente
+//si acelasi CSV poate sta in locul lui (de ex. scriptul de test din bench/)
+void gpu_channel_init(GpuChannel *channel, const char *command, int loop_ms);
+
+//citeste ce a aparut in pipe (nu blocheaza) si copiaza in gpus ultimele valori
+//intoarce numarul de GPU-uri cunoscute; 0 daca inca nu stim sau nu exista
+int gpu_channel_poll(GpuChannel *channel, GpuData *gpus, int max_gpus);
+
+void gpu_channel_close(GpuChannel *channel);
 
-#endif
\ No newline at end of file
+#endif
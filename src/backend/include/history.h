@@ -0,0 +1,100 @@
+#ifndef HISTORY_H
+#define HISTORY_H
+
+#include <stdint.h>
+#include <stddef.h>
+#include <pthread.h>
+#include <sys/types.h>
+#include "core.h"
+
+//nivelurile: esantioane brute (~1s), apoi agregari pe 10s, 1m si 1h
+#define HISTORY_LEVELS 4
+#define HISTORY_LEVEL_AUTO -1
+#define HISTORY_BLOCK_POINTS 256
+#define HISTORY_NAME_LEN 64
+#define HISTORY_MAX_SERIES 65536
+#define HISTORY_MAX_PROC_SERIES 16384 //seriile proc.* au plafonul lor, ca seriile de sistem sa aiba mereu loc
+
+typedef struct{
+    double timestamp; //secunde, CLOCK_REALTIME
+    double avg;
+    double min;
+    double max;
+}HistoryPoint;
+
+//bitstream in care se comprima un bloc (delta-of-delta + XOR)
+typedef struct{
+    uint8_t *data;
+    size_t capacity;
+    size_t bit_len;
+}BitWriter;
+
+//blocul deschis al unei serii pe un nivel, inca in memorie
+typedef struct{
+    BitWriter bits;
+    uint32_t count;
+    int64_t first_ms;
+    int64_t last_ms;
+    int64_t prev_delta;
+    int64_t window_start;
+    uint64_t prev_values[3];
+    int prev_leading[3];
+    int prev_trailing[3];
+}OpenBlock;
+
+//agregarea in curs pentru un nivel de rollup
+typedef struct{
+    int64_t start_ms;
+    uint32_t count;
+    double sum;
+    double min;
+    double max;
+}RollupBucket;
+
+typedef struct{
+    char name[HISTORY_NAME_LEN];
+    uint32_t id;
+    int active;
+    int64_t last_update_ms;
+    OpenBlock blocks[HISTORY_LEVELS];
+    RollupBucket buckets[HISTORY_LEVELS]; //nivelul 0 nu agrega
+}HistorySeries;
+
+typedef struct{
+    char dir[LEN_LINE];
+    int writable;
+    int lock_fd;           //flock exclusiv pe director cat timp scriem (-1 la cititori)
+    pthread_mutex_t lock;
+
+    HistorySeries *series;
+    size_t series_count;
+    size_t series_capacity;
+    uint32_t *index;       //tabela hash nume -> pozitie + 1
+    size_t index_capacity;
+    size_t registry_loaded; //cate randuri din series.idx am citit deja
+    ino_t registry_ino;     //series.idx e rescris prin rename la compactare: alt inode = recitim tot
+    uint32_t next_id;       //id-urile nu se refolosesc: segmentele vechi le mai contin
+    size_t proc_series;     //cate serii proc.* avem
+
+    int segment_fd[HISTORY_LEVELS];
+    int64_t segment_window[HISTORY_LEVELS];
+    uint64_t append_count;
+}HistoryStore;
+
+//writable = 0 pentru cititori (alt proces scrie in acelasi director)
+//un singur scriitor per director: id-urile seriilor se dau din series.idx fara alta coordonare,
+//asa ca history_open(dir, 1) intoarce NULL daca alt proces tine deja lock-ul
+HistoryStore *history_open(const char *dir, int writable);
+void history_close(HistoryStore *store);
+
+//adauga un esantion complet: campurile scalare, per-nucleu, per-disc, per-GPU si per-proces
+int history_append(HistoryStore *store, double timestamp, const SystemMetrics *metrics);
+
+//scrie pe disc blocurile deschise (si agregarile incomplete)
+int history_flush(HistoryStore *store);
+
+//intoarce cate puncte a scris in out; level = HISTORY_LEVEL_AUTO alege cel mai fin nivel care incape
+int history_query(HistoryStore *store, const char *series, double from, double to, int level,
+                  HistoryPoint *out, int max_points);
+
+#endif
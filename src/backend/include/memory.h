@@ -2,6 +2,7 @@
 #define MEMORY_H
 
 #include <stdint.h>
+#include "procfs.h"
 
 #define SIZE 256
 
@@ -9,8 +10,13 @@ typedef struct{
     double total_gb;
     double used_gb;
     double usage_percent;
+
+    //swap-ul (0 daca nu exista)
+    double swap_total_gb;
+    double swap_used_gb;
+    double swap_usage_percent;
 }MemoryData;
 
-int memory_get_data(MemoryData *mem);
+int memory_get_data(ProcSource *src, MemoryData *mem);
 
 #endif
\ No newline at end of file
@@ -1,11 +1,36 @@
 #ifndef NETWORK_H
 #define NETWORK_H
 
+#include "procfs.h"
+
+#define MAX_INTERFACES 32
+#define IFACE_NAME_LEN 16 //IFNAMSIZ
+
+//ratele unei interfete, calculate pe timpul scurs real (CLOCK_MONOTONIC)
 typedef struct {
-    double rx_speed_kbps; // Viteza de Download (KB/s)
+    char name[IFACE_NAME_LEN];
+    double rx_kbps;
+    double tx_kbps;
+    double rx_packets;    // pachete/s
+    double tx_packets;
+    double rx_errors;     // erori/s
+    double tx_errors;
+    double rx_drops;      // pachete aruncate/s
+    double tx_drops;
+    uint64_t rx_bytes;    // contoarele brute din /proc/net/dev
+    uint64_t tx_bytes;
+} InterfaceRates;
+
+typedef struct {
+    double rx_speed_kbps; // Viteza de Download (KB/s), toate interfetele fara lo
     double tx_speed_kbps; // Viteza de Upload (KB/s)
+    int interface_count;
+    InterfaceRates interfaces[MAX_INTERFACES]; // in ordinea din /proc/net/dev, inclusiv lo
 } NetworkData;
 
-int network_get_data(NetworkData *net);
+int network_get_data(ProcSource *src, NetworkData *net);
+
+//netezire EWMA cu constanta de timp in secunde (0 = valori brute)
+void network_set_smoothing(double seconds);
 
-#endif // NETWORK_H
\ No newline at end of file
+#endif // NETWORK_H
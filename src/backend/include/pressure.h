@@ -0,0 +1,62 @@
+#ifndef PRESSURE_H
+#define PRESSURE_H
+
+#include <stdint.h>
+#include "procfs.h"
+
+#define PSI_RESOURCES 3 //cpu, memory, io
+#define VMSTAT_COUNTERS 4 //pgfault, pgmajfault, pswpin, pswpout
+
+//o resursa din /proc/pressure: cat din timp au stat task-urile blocate pe ea
+//"some" = cel putin un task, "full" = toate task-urile care nu sunt idle (la cpu doar de la 5.13)
+typedef struct{
+    double some_avg10;   //mediile kernelului pe 10 s / 60 s / 300 s, in procente
+    double some_avg60;
+    double some_avg300;
+    double full_avg10;
+    double full_avg60;
+    double full_avg300;
+    double some_percent; //din contorul total=, pe intervalul dintre ultimele doua citiri
+    double full_percent;
+}PsiData;
+
+typedef struct{
+    int psi_available;   //0 = kernel fara PSI (CONFIG_PSI sau psi=0)
+    PsiData cpu;
+    PsiData memory;
+    PsiData io;
+
+    //din /proc/loadavg
+    double load_1;
+    double load_5;
+    double load_15;
+    int tasks_runnable;
+    int tasks_total;
+
+    //din /proc/vmstat, pe secunda
+    double page_faults_per_sec;
+    double major_faults_per_sec;
+    double swap_in_per_sec;  //pagini
+    double swap_out_per_sec;
+}PressureData;
+
+//sursele (deschise o data, recitite cu pread) si contoarele de la citirea trecuta
+typedef struct{
+    ProcSource psi[PSI_RESOURCES];
+    ProcSource loadavg;
+    ProcSource vmstat;
+    int psi_checked;
+    int psi_present;
+
+    double prev_time; //CLOCK_MONOTONIC, 0 = inca nu avem baza
+    uint64_t prev_some_us[PSI_RESOURCES];
+    uint64_t prev_full_us[PSI_RESOURCES];
+    uint64_t prev_vmstat[VMSTAT_COUNTERS];
+}PressureSources;
+
+void pressure_sources_init(PressureSources *src);
+
+//ratele sunt fata de apelul precedent; primul apel le lasa pe 0
+int pressure_get_data(PressureSources *src, PressureData *pressure);
+
+#endif
@@ -1,18 +1,82 @@
 #ifndef PROCESSES_H
 #define PROCESSES_H
 
+#include "cpu.h"
+
 #define MAX_PROCESSES 30
 #define STR_LEN 256
 #define LINE_LEN 512
+#define PROC_NAME_LEN 16 //comm din kernel are cel mult 15 caractere
+#define PROC_USER_LEN 32
 
+//randul din topul pus in SystemMetrics
 typedef struct{
     int pid;
-    char name[STR_LEN];
+    char name[PROC_NAME_LEN];
+    unsigned int start_ticks; //starttime din stat (mod 2^32): pid + start_ticks deosebesc un pid refolosit
     double cpu_percent;
     double ram_percent;
-    char user[STR_LEN];
+    char user[PROC_USER_LEN];
 }ProcessData;
 
-int processes_get_top(ProcessData *procs, int max_count);
+//inregistrarea compacta (48 octeti) pentru lista completa de procese
+typedef struct{
+    uint64_t rss_kb;
+    int pid;
+    int ppid;
+    unsigned int uid;  //numele: processes_user_name(uid)
+    float cpu_percent;
+    float ram_percent;
+    char state;        //R, S, D, Z...
+    char name[PROC_NAME_LEN];
+}ProcessRecord;
+
+//coloanele de arbore pentru o inregistrare din snapshot (aceeasi ordine ca processes_get_snapshot)
+typedef struct{
+    uint64_t subtree_rss_kb;   //procesul si toti descendentii lui
+    int parent_pid;            //parintele din arbore; 0 = radacina (ppid 0 sau parinte care nu se vede)
+    int descendants;
+    float subtree_cpu_percent;
+    float subtree_ram_percent;
+}ProcessTreeNode;
+
+#define ROLLUP_USERS 0
+#define ROLLUP_CGROUPS 1
+#define ROLLUP_NAME_LEN 128
+
+//suma proceselor unui utilizator sau ale unui cgroup
+typedef struct{
+    uint64_t rss_kb;
+    unsigned int uid;          //doar la ROLLUP_USERS
+    int process_count;
+    float cpu_percent;
+    float ram_percent;
+    char name[ROLLUP_NAME_LEN];//numele utilizatorului sau calea cgroup-ului ("0::" din /proc/[pid]/cgroup)
+}ProcessRollup;
+
+//cpu_total este randul "cpu " din /proc/stat citit in aceeasi runda
+//scaneaza tot /proc, pastreaza lista completa si intoarce primele max_count dupa CPU
+int processes_get_top(ProcessData *procs, int max_count, const CpuRawData *cpu_total, int num_cores);
+
+//copiaza din ultima scanare inregistrarile [offset, offset + capacity) in out
+//intoarce cate a scris; *total primeste numarul tuturor proceselor
+//nu rescaneaza, deci un apelant cu bufferul prea mic il mareste si apeleaza din nou
+//trebuie apelata din acelasi fir ca get_system_metrics
+int processes_get_snapshot(ProcessRecord *out, int offset, int capacity, int *total);
+
+//arborele din ultima scanare: out[i] corespunde inregistrarii offset + i din processes_get_snapshot
+//intoarce cate a scris; *total primeste numarul tuturor proceselor
+int processes_get_tree(ProcessTreeNode *out, int offset, int capacity, int *total);
+
+//sumele pe utilizator (ROLLUP_USERS) sau pe cgroup (ROLLUP_CGROUPS), in ordine oarecare
+//intoarce cate a scris; *total primeste cate grupuri au cel putin un proces
+int processes_get_rollups(int kind, ProcessRollup *out, int capacity, int *total);
+
+//numele utilizatorului pentru un uid, din cache (pointerul ramane valid pana la urmatorul apel)
+//cache-ul nu are lock: trebuie apelata din acelasi fir ca get_system_metrics
+const char *processes_user_name(unsigned int uid);
+
+//radacina pentru /proc (implicit "/proc"), folosita de benchmark
+void processes_set_proc_root(const char *root);
 
-#endif
\ No newline at end of file
+#endif
@@ -0,0 +1,42 @@
+#ifndef PROCFS_H
+#define PROCFS_H
+
+#include <stdint.h>
+#include <stddef.h>
+
+#define PROCFS_PATH_LEN 512
+#define PROCFS_INITIAL_BUFFER 4096
+
+//un fisier din /proc sau /sys deschis o singura data si recitit cu pread
+typedef struct{
+    char path[PROCFS_PATH_LEN];
+    int fd;
+    char *buffer;
+    size_t capacity;
+    size_t length;
+    int reported; //am afisat deja eroarea pentru sursa asta
+}ProcSource;
+
+//radacina pusa in fata tuturor cailor din /proc si /sys ("" = sistemul real);
+//bench-urile o folosesc ca sa ruleze colectorii pe un /proc fals
+void procfs_set_root(const char *root);
+const char *procfs_root(void);
+
+//"/proc/stat" -> "<radacina>/proc/stat"
+void procfs_path(char *out, size_t size, const char *path);
+
+//path e o cale absoluta, luata fata de radacina de mai sus
+void procfs_source_init(ProcSource *src, const char *path);
+void procfs_source_close(ProcSource *src);
+
+//reciteste fisierul de la offset 0; intoarce textul terminat cu '\0' sau NULL
+const char *procfs_source_read(ProcSource *src);
+
+//parsere scrise de mana pentru campurile numerice
+const char *procfs_skip_spaces(const char *p);
+const char *procfs_parse_u64(const char *p, uint64_t *value);
+//"12.34" -> 12.34 fara strtod, care depinde de locale (Qt il pune pe cel al utilizatorului)
+const char *procfs_parse_decimal(const char *p, double *value);
+const char *procfs_next_line(const char *p);
+
+#endif
@@ -0,0 +1,31 @@
+#ifndef PROCTREE_H
+#define PROCTREE_H
+
+#include "processes.h"
+
+//arborele de procese (din ppid) tinut intre scanari: nodurile se adauga si se scot doar cand
+//procesele apar sau dispar, iar sumele pe subarbore, pe utilizator si pe cgroup se actualizeaza
+//cu diferenta fata de runda trecuta, urcand doar de la procesele care s-au schimbat
+
+//inceputul unei scanari /proc
+void proctree_begin(void);
+
+//un proces din scanare (start_time = campul 22 din stat); intoarce indexul nodului sau -1 (fara memorie)
+//*needs_cgroup = 1 pentru un proces nou, dupa exec (numele s-a schimbat) sau cand pid-ul a fost refolosit
+int proctree_update(const ProcessRecord *record, uint64_t start_time, int *needs_cgroup);
+
+//cgroup-ul nodului intors de proctree_update
+void proctree_set_cgroup(int node, const char *path);
+
+//sfarsitul scanarii: scoate procesele disparute si leaga nodurile noi sau mutate de parinti
+void proctree_end(void);
+
+//coloanele de arbore pentru records[0..count) (lista din ultima scanare)
+void proctree_get_nodes(const ProcessRecord *records, int count, ProcessTreeNode *out, double total_ram_kb);
+
+int proctree_get_rollups(int kind, ProcessRollup *out, int capacity, int *total, double total_ram_kb);
+
+//uita tot (alt /proc)
+void proctree_reset(void);
+
+#endif
@@ -0,0 +1,51 @@
+#ifndef RING_H
+#define RING_H
+
+#include <stdint.h>
+#include "core.h"
+
+#define RING_MAGIC 0x474E5253u // "SRNG"
+#define RING_VERSION 1
+#define RING_DEFAULT_NAME "system-monitor"
+#define RING_DEFAULT_SLOTS 120
+#define RING_SHM_DIR "/dev/shm/"
+
+//antetul zonei partajate, exact 64 de octeti
+typedef struct{
+    uint32_t magic;
+    uint32_t version;
+    uint32_t slot_count;
+    uint32_t record_size;   //sizeof(SystemMetrics), ca cititorii sa verifice layout-ul
+    uint64_t head;          //numarul de esantioane scrise; ultimul e in slotul (head - 1) % slot_count
+    uint64_t writer_pid;
+    uint64_t reserved[4];
+}RingHeader;
+
+//un slot protejat de un seqlock: seq impar = scriere in curs
+typedef struct{
+    uint64_t seq;
+    uint64_t sample_index;
+    double timestamp;       //CLOCK_REALTIME, secunde
+    double sample_ms;       //cat a durat get_system_metrics
+    SystemMetrics metrics;
+}RingSlot;
+
+typedef struct{
+    char path[LEN_LINE];
+    int fd;
+    size_t size;
+    RingHeader *header;
+    RingSlot *slots;
+}Ring;
+
+//creeaza /dev/shm/<name> pentru scriere; un inel existent e inlocuit atomic (rename),
+//nu suprascris, ca cititorii lui sa nu vada zona schimbata sub ei
+int ring_writer_open(Ring *ring, const char *name, uint32_t slot_count);
+
+//scrie un esantion fara sa astepte vreun cititor
+void ring_writer_push(Ring *ring, const SystemMetrics *metrics, double sample_ms);
+
+//unlink_file = 1 sterge si fisierul din /dev/shm (daca nu l-a inlocuit intre timp alt colector)
+void ring_close(Ring *ring, int unlink_file);
+
+#endif
@@ -9,5 +9,6 @@ typedef struct{
 }SysInfoData;
 
 int sysinfo_get_data(SysInfoData* info);
+long sysinfo_get_uptime(void);
 
 #endif
\ No newline at end of file
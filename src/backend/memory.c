@@ -2,32 +2,44 @@
 #include <stdio.h>
 #include <string.h>
 
-int memory_get_data(MemoryData *mem){
-    FILE *fin = fopen("/proc/meminfo", "r");
-    if (fin == NULL){
-        fprintf(stderr,"Unable to open /proc/meminfo\n");
+//MemTotal nu se schimba cat timp ruleaza sistemul, il citim o singura data
+static uint64_t mem_total = 0;
+
+int memory_get_data(ProcSource *src, MemoryData *mem){
+    const char *line = procfs_source_read(src);
+    if (line == NULL){
         return 0;
     }
 
-    char line[SIZE];
-    uint64_t mem_total = 0;
     uint64_t mem_available = 0;
-    while (fgets(line, sizeof(line), fin) != NULL){
-        if (strncmp(line, "MemTotal:", 9) == 0){
-            sscanf(line, "MemTotal: %lu kB", &mem_total);
+    uint64_t swap_total = 0;
+    uint64_t swap_free = 0;
+    int found = 0; //MemAvailable, SwapTotal, SwapFree
+    while (line != NULL){
+        if (mem_total == 0 && strncmp(line, "MemTotal:", 9) == 0){
+            procfs_parse_u64(line + 9, &mem_total);
         }else if (strncmp(line, "MemAvailable:", 13) == 0){
-            sscanf(line, "MemAvailable: %lu kB", &mem_available);
+            procfs_parse_u64(line + 13, &mem_available);
+            found = found + 1;
+        }else if (strncmp(line, "SwapTotal:", 10) == 0){
+            procfs_parse_u64(line + 10, &swap_total);
+            found = found + 1;
+        }else if (strncmp(line, "SwapFree:", 9) == 0){
+            procfs_parse_u64(line + 9, &swap_free);
+            found = found + 1;
         }
 
-        if (mem_total > 0 && mem_available > 0){
+        //SwapFree vine dupa celelalte, pe la jumatatea fisierului
+        if (mem_total > 0 && found == 3){
             break;
         }
+        line = procfs_next_line(line);
     }
 
-    if (fclose(fin) != 0){
-        fprintf(stderr,"Unable to close /proc/meminfo\n");
-        return 0;
-    }
+    uint64_t swap_used = swap_total > swap_free ? swap_total - swap_free : 0;
+    mem->swap_total_gb = (double)swap_total / (1024.0 * 1024.0);
+    mem->swap_used_gb = (double)swap_used / (1024.0 * 1024.0);
+    mem->swap_usage_percent = swap_total > 0 ? (double)swap_used / swap_total * 100.0 : 0.0;
 
     if (mem_total > 0){
         uint64_t mem_used = mem_total - mem_available;
@@ -40,4 +52,4 @@ int memory_get_data(MemoryData *mem){
     }
 
     return 0;
-}
\ No newline at end of file
+}
@@ -1,50 +1,208 @@
 #include "include/network.h"
 #include <stdio.h>
+#include <stdlib.h>
 #include <string.h>
+#include <math.h>
+#include <time.h>
 
-static unsigned long long prev_rx = 0;
-static unsigned long long prev_tx = 0;
-static int is_first_run = 1;
+#define IFACE_TABLE_MIN 64
+#define IFACE_COUNTERS 8 //rx: bytes packets errs drop, tx: bytes packets errs drop
 
-int network_get_data(NetworkData *net) {
-    FILE *fin = fopen("/proc/net/dev", "r");
-    if (!fin) return 0;
+typedef struct {
+    char name[IFACE_NAME_LEN];        //"" = slot liber
+    uint64_t counters[IFACE_COUNTERS];
+    double rates[IFACE_COUNTERS];     //pe secunda, netezite daca e cazul
+    int has_rates;
+} IfaceEntry;
 
-    char line[512];
-    unsigned long long total_rx = 0;
-    unsigned long long total_tx = 0;
+//aceeasi schema ca la procese: tabela hash cu adresare deschisa, doua tabele
+//schimbate la fiecare runda, ca interfetele disparute sa iasa singure
+typedef struct {
+    IfaceEntry *entries;
+    size_t capacity;
+    size_t count;
+} IfaceTable;
 
-    fgets(line, sizeof(line), fin);
-    fgets(line, sizeof(line), fin);
+static IfaceTable tables[2];
+static int prev_table = 0;
+static double prev_time = 0.0;
+static double smoothing_seconds = 0.0;
 
-    while (fgets(line, sizeof(line), fin)) {
-        char iface[32];
-        unsigned long long rx_bytes, tx_bytes, dummy;
+void network_set_smoothing(double seconds) {
+    smoothing_seconds = seconds > 0.0 ? seconds : 0.0;
+}
 
-        char *colon = strchr(line, ':');
-        if (colon) {
-            *colon = ' ';
-            if (sscanf(line, "%s %llu %llu %llu %llu %llu %llu %llu %llu %llu",iface, &rx_bytes, &dummy, &dummy, &dummy, &dummy, &dummy, &dummy, &dummy, &tx_bytes) >= 10) {
-                if (strcmp(iface, "lo") != 0) {
-                    total_rx += rx_bytes;
-                    total_tx += tx_bytes;
-                }
-            }
+static double monotonic_seconds(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+}
+
+//FNV-1a pe numele interfetei
+static size_t iface_hash(const char *name, size_t capacity) {
+    uint32_t hash = 2166136261u;
+    while (*name) {
+        hash = (hash ^ (unsigned char)*name) * 16777619u;
+        name++;
+    }
+    return hash & (capacity - 1);
+}
+
+static IfaceEntry *iface_slot(IfaceEntry *entries, size_t capacity, const char *name) {
+    size_t slot = iface_hash(name, capacity);
+    while (entries[slot].name[0] != '\0' && strcmp(entries[slot].name, name) != 0) {
+        slot = (slot + 1) & (capacity - 1);
+    }
+    return &entries[slot];
+}
+
+static int iface_table_resize(IfaceTable *table, size_t capacity) {
+    IfaceEntry *entries = calloc(capacity, sizeof(IfaceEntry));
+    if (!entries) {
+        fprintf(stderr, "Could not allocate interface table\n");
+        return 0;
+    }
+
+    for (size_t i = 0; i < table->capacity; i++) {
+        if (table->entries[i].name[0] != '\0') {
+            *iface_slot(entries, capacity, table->entries[i].name) = table->entries[i];
         }
     }
-    fclose(fin);
 
-    if (is_first_run) {
-        net->rx_speed_kbps = 0.0;
-        net->tx_speed_kbps = 0.0;
-        is_first_run = 0;
+    free(table->entries);
+    table->entries = entries;
+    table->capacity = capacity;
+    return 1;
+}
+
+static int iface_table_reset(IfaceTable *table, size_t min_count) {
+    size_t capacity = table->capacity ? table->capacity : IFACE_TABLE_MIN;
+    while (capacity < min_count * 2) {
+        capacity *= 2;
+    }
+
+    if (capacity != table->capacity) {
+        free(table->entries);
+        table->entries = NULL;
+        table->capacity = 0;
+        if (!iface_table_resize(table, capacity)) return 0;
     } else {
-        net->rx_speed_kbps = (double)(total_rx - prev_rx) / 1024.0;
-        net->tx_speed_kbps = (double)(total_tx - prev_tx) / 1024.0;
+        memset(table->entries, 0, capacity * sizeof(IfaceEntry));
+    }
+    table->count = 0;
+    return 1;
+}
+
+static IfaceEntry *iface_table_put(IfaceTable *table, const char *name) {
+    if ((table->count + 1) * 2 > table->capacity && !iface_table_resize(table, table->capacity * 2)) {
+        return NULL;
+    }
+
+    IfaceEntry *entry = iface_slot(table->entries, table->capacity, name);
+    if (entry->name[0] == '\0') {
+        memcpy(entry->name, name, strlen(name) + 1); //numele are sub IFACE_NAME_LEN
+        table->count++;
+    }
+    return entry;
+}
+
+static const IfaceEntry *iface_table_get(const IfaceTable *table, const char *name) {
+    if (table->capacity == 0) return NULL;
+    const IfaceEntry *entry = iface_slot(table->entries, table->capacity, name);
+    return entry->name[0] != '\0' ? entry : NULL;
+}
+
+//ratele fata de runda trecuta; un contor care scade (interfata resetata) da 0
+static void iface_update_rates(IfaceEntry *entry, const IfaceEntry *old, double elapsed) {
+    if (!old || elapsed <= 0.0) {
+        memset(entry->rates, 0, sizeof(entry->rates));
+        entry->has_rates = 0;
+        return;
     }
 
-    prev_rx = total_rx;
-    prev_tx = total_tx;
+    double alpha = 1.0;
+    if (smoothing_seconds > 0.0 && old->has_rates) {
+        alpha = 1.0 - exp(-elapsed / smoothing_seconds);
+    }
+
+    for (int i = 0; i < IFACE_COUNTERS; i++) {
+        uint64_t delta = entry->counters[i] >= old->counters[i] ? entry->counters[i] - old->counters[i] : 0;
+        double rate = (double)delta / elapsed;
+        entry->rates[i] = old->has_rates ? old->rates[i] + alpha * (rate - old->rates[i]) : rate;
+    }
+    entry->has_rates = 1;
+}
+
+int network_get_data(ProcSource *src, NetworkData *net) {
+    const char *line = procfs_source_read(src);
+    if (!line) return 0;
+
+    //timpul citirii, nu al timer-ului din interfata
+    double now = monotonic_seconds();
+    double elapsed = prev_time > 0.0 ? now - prev_time : 0.0;
+
+    IfaceTable *prev = &tables[prev_table];
+    IfaceTable *curr = &tables[1 - prev_table];
+    if (!iface_table_reset(curr, prev->count)) return 0;
+
+    net->rx_speed_kbps = 0.0;
+    net->tx_speed_kbps = 0.0;
+    net->interface_count = 0;
+
+    //primele doua randuri sunt antetul tabelului
+    line = procfs_next_line(line);
+    if (line) line = procfs_next_line(line);
+
+    while (line) {
+        const char *iface = procfs_skip_spaces(line);
+        const char *colon = strchr(iface, ':');
+        const char *newline = strchr(iface, '\n');
+        size_t name_len = colon ? (size_t)(colon - iface) : 0;
+        if (colon && (!newline || colon < newline) && name_len > 0 && name_len < IFACE_NAME_LEN) {
+            char name[IFACE_NAME_LEN];
+            memcpy(name, iface, name_len);
+            name[name_len] = '\0';
+
+            //rx: bytes packets errs drop fifo frame compressed multicast, apoi tx la fel
+            uint64_t fields[12];
+            const char *p = colon + 1;
+            for (int i = 0; i < 12; i++) {
+                p = procfs_parse_u64(p, &fields[i]);
+            }
+
+            IfaceEntry *entry = iface_table_put(curr, name);
+            if (entry) {
+                const int columns[IFACE_COUNTERS] = {0, 1, 2, 3, 8, 9, 10, 11};
+                for (int i = 0; i < IFACE_COUNTERS; i++) {
+                    entry->counters[i] = fields[columns[i]];
+                }
+                iface_update_rates(entry, iface_table_get(prev, name), elapsed);
+
+                if (strcmp(name, "lo") != 0) {
+                    net->rx_speed_kbps += entry->rates[0] / 1024.0;
+                    net->tx_speed_kbps += entry->rates[4] / 1024.0;
+                }
+
+                if (net->interface_count < MAX_INTERFACES) {
+                    InterfaceRates *out = &net->interfaces[net->interface_count++];
+                    memcpy(out->name, name, sizeof(out->name));
+                    out->rx_kbps = entry->rates[0] / 1024.0;
+                    out->rx_packets = entry->rates[1];
+                    out->rx_errors = entry->rates[2];
+                    out->rx_drops = entry->rates[3];
+                    out->tx_kbps = entry->rates[4] / 1024.0;
+                    out->tx_packets = entry->rates[5];
+                    out->tx_errors = entry->rates[6];
+                    out->tx_drops = entry->rates[7];
+                    out->rx_bytes = entry->counters[0];
+                    out->tx_bytes = entry->counters[4];
+                }
+            }
+        }
+        line = procfs_next_line(line);
+    }
 
+    prev_table = 1 - prev_table;
+    prev_time = now;
     return 1;
-}
\ No newline at end of file
+}
@@ -0,0 +1,156 @@
+#include "include/pressure.h"
+#include <stdio.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+
+static const char *psi_paths[PSI_RESOURCES] = {"/proc/pressure/cpu", "/proc/pressure/memory", "/proc/pressure/io"};
+static const char *vmstat_keys[VMSTAT_COUNTERS] = {"pgfault ", "pgmajfault ", "pswpin ", "pswpout "};
+
+static double monotonic_seconds(void){
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+}
+
+void pressure_sources_init(PressureSources *src){
+    for (int i = 0; i < PSI_RESOURCES; i = i + 1){
+        procfs_source_init(&src->psi[i], psi_paths[i]);
+    }
+    procfs_source_init(&src->loadavg, "/proc/loadavg");
+    procfs_source_init(&src->vmstat, "/proc/vmstat");
+    src->psi_checked = 0;
+    src->psi_present = 0;
+    src->prev_time = 0.0;
+    memset(src->prev_some_us, 0, sizeof(src->prev_some_us));
+    memset(src->prev_full_us, 0, sizeof(src->prev_full_us));
+    memset(src->prev_vmstat, 0, sizeof(src->prev_vmstat));
+}
+
+//"avg10=0.12 avg60=0.05 avg300=0.01 total=123456" (dupa "some " sau "full ")
+static void psi_parse_line(const char *p, double *avg10, double *avg60, double *avg300, uint64_t *total_us){
+    double *averages[3] = {avg10, avg60, avg300};
+    for (int i = 0; i < 3; i = i + 1){
+        p = strchr(p, '=');
+        if (p == NULL){
+            return;
+        }
+        p = procfs_parse_decimal(p + 1, averages[i]);
+    }
+
+    p = strchr(p, '=');
+    if (p != NULL){
+        procfs_parse_u64(p + 1, total_us);
+    }
+}
+
+static double stall_percent(uint64_t now_us, uint64_t prev_us, double elapsed){
+    if (elapsed <= 0.0 || now_us < prev_us){
+        return 0.0;
+    }
+    return (double)(now_us - prev_us) / (elapsed * 1e6) * 100.0;
+}
+
+static int pressure_read_psi(PressureSources *src, int resource, PsiData *psi, double elapsed){
+    const char *line = procfs_source_read(&src->psi[resource]);
+    if (line == NULL){
+        return 0;
+    }
+
+    uint64_t some_us = 0;
+    uint64_t full_us = 0;
+    memset(psi, 0, sizeof(*psi));
+    while (line != NULL){
+        if (strncmp(line, "some ", 5) == 0){
+            psi_parse_line(line + 5, &psi->some_avg10, &psi->some_avg60, &psi->some_avg300, &some_us);
+        }else if (strncmp(line, "full ", 5) == 0){
+            psi_parse_line(line + 5, &psi->full_avg10, &psi->full_avg60, &psi->full_avg300, &full_us);
+        }
+        line = procfs_next_line(line);
+    }
+
+    psi->some_percent = stall_percent(some_us, src->prev_some_us[resource], elapsed);
+    psi->full_percent = stall_percent(full_us, src->prev_full_us[resource], elapsed);
+    src->prev_some_us[resource] = some_us;
+    src->prev_full_us[resource] = full_us;
+    return 1;
+}
+
+//"0.52 0.58 0.59 2/345 12345"
+static int pressure_read_loadavg(PressureSources *src, PressureData *pressure){
+    const char *p = procfs_source_read(&src->loadavg);
+    if (p == NULL){
+        return 0;
+    }
+
+    p = procfs_parse_decimal(p, &pressure->load_1);
+    p = procfs_parse_decimal(p, &pressure->load_5);
+    p = procfs_parse_decimal(p, &pressure->load_15);
+
+    uint64_t runnable = 0;
+    uint64_t total = 0;
+    p = procfs_parse_u64(p, &runnable);
+    if (*p == '/'){
+        procfs_parse_u64(p + 1, &total);
+    }
+    pressure->tasks_runnable = (int)runnable;
+    pressure->tasks_total = (int)total;
+    return 1;
+}
+
+static int pressure_read_vmstat(PressureSources *src, PressureData *pressure, double elapsed){
+    const char *line = procfs_source_read(&src->vmstat);
+    if (line == NULL){
+        return 0;
+    }
+
+    uint64_t counters[VMSTAT_COUNTERS] = {0};
+    int found = 0;
+    while (line != NULL && found < VMSTAT_COUNTERS){
+        for (int i = 0; i < VMSTAT_COUNTERS; i = i + 1){
+            size_t len = strlen(vmstat_keys[i]);
+            if (strncmp(line, vmstat_keys[i], len) == 0){
+                procfs_parse_u64(line + len, &counters[i]);
+                found = found + 1;
+                break;
+            }
+        }
+        line = procfs_next_line(line);
+    }
+
+    double rates[VMSTAT_COUNTERS] = {0.0};
+    for (int i = 0; i < VMSTAT_COUNTERS; i = i + 1){
+        if (elapsed > 0.0 && counters[i] >= src->prev_vmstat[i]){
+            rates[i] = (double)(counters[i] - src->prev_vmstat[i]) / elapsed;
+        }
+        src->prev_vmstat[i] = counters[i];
+    }
+    pressure->page_faults_per_sec = rates[0];
+    pressure->major_faults_per_sec = rates[1];
+    pressure->swap_in_per_sec = rates[2];
+    pressure->swap_out_per_sec = rates[3];
+    return 1;
+}
+
+int pressure_get_data(PressureSources *src, PressureData *pressure){
+    //fara PSI in kernel lipseste tot /proc/pressure: verificam o data, fara mesaje la fiecare runda
+    if (!src->psi_checked){
+        src->psi_present = access(src->psi[0].path, R_OK) == 0;
+        src->psi_checked = 1;
+    }
+
+    double now = monotonic_seconds();
+    double elapsed = src->prev_time > 0.0 ? now - src->prev_time : 0.0;
+
+    pressure->psi_available = 0;
+    if (src->psi_present){
+        pressure->psi_available = pressure_read_psi(src, 0, &pressure->cpu, elapsed) &&
+                                  pressure_read_psi(src, 1, &pressure->memory, elapsed) &&
+                                  pressure_read_psi(src, 2, &pressure->io, elapsed);
+    }
+
+    int ok = pressure_read_loadavg(src, pressure);
+    ok = pressure_read_vmstat(src, pressure, elapsed) && ok;
+    src->prev_time = now;
+    return ok;
+}
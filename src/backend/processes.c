@@ -1,31 +1,574 @@
 #include "include/processes.h"
+#include "include/proctree.h"
 #include <stdio.h>
+#include <stdlib.h>
 #include <string.h>
+#include <dirent.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <pwd.h>
+#include <sys/stat.h>
+#include <sys/sysinfo.h>
 
-int processes_get_top(ProcessData *procs, int max_count){
-    FILE *fin = popen("ps -eo pid,comm,%cpu,%mem,user --sort=-%cpu | head -n 31", "r");
-    if (fin == NULL){
+#define PID_TABLE_MIN 1024
+#define USER_TABLE_MIN 64
+#define RECORDS_MIN 512
+
+typedef struct{
+    int pid;        //0 = slot liber
+    uint64_t ticks; //utime + stime la ultima citire
+}PidEntry;
+
+//tabela hash cu adresare deschisa, capacitatea e mereu putere a lui 2
+typedef struct{
+    PidEntry *entries;
+    size_t capacity;
+    size_t count;
+}PidTable;
+
+//utilizatorii vazuti pana acum; numele sunt alocate separat ca pointerii sa ramana valizi
+typedef struct{
+    int valid;
+    unsigned int uid;
+    char *name;
+}UserEntry;
+
+//doua tabele: una cu runda trecuta, una care se umple acum
+//procesele care au murit dispar singure la schimbarea tabelelor
+static PidTable tables[2];
+static int prev_table = 0;
+static uint64_t prev_cpu_ticks = 0;
+static char proc_root[LINE_LEN] = "/proc";
+
+//lista completa din ultima scanare
+static ProcessRecord *records = NULL;
+static uint32_t *record_starts = NULL; //starttime-ul fiecarei inregistrari (ProcessRecord nu are loc de el)
+static int record_count = 0;
+static int record_capacity = 0;
+static double total_ram_kb = 0.0; //din ultima scanare, pentru procentele pe subarbore si grupuri
+
+static UserEntry *users = NULL;
+static size_t user_count = 0;
+static size_t user_capacity = 0;
+
+void processes_set_proc_root(const char *root){
+    strncpy(proc_root, root, sizeof(proc_root) - 1);
+    proc_root[sizeof(proc_root) - 1] = '\0';
+
+    //starea veche nu mai are sens pentru alt arbore
+    tables[0].count = 0;
+    tables[1].count = 0;
+    if (tables[0].entries){
+        memset(tables[0].entries, 0, tables[0].capacity * sizeof(PidEntry));
+    }
+    if (tables[1].entries){
+        memset(tables[1].entries, 0, tables[1].capacity * sizeof(PidEntry));
+    }
+    prev_cpu_ticks = 0;
+    record_count = 0;
+    proctree_reset();
+}
+
+static size_t pid_hash(int pid, size_t capacity){
+    return ((uint32_t)pid * 2654435761u) & (capacity - 1);
+}
+
+static int pid_table_reset(PidTable *table, size_t min_capacity){
+    size_t capacity = table->capacity ? table->capacity : PID_TABLE_MIN;
+    while (capacity < min_capacity * 2){
+        capacity = capacity * 2;
+    }
+
+    if (capacity != table->capacity){
+        PidEntry *entries = calloc(capacity, sizeof(PidEntry));
+        if (entries == NULL){
+            fprintf(stderr, "Could not allocate pid table\n");
+            return 0;
+        }
+        free(table->entries);
+        table->entries = entries;
+        table->capacity = capacity;
+    }else{
+        memset(table->entries, 0, capacity * sizeof(PidEntry));
+    }
+
+    table->count = 0;
+    return 1;
+}
+
+static int pid_table_grow(PidTable *table){
+    size_t capacity = table->capacity * 2;
+    PidEntry *entries = calloc(capacity, sizeof(PidEntry));
+    if (entries == NULL){
+        fprintf(stderr, "Could not grow pid table\n");
+        return 0;
+    }
+
+    for (size_t i = 0; i < table->capacity; i = i + 1){
+        if (table->entries[i].pid != 0){
+            size_t slot = pid_hash(table->entries[i].pid, capacity);
+            while (entries[slot].pid != 0){
+                slot = (slot + 1) & (capacity - 1);
+            }
+            entries[slot] = table->entries[i];
+        }
+    }
+
+    free(table->entries);
+    table->entries = entries;
+    table->capacity = capacity;
+    return 1;
+}
+
+static void pid_table_put(PidTable *table, int pid, uint64_t ticks){
+    if ((table->count + 1) * 2 > table->capacity && !pid_table_grow(table)){
+        return;
+    }
+
+    size_t slot = pid_hash(pid, table->capacity);
+    while (table->entries[slot].pid != 0 && table->entries[slot].pid != pid){
+        slot = (slot + 1) & (table->capacity - 1);
+    }
+
+    if (table->entries[slot].pid == 0){
+        table->count = table->count + 1;
+    }
+    table->entries[slot].pid = pid;
+    table->entries[slot].ticks = ticks;
+}
+
+static const PidEntry *pid_table_get(const PidTable *table, int pid){
+    if (table->capacity == 0){
+        return NULL;
+    }
+
+    size_t slot = pid_hash(pid, table->capacity);
+    while (table->entries[slot].pid != 0){
+        if (table->entries[slot].pid == pid){
+            return &table->entries[slot];
+        }
+        slot = (slot + 1) & (table->capacity - 1);
+    }
+    return NULL;
+}
+
+static const char *skip_fields(const char *p, int count){
+    for (int i = 0; i < count && *p != '\0'; i = i + 1){
+        while (*p == ' '){
+            p = p + 1;
+        }
+        while (*p != ' ' && *p != '\0'){
+            p = p + 1;
+        }
+    }
+    return p;
+}
+
+//parseaza /proc/[pid]/stat: numele, starea, ppid, utime + stime, starttime si rss (in pagini)
+static int parse_pid_stat(const char *buffer, ProcessRecord *record, uint64_t *ticks, uint64_t *start_time, uint64_t *rss_pages){
+    //numele poate contine spatii si paranteze, asa ca luam ultima ')'
+    const char *open = strchr(buffer, '(');
+    const char *close = strrchr(buffer, ')');
+    if (open == NULL || close == NULL || close < open){
+        return 0;
+    }
+
+    size_t len = (size_t)(close - open - 1);
+    if (len >= sizeof(record->name)){
+        len = sizeof(record->name) - 1;
+    }
+    memcpy(record->name, open + 1, len);
+    record->name[len] = '\0';
+
+    //dupa ')' urmeaza campul 3 (state) si 4 (ppid); utime e campul 14, stime 15, starttime 22, rss 24
+    const char *p = procfs_skip_spaces(close + 1);
+    record->state = *p != '\0' ? *p : '?';
+    uint64_t ppid = 0;
+    p = procfs_parse_u64(skip_fields(p, 1), &ppid);
+    record->ppid = (int)ppid;
+
+    p = skip_fields(p, 9);
+    uint64_t utime = 0;
+    uint64_t stime = 0;
+    p = procfs_parse_u64(p, &utime);
+    p = procfs_parse_u64(p, &stime);
+    p = skip_fields(p, 6);
+    p = procfs_parse_u64(p, start_time);
+    p = skip_fields(p, 1);
+    p = procfs_parse_u64(p, rss_pages);
+
+    *ticks = utime + stime;
+    return 1;
+}
+
+//heap minim dupa cpu: in varf ramane cel mai slab candidat din top
+static int candidate_less(const ProcessRecord *a, const ProcessRecord *b){
+    if (a->cpu_percent != b->cpu_percent){
+        return a->cpu_percent < b->cpu_percent;
+    }
+    return a->rss_kb < b->rss_kb;
+}
+
+static void heap_sift_down(const ProcessRecord **heap, int size, int index){
+    while (1){
+        int smallest = index;
+        int left = index * 2 + 1;
+        int right = index * 2 + 2;
+
+        if (left < size && candidate_less(heap[left], heap[smallest])){
+            smallest = left;
+        }
+        if (right < size && candidate_less(heap[right], heap[smallest])){
+            smallest = right;
+        }
+        if (smallest == index){
+            return;
+        }
+
+        const ProcessRecord *tmp = heap[index];
+        heap[index] = heap[smallest];
+        heap[smallest] = tmp;
+        index = smallest;
+    }
+}
+
+static void heap_sift_up(const ProcessRecord **heap, int index){
+    while (index > 0){
+        int parent = (index - 1) / 2;
+        if (!candidate_less(heap[index], heap[parent])){
+            return;
+        }
+
+        const ProcessRecord *tmp = heap[index];
+        heap[index] = heap[parent];
+        heap[parent] = tmp;
+        index = parent;
+    }
+}
+
+static size_t uid_hash(unsigned int uid, size_t capacity){
+    return (uid * 2654435761u) & (capacity - 1);
+}
+
+static UserEntry *user_slot(UserEntry *table, size_t capacity, unsigned int uid){
+    size_t slot = uid_hash(uid, capacity);
+    while (table[slot].valid && table[slot].uid != uid){
+        slot = (slot + 1) & (capacity - 1);
+    }
+    return &table[slot];
+}
+
+static int user_table_grow(void){
+    size_t capacity = user_capacity ? user_capacity * 2 : USER_TABLE_MIN;
+    UserEntry *table = calloc(capacity, sizeof(UserEntry));
+    if (table == NULL){
+        fprintf(stderr, "Could not grow user table\n");
+        return 0;
+    }
+
+    for (size_t i = 0; i < user_capacity; i = i + 1){
+        if (users[i].valid){
+            *user_slot(table, capacity, users[i].uid) = users[i];
+        }
+    }
+
+    free(users);
+    users = table;
+    user_capacity = capacity;
+    return 1;
+}
+
+const char *processes_user_name(unsigned int uid){
+    if (user_capacity != 0){
+        UserEntry *entry = user_slot(users, user_capacity, uid);
+        if (entry->valid){
+            return entry->name;
+        }
+    }
+
+    if ((user_count + 1) * 2 > user_capacity && !user_table_grow()){
+        return "?";
+    }
+
+    char name[PROC_USER_LEN];
+    struct passwd pwd;
+    struct passwd *result = NULL;
+    char buffer[1024];
+    if (getpwuid_r(uid, &pwd, buffer, sizeof(buffer), &result) == 0 && result != NULL){
+        strncpy(name, result->pw_name, sizeof(name) - 1);
+        name[sizeof(name) - 1] = '\0';
+    }else{
+        snprintf(name, sizeof(name), "%u", uid);
+    }
+
+    char *copy = strdup(name);
+    if (copy == NULL){
+        return "?";
+    }
+
+    UserEntry *entry = user_slot(users, user_capacity, uid);
+    entry->valid = 1;
+    entry->uid = uid;
+    entry->name = copy;
+    user_count = user_count + 1;
+    return copy;
+}
+
+static ProcessRecord *record_append(void){
+    if (record_count == record_capacity){
+        int capacity = record_capacity ? record_capacity * 2 : RECORDS_MIN;
+        ProcessRecord *grown = realloc(records, (size_t)capacity * sizeof(ProcessRecord));
+        if (grown == NULL){
+            fprintf(stderr, "Could not grow process list\n");
+            return NULL;
+        }
+        records = grown;
+        uint32_t *starts = realloc(record_starts, (size_t)capacity * sizeof(uint32_t));
+        if (starts == NULL){
+            fprintf(stderr, "Could not grow process list\n");
+            return NULL;
+        }
+        record_starts = starts;
+        record_capacity = capacity;
+    }
+
+    record_count = record_count + 1;
+    return &records[record_count - 1];
+}
+
+//"0::/system.slice/x.service" (cgroup v2); fara ierarhia unificata, cea a controlerului cpu din v1
+static int read_pid_cgroup(int dir_fd, int pid, char *path, size_t size){
+    char name[64];
+    char buffer[LINE_LEN * 2];
+    snprintf(name, sizeof(name), "%d/cgroup", pid);
+    int fd = openat(dir_fd, name, O_RDONLY);
+    if (fd < 0){
+        return 0;
+    }
+    ssize_t len = read(fd, buffer, sizeof(buffer) - 1);
+    close(fd);
+    if (len <= 0){
+        return 0;
+    }
+    buffer[len] = '\0';
+
+    const char *chosen = NULL;
+    for (const char *line = buffer; line != NULL; line = procfs_next_line(line)){
+        const char *controllers = strchr(line, ':');
+        if (controllers == NULL){
+            continue;
+        }
+        controllers = controllers + 1;
+        if (strncmp(line, "0::", 3) == 0){
+            chosen = line + 3;
+            break;
+        }
+        //"4:cpu,cpuacct:/..." (pe unele sisteme doar "cpu")
+        if (chosen == NULL && (strncmp(controllers, "cpu,", 4) == 0 || strncmp(controllers, "cpu:", 4) == 0)){
+            chosen = strchr(controllers, ':') + 1;
+        }
+    }
+    if (chosen == NULL){
+        return 0;
+    }
+
+    size_t n = strcspn(chosen, "\n");
+    if (n >= size){
+        n = size - 1;
+    }
+    memcpy(path, chosen, n);
+    path[n] = '\0';
+    return 1;
+}
+
+//o trecere prin /proc: reface lista completa si tabela pid -> ticks
+//si actualizeaza arborele de procese cu ce s-a schimbat
+static int processes_scan(const CpuRawData *cpu_total, int num_cores){
+    DIR *dir = opendir(proc_root);
+    if (dir == NULL){
+        fprintf(stderr, "Could not open %s\n", proc_root);
         return 0;
     }
+    int dir_fd = dirfd(dir);
+
+    PidTable *prev = &tables[prev_table];
+    PidTable *curr = &tables[1 - prev_table];
+    if (!pid_table_reset(curr, prev->count)){
+        closedir(dir);
+        return 0;
+    }
+
+    //timpul scurs pe un nucleu, in aceleasi unitati ca utime/stime
+    uint64_t cpu_ticks = cpu_total->user + cpu_total->nice + cpu_total->system + cpu_total->idle +
+                         cpu_total->iowait + cpu_total->irq + cpu_total->softirq + cpu_total->steal;
+    uint64_t total_diff = prev_cpu_ticks ? cpu_ticks - prev_cpu_ticks : 0;
+    if (num_cores < 1){
+        num_cores = 1;
+    }
+
+    struct sysinfo s_info;
+    double total_ram = 0.0;
+    if (sysinfo(&s_info) == 0){
+        total_ram = (double)s_info.totalram * s_info.mem_unit;
+    }
+    uint64_t page_kb = (uint64_t)sysconf(_SC_PAGESIZE) / 1024;
+    total_ram_kb = total_ram / 1024.0;
+    proctree_begin();
+
+    record_count = 0;
+    char path[64];
+    char buffer[LINE_LEN * 2];
+    struct dirent *entry;
+    while ((entry = readdir(dir)) != NULL){
+        if (entry->d_name[0] < '1' || entry->d_name[0] > '9'){
+            continue;
+        }
+
+        int pid = atoi(entry->d_name);
+        snprintf(path, sizeof(path), "%d/stat", pid);
+        int fd = openat(dir_fd, path, O_RDONLY);
+        if (fd < 0){
+            continue; //procesul a disparut intre timp
+        }
+        ssize_t len = read(fd, buffer, sizeof(buffer) - 1);
+        close(fd);
+        if (len <= 0){
+            continue;
+        }
+        buffer[len] = '\0';
+
+        //proprietarul directorului /proc/[pid] este uid-ul efectiv
+        struct stat st;
+        if (fstatat(dir_fd, entry->d_name, &st, 0) != 0){
+            continue;
+        }
+
+        ProcessRecord *record = record_append();
+        if (record == NULL){
+            break;
+        }
 
-    char line[LINE_LEN];
-    int count = 0;
-    int is_header = 1;
-    while (fgets(line, LINE_LEN, fin) != NULL && count < max_count){
-        if (is_header){
-            is_header = 0;
+        uint64_t ticks = 0;
+        uint64_t start_time = 0;
+        uint64_t rss_pages = 0;
+        if (!parse_pid_stat(buffer, record, &ticks, &start_time, &rss_pages)){
+            record_count = record_count - 1;
             continue;
         }
+        record->pid = pid;
+        record->uid = st.st_uid;
+        record_starts[record_count - 1] = (uint32_t)start_time;
+        record->rss_kb = rss_pages * page_kb;
+        pid_table_put(curr, pid, ticks);
+
+        //la fel ca cpu_calculate_usage: delta procesului / delta totala
+        const PidEntry *old = pid_table_get(prev, pid);
+        if (old != NULL && total_diff > 0 && ticks >= old->ticks){
+            record->cpu_percent = (float)((double)(ticks - old->ticks) * num_cores / total_diff * 100.0);
+        }else{
+            record->cpu_percent = 0.0f;
+        }
+        record->ram_percent = total_ram > 0 ? (float)((double)record->rss_kb * 1024.0 / total_ram * 100.0) : 0.0f;
+
+        //cgroup-ul se citeste doar pentru procese noi si dupa exec, nu la fiecare runda
+        int needs_cgroup = 0;
+        int node = proctree_update(record, start_time, &needs_cgroup);
+        char cgroup[ROLLUP_NAME_LEN];
+        if (needs_cgroup && read_pid_cgroup(dir_fd, pid, cgroup, sizeof(cgroup))){
+            proctree_set_cgroup(node, cgroup);
+        }
+    }
+    proctree_end();
+
+    prev_table = 1 - prev_table;
+    prev_cpu_ticks = cpu_ticks;
+    closedir(dir);
+    return record_count;
+}
+
+int processes_get_top(ProcessData *procs, int max_count, const CpuRawData *cpu_total, int num_cores){
+    if (max_count <= 0){
+        return 0;
+    }
+
+    processes_scan(cpu_total, num_cores);
+
+    const ProcessRecord **heap = malloc((size_t)max_count * sizeof(ProcessRecord *));
+    if (heap == NULL){
+        return 0;
+    }
+    int heap_size = 0;
 
-        if (sscanf(line, "%d %255s %lf %lf %255s",
-            &procs[count].pid, procs[count].name, &procs[count].cpu_percent,
-            &procs[count].ram_percent, procs[count].user) == 5) {
-            count++;
+    for (int i = 0; i < record_count; i = i + 1){
+        const ProcessRecord *candidate = &records[i];
+        if (heap_size < max_count){
+            heap[heap_size] = candidate;
+            heap_sift_up(heap, heap_size);
+            heap_size = heap_size + 1;
+        }else if (candidate_less(heap[0], candidate)){
+            heap[0] = candidate;
+            heap_sift_down(heap, heap_size, 0);
         }
     }
 
-    if (pclose(fin) != 0){
+    //scoatem din heap de la cel mai mic, deci umplem de la coada
+    int count = heap_size;
+    for (int i = count - 1; i >= 0; i = i - 1){
+        const ProcessRecord *top = heap[0];
+        heap_size = heap_size - 1;
+        heap[0] = heap[heap_size];
+        heap_sift_down(heap, heap_size, 0);
+
+        procs[i].pid = top->pid;
+        procs[i].start_ticks = record_starts[top - records];
+        memcpy(procs[i].name, top->name, sizeof(procs[i].name));
+        procs[i].cpu_percent = top->cpu_percent;
+        procs[i].ram_percent = top->ram_percent;
+
+        const char *user = processes_user_name(top->uid);
+        strncpy(procs[i].user, user, sizeof(procs[i].user) - 1);
+        procs[i].user[sizeof(procs[i].user) - 1] = '\0';
+    }
+
+    free(heap);
+    return count;
+}
+
+int processes_get_snapshot(ProcessRecord *out, int offset, int capacity, int *total){
+    if (total != NULL){
+        *total = record_count;
+    }
+    if (out == NULL || offset < 0 || capacity <= 0 || offset >= record_count){
         return 0;
     }
+
+    int count = record_count - offset;
+    if (count > capacity){
+        count = capacity;
+    }
+    memcpy(out, &records[offset], (size_t)count * sizeof(ProcessRecord));
     return count;
-}
\ No newline at end of file
+}
+
+int processes_get_tree(ProcessTreeNode *out, int offset, int capacity, int *total){
+    if (total != NULL){
+        *total = record_count;
+    }
+    if (out == NULL || offset < 0 || capacity <= 0 || offset >= record_count){
+        return 0;
+    }
+
+    int count = record_count - offset;
+    if (count > capacity){
+        count = capacity;
+    }
+    proctree_get_nodes(&records[offset], count, out, total_ram_kb);
+    return count;
+}
+
+int processes_get_rollups(int kind, ProcessRollup *out, int capacity, int *total){
+    if (kind != ROLLUP_USERS && kind != ROLLUP_CGROUPS){
+        return 0;
+    }
+    return proctree_get_rollups(kind, out, capacity, total, total_ram_kb);
+}
@@ -0,0 +1,176 @@
+#include "include/procfs.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+
+static char root_prefix[PROCFS_PATH_LEN] = "";
+
+void procfs_set_root(const char *root){
+    if (root == NULL){
+        root = "";
+    }
+    strncpy(root_prefix, root, sizeof(root_prefix) - 1);
+    root_prefix[sizeof(root_prefix) - 1] = '\0';
+
+    //fara '/' la final, ca sa nu iasa "//proc"
+    size_t len = strlen(root_prefix);
+    while (len > 0 && root_prefix[len - 1] == '/'){
+        root_prefix[len - 1] = '\0';
+        len = len - 1;
+    }
+}
+
+const char *procfs_root(void){
+    return root_prefix;
+}
+
+void procfs_path(char *out, size_t size, const char *path){
+    snprintf(out, size, "%s%s", root_prefix, path);
+}
+
+void procfs_source_init(ProcSource *src, const char *path){
+    procfs_path(src->path, sizeof(src->path), path);
+    src->fd = -1;
+    src->buffer = NULL;
+    src->capacity = 0;
+    src->length = 0;
+    src->reported = 0;
+}
+
+void procfs_source_close(ProcSource *src){
+    if (src->fd >= 0){
+        close(src->fd);
+        src->fd = -1;
+    }
+    free(src->buffer);
+    src->buffer = NULL;
+    src->capacity = 0;
+    src->length = 0;
+}
+
+static int procfs_source_open(ProcSource *src){
+    src->fd = open(src->path, O_RDONLY | O_CLOEXEC);
+    if (src->fd < 0){
+        //o singura data, altfel umplem stderr la fiecare secunda
+        if (!src->reported){
+            fprintf(stderr, "Could not open %s\n", src->path);
+            src->reported = 1;
+        }
+        return 0;
+    }
+
+    src->reported = 0;
+    return 1;
+}
+
+static int procfs_source_grow(ProcSource *src){
+    size_t capacity = src->capacity ? src->capacity * 2 : PROCFS_INITIAL_BUFFER;
+    char *buffer = realloc(src->buffer, capacity);
+    if (buffer == NULL){
+        fprintf(stderr, "Could not allocate buffer for %s\n", src->path);
+        return 0;
+    }
+
+    src->buffer = buffer;
+    src->capacity = capacity;
+    return 1;
+}
+
+//citeste tot fisierul; un pread scurt inseamna ca am ajuns la final
+static int procfs_source_fill(ProcSource *src){
+    src->length = 0;
+    while (1){
+        if (src->capacity - src->length < 2 && !procfs_source_grow(src)){
+            return 0;
+        }
+
+        size_t room = src->capacity - src->length - 1;
+        ssize_t len = pread(src->fd, src->buffer + src->length, room, (off_t)src->length);
+        if (len < 0){
+            return 0;
+        }
+
+        src->length = src->length + (size_t)len;
+        if ((size_t)len < room){
+            break;
+        }
+    }
+
+    src->buffer[src->length] = '\0';
+    return 1;
+}
+
+const char *procfs_source_read(ProcSource *src){
+    if (src->buffer == NULL && !procfs_source_grow(src)){
+        return NULL;
+    }
+
+    //a doua incercare redeschide fisierul (ex: interfata sau cpufreq reincarcat)
+    for (int attempt = 0; attempt < 2; attempt = attempt + 1){
+        if (src->fd < 0 && !procfs_source_open(src)){
+            return NULL;
+        }
+
+        if (procfs_source_fill(src)){
+            return src->buffer;
+        }
+
+        close(src->fd);
+        src->fd = -1;
+    }
+
+    if (!src->reported){
+        fprintf(stderr, "Could not read %s\n", src->path);
+        src->reported = 1;
+    }
+    return NULL;
+}
+
+const char *procfs_skip_spaces(const char *p){
+    while (*p == ' ' || *p == '\t'){
+        p = p + 1;
+    }
+    return p;
+}
+
+const char *procfs_parse_u64(const char *p, uint64_t *value){
+    p = procfs_skip_spaces(p);
+
+    uint64_t result = 0;
+    while (*p >= '0' && *p <= '9'){
+        result = result * 10 + (uint64_t)(*p - '0');
+        p = p + 1;
+    }
+
+    *value = result;
+    return p;
+}
+
+const char *procfs_parse_decimal(const char *p, double *value){
+    uint64_t whole = 0;
+    p = procfs_parse_u64(p, &whole);
+
+    double result = (double)whole;
+    if (*p == '.'){
+        double scale = 0.1;
+        p = p + 1;
+        while (*p >= '0' && *p <= '9'){
+            result = result + (*p - '0') * scale;
+            scale = scale / 10.0;
+            p = p + 1;
+        }
+    }
+
+    *value = result;
+    return p;
+}
+
+const char *procfs_next_line(const char *p){
+    const char *newline = strchr(p, '\n');
+    if (newline == NULL){
+        return NULL;
+    }
+    return newline + 1;
+}
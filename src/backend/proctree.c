@@ -0,0 +1,637 @@
+#include "include/proctree.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define TREE_MIN 1024
+#define GROUP_MIN 64
+
+typedef struct{
+    int pid;              //0 = nod liber
+    int ppid;             //cum l-am vazut in /proc/[pid]/stat
+    int parent;           //indexul parintelui, -1 = radacina
+    int first_child;
+    int next_sibling;     //la nodurile libere: urmatorul nod liber
+    int prev_sibling;
+    int seen;             //ultima runda in care a aparut in /proc
+    int detached;         //radacina cu ppid > 0 al carei parinte nu exista (inca); 2 = deja pus in lista
+    unsigned int uid;
+    int user;             //indexul in users
+    int cgroup;           //indexul in cgroups, -1 = inca necitit
+    char name[PROC_NAME_LEN];
+    double cpu_percent;   //procesul insusi, ca in ProcessRecord
+    uint64_t rss_kb;
+    double subtree_cpu;   //cu tot subarborele, inclusiv el
+    uint64_t subtree_rss_kb;
+    int subtree_count;
+    uint64_t start_time;  //alt start_time pe acelasi pid = pid refolosit
+}TreeNode;
+
+typedef struct{
+    unsigned int uid;     //cheia la utilizatori
+    char name[ROLLUP_NAME_LEN]; //cheia la cgroup-uri
+    int count;            //procese in grup; 0 = grup gol, refolosit la compactare
+    double cpu_percent;
+    uint64_t rss_kb;
+}Group;
+
+//grupurile, cu index hash (cheie -> indexul grupului) cu adresare deschisa
+typedef struct{
+    int kind;             //ROLLUP_USERS sau ROLLUP_CGROUPS
+    Group *groups;
+    int count;
+    int capacity;
+    int empty;            //cate grupuri au count 0
+    int *slots;           //-1 = liber
+    size_t slot_capacity;
+}GroupTable;
+
+static TreeNode *nodes = NULL;
+static int node_capacity = 0;
+static int free_nodes = -1;
+static int node_count = 0;
+
+//pid -> indexul nodului, adresare deschisa (putere a lui 2, -1 = liber)
+static int *pid_slots = NULL;
+static size_t pid_slot_capacity = 0;
+
+//nodurile noi sau cu alt ppid din runda curenta, legate de parinte in proctree_end
+static int *pending = NULL;
+static int pending_count = 0;
+static int pending_capacity = 0;
+static int arrived = 0;
+
+//radacinile care asteapta parintele (de ex. procese vazute inaintea parintelui)
+static int *detached = NULL;
+static int detached_count = 0;
+static int detached_capacity = 0;
+
+static int scan_round = 0;
+static GroupTable users = {ROLLUP_USERS, NULL, 0, 0, 0, NULL, 0};
+static GroupTable cgroups = {ROLLUP_CGROUPS, NULL, 0, 0, 0, NULL, 0};
+
+//─── pid -> nod ────────────────────────────────────────────────────────────
+
+static size_t pid_hash(int pid, size_t capacity){
+    return ((uint32_t)pid * 2654435761u) & (capacity - 1);
+}
+
+static int find_node(int pid){
+    if (pid_slot_capacity == 0){
+        return -1;
+    }
+
+    size_t slot = pid_hash(pid, pid_slot_capacity);
+    while (pid_slots[slot] >= 0){
+        if (nodes[pid_slots[slot]].pid == pid){
+            return pid_slots[slot];
+        }
+        slot = (slot + 1) & (pid_slot_capacity - 1);
+    }
+    return -1;
+}
+
+static void pid_slot_put(int *slots, size_t capacity, int pid, int index){
+    size_t slot = pid_hash(pid, capacity);
+    while (slots[slot] >= 0){
+        slot = (slot + 1) & (capacity - 1);
+    }
+    slots[slot] = index;
+}
+
+static int pid_index_insert(int pid, int index){
+    if ((size_t)(node_count + 1) * 2 > pid_slot_capacity){
+        size_t capacity = pid_slot_capacity ? pid_slot_capacity * 2 : TREE_MIN;
+        int *slots = malloc(capacity * sizeof(int));
+        if (slots == NULL){
+            fprintf(stderr, "Could not grow process tree index\n");
+            return 0;
+        }
+        memset(slots, 0xff, capacity * sizeof(int));
+        for (size_t i = 0; i < pid_slot_capacity; i = i + 1){
+            if (pid_slots[i] >= 0){
+                pid_slot_put(slots, capacity, nodes[pid_slots[i]].pid, pid_slots[i]);
+            }
+        }
+        free(pid_slots);
+        pid_slots = slots;
+        pid_slot_capacity = capacity;
+    }
+
+    pid_slot_put(pid_slots, pid_slot_capacity, pid, index);
+    return 1;
+}
+
+//stergere cu mutarea inapoi a elementelor din acelasi lant, fara morminte
+static void pid_index_remove(int pid){
+    size_t mask = pid_slot_capacity - 1;
+    size_t hole = pid_hash(pid, pid_slot_capacity);
+    while (pid_slots[hole] >= 0 && nodes[pid_slots[hole]].pid != pid){
+        hole = (hole + 1) & mask;
+    }
+    if (pid_slots[hole] < 0){
+        return;
+    }
+
+    size_t next = hole;
+    while (1){
+        next = (next + 1) & mask;
+        if (pid_slots[next] < 0){
+            break;
+        }
+        //elementul de pe next poate umple gaura daca locul lui ideal nu e intre gaura si el
+        size_t ideal = pid_hash(nodes[pid_slots[next]].pid, pid_slot_capacity);
+        if (((next - ideal) & mask) >= ((next - hole) & mask)){
+            pid_slots[hole] = pid_slots[next];
+            hole = next;
+        }
+    }
+    pid_slots[hole] = -1;
+}
+
+//─── grupuri (utilizatori, cgroup-uri) ─────────────────────────────────────
+
+static size_t group_hash(const GroupTable *table, unsigned int uid, const char *name){
+    if (table->kind == ROLLUP_USERS){
+        return (uid * 2654435761u) & (table->slot_capacity - 1);
+    }
+
+    //FNV-1a pe cale
+    uint32_t hash = 2166136261u;
+    while (*name){
+        hash = (hash ^ (unsigned char)*name) * 16777619u;
+        name = name + 1;
+    }
+    return hash & (table->slot_capacity - 1);
+}
+
+static int group_matches(const GroupTable *table, const Group *group, unsigned int uid, const char *name){
+    return table->kind == ROLLUP_USERS ? group->uid == uid : strcmp(group->name, name) == 0;
+}
+
+static int group_index_rebuild(GroupTable *table, size_t capacity){
+    if (capacity != table->slot_capacity){
+        int *slots = malloc(capacity * sizeof(int));
+        if (slots == NULL){
+            fprintf(stderr, "Could not grow rollup index\n");
+            return 0;
+        }
+        free(table->slots);
+        table->slots = slots;
+        table->slot_capacity = capacity;
+    }
+
+    memset(table->slots, 0xff, table->slot_capacity * sizeof(int));
+    for (int i = 0; i < table->count; i = i + 1){
+        size_t slot = group_hash(table, table->groups[i].uid, table->groups[i].name);
+        while (table->slots[slot] >= 0){
+            slot = (slot + 1) & (table->slot_capacity - 1);
+        }
+        table->slots[slot] = i;
+    }
+    return 1;
+}
+
+//grupurile goale (containere oprite, utilizatori delogati) se aduna; cand sunt peste jumatate
+//le scoatem si renumerotam nodurile, o trecere rara
+static void group_compact(GroupTable *table){
+    int *remap = malloc((size_t)table->count * sizeof(int));
+    if (remap == NULL){
+        return;
+    }
+
+    int kept = 0;
+    for (int i = 0; i < table->count; i = i + 1){
+        if (table->groups[i].count > 0){
+            table->groups[kept] = table->groups[i];
+            remap[i] = kept;
+            kept = kept + 1;
+        }else{
+            remap[i] = -1;
+        }
+    }
+    for (int i = 0; i < node_capacity; i = i + 1){
+        if (nodes[i].pid == 0){
+            continue;
+        }
+        int *group = table->kind == ROLLUP_USERS ? &nodes[i].user : &nodes[i].cgroup;
+        if (*group >= 0){
+            *group = remap[*group];
+        }
+    }
+    free(remap);
+
+    table->count = kept;
+    table->empty = 0;
+    group_index_rebuild(table, table->slot_capacity);
+}
+
+static int group_find(GroupTable *table, unsigned int uid, const char *name){
+    if (table->slot_capacity != 0){
+        size_t slot = group_hash(table, uid, name);
+        while (table->slots[slot] >= 0){
+            if (group_matches(table, &table->groups[table->slots[slot]], uid, name)){
+                return table->slots[slot];
+            }
+            slot = (slot + 1) & (table->slot_capacity - 1);
+        }
+    }
+
+    if (table->empty > GROUP_MIN && table->empty * 2 > table->count){
+        group_compact(table);
+    }
+    if (table->count == table->capacity){
+        int capacity = table->capacity ? table->capacity * 2 : GROUP_MIN;
+        Group *grown = realloc(table->groups, (size_t)capacity * sizeof(Group));
+        if (grown == NULL){
+            fprintf(stderr, "Could not grow rollup table\n");
+            return -1;
+        }
+        table->groups = grown;
+        table->capacity = capacity;
+    }
+
+    Group *group = &table->groups[table->count];
+    memset(group, 0, sizeof(*group));
+    group->uid = uid;
+    if (name != NULL){
+        strncpy(group->name, name, sizeof(group->name) - 1);
+    }
+    table->count = table->count + 1;
+    table->empty = table->empty + 1; //gol pana primeste primul proces
+
+    size_t capacity = table->slot_capacity ? table->slot_capacity : GROUP_MIN * 2;
+    while ((size_t)table->count * 2 > capacity){
+        capacity = capacity * 2;
+    }
+    if (capacity != table->slot_capacity){
+        if (!group_index_rebuild(table, capacity)){
+            table->count = table->count - 1;
+            return -1;
+        }
+    }else{
+        size_t slot = group_hash(table, uid, group->name);
+        while (table->slots[slot] >= 0){
+            slot = (slot + 1) & (table->slot_capacity - 1);
+        }
+        table->slots[slot] = table->count - 1;
+    }
+    return table->count - 1;
+}
+
+static void group_add(GroupTable *table, int index, double cpu, int64_t rss_kb, int count){
+    if (index < 0){
+        return;
+    }
+
+    Group *group = &table->groups[index];
+    if (group->count == 0 && count > 0){
+        table->empty = table->empty - 1;
+    }
+    group->count = group->count + count;
+    if (group->count == 0 && count < 0){
+        table->empty = table->empty + 1;
+        //fara resturi de virgula mobila intr-un grup gol
+        group->cpu_percent = 0.0;
+        group->rss_kb = 0;
+        return;
+    }
+    group->cpu_percent = group->cpu_percent + cpu;
+    group->rss_kb = (uint64_t)((int64_t)group->rss_kb + rss_kb);
+}
+
+//─── noduri si legaturi ────────────────────────────────────────────────────
+
+static int list_push(int **list, int *count, int *capacity, int value){
+    if (*count == *capacity){
+        int grown_capacity = *capacity ? *capacity * 2 : GROUP_MIN;
+        int *grown = realloc(*list, (size_t)grown_capacity * sizeof(int));
+        if (grown == NULL){
+            return 0;
+        }
+        *list = grown;
+        *capacity = grown_capacity;
+    }
+    (*list)[*count] = value;
+    *count = *count + 1;
+    return 1;
+}
+
+static int node_alloc(void){
+    if (free_nodes < 0){
+        int capacity = node_capacity ? node_capacity * 2 : TREE_MIN;
+        TreeNode *grown = realloc(nodes, (size_t)capacity * sizeof(TreeNode));
+        if (grown == NULL){
+            fprintf(stderr, "Could not grow process tree\n");
+            return -1;
+        }
+        nodes = grown;
+        //nodurile noi intra in lista libera, primul la inceput
+        for (int i = capacity - 1; i >= node_capacity; i = i - 1){
+            nodes[i].pid = 0;
+            nodes[i].next_sibling = free_nodes;
+            free_nodes = i;
+        }
+        node_capacity = capacity;
+    }
+
+    int index = free_nodes;
+    free_nodes = nodes[index].next_sibling;
+    node_count = node_count + 1;
+    return index;
+}
+
+static void node_free(int index){
+    nodes[index].pid = 0;
+    nodes[index].next_sibling = free_nodes;
+    free_nodes = index;
+    node_count = node_count - 1;
+}
+
+//adauga diferenta la nod si la toti stramosii lui
+static void add_to_ancestors(int index, double cpu, int64_t rss_kb, int count){
+    while (index >= 0){
+        TreeNode *node = &nodes[index];
+        node->subtree_cpu = node->subtree_cpu + cpu;
+        node->subtree_rss_kb = (uint64_t)((int64_t)node->subtree_rss_kb + rss_kb);
+        node->subtree_count = node->subtree_count + count;
+        index = node->parent;
+    }
+}
+
+static void node_link(int index, int parent){
+    TreeNode *node = &nodes[index];
+    node->parent = parent;
+    node->prev_sibling = -1;
+    node->next_sibling = nodes[parent].first_child;
+    if (node->next_sibling >= 0){
+        nodes[node->next_sibling].prev_sibling = index;
+    }
+    nodes[parent].first_child = index;
+    add_to_ancestors(parent, node->subtree_cpu, (int64_t)node->subtree_rss_kb, node->subtree_count);
+}
+
+static void node_unlink(int index){
+    TreeNode *node = &nodes[index];
+    if (node->parent < 0){
+        return;
+    }
+
+    add_to_ancestors(node->parent, -node->subtree_cpu, -(int64_t)node->subtree_rss_kb, -node->subtree_count);
+    if (node->prev_sibling >= 0){
+        nodes[node->prev_sibling].next_sibling = node->next_sibling;
+    }else{
+        nodes[node->parent].first_child = node->next_sibling;
+    }
+    if (node->next_sibling >= 0){
+        nodes[node->next_sibling].prev_sibling = node->prev_sibling;
+    }
+    node->parent = -1;
+    node->prev_sibling = -1;
+    node->next_sibling = -1;
+}
+
+//leaga nodul de parintele dupa ppid; fara parinte (sau cand ar face un ciclu, la pid-uri refolosite)
+//ramane radacina
+static void node_attach(int index){
+    TreeNode *node = &nodes[index];
+    int parent = node->ppid > 0 ? find_node(node->ppid) : -1;
+    for (int up = parent; up >= 0; up = nodes[up].parent){
+        if (up == index){
+            parent = -1;
+            break;
+        }
+    }
+
+    if (parent >= 0){
+        node->detached = 0;
+        node_link(index, parent);
+    }else if (node->ppid > 0 && find_node(node->ppid) < 0){
+        node->detached = 1;
+        list_push(&detached, &detached_count, &detached_capacity, index);
+    }
+}
+
+static void node_remove(int index){
+    //copiii raman radacini pana cand kernelul ii muta la alt parinte (se vede in ppid)
+    while (nodes[index].first_child >= 0){
+        int child = nodes[index].first_child;
+        node_unlink(child);
+        if (nodes[child].ppid > 0){
+            nodes[child].detached = 1;
+            list_push(&detached, &detached_count, &detached_capacity, child);
+        }
+    }
+    node_unlink(index);
+
+    TreeNode *node = &nodes[index];
+    group_add(&users, node->user, -node->cpu_percent, -(int64_t)node->rss_kb, -1);
+    group_add(&cgroups, node->cgroup, -node->cpu_percent, -(int64_t)node->rss_kb, -1);
+    pid_index_remove(node->pid);
+    node_free(index);
+}
+
+//─── scanarea ──────────────────────────────────────────────────────────────
+
+void proctree_begin(void){
+    scan_round = scan_round + 1;
+    pending_count = 0;
+    arrived = 0;
+}
+
+int proctree_update(const ProcessRecord *record, uint64_t start_time, int *needs_cgroup){
+    *needs_cgroup = 0;
+    int index = find_node(record->pid);
+    if (index < 0){
+        index = node_alloc();
+        if (index < 0){
+            return -1;
+        }
+        if (!pid_index_insert(record->pid, index)){
+            node_free(index);
+            return -1;
+        }
+
+        TreeNode *node = &nodes[index];
+        memset(node, 0, sizeof(*node));
+        node->pid = record->pid;
+        node->ppid = record->ppid;
+        node->parent = -1;
+        node->first_child = -1;
+        node->next_sibling = -1;
+        node->prev_sibling = -1;
+        node->uid = record->uid;
+        node->cgroup = -1;
+        node->subtree_count = 1;
+        node->start_time = start_time;
+        memcpy(node->name, record->name, sizeof(node->name));
+        node->user = group_find(&users, record->uid, NULL);
+        group_add(&users, node->user, 0.0, 0, 1);
+
+        list_push(&pending, &pending_count, &pending_capacity, index);
+        arrived = arrived + 1;
+        *needs_cgroup = 1;
+    }else{
+        TreeNode *node = &nodes[index];
+        if (node->ppid != record->ppid){
+            node_unlink(index);
+            node->ppid = record->ppid;
+            node->detached = 0;
+            list_push(&pending, &pending_count, &pending_capacity, index);
+        }
+        //exec: de obicei dupa ce procesul a fost mutat in cgroup-ul lui (systemd, runc)
+        if (strncmp(node->name, record->name, sizeof(node->name)) != 0 || node->start_time != start_time){
+            memcpy(node->name, record->name, sizeof(node->name));
+            node->start_time = start_time;
+            *needs_cgroup = 1;
+        }
+        if (node->uid != record->uid){
+            group_add(&users, node->user, -node->cpu_percent, -(int64_t)node->rss_kb, -1);
+            node->uid = record->uid;
+            node->user = group_find(&users, record->uid, NULL);
+            group_add(&users, node->user, node->cpu_percent, (int64_t)node->rss_kb, 1);
+        }
+    }
+
+    //doar procesele care s-au schimbat urca pana la radacina
+    TreeNode *node = &nodes[index];
+    node->seen = scan_round;
+    double cpu_delta = (double)record->cpu_percent - node->cpu_percent;
+    int64_t rss_delta = (int64_t)record->rss_kb - (int64_t)node->rss_kb;
+    if (cpu_delta != 0.0 || rss_delta != 0){
+        node->cpu_percent = record->cpu_percent;
+        node->rss_kb = record->rss_kb;
+        add_to_ancestors(index, cpu_delta, rss_delta, 0);
+        group_add(&users, node->user, cpu_delta, rss_delta, 0);
+        group_add(&cgroups, node->cgroup, cpu_delta, rss_delta, 0);
+    }
+    return index;
+}
+
+void proctree_set_cgroup(int index, const char *path){
+    if (index < 0){
+        return;
+    }
+
+    TreeNode *node = &nodes[index];
+    int cgroup = group_find(&cgroups, 0, path);
+    if (cgroup == node->cgroup){
+        return;
+    }
+    //group_find poate compacta tabela si renumerota node->cgroup
+    group_add(&cgroups, node->cgroup, -node->cpu_percent, -(int64_t)node->rss_kb, -1);
+    node->cgroup = cgroup;
+    group_add(&cgroups, cgroup, node->cpu_percent, (int64_t)node->rss_kb, 1);
+}
+
+void proctree_end(void){
+    for (int i = 0; i < node_capacity; i = i + 1){
+        if (nodes[i].pid != 0 && nodes[i].seen != scan_round){
+            node_remove(i);
+        }
+    }
+
+    for (int i = 0; i < pending_count; i = i + 1){
+        node_attach(pending[i]);
+    }
+
+    //radacinile in asteptare isi pot gasi parintele doar cand apar procese noi
+    if (arrived == 0 || detached_count == 0){
+        return;
+    }
+    int waiting = detached_count;
+    detached_count = 0;
+    for (int i = 0; i < waiting; i = i + 1){
+        int index = detached[i];
+        TreeNode *node = &nodes[index];
+        if (node->pid == 0 || node->detached != 1 || node->parent >= 0){
+            continue; //a disparut, a fost deja legat sau e de doua ori in lista
+        }
+        node->detached = 0;
+        node_attach(index);
+        if (node->detached){
+            node->detached = 2;
+        }
+    }
+    for (int i = 0; i < detached_count; i = i + 1){
+        nodes[detached[i]].detached = 1;
+    }
+}
+
+//─── rezultate ─────────────────────────────────────────────────────────────
+
+void proctree_get_nodes(const ProcessRecord *records, int count, ProcessTreeNode *out, double total_ram_kb){
+    for (int i = 0; i < count; i = i + 1){
+        int index = find_node(records[i].pid);
+        if (index < 0){
+            memset(&out[i], 0, sizeof(out[i]));
+            continue;
+        }
+
+        const TreeNode *node = &nodes[index];
+        //sumele sunt tinute prin diferente: fara -0.0 din rotunjiri
+        double cpu = node->subtree_cpu > 0.0 ? node->subtree_cpu : 0.0;
+        out[i].subtree_rss_kb = node->subtree_rss_kb;
+        out[i].parent_pid = node->parent >= 0 ? nodes[node->parent].pid : 0;
+        out[i].descendants = node->subtree_count - 1;
+        out[i].subtree_cpu_percent = (float)cpu;
+        out[i].subtree_ram_percent = total_ram_kb > 0 ? (float)((double)node->subtree_rss_kb / total_ram_kb * 100.0) : 0.0f;
+    }
+}
+
+int proctree_get_rollups(int kind, ProcessRollup *out, int capacity, int *total, double total_ram_kb){
+    const GroupTable *table = kind == ROLLUP_USERS ? &users : &cgroups;
+    int written = 0;
+    int groups = 0;
+    for (int i = 0; i < table->count; i = i + 1){
+        const Group *group = &table->groups[i];
+        if (group->count <= 0){
+            continue;
+        }
+        groups = groups + 1;
+        if (out == NULL || written >= capacity){
+            continue;
+        }
+
+        ProcessRollup *rollup = &out[written];
+        rollup->rss_kb = group->rss_kb;
+        rollup->uid = group->uid;
+        rollup->process_count = group->count;
+        rollup->cpu_percent = group->cpu_percent > 0.0 ? (float)group->cpu_percent : 0.0f;
+        rollup->ram_percent = total_ram_kb > 0 ? (float)((double)group->rss_kb / total_ram_kb * 100.0) : 0.0f;
+        const char *name = kind == ROLLUP_USERS ? processes_user_name(group->uid) : group->name;
+        strncpy(rollup->name, name, sizeof(rollup->name) - 1);
+        rollup->name[sizeof(rollup->name) - 1] = '\0';
+        written = written + 1;
+    }
+
+    if (total != NULL){
+        *total = groups;
+    }
+    return written;
+}
+
+static void group_table_reset(GroupTable *table){
+    table->count = 0;
+    table->empty = 0;
+    if (table->slots != NULL){
+        memset(table->slots, 0xff, table->slot_capacity * sizeof(int));
+    }
+}
+
+void proctree_reset(void){
+    free_nodes = -1;
+    for (int i = node_capacity - 1; i >= 0; i = i - 1){
+        nodes[i].pid = 0;
+        nodes[i].next_sibling = free_nodes;
+        free_nodes = i;
+    }
+    node_count = 0;
+    if (pid_slots != NULL){
+        memset(pid_slots, 0xff, pid_slot_capacity * sizeof(int));
+    }
+    pending_count = 0;
+    detached_count = 0;
+    group_table_reset(&users);
+    group_table_reset(&cgroups);
+}
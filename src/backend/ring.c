@@ -0,0 +1,115 @@
+#include "include/ring.h"
+#include <stdio.h>
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <time.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+int ring_writer_open(Ring *ring, const char *name, uint32_t slot_count){
+    if (slot_count == 0){
+        slot_count = RING_DEFAULT_SLOTS;
+    }
+
+    snprintf(ring->path, sizeof(ring->path), "%s%s", RING_SHM_DIR, name);
+    ring->size = sizeof(RingHeader) + (size_t)slot_count * sizeof(RingSlot);
+    ring->header = NULL;
+    ring->slots = NULL;
+
+    //zona noua se pregateste sub un nume temporar si abia apoi ia locul celei vechi (rename):
+    //cititorii atasati la un colector anterior raman cu maparea lor intreaga (fara zerouri
+    //sau SIGBUS cand se schimba numarul de sloturi) si se reataseaza cand vad alt inode
+    char tmp_path[LEN_LINE + 32];
+    snprintf(tmp_path, sizeof(tmp_path), "%s.%ld.tmp", ring->path, (long)getpid());
+    unlink(tmp_path);
+    ring->fd = open(tmp_path, O_RDWR | O_CREAT | O_EXCL | O_CLOEXEC, 0644);
+    if (ring->fd < 0){
+        fprintf(stderr, "Could not create %s\n", tmp_path);
+        return 0;
+    }
+
+    if (ftruncate(ring->fd, (off_t)ring->size) != 0){
+        fprintf(stderr, "Could not resize %s\n", tmp_path);
+        close(ring->fd);
+        unlink(tmp_path);
+        ring->fd = -1;
+        return 0;
+    }
+
+    void *base = mmap(NULL, ring->size, PROT_READ | PROT_WRITE, MAP_SHARED, ring->fd, 0);
+    if (base == MAP_FAILED){
+        fprintf(stderr, "Could not map %s\n", tmp_path);
+        close(ring->fd);
+        unlink(tmp_path);
+        ring->fd = -1;
+        return 0;
+    }
+
+    ring->header = (RingHeader *)base;
+    ring->slots = (RingSlot *)((char *)base + sizeof(RingHeader));
+
+    ring->header->slot_count = slot_count;
+    ring->header->record_size = (uint32_t)sizeof(SystemMetrics);
+    ring->header->version = RING_VERSION;
+    ring->header->writer_pid = (uint64_t)getpid();
+    ring->header->head = 0;
+    //magic la final: cititorii nu folosesc zona pana nu e gata
+    __atomic_store_n(&ring->header->magic, RING_MAGIC, __ATOMIC_RELEASE);
+
+    if (rename(tmp_path, ring->path) != 0){
+        fprintf(stderr, "Could not replace %s\n", ring->path);
+        munmap(base, ring->size);
+        close(ring->fd);
+        unlink(tmp_path);
+        ring->header = NULL;
+        ring->slots = NULL;
+        ring->fd = -1;
+        return 0;
+    }
+    return 1;
+}
+
+void ring_writer_push(Ring *ring, const SystemMetrics *metrics, double sample_ms){
+    uint64_t index = ring->header->head;
+    RingSlot *slot = &ring->slots[index % ring->header->slot_count];
+
+    struct timespec ts;
+    clock_gettime(CLOCK_REALTIME, &ts);
+
+    //seq impar cat timp scriem; cititorii care vad asta reincearca
+    uint64_t seq = slot->seq;
+    __atomic_store_n(&slot->seq, seq + 1, __ATOMIC_RELAXED);
+    __atomic_thread_fence(__ATOMIC_RELEASE);
+
+    slot->sample_index = index;
+    slot->timestamp = (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+    slot->sample_ms = sample_ms;
+    memcpy(&slot->metrics, metrics, sizeof(SystemMetrics));
+
+    __atomic_store_n(&slot->seq, seq + 2, __ATOMIC_RELEASE);
+    __atomic_store_n(&ring->header->head, index + 1, __ATOMIC_RELEASE);
+}
+
+void ring_close(Ring *ring, int unlink_file){
+    if (ring->header != NULL){
+        munmap(ring->header, ring->size);
+        ring->header = NULL;
+        ring->slots = NULL;
+    }
+
+    //stergem numele doar daca inca e al nostru: un colector pornit intre timp l-a inlocuit deja
+    if (unlink_file && ring->fd >= 0){
+        struct stat ours;
+        struct stat current;
+        if (fstat(ring->fd, &ours) == 0 && stat(ring->path, &current) == 0 &&
+            ours.st_dev == current.st_dev && ours.st_ino == current.st_ino){
+            unlink(ring->path);
+        }
+    }
+
+    if (ring->fd >= 0){
+        close(ring->fd);
+        ring->fd = -1;
+    }
+}
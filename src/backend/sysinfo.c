@@ -3,14 +3,17 @@
 #include <sys/utsname.h>
 #include <string.h>
 
-int sysinfo_get_data(SysInfoData* info){
-    //luam uptime-ul(de cand ii aprins pc-ul)
+//luam uptime-ul(de cand ii aprins pc-ul)
+long sysinfo_get_uptime(void){
     struct sysinfo s_info;
     if (sysinfo(&s_info) == 0){
-        info->uptime_seconds = s_info.uptime;
-    }else{
-        info->uptime_seconds = 0;
+        return s_info.uptime;
     }
+    return 0;
+}
+
+int sysinfo_get_data(SysInfoData* info){
+    info->uptime_seconds = sysinfo_get_uptime();
 
     //luam informatiile despre kernel
     struct utsname u_name;
@@ -0,0 +1,159 @@
+//Colector headless: scrie SystemMetrics intr-un ring buffer din /dev/shm
+//
+//  monitord [-n name] [-s slots] [-i interval_ms] [-H history_dir] [-a rules] [-A sink]
+//
+//Cu -a, fiecare esantion trece si prin regulile de alerta; evenimentele merg
+//in sink (fisier sau unix:/cale), implicit pe stderr.
+//
+//kill -USR1 <pid> scrie pe stderr cat a costat fiecare colector (rulari, medie, ultima).
+//
+//Oricate ferestre (main.py --ring) sau scripturi pot citi acelasi ring,
+//fara sa mai porneasca fiecare propriul ps / nvidia-smi.
+
+#include "ring.h"
+#include "history.h"
+#include "alerts.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <signal.h>
+#include <errno.h>
+#include <time.h>
+#include <unistd.h>
+
+static volatile sig_atomic_t running = 1;
+static volatile sig_atomic_t dump_timings = 0;
+
+static void handle_stop(int signum){
+    (void)signum;
+    running = 0;
+}
+
+static void handle_dump(int signum){
+    (void)signum;
+    dump_timings = 1;
+}
+
+static double elapsed_ms(const struct timespec *start, const struct timespec *end){
+    return (end->tv_sec - start->tv_sec) * 1000.0 + (end->tv_nsec - start->tv_nsec) / 1e6;
+}
+
+static void add_ms(struct timespec *ts, long ms){
+    ts->tv_sec += ms / 1000;
+    ts->tv_nsec += (ms % 1000) * 1000000L;
+    if (ts->tv_nsec >= 1000000000L){
+        ts->tv_sec += 1;
+        ts->tv_nsec -= 1000000000L;
+    }
+}
+
+int main(int argc, char **argv){
+    const char *name = RING_DEFAULT_NAME;
+    long slots = RING_DEFAULT_SLOTS;
+    long interval_ms = 1000;
+    const char *history_dir = NULL;
+    const char *rules_path = NULL;
+    const char *alert_sink = NULL;
+
+    int opt;
+    while ((opt = getopt(argc, argv, "n:s:i:H:a:A:")) != -1){
+        switch (opt){
+            case 'n': name = optarg; break;
+            case 's': slots = atol(optarg); break;
+            case 'i': interval_ms = atol(optarg); break;
+            case 'H': history_dir = optarg; break;
+            case 'a': rules_path = optarg; break;
+            case 'A': alert_sink = optarg; break;
+            default:
+                fprintf(stderr, "usage: %s [-n name] [-s slots] [-i interval_ms] [-H history_dir] [-a rules] [-A sink]\n", argv[0]);
+                return 1;
+        }
+    }
+
+    if (slots < 2 || interval_ms < 10){
+        fprintf(stderr, "Need at least 2 slots and a 10 ms interval\n");
+        return 1;
+    }
+
+    Ring ring;
+    if (!ring_writer_open(&ring, name, (uint32_t)slots)){
+        return 1;
+    }
+
+    HistoryStore *history = NULL;
+    if (history_dir != NULL){
+        history = history_open(history_dir, 1);
+        if (history == NULL){
+            ring_close(&ring, 1);
+            return 1;
+        }
+    }
+
+    AlertEngine *alerts = NULL;
+    if (rules_path != NULL){
+        alerts = alerts_open(alert_sink);
+        //la fel ca bridge.open_alerts: un fisier fara nicio regula valida e o eroare
+        int loaded = alerts != NULL ? alerts_load_rules(alerts, rules_path) : -1;
+        if (loaded == 0){
+            fprintf(stderr, "Could not find any valid alert rule in %s\n", rules_path);
+        }
+        if (loaded <= 0){
+            alerts_close(alerts);
+            history_close(history);
+            ring_close(&ring, 1);
+            return 1;
+        }
+    }
+
+    struct sigaction action = {0};
+    action.sa_handler = handle_stop;
+    sigaction(SIGINT, &action, NULL);
+    sigaction(SIGTERM, &action, NULL);
+    action.sa_handler = handle_dump;
+    sigaction(SIGUSR1, &action, NULL);
+
+    printf("Writing samples to %s (%ld slots, every %ld ms)\n", ring.path, slots, interval_ms);
+    fflush(stdout);
+
+    //baza pentru ratele din primul esantion, scris dupa un interval, nu cu CPU 0%
+    static SystemMetrics metrics;
+    prime_system_metrics();
+    struct timespec next;
+    clock_gettime(CLOCK_MONOTONIC, &next);
+    add_ms(&next, interval_ms);
+    clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &next, NULL);
+
+    while (running){
+        struct timespec start, end;
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        get_system_metrics(&metrics);
+        clock_gettime(CLOCK_MONOTONIC, &end);
+
+        ring_writer_push(&ring, &metrics, elapsed_ms(&start, &end));
+        if (history != NULL){
+            struct timespec wall;
+            clock_gettime(CLOCK_REALTIME, &wall);
+            history_append(history, (double)wall.tv_sec + (double)wall.tv_nsec / 1e9, &metrics);
+        }
+        if (alerts != NULL){
+            alerts_evaluate(alerts, &metrics, (double)end.tv_sec + (double)end.tv_nsec / 1e9);
+        }
+        if (dump_timings){
+            dump_timings = 0;
+            print_collector_timings(stderr);
+        }
+
+        //termen absolut, ca intarzierile sa nu se adune
+        if (end.tv_sec > next.tv_sec + 1){
+            next = end; //am ramas mult in urma, nu recuperam in rafala
+        }
+        add_ms(&next, interval_ms);
+        //SIGUSR1 intrerupe somnul; termenul e absolut, asa ca doar il reluam
+        while (clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &next, NULL) == EINTR && running){
+        }
+    }
+
+    alerts_close(alerts);
+    history_close(history);
+    ring_close(&ring, 1);
+    return 0;
+}
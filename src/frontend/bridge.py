@@ -0,0 +1,525 @@
+"""ctypes bridge to libmonitor.so: struct layouts, constants and library loading.
+
+Kept free of Qt so headless scripts (ring readers, tools) can import it.
+"""
+import ctypes
+import os
+import time
+
+MAX_CORES = 1024
+MAX_PROCESSES = 30
+LEN_LINE = 512
+STR_LEN = 256
+PROC_NAME_LEN = 16
+PROC_USER_LEN = 32
+MAX_GPUS = 8
+MAX_INTERFACES = 32
+IFACE_NAME_LEN = 16
+MAX_MOUNTS = 16
+MAX_DISK_DEVICES = 16
+MOUNT_PATH_LEN = 128
+DEVICE_NAME_LEN = 32
+FS_TYPE_LEN = 16
+GPU_NAME_LEN = 96
+MAX_CGROUPS = 16
+CGROUP_PATH_LEN = 128
+
+# Collector ids - must match the CollectorId enum in core.h
+COLLECTOR_CPU       = 0
+COLLECTOR_MEMORY    = 1
+COLLECTOR_DISK      = 2
+COLLECTOR_NETWORK   = 3
+COLLECTOR_PROCESSES = 4
+COLLECTOR_GPU       = 5
+COLLECTOR_SYSINFO   = 6
+COLLECTOR_DISK_IO   = 7
+COLLECTOR_PRESSURE  = 8
+COLLECTOR_CGROUPS   = 9
+COLLECTOR_COUNT     = 10
+
+# Short names, in CollectorId order (same as collector_names in core.c)
+COLLECTOR_NAMES = ("cpu", "memory", "disk", "network", "processes", "gpu", "sysinfo", "disk_io",
+                   "pressure", "cgroups")
+
+# Sampling period per collector, in seconds. Collectors that are not due
+# return their cached values; updated_at[] tells how fresh each group is.
+COLLECTOR_PERIODS = {
+    COLLECTOR_CPU:       1.0,
+    COLLECTOR_MEMORY:    1.0,
+    COLLECTOR_DISK:      10.0,
+    COLLECTOR_NETWORK:   1.0,
+    COLLECTOR_PROCESSES: 1.0,
+    COLLECTOR_GPU:       2.0,
+    COLLECTOR_SYSINFO:   1.0,
+    COLLECTOR_DISK_IO:   1.0,   # throughput counters; COLLECTOR_DISK is the slow statvfs pass
+    COLLECTOR_PRESSURE:  1.0,   # /proc/pressure, loadavg, vmstat
+    COLLECTOR_CGROUPS:   1.0,   # cgroup v2 walk, rescanned every 10 s
+}
+
+# EWMA time constant for the network rates, in seconds (0 = raw per-interval rates)
+NETWORK_SMOOTHING_SECONDS = 0.0
+
+class ProcessData(ctypes.Structure):
+    _fields_ = [
+        ("pid", ctypes.c_int),
+        ("name", ctypes.c_char * PROC_NAME_LEN),
+        ("start_ticks", ctypes.c_uint),   # starttime from /proc/<pid>/stat, mod 2**32
+        ("cpu_percent", ctypes.c_double),
+        ("ram_percent", ctypes.c_double),
+        ("user", ctypes.c_char * PROC_USER_LEN)
+    ]
+
+# Compact record for the full process list (processes_get_snapshot) - must match processes.h
+class ProcessRecord(ctypes.Structure):
+    _fields_ = [
+        ("rss_kb", ctypes.c_uint64),
+        ("pid", ctypes.c_int),
+        ("ppid", ctypes.c_int),
+        ("uid", ctypes.c_uint),
+        ("cpu_percent", ctypes.c_float),
+        ("ram_percent", ctypes.c_float),
+        ("state", ctypes.c_char),
+        ("name", ctypes.c_char * PROC_NAME_LEN),
+    ]
+
+class ProcessTreeNode(ctypes.Structure):
+    """Tree columns for the ProcessRecord at the same index of a snapshot."""
+    _fields_ = [
+        ("subtree_rss_kb", ctypes.c_uint64),   # the process and all its descendants
+        ("parent_pid", ctypes.c_int),          # 0 = root (ppid 0 or a parent we cannot see)
+        ("descendants", ctypes.c_int),
+        ("subtree_cpu_percent", ctypes.c_float),
+        ("subtree_ram_percent", ctypes.c_float),
+    ]
+
+ROLLUP_USERS = 0
+ROLLUP_CGROUPS = 1
+ROLLUP_NAME_LEN = 128
+
+class ProcessRollup(ctypes.Structure):
+    _fields_ = [
+        ("rss_kb", ctypes.c_uint64),
+        ("uid", ctypes.c_uint),                 # ROLLUP_USERS only
+        ("process_count", ctypes.c_int),
+        ("cpu_percent", ctypes.c_float),
+        ("ram_percent", ctypes.c_float),
+        ("name", ctypes.c_char * ROLLUP_NAME_LEN),   # user name or cgroup path
+    ]
+
+class GpuData(ctypes.Structure):
+    _fields_ = [
+        ("name", ctypes.c_char * GPU_NAME_LEN),
+        ("usage_percent", ctypes.c_double),
+        ("memory_total_mb", ctypes.c_double),
+        ("memory_used_mb", ctypes.c_double),
+    ]
+
+class MountData(ctypes.Structure):
+    _fields_ = [
+        ("mount_point", ctypes.c_char * MOUNT_PATH_LEN),
+        ("device", ctypes.c_char * DEVICE_NAME_LEN),   # /proc/diskstats name, b"" if not block-backed
+        ("fs_type", ctypes.c_char * FS_TYPE_LEN),
+        ("total_gb", ctypes.c_double),
+        ("used_gb", ctypes.c_double),
+        ("free_gb", ctypes.c_double),
+        ("usage_percent", ctypes.c_double),
+    ]
+
+class DiskIoData(ctypes.Structure):
+    _fields_ = [
+        ("name", ctypes.c_char * DEVICE_NAME_LEN),
+        ("read_bytes_per_sec", ctypes.c_double),
+        ("write_bytes_per_sec", ctypes.c_double),
+        ("read_iops", ctypes.c_double),
+        ("write_iops", ctypes.c_double),
+        ("util_percent", ctypes.c_double),
+    ]
+
+class InterfaceRates(ctypes.Structure):
+    _fields_ = [
+        ("name", ctypes.c_char * IFACE_NAME_LEN),
+        ("rx_kbps", ctypes.c_double),
+        ("tx_kbps", ctypes.c_double),
+        ("rx_packets", ctypes.c_double),   # per second, like the errors and drops
+        ("tx_packets", ctypes.c_double),
+        ("rx_errors", ctypes.c_double),
+        ("tx_errors", ctypes.c_double),
+        ("rx_drops", ctypes.c_double),
+        ("tx_drops", ctypes.c_double),
+        ("rx_bytes", ctypes.c_uint64),     # raw /proc/net/dev counters
+        ("tx_bytes", ctypes.c_uint64),
+    ]
+
+class PsiData(ctypes.Structure):
+    """One /proc/pressure resource, in percent of wall time stalled."""
+    _fields_ = [
+        ("some_avg10", ctypes.c_double),   # the kernel's 10 s / 60 s / 300 s averages
+        ("some_avg60", ctypes.c_double),
+        ("some_avg300", ctypes.c_double),
+        ("full_avg10", ctypes.c_double),
+        ("full_avg60", ctypes.c_double),
+        ("full_avg300", ctypes.c_double),
+        ("some_percent", ctypes.c_double),   # from total=, over the last sampling interval
+        ("full_percent", ctypes.c_double),
+    ]
+
+class CgroupData(ctypes.Structure):
+    _fields_ = [
+        ("path", ctypes.c_char * CGROUP_PATH_LEN),   # relative to the cgroup2 root
+        ("depth", ctypes.c_int),
+        ("cpu_percent", ctypes.c_double),   # 100 = one full core, like processes
+        ("cpu_throttled_percent", ctypes.c_double),
+        ("memory_mb", ctypes.c_double),
+        ("memory_limit_mb", ctypes.c_double),   # 0 = no memory.max
+    ]
+
+class SystemMetrics(ctypes.Structure):
+    _fields_ = [
+        ("cpu_model", ctypes.c_char * LEN_LINE),
+        ("core_count", ctypes.c_int),
+        ("cpu_freq_mhz", ctypes.c_double),
+        ("cpu_usage_percent", ctypes.c_double),
+        ("cpu_cores_usage", ctypes.c_double * MAX_CORES),
+        ("ram_total_gb", ctypes.c_double),
+        ("ram_used_gb", ctypes.c_double),
+        ("ram_usage_percent", ctypes.c_double),
+        ("disk_total_gb", ctypes.c_double),
+        ("disk_used_gb", ctypes.c_double),
+        ("disk_usage_percent", ctypes.c_double),
+        ("mount_count", ctypes.c_int),
+        ("mounts", MountData * MAX_MOUNTS),   # mounts[0] is "/"
+        ("disk_io_count", ctypes.c_int),
+        ("disk_io", DiskIoData * MAX_DISK_DEVICES),
+        ("uptime_seconds", ctypes.c_long),
+        ("os_name", ctypes.c_char * LEN_LINE),
+        ("kernel_version", ctypes.c_char * LEN_LINE),
+        ("gpu_name", ctypes.c_char * LEN_LINE),
+        ("gpu_usage_percent", ctypes.c_double),
+        ("gpu_memory_total_gb", ctypes.c_double),
+        ("gpu_memory_used_gb", ctypes.c_double),
+        ("process_count", ctypes.c_int),
+        ("processes", ProcessData * MAX_PROCESSES),
+        # Network speed fields - must match order in core.h
+        ("net_rx_kbps", ctypes.c_double),
+        ("net_tx_kbps", ctypes.c_double),
+        ("net_interface_count", ctypes.c_int),
+        ("net_interfaces", InterfaceRates * MAX_INTERFACES),
+        # CLOCK_MONOTONIC seconds (same clock as time.monotonic()) per collector
+        ("updated_at", ctypes.c_double * COLLECTOR_COUNT),
+        # Every GPU; the gpu_* fields above mirror GPU 0
+        ("gpu_count", ctypes.c_int),
+        ("gpus", GpuData * MAX_GPUS),
+        # Saturation: PSI, load average, scheduler and paging rates, swap
+        ("psi_available", ctypes.c_int),
+        ("cpu_pressure", PsiData),
+        ("memory_pressure", PsiData),
+        ("io_pressure", PsiData),
+        ("load_avg_1", ctypes.c_double),
+        ("load_avg_5", ctypes.c_double),
+        ("load_avg_15", ctypes.c_double),
+        ("tasks_runnable", ctypes.c_int),
+        ("tasks_total", ctypes.c_int),
+        ("tasks_blocked", ctypes.c_int),
+        ("context_switches_per_sec", ctypes.c_double),
+        ("interrupts_per_sec", ctypes.c_double),
+        ("forks_per_sec", ctypes.c_double),
+        ("page_faults_per_sec", ctypes.c_double),
+        ("major_faults_per_sec", ctypes.c_double),
+        ("swap_in_per_sec", ctypes.c_double),   # pages
+        ("swap_out_per_sec", ctypes.c_double),
+        ("swap_total_gb", ctypes.c_double),
+        ("swap_used_gb", ctypes.c_double),
+        ("swap_usage_percent", ctypes.c_double),
+        # cgroup v2: all are walked, the top MAX_CGROUPS by CPU land here
+        ("cgroup_total", ctypes.c_int),
+        ("cgroup_count", ctypes.c_int),
+        ("cgroups", CgroupData * MAX_CGROUPS),
+    ]
+
+class CollectorTimings(ctypes.Structure):
+    """What the monitor itself costs: microseconds per collector inside get_system_metrics."""
+    _fields_ = [
+        ("last_us", ctypes.c_double * COLLECTOR_COUNT),    # last run of each collector
+        ("total_us", ctypes.c_double * COLLECTOR_COUNT),   # since load (or reset_collector_timings)
+        ("runs", ctypes.c_long * COLLECTOR_COUNT),
+        ("sample_last_us", ctypes.c_double),   # the whole get_system_metrics call
+        ("sample_total_us", ctypes.c_double),
+        ("samples", ctypes.c_long),
+    ]
+
+class HistoryPoint(ctypes.Structure):
+    _fields_ = [
+        ("timestamp", ctypes.c_double),   # seconds since the epoch
+        ("avg", ctypes.c_double),
+        ("min", ctypes.c_double),
+        ("max", ctypes.c_double),
+    ]
+
+HISTORY_LEVEL_AUTO = -1
+HISTORY_LEVEL_RAW  = 0
+HISTORY_LEVEL_10S  = 1
+HISTORY_LEVEL_1M   = 2
+HISTORY_LEVEL_1H   = 3
+# Alert rules ("name: field > value [for 30s] [clear value]", one per line) and where events go
+ALERT_MAX_RULES = 64
+ALERT_NAME_LEN = 64
+ALERT_OK      = 0
+ALERT_PENDING = 1
+ALERT_FIRING  = 2
+ALERT_RULES_PATH = os.path.join(os.path.expanduser("~"), ".config", "system-monitor", "alerts.conf")
+ALERT_LOG_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "system-monitor", "alerts.log")
+
+class AlertStatus(ctypes.Structure):
+    _fields_ = [
+        ("name", ctypes.c_char * ALERT_NAME_LEN),
+        ("field", ctypes.c_char * ALERT_NAME_LEN),
+        ("state", ctypes.c_int),          # ALERT_OK / ALERT_PENDING / ALERT_FIRING
+        ("value", ctypes.c_double),       # value in the last evaluated sample
+        ("threshold", ctypes.c_double),
+        ("since", ctypes.c_double),       # CLOCK_MONOTONIC of the last state change
+    ]
+
+HISTORY_DIR = os.path.join(os.path.expanduser("~"), ".local", "share", "system-monitor", "history")
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+lib_path = os.path.abspath(os.path.join(current_dir, '../../build/libmonitor.so'))
+_monitor_lib = None
+_primed_at = None
+
+# Shortest baseline worth a first sample: /proc/stat counts in 10 ms ticks,
+# so a younger baseline gives coarse (or 0%) CPU numbers
+BASELINE_MIN_SECONDS = 0.2
+
+
+def load_monitor_lib():
+    """Load libmonitor.so once, declare its signatures and apply the sampling settings."""
+    global _monitor_lib
+    if _monitor_lib is not None:
+        return _monitor_lib
+
+    lib = ctypes.CDLL(lib_path)
+    lib.get_system_metrics.argtypes = [ctypes.POINTER(SystemMetrics)]
+    lib.get_system_metrics.restype = None
+    lib.prime_system_metrics.argtypes = []
+    lib.prime_system_metrics.restype = None
+    lib.set_collector_period.argtypes = [ctypes.c_int, ctypes.c_double]
+    lib.set_collector_period.restype = ctypes.c_int
+    lib.get_collector_timings.argtypes = [ctypes.POINTER(CollectorTimings)]
+    lib.get_collector_timings.restype = None
+    lib.reset_collector_timings.argtypes = []
+    lib.reset_collector_timings.restype = None
+
+    lib.processes_get_snapshot.argtypes = [ctypes.POINTER(ProcessRecord), ctypes.c_int, ctypes.c_int,
+                                           ctypes.POINTER(ctypes.c_int)]
+    lib.processes_get_snapshot.restype = ctypes.c_int
+    lib.processes_get_tree.argtypes = [ctypes.POINTER(ProcessTreeNode), ctypes.c_int, ctypes.c_int,
+                                       ctypes.POINTER(ctypes.c_int)]
+    lib.processes_get_tree.restype = ctypes.c_int
+    lib.processes_get_rollups.argtypes = [ctypes.c_int, ctypes.POINTER(ProcessRollup), ctypes.c_int,
+                                          ctypes.POINTER(ctypes.c_int)]
+    lib.processes_get_rollups.restype = ctypes.c_int
+    lib.processes_user_name.argtypes = [ctypes.c_uint]
+    lib.processes_user_name.restype = ctypes.c_char_p
+
+    lib.history_open.argtypes = [ctypes.c_char_p, ctypes.c_int]
+    lib.history_open.restype = ctypes.c_void_p
+    lib.history_close.argtypes = [ctypes.c_void_p]
+    lib.history_close.restype = None
+    lib.history_append.argtypes = [ctypes.c_void_p, ctypes.c_double, ctypes.POINTER(SystemMetrics)]
+    lib.history_append.restype = ctypes.c_int
+    lib.history_flush.argtypes = [ctypes.c_void_p]
+    lib.history_flush.restype = ctypes.c_int
+    lib.history_query.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_double, ctypes.c_double,
+                                  ctypes.c_int, ctypes.POINTER(HistoryPoint), ctypes.c_int]
+    lib.history_query.restype = ctypes.c_int
+
+    lib.alerts_open.argtypes = [ctypes.c_char_p]
+    lib.alerts_open.restype = ctypes.c_void_p
+    lib.alerts_close.argtypes = [ctypes.c_void_p]
+    lib.alerts_close.restype = None
+    lib.alerts_add_rule.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+    lib.alerts_add_rule.restype = ctypes.c_int
+    lib.alerts_load_rules.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+    lib.alerts_load_rules.restype = ctypes.c_int
+    lib.alerts_evaluate.argtypes = [ctypes.c_void_p, ctypes.POINTER(SystemMetrics), ctypes.c_double]
+    lib.alerts_evaluate.restype = ctypes.c_int
+    lib.alerts_get_status.argtypes = [ctypes.c_void_p, ctypes.POINTER(AlertStatus), ctypes.c_int]
+    lib.alerts_get_status.restype = ctypes.c_int
+
+    lib.network_set_smoothing.argtypes = [ctypes.c_double]
+    lib.network_set_smoothing.restype = None
+
+    for collector, period in COLLECTOR_PERIODS.items():
+        lib.set_collector_period(collector, period)
+    lib.network_set_smoothing(NETWORK_SMOOTHING_SECONDS)
+
+    # Baseline for every rate, so the first get_system_metrics returns real numbers
+    global _primed_at
+    lib.prime_system_metrics()
+    _primed_at = time.monotonic()
+
+    _monitor_lib = lib
+    return lib
+
+
+def first_sample_delay():
+    """Seconds to wait before the first sample so its rates cover BASELINE_MIN_SECONDS."""
+    load_monitor_lib()
+    return max(0.0, BASELINE_MIN_SECONDS - (time.monotonic() - _primed_at))
+
+
+class ProcessSnapshot:
+    """Caller-owned, growable ProcessRecord buffer for the full process list.
+
+    `fill()` copies the records of the last process scan (it never rescans),
+    so it is cheap to call after every get_system_metrics, from the same
+    thread. `total` is the number of processes on the box; when it exceeds the
+    buffer, the buffer grows and the copy is repeated. Pass `offset`/`limit`
+    to fetch just one page instead. The owners' names are resolved there too
+    (`user_names`, read through `user_name(uid)`), so a GUI thread handed the
+    snapshot never touches the library's uid cache.
+    """
+
+    def __init__(self, capacity=512):
+        self.records = (ProcessRecord * capacity)()
+        self.tree = None   # ProcessTreeNode per record, after fill_tree()
+        self.has_tree = False
+        self.rollups = None   # (kind, [ProcessRollup]) after fill_rollups()
+        self.user_names = {}   # uid -> name for every owner seen by fill()
+        self.offset = 0
+        self.count = 0
+        self.total = 0
+        self._total = ctypes.c_int(0)
+
+    @property
+    def capacity(self):
+        return len(self.records)
+
+    def fill(self, offset=0, limit=None):
+        lib = load_monitor_lib()
+        self.offset = offset
+        self.has_tree = False
+        self.rollups = None
+        want = self.capacity if limit is None else min(limit, self.capacity)
+        self.count = lib.processes_get_snapshot(self.records, offset, want, ctypes.byref(self._total))
+        self.total = self._total.value
+
+        needed = self.total - offset if limit is None else min(limit, self.total - offset)
+        if needed > self.count and (limit is None or limit > self.capacity):
+            # Grow with headroom so a few new processes do not force another resize
+            self.records = (ProcessRecord * (needed + needed // 4))()
+            self.count = lib.processes_get_snapshot(self.records, offset, needed, ctypes.byref(self._total))
+            self.total = self._total.value
+
+        records = self.records
+        for uid in {records[i].uid for i in range(self.count)} - self.user_names.keys():
+            self.user_names[uid] = user_name(uid)
+        return self.count
+
+    def user_name(self, uid):
+        """Owner name for a uid of these records (safe on any thread)."""
+        name = self.user_names.get(uid)
+        return str(uid) if name is None else name
+
+    def fill_tree(self):
+        """Copy the tree columns (parent, subtree CPU/RSS) for the records of the last fill().
+
+        Same rule as fill(): right after it, on the same thread. The tree is kept
+        up to date by the collector, so this is a copy, not a rebuild.
+        """
+        if self.tree is None or len(self.tree) < self.capacity:
+            self.tree = (ProcessTreeNode * self.capacity)()
+        load_monitor_lib().processes_get_tree(self.tree, self.offset, self.count, None)
+        self.has_tree = True
+
+    def fill_rollups(self, kind):
+        """Attach the per-user or per-cgroup totals of the same scan (see process_rollups)."""
+        self.rollups = (kind, process_rollups(kind))
+
+
+def process_rollups(kind, capacity=256):
+    """Per-user (ROLLUP_USERS) or per-cgroup (ROLLUP_CGROUPS) totals of the last process scan.
+
+    Returns a list of ProcessRollup copies in no particular order; call it from
+    the thread that runs get_system_metrics, like ProcessSnapshot.fill().
+    """
+    lib = load_monitor_lib()
+    total = ctypes.c_int(0)
+    rollups = (ProcessRollup * capacity)()
+    count = lib.processes_get_rollups(kind, rollups, capacity, ctypes.byref(total))
+    if total.value > capacity:
+        rollups = (ProcessRollup * total.value)()
+        count = lib.processes_get_rollups(kind, rollups, total.value, ctypes.byref(total))
+    return rollups[:count]
+
+
+_user_names = {}
+
+
+def user_name(uid):
+    """User name for a uid, interned on both sides of the bridge.
+
+    The library's cache is not locked: call this from the thread that runs
+    get_system_metrics (the GUI reads ProcessSnapshot.user_name instead).
+    """
+    name = _user_names.get(uid)
+    if name is None:
+        name = load_monitor_lib().processes_user_name(uid).decode('utf-8', 'replace')
+        _user_names[uid] = name
+    return name
+
+
+def open_history(path=HISTORY_DIR, writable=True):
+    """Open the on-disk history store; returns an opaque handle or None.
+
+    Only one process may write to a store at a time: a writable open returns
+    None while another writer (`monitord -H`, another dashboard) holds it.
+    """
+    handle = load_monitor_lib().history_open(path.encode(), 1 if writable else 0)
+    return handle or None
+
+
+def query_history(store, series, t_from, t_to, max_points=2000, level=HISTORY_LEVEL_AUTO):
+    """Return the HistoryPoints of `series` in [t_from, t_to] (seconds since the epoch).
+
+    Series are named after the SystemMetrics fields ("cpu_usage_percent"),
+    "cpu_cores_usage.<n>" per core, "disk.<dev>.read_bytes_per_sec" /
+    "disk.<dev>.write_bytes_per_sec" / "disk.<dev>.util_percent" per block
+    device, "gpu.<n>.usage_percent" /
+    "gpu.<n>.memory_used_mb" per GPU and "proc.<pid>.<start>.cpu_percent" /
+    "proc.<pid>.<start>.ram_percent" per process in the top list, where
+    <start> is ProcessData.start_ticks (so a reused PID starts a new series).
+    The auto level picks the finest resolution (raw, 10s, 1m, 1h) that fits
+    in max_points.
+    """
+    points = (HistoryPoint * max_points)()
+    count = load_monitor_lib().history_query(store, series.encode(), t_from, t_to, level, points, max_points)
+    return points[:count]
+
+
+def open_alerts(rules_path=ALERT_RULES_PATH, sink=ALERT_LOG_PATH):
+    """Compile the rules file into an alert engine; returns an opaque handle or None.
+
+    `sink` is a log file path, "unix:/path" for a datagram socket, or None for
+    stderr. Returns None when the rules file is missing or has no valid rule.
+    Evaluate with lib.alerts_evaluate(handle, metrics, time.monotonic()).
+    """
+    if rules_path is None or not os.path.exists(rules_path):
+        return None
+    lib = load_monitor_lib()
+    if sink is not None and not sink.startswith("unix:"):
+        os.makedirs(os.path.dirname(os.path.abspath(sink)), exist_ok=True)
+    handle = lib.alerts_open(sink.encode() if sink is not None else None)
+    if not handle:
+        return None
+    if lib.alerts_load_rules(handle, rules_path.encode()) <= 0:
+        lib.alerts_close(handle)
+        return None
+    return handle
+
+
+def alert_status(engine):
+    """Copy of every rule's AlertStatus, in rules-file order."""
+    statuses = (AlertStatus * ALERT_MAX_RULES)()
+    count = load_monitor_lib().alerts_get_status(engine, statuses, ALERT_MAX_RULES)
+    return statuses[:count]
@@ -1,58 +1,44 @@
 import sys
+import argparse
+import contextlib
 import ctypes
 import os
+import threading
+import time
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QGridLayout,
-                             QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView)
-from PyQt6.QtCore import QTimer, Qt, QRectF
+                             QVBoxLayout, QHBoxLayout, QLabel, QTableView, QHeaderView, QLineEdit,
+                             QComboBox, QStackedWidget, QPushButton, QTreeView, QSlider)
+from PyQt6.QtCore import QTimer, Qt, QRectF, QObject, QThread, QMetaObject, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QLinearGradient, QConicalGradient, QRadialGradient, QBrush
-import pyqtgraph as pg
-
-MAX_CORES = 64
-MAX_PROCESSES = 30
-LEN_LINE = 512
-STR_LEN = 256
-
-class ProcessData(ctypes.Structure):
-    _fields_ = [
-        ("pid", ctypes.c_int),
-        ("name", ctypes.c_char * STR_LEN),
-        ("cpu_percent", ctypes.c_double),
-        ("ram_percent", ctypes.c_double),
-        ("user", ctypes.c_char * STR_LEN)
-    ]
-
-class SystemMetrics(ctypes.Structure):
-    _fields_ = [
-        ("cpu_model", ctypes.c_char * LEN_LINE),
-        ("core_count", ctypes.c_int),
-        ("cpu_freq_mhz", ctypes.c_double),
-        ("cpu_usage_percent", ctypes.c_double),
-        ("cpu_cores_usage", ctypes.c_double * MAX_CORES),
-        ("ram_total_gb", ctypes.c_double),
-        ("ram_used_gb", ctypes.c_double),
-        ("ram_usage_percent", ctypes.c_double),
-        ("disk_total_gb", ctypes.c_double),
-        ("disk_used_gb", ctypes.c_double),
-        ("disk_usage_percent", ctypes.c_double),
-        ("uptime_seconds", ctypes.c_long),
-        ("os_name", ctypes.c_char * LEN_LINE),
-        ("kernel_version", ctypes.c_char * LEN_LINE),
-        ("gpu_name", ctypes.c_char * LEN_LINE),
-        ("gpu_usage_percent", ctypes.c_double),
-        ("gpu_memory_total_gb", ctypes.c_double),
-        ("gpu_memory_used_gb", ctypes.c_double),
-        ("process_count", ctypes.c_int),
-        ("processes", ProcessData * MAX_PROCESSES),
-        # Network speed fields - must match order in core.h
-        ("net_rx_kbps", ctypes.c_double),
-        ("net_tx_kbps", ctypes.c_double),
-    ]
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-lib_path = os.path.abspath(os.path.join(current_dir, '../../build/libmonitor.so'))
-monitor_lib = ctypes.CDLL(lib_path)
-monitor_lib.get_system_metrics.argtypes = [ctypes.POINTER(SystemMetrics)]
-monitor_lib.get_system_metrics.restype = None
+import numpy as np
+
+from bridge import (SystemMetrics, ProcessSnapshot, CollectorTimings, MAX_CORES, COLLECTOR_PROCESSES,
+                    COLLECTOR_COUNT, COLLECTOR_NAMES, ROLLUP_USERS, ROLLUP_CGROUPS,
+                    ALERT_FIRING, ALERT_PENDING, ALERT_RULES_PATH, ALERT_LOG_PATH,
+                    load_monitor_lib, first_sample_delay, open_history, open_alerts, alert_status)
+from ring import RingReader, RING_DEFAULT_NAME
+from remote import FrameDecoder, ProtocolError, parse_address
+from recording import SessionReader, SessionRecorder, SessionError
+from series import RingSeries, decimate_minmax
+from proc_model import (ProcessTableModel, ProcessTreeModel, RollupTableModel, ProcessFilterProxy,
+                        COL_CPU, TREE_COL_CPU, ROLLUP_COL_CPU)
+
+
+# Graph history: an hour of scroll-back at 1 Hz, the last minute on screen
+HISTORY_CAPACITY = 3600
+GRAPH_WINDOW     = 60
+HEATMAP_WINDOW   = 120   # seconds of per-core history in the heatmap
+TILE_HISTORY     = 600   # samples behind each host tile in the grid (10 minutes at 1 Hz)
+TILE_FRAME_MS    = 16    # dirty host tiles are redrawn at most once per frame (~60 fps)
+TILE_BUDGET_MS   = 4     # tile redraw time per frame (the paint after it costs about as much again)
+
+# Process panel views (local sampling only: the ring and the wire carry just the top-N)
+PROC_VIEWS = ["Processes", "Tree", "By user", "By cgroup"]
+PROC_VIEW_TABLE, PROC_VIEW_TREE, PROC_VIEW_USERS, PROC_VIEW_CGROUPS = range(4)
+PROC_VIEW_ROLLUPS = {PROC_VIEW_USERS: ROLLUP_USERS, PROC_VIEW_CGROUPS: ROLLUP_CGROUPS}
+
+REPLAY_SPEEDS  = (1, 2, 5, 10, 25, 50, 100)
+REPLAY_TICK_MS = 50      # replay repaints at most this often, whatever the speed
 
 
 # ─── COLOR PALETTE ───────────────────────────────────────────────────────────
@@ -62,10 +48,194 @@ BG_PANEL2    = "#161830"   # alternate panel color used for table headers
 ACCENT_BLUE  = "#4db8ff"   # electric blue accent - used for CPU and highlights
 ACCENT_VIOLET= "#9d7ff5"   # soft violet accent - used for RAM
 ACCENT_GREEN = "#4dffb4"   # neon green accent - used for disk storage
+ACCENT_RED   = "#ff4d6d"   # hot pink-red accent - used for firing alerts
 TEXT_PRIMARY = "#e2e8ff"   # primary text color - light blue-white
 TEXT_DIM     = "#5a6080"   # secondary/dimmed text - muted blue-grey
 BORDER_GLOW  = "#1e2045"   # subtle panel border color
 
+# Label colors and sizes, selected with the `tone` / `textSize` properties (see make_info_label)
+LABEL_TONES = {"blue": ACCENT_BLUE, "violet": ACCENT_VIOLET, "green": ACCENT_GREEN,
+               "red": ACCENT_RED, "primary": TEXT_PRIMARY, "dim": TEXT_DIM}
+LABEL_SIZES = (8, 9, 10, 11, 12, 14)
+TONE_OF_COLOR = {color: name for name, color in LABEL_TONES.items()}
+
+
+# ─── STYLESHEET ──────────────────────────────────────────────────────────────
+# The whole window is styled by this one sheet, set once on the MainWindow.
+# Widgets only carry an objectName or a tone/textSize property, so Qt parses and
+# polishes a single sheet at startup instead of one per widget.
+STYLESHEET = f"""
+    QMainWindow {{
+        background-color: {BG_DARK};
+    }}
+    QWidget {{
+        color: {TEXT_PRIMARY};
+        font-family: 'Consolas', monospace;
+    }}
+    QScrollBar:vertical {{
+        background: {BG_PANEL};
+        width: 6px;
+        border-radius: 3px;
+    }}
+    QScrollBar::handle:vertical {{
+        background: {ACCENT_BLUE};
+        border-radius: 3px;
+        min-height: 20px;
+    }}
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+        height: 0px;
+    }}
+    QStatusBar {{
+        color: {TEXT_DIM};
+        font-size: 9px;
+    }}
+    QLabel#alerts {{
+        color: {ACCENT_RED};
+        font-weight: bold;
+    }}
+
+    /* Panels: card, colored dot, title and separator */
+    QWidget#panel {{
+        background-color: {BG_PANEL};
+        border-radius: 12px;
+        border: 1px solid {BORDER_GLOW};
+    }}
+    QLabel#panelDot {{
+        font-size: 10px;
+    }}
+    QLabel#panelTitle {{
+        color: {TEXT_PRIMARY};
+        font-size: 14px;
+        font-weight: bold;
+        letter-spacing: 1.5px;
+    }}
+    QWidget#separator {{
+        background-color: {BORDER_GLOW};
+    }}
+    QGraphicsView {{
+        border: none;
+    }}
+
+    /* Inputs */
+    QLineEdit, QComboBox, QPushButton {{
+        background-color: {BG_PANEL2};
+        color: {TEXT_PRIMARY};
+        border: 1px solid {BORDER_GLOW};
+        border-radius: 6px;
+    }}
+    QLineEdit {{
+        padding: 4px 8px;
+        font-size: 10px;
+    }}
+    QComboBox, QPushButton {{
+        padding: 2px 8px;
+        font-size: 9px;
+    }}
+    QPushButton:checked {{
+        color: {ACCENT_BLUE};
+        border-color: {ACCENT_BLUE};
+    }}
+    QComboBox QAbstractItemView, QMenu {{
+        background-color: {BG_PANEL2};
+        color: {TEXT_PRIMARY};
+        selection-background-color: {BORDER_GLOW};
+    }}
+
+    /* Process table */
+    QHeaderView {{
+        background-color: {BG_PANEL2};
+        border: none;
+    }}
+    QHeaderView::section {{
+        background-color: {BG_PANEL2};
+        color: {ACCENT_BLUE};
+        border: none;
+        border-bottom: 1px solid {BORDER_GLOW};
+        padding: 5px;
+        font-size: 9px;
+        font-weight: bold;
+        letter-spacing: 1px;
+    }}
+    QTableView, QTreeView {{
+        background-color: {BG_PANEL};
+        color: {TEXT_PRIMARY};
+        border: none;
+        gridline-color: transparent;
+        font-size: 10px;
+        selection-background-color: {BORDER_GLOW};
+    }}
+    QTableView::item, QTreeView::item {{
+        padding: 5px 8px;
+        border-bottom: 1px solid {BORDER_GLOW};
+        background: transparent;
+    }}
+    QTableView::item:selected, QTreeView::item:selected {{
+        background-color: {BORDER_GLOW};
+        color: {ACCENT_BLUE};
+    }}
+
+    /* Single-purpose labels */
+    QLabel#uptime {{
+        font-size: 22px;
+        color: {ACCENT_BLUE};
+        font-weight: bold;
+    }}
+    QLabel#kernel {{
+        font-size: 11px;
+        color: {TEXT_PRIMARY};
+    }}
+    QLabel#diskInfo {{
+        color: {TEXT_DIM};
+        font-size: 11px;
+        line-height: 1.8;
+    }}
+""" + "".join(f'    QLabel[tone="{name}"] {{ color: {color}; }}\n' for name, color in LABEL_TONES.items()) \
+    + "".join(f'    QLabel[textSize="{size}"] {{ font-size: {size}px; }}\n' for size in LABEL_SIZES)
+
+
+_pg = None
+
+
+def pyqtgraph():
+    """Import pyqtgraph on first use; it is most of the import time of this module."""
+    global _pg
+    if _pg is None:
+        import pyqtgraph as pg
+        _pg = pg
+    return _pg
+
+
+def fmt_bytes_rate(bytes_per_sec):
+    """Format a byte rate as B/s, KB/s, MB/s or GB/s."""
+    if bytes_per_sec < 1024:
+        return f"{bytes_per_sec:.0f} B/s"
+    for unit in ("KB/s", "MB/s"):
+        bytes_per_sec /= 1024
+        if bytes_per_sec < 1024:
+            return f"{bytes_per_sec:.1f} {unit}"
+    return f"{bytes_per_sec / 1024:.1f} GB/s"
+
+
+class SelfUsage:
+    """CPU% (all threads) and RSS of this process since the previous `sample()` call."""
+
+    PAGE_BYTES = os.sysconf("SC_PAGE_SIZE")
+
+    def __init__(self):
+        self.last_cpu = time.process_time()
+        self.last_wall = time.monotonic()
+
+    def sample(self):
+        cpu, wall = time.process_time(), time.monotonic()
+        percent = (cpu - self.last_cpu) / (wall - self.last_wall) * 100.0 if wall > self.last_wall else 0.0
+        self.last_cpu, self.last_wall = cpu, wall
+        try:
+            with open("/proc/self/statm") as statm:
+                rss_bytes = int(statm.read().split()[1]) * self.PAGE_BYTES
+        except (OSError, ValueError, IndexError):
+            rss_bytes = 0
+        return percent, rss_bytes
+
 
 class CircularGauge(QWidget):
     """Circular gauge with a double ring: background track + neon glowing arc."""
@@ -133,37 +303,520 @@ class CircularGauge(QWidget):
         painter.end()
 
 
+class PlotSlot(QWidget):
+    """Placeholder for a pyqtgraph widget, built once it is both shown and armed.
+
+    MainWindow arms the slots after the first frame is painted, so neither the
+    pyqtgraph import nor the plot construction delays the first real numbers;
+    a slot in a panel that is not visible yet waits for its first showEvent.
+    `build` returns the widget and is called at most once.
+    """
+
+    def __init__(self, build, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.build = build
+        self.widget = None
+        self.armed = False
+
+    def arm(self):
+        self.armed = True
+        if self.isVisible():
+            self.materialize()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.armed:
+            self.materialize()
+
+    def materialize(self):
+        if self.widget is None:
+            self.widget = self.build()
+            self.layout().addWidget(self.widget)
+
+
+# ─── BACKGROUND SAMPLER ──────────────────────────────────────────────────────
+class MetricsSampler(QObject):
+    """Calls get_system_metrics on a worker thread into a double-buffered SystemMetrics.
+
+    The worker always fills the back buffers (metrics and the full process
+    list), then swaps them with the front ones under `lock` and emits
+    `sample_ready`. The GUI holds `lock` while it paints
+    from `front` (read at paint time, not when the signal was emitted), so a
+    slow collector (nvidia-smi, a huge /proc) never blocks the event loop and
+    the GUI never sees a half-written struct. ctypes drops the GIL for the call.
+    """
+
+    sample_ready = pyqtSignal(float)   # sample latency (ms)
+
+    def __init__(self, interval_ms=1000, alerts=None, record=None):
+        super().__init__()
+        self.interval_ms = interval_ms
+        self.monitor_lib = load_monitor_lib()
+        self.lock = threading.Lock()
+        self.front = SystemMetrics()
+        self.back = SystemMetrics()
+        self.front_procs = ProcessSnapshot()
+        self.back_procs = ProcessSnapshot()
+        # Set by the GUI for the process view on screen: the tree and the rollups are
+        # copied out of the library only while someone looks at them
+        self.want_tree = False
+        self.want_rollups = None   # ROLLUP_USERS / ROLLUP_CGROUPS
+        self.timer = None
+        # Every sample also goes to the on-disk history store (if it can be opened)
+        self.history = open_history()
+        # ...and through the alert rules (an open_alerts handle), right here on the worker
+        self.alerts = alerts
+        self.front_alerts = []
+        self.back_alerts = []
+        # Per-collector cost of the sample above, read on this thread right after it
+        self.front_timings = CollectorTimings()
+        self.back_timings = CollectorTimings()
+        # --record: the raw stream (metrics and full process list) for a later --replay
+        self.recorder = SessionRecorder(record) if record else None
+
+    @pyqtSlot()
+    def start(self):
+        # Created here so the timer lives in the worker thread
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.sample)
+        self.timer.start(self.interval_ms)
+        # The library primed its counters at load; let them age a little so the
+        # first frame has real rates instead of 0%
+        QTimer.singleShot(int(first_sample_delay() * 1000), self.sample)
+
+    @pyqtSlot()
+    def stop(self):
+        if self.timer is not None:
+            self.timer.stop()
+        if self.history is not None:
+            self.monitor_lib.history_close(self.history)
+            self.history = None
+        if self.alerts is not None:
+            self.monitor_lib.alerts_close(self.alerts)
+            self.alerts = None
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    @pyqtSlot()
+    def sample(self):
+        start = time.perf_counter()
+        self.monitor_lib.get_system_metrics(ctypes.byref(self.back))
+        self.back_procs.fill()   # copy of the scan above, same thread
+        if self.want_tree:
+            self.back_procs.fill_tree()
+        rollup_kind = self.want_rollups
+        if rollup_kind is not None:
+            self.back_procs.fill_rollups(rollup_kind)
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        self.monitor_lib.get_collector_timings(ctypes.byref(self.back_timings))
+
+        if self.history is not None:
+            self.monitor_lib.history_append(self.history, time.time(), ctypes.byref(self.back))
+        if self.recorder is not None:
+            self.recorder.append(time.time(), latency_ms, self.back, self.back_procs)
+        if self.alerts is not None:
+            self.monitor_lib.alerts_evaluate(self.alerts, ctypes.byref(self.back), time.monotonic())
+            self.back_alerts = alert_status(self.alerts)
+
+        with self.lock:
+            self.front, self.back = self.back, self.front
+            self.front_procs, self.back_procs = self.back_procs, self.front_procs
+            self.front_alerts, self.back_alerts = self.back_alerts, self.front_alerts
+            self.front_timings, self.back_timings = self.back_timings, self.front_timings
+        self.sample_ready.emit(latency_ms)
+
+
+class RingSampler(QObject):
+    """Reads samples from a headless monitord through its /dev/shm ring.
+
+    Same interface as MetricsSampler, but nothing is sampled locally: `front`
+    is a ctypes view straight into the shared mapping (no copy). Polling is
+    cheap, so it runs on the GUI thread. If the writer lapped the slot while
+    it was being painted, the sample is painted again on the next poll.
+    """
+
+    sample_ready = pyqtSignal(float)   # collector-side sample latency (ms)
+
+    def __init__(self, name=RING_DEFAULT_NAME, poll_ms=250):
+        super().__init__()
+        self.name = name
+        self.reader = RingReader(name)
+        self.retired = None   # the ring of a restarted monitord, while `front` still points into it
+        self.lock = contextlib.nullcontext()   # the seqlock replaces the mutex
+        self.front = None
+        self.front_procs = None   # only the top-N in SystemMetrics crosses the ring
+        self.front_alerts = []    # monitord -a evaluates the rules on the collector side
+        self.front_timings = None # the collectors run in monitord (kill -USR1 dumps their cost)
+        self.last_index = None
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.poll)
+        self.poll_ms = poll_ms
+
+    def start(self):
+        self.timer.start(self.poll_ms)
+        self.poll()
+
+    def stop(self):
+        self.timer.stop()
+
+    def poll(self):
+        sample = self.reader.latest()
+        if sample is None or sample.index == self.last_index:
+            if self.reader.replaced():
+                self.reattach()
+            return
+
+        self.front = sample.metrics
+        self.retired = None
+        self.last_index = sample.index
+        self.sample_ready.emit(sample.sample_ms)   # direct connection: paints now
+
+        if not self.reader.is_valid(sample):
+            self.last_index = None
+
+    def reattach(self):
+        """Follow a restarted monitord to its new ring."""
+        try:
+            reader = RingReader(self.name)
+        except (OSError, ValueError):
+            return   # not ready yet, try again on the next poll
+        # `front` is a view into the old mapping: keep it mapped until a new sample replaces it
+        self.retired, self.reader = self.reader, reader
+        self.last_index = None
+
+
+class RemoteHost(QObject):
+    """One metrics_server.py connection: a Qt socket feeding a FrameDecoder.
+
+    Bytes are decoded on the GUI thread as they arrive (readyRead), so there
+    is no thread per server. A dropped or refused connection is retried every
+    RECONNECT_MS; a server built with another SystemMetrics is not.
+    """
+
+    sample_ready = pyqtSignal()
+    state_changed = pyqtSignal()
+    RECONNECT_MS = 3000
+
+    def __init__(self, address, parent=None):
+        super().__init__(parent)
+        from PyQt6.QtNetwork import QTcpSocket, QLocalSocket   # only remote mode pays for QtNetwork
+        self.address = address
+        self.kind, self.target = parse_address(address)
+        self.socket = QLocalSocket(self) if self.kind == "unix" else QTcpSocket(self)
+        self.socket.readyRead.connect(self.on_ready_read)
+        self.socket.disconnected.connect(self.on_lost)
+        self.socket.errorOccurred.connect(self.on_lost)
+        self.retry = QTimer(self)
+        self.retry.setSingleShot(True)
+        self.retry.timeout.connect(self.open)
+        self.decoder = FrameDecoder()
+        self.state = "connecting"
+        self.stopped = False
+
+    @property
+    def label(self):
+        if self.decoder.host is None:
+            return f"{self.address} ({self.state})"
+        name = f"{self.decoder.host}  [{self.address}]"
+        return name if self.state == "live" else f"{name} ({self.state})"
+
+    def open(self):
+        self.decoder = FrameDecoder()
+        if self.kind == "unix":
+            self.socket.connectToServer(self.target)
+        else:
+            self.socket.connectToHost(*self.target)
+
+    def close(self):
+        self.stopped = True
+        self.retry.stop()
+        self.socket.abort()
+
+    def set_state(self, state):
+        if state != self.state:
+            self.state = state
+            self.state_changed.emit()
+
+    def on_ready_read(self):
+        try:
+            samples = self.decoder.feed(bytes(self.socket.readAll()))
+        except ProtocolError as error:
+            self.stopped = True   # retrying cannot fix a mismatched build
+            self.set_state(f"error: {error}")
+            self.socket.abort()
+            return
+        if self.decoder.host is not None:
+            self.set_state("live")
+        if samples:
+            self.sample_ready.emit()
+
+    def on_lost(self, *args):
+        if self.stopped:
+            return
+        self.set_state("reconnecting")
+        self.retry.start(self.RECONNECT_MS)
+
+
+class RemoteSampler(QObject):
+    """Subscribes to one or more metrics servers (metrics_server.py).
+
+    Same interface as RingSampler; `front` is the latest sample of the host
+    picked with `select()`, the other connections keep decoding in the
+    background so switching hosts paints at once.
+    """
+
+    sample_ready = pyqtSignal(float)   # collector-side sample latency (ms)
+    hosts_changed = pyqtSignal()
+
+    def __init__(self, addresses):
+        super().__init__()
+        self.lock = contextlib.nullcontext()   # sockets and painting share the GUI thread
+        self.front_procs = None    # only the top-N in SystemMetrics crosses the wire
+        self.front_alerts = []     # alert rules run on the collector side
+        self.front_timings = None
+        self.selected = 0
+        self.hosts = [RemoteHost(address, self) for address in addresses]
+        for index, host in enumerate(self.hosts):
+            host.sample_ready.connect(lambda index=index: self.on_host_sample(index))
+            host.state_changed.connect(self.hosts_changed)
+
+    @property
+    def front(self):
+        return self.hosts[self.selected].decoder.metrics
+
+    def start(self):
+        for host in self.hosts:
+            host.open()
+
+    def stop(self):
+        for host in self.hosts:
+            host.close()
+
+    def select(self, index):
+        self.selected = index
+        if self.front is not None:
+            self.sample_ready.emit(self.hosts[index].decoder.sample_ms)
+
+    def on_host_sample(self, index):
+        if index == self.selected:
+            self.sample_ready.emit(self.hosts[index].decoder.sample_ms)
+
+
+class ReplaySampler(QObject):
+    """Plays a session recorded with --record back on the GUI thread.
+
+    Same interface as MetricsSampler. A replay clock runs `speed` times faster
+    than the wall clock; every tick the reader seeks to the last frame at or
+    before it and only that frame is painted, so 100x repaints no more often
+    than 1x (the graphs then get every painted frame, not every recorded one).
+    """
+
+    sample_ready = pyqtSignal(float)    # recorded sample latency (ms)
+    position_changed = pyqtSignal(int)  # frame on screen
+    finished = pyqtSignal()             # the clock reached the last frame
+
+    def __init__(self, path, tick_ms=REPLAY_TICK_MS):
+        super().__init__()
+        self.reader = SessionReader(path)
+        self.lock = contextlib.nullcontext()   # reading and painting share the GUI thread
+        self.front = self.reader.metrics
+        self.front_procs = None
+        self.front_alerts = []     # alert states are not recorded
+        self.front_timings = None  # neither is the recording monitor's own cost
+        self.speed = 1
+        self.playing = True
+        self.clock = self.reader.start
+        self.last_tick = 0.0
+        self.tick_ms = tick_ms
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.show(0)
+        self.last_tick = time.monotonic()
+        self.timer.start(self.tick_ms)
+
+    def stop(self):
+        self.timer.stop()
+        self.reader.close()
+
+    def tick(self):
+        now = time.monotonic()
+        if self.playing:
+            self.clock += (now - self.last_tick) * self.speed
+            frame = self.reader.frame_at(self.clock)
+            if frame != self.reader.position:
+                self.show(frame)
+            if frame == len(self.reader) - 1:
+                self.playing = False
+                self.finished.emit()
+        self.last_tick = now
+
+    def seek(self, frame):
+        self.clock = float(self.reader.timestamps[frame])
+        self.show(frame)
+
+    def show(self, frame):
+        self.reader.seek(frame)
+        self.front_procs = self.reader.procs
+        self.position_changed.emit(frame)
+        self.sample_ready.emit(self.reader.sample_ms)
+
+
+# ─── HOST GRID ───────────────────────────────────────────────────────────────
+class HostTile:
+    """One host in the grid: its sparkline series, and its graphics once the grid is built."""
+
+    def __init__(self, host):
+        self.host = host
+        self.cpu = RingSeries(TILE_HISTORY)
+        self.ram = RingSeries(TILE_HISTORY)
+        self.box = self.cpu_curve = self.ram_curve = self.text = None
+
+    def push(self):
+        metrics = self.host.decoder.metrics
+        self.cpu.append(metrics.cpu_usage_percent)
+        self.ram.append(metrics.ram_usage_percent)
+
+    def draw(self):
+        """Hand pyqtgraph the series decimated to the tile's width: two points per pixel at most."""
+        buckets = max(16, int(self.box.width()))
+        self.cpu_curve.setData(*decimate_minmax(self.cpu.view(), buckets), skipFiniteCheck=True)
+        self.ram_curve.setData(*decimate_minmax(self.ram.view(), buckets), skipFiniteCheck=True)
+        name = self.host.decoder.host or self.host.address
+        if self.host.state == "live":
+            self.text.setText(f"{name}\nCPU {self.cpu.view()[-1]:.0f}%  RAM {self.ram.view()[-1]:.0f}%",
+                              color=TEXT_PRIMARY)
+        else:
+            self.text.setText(f"{name}\n{self.host.state}", color=TEXT_DIM)
+
+
+class HostGrid(QWidget):
+    """Overview of every remote host as a sparkline tile (CPU filled, RAM as a line).
+
+    All tiles are ViewBoxes in one pyqtgraph scene, built on the first show.
+    A host's sample only marks its tile dirty; dirty tiles are redrawn at most
+    once per frame (TILE_FRAME_MS), oldest first and only for TILE_BUDGET_MS,
+    so the scene repaints just the tiles that changed and a whole fleet
+    reporting in the same frame is spread over the next few instead of
+    stalling one. Double-clicking a tile emits `host_activated` with its index.
+    """
+
+    host_activated = pyqtSignal(int)
+
+    def __init__(self, hosts, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.tiles = [HostTile(host) for host in hosts]
+        for tile in self.tiles:
+            tile.host.sample_ready.connect(lambda tile=tile: self.on_sample(tile))
+            tile.host.state_changed.connect(lambda tile=tile: self.mark_dirty(tile))
+        self.view = None
+        self.columns = 0
+        self.dirty = {}   # tile -> None, in the order they became dirty
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def build(self):
+        pg = pyqtgraph()
+        self.view = pg.GraphicsLayoutWidget()
+        self.view.setBackground(BG_DARK)
+        self.view.ci.setSpacing(6)
+        self.view.scene().sigMouseClicked.connect(self.on_click)
+        cpu_pen = pg.mkPen(color=ACCENT_BLUE, width=1)
+        ram_pen = pg.mkPen(color=ACCENT_VIOLET, width=1)
+        for tile in self.tiles:
+            # A bare ViewBox (no axes, no mouse) is far cheaper to lay out and paint than a PlotItem
+            tile.box = pg.ViewBox(enableMouse=False, enableMenu=False, defaultPadding=0)
+            tile.box.setBackgroundColor(BG_PANEL)
+            tile.box.setRange(xRange=(0, TILE_HISTORY), yRange=(0, 100), padding=0)
+            tile.cpu_curve = pg.PlotCurveItem(pen=cpu_pen, fillLevel=0, brush=pg.mkBrush(30, 100, 200, 60))
+            tile.ram_curve = pg.PlotCurveItem(pen=ram_pen)
+            tile.text = pg.TextItem(anchor=(0, 0))
+            tile.text.setPos(0, 100)
+            for item in (tile.cpu_curve, tile.ram_curve, tile.text):
+                tile.box.addItem(item)
+            tile.box.sigResized.connect(lambda box, tile=tile: self.mark_dirty(tile))
+        self.layout().addWidget(self.view)
+        self.arrange()
+        self.dirty.update(dict.fromkeys(self.tiles))
+
+    def arrange(self):
+        """Pick the column count that keeps tiles about 3:1 and re-lay them out if it changed."""
+        count = len(self.tiles)
+        width, height = max(1, self.width()), max(1, self.height())
+        columns = max(1, min(count, round((count * width / (height * 3.0)) ** 0.5)))
+        if columns == self.columns:
+            return
+        self.columns = columns
+        self.view.ci.clear()
+        for index, tile in enumerate(self.tiles):
+            self.view.ci.addItem(tile.box, row=index // columns, col=index % columns)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.view is None:
+            self.build()
+        self.flush()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.view is not None:
+            self.arrange()
+
+    def on_sample(self, tile):
+        tile.push()
+        self.mark_dirty(tile)
+
+    def mark_dirty(self, tile):
+        self.dirty.setdefault(tile)
+        if self.view is not None and not self.flush_timer.isActive():
+            self.flush_timer.start(TILE_FRAME_MS)
+
+    def flush(self):
+        if self.view is None or not self.isVisible():
+            return   # the dirty set waits for the next show
+        deadline = time.perf_counter() + TILE_BUDGET_MS / 1000.0
+        while self.dirty and time.perf_counter() < deadline:
+            tile = next(iter(self.dirty))
+            del self.dirty[tile]
+            tile.draw()
+        if self.dirty:
+            self.flush_timer.start(TILE_FRAME_MS)
+
+    def on_click(self, event):
+        if not event.double():
+            return
+        position = event.scenePos()
+        for index, tile in enumerate(self.tiles):
+            if tile.box.sceneBoundingRect().contains(position):
+                self.host_activated.emit(index)
+                return
+
+
 # ─── MAIN WINDOW ─────────────────────────────────────────────────────────────
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, ring_name=None, alerts=None, timings_path=None, remote=None, grid=False,
+                 record=None, replay=None):
         super().__init__()
+        if ring_name is None and not remote and not replay:
+            load_monitor_lib()   # primes the collectors' baseline while the window is built
         self.setWindowTitle("Linux System Monitor")
         self.resize(1300, 850)
 
-        # Global stylesheet - deep dark navy theme
-        self.setStyleSheet(f"""
-            QMainWindow, QWidget {{
-                background-color: {BG_DARK};
-                color: {TEXT_PRIMARY};
-                font-family: 'Consolas', monospace;
-            }}
-            QScrollBar:vertical {{
-                background: {BG_PANEL};
-                width: 6px;
-                border-radius: 3px;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {ACCENT_BLUE};
-                border-radius: 3px;
-                min-height: 20px;
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0px;
-            }}
-        """)
+        # Global stylesheet - deep dark navy theme (the only setStyleSheet call)
+        self.setStyleSheet(STYLESHEET)
 
+        # The dashboard is the first page; remote mode adds the host grid as the second
+        self.pages = QStackedWidget()
+        self.setCentralWidget(self.pages)
         central_widget = QWidget()
-        self.setCentralWidget(central_widget)
+        self.pages.addWidget(central_widget)
         self.main_layout = QGridLayout(central_widget)
         self.main_layout.setContentsMargins(16, 16, 16, 16)
         self.main_layout.setSpacing(12)
@@ -184,26 +837,233 @@ class MainWindow(QMainWindow):
 
         self.init_ui()
 
-        self.metrics = SystemMetrics()
-        self.cpu_history = [0.0] * 60
-        self.rx_history  = [0.0] * 60   # download speed history (KB/s)
-        self.tx_history  = [0.0] * 60   # upload speed history (KB/s)
+        # Firing alerts, on the right of the status bar
+        self.lbl_alerts = QLabel("")
+        self.lbl_alerts.setObjectName("alerts")
+        self.statusBar().addPermanentWidget(self.lbl_alerts)
+
+        self.cpu_history = RingSeries(HISTORY_CAPACITY, window=GRAPH_WINDOW)
+        self.rx_history  = RingSeries(HISTORY_CAPACITY, window=GRAPH_WINDOW)   # download speed (KB/s)
+        self.tx_history  = RingSeries(HISTORY_CAPACITY, window=GRAPH_WINDOW)   # upload speed (KB/s)
+        self.host_picker = None
+        self.host_grid = None
+
+        self.plots_armed = False
+
+        # Latency instrumentation (exponential moving averages, ms)
+        self.sample_latency_ms = 0.0
+        self.paint_latency_ms  = 0.0
+
+        # The monitor's own cost: CPU/RSS, and the table diff timed apart from the rest of the paint
+        self.self_usage = SelfUsage()
+        self.table_ms = 0.0
+        self.timings_file = None
+        self.dumped_runs = [0] * COLLECTOR_COUNT
+        if timings_path is not None:
+            self.open_timings_dump(timings_path)
+
+        if replay:
+            # Play a recorded session back; its controls sit in the status bar
+            self.sampler_thread = None
+            self.sampler = ReplaySampler(replay)
+            self.sampler.sample_ready.connect(self.on_sample_ready)
+            self.add_replay_controls()
+            self.sampler.start()
+        elif remote:
+            # Subscribe to metrics servers; the host picker chooses which one is painted
+            self.sampler_thread = None
+            self.sampler = RemoteSampler(remote)
+            self.sampler.sample_ready.connect(self.on_sample_ready)
+            self.host_picker = QComboBox()
+            self.host_picker.currentIndexChanged.connect(self.on_remote_host_changed)
+            self.statusBar().addPermanentWidget(self.host_picker)
+            self.sampler.hosts_changed.connect(self.sync_remote_hosts)
+            self.sync_remote_hosts()
+
+            # Every host as a sparkline tile; double-click one to open it in the dashboard
+            self.host_grid = HostGrid(self.sampler.hosts)
+            self.host_grid.host_activated.connect(self.on_grid_host_activated)
+            self.pages.addWidget(self.host_grid)
+            self.grid_button = QPushButton("GRID")
+            self.grid_button.setCheckable(True)
+            self.grid_button.toggled.connect(self.show_host_grid)
+            self.statusBar().addPermanentWidget(self.grid_button)
+            self.grid_button.setChecked(grid)
+            self.sampler.start()
+        elif ring_name is not None:
+            # Attach to a shared headless collector instead of sampling here
+            self.sampler_thread = None
+            self.sampler = RingSampler(ring_name)
+            self.sampler.sample_ready.connect(self.on_sample_ready)
+            self.sampler.start()
+        else:
+            # Sampling runs on its own thread and posts every second; the GUI only paints
+            self.sampler_thread = QThread()
+            self.sampler = MetricsSampler(interval_ms=1000, alerts=alerts, record=record)
+            self.sampler.moveToThread(self.sampler_thread)
+            self.sampler_thread.started.connect(self.sampler.start)
+            self.sampler.sample_ready.connect(self.on_sample_ready)
+            self.sampler_thread.start()
+            self.proc_view.setVisible(True)
+
+    def closeEvent(self, event):
+        """Stop the sampler (and its thread, if any) before the window goes away."""
+        if self.sampler_thread is None:
+            self.sampler.stop()
+        else:
+            QMetaObject.invokeMethod(self.sampler, "stop", Qt.ConnectionType.BlockingQueuedConnection)
+            self.sampler_thread.quit()
+            self.sampler_thread.wait()
+        if self.timings_file is not None:
+            self.timings_file.close()
+            self.timings_file = None
+        super().closeEvent(event)
+
+    def on_sample_ready(self, sample_ms):
+        """Paint the sampler's front buffer and record sample vs. paint latency."""
+        start = time.perf_counter()
+        with self.sampler.lock:
+            self.update_dashboard(self.sampler.front, self.sampler.front_procs)
+            self.update_alerts(self.sampler.front_alerts)
+        paint_ms = (time.perf_counter() - start) * 1000.0
+        with self.sampler.lock:
+            self.update_overhead(self.sampler.front_timings, paint_ms - self.table_ms, self.table_ms)
+
+        if not self.plots_armed:
+            # The first frame is up with real numbers; now pay for pyqtgraph and the plots
+            self.plots_armed = True
+            for slot in (self.cpu_graph_slot, self.core_heatmap_slot, self.net_graph_slot):
+                QTimer.singleShot(0, slot.arm)
+
+        alpha = 0.2
+        self.sample_latency_ms += alpha * (sample_ms - self.sample_latency_ms)
+        self.paint_latency_ms  += alpha * (paint_ms - self.paint_latency_ms)
+        self.statusBar().showMessage(
+            f"sample {sample_ms:.1f} ms (avg {self.sample_latency_ms:.1f})   |   "
+            f"paint {paint_ms:.1f} ms (avg {self.paint_latency_ms:.1f})"
+        )
 
-        # Refresh timer - updates all widgets every second
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_dashboard)
-        self.timer.start(1000)
+    def update_alerts(self, statuses):
+        """Show firing (and pending) alert rules at the right of the status bar."""
+        firing = [a.name.decode('utf-8', 'replace') for a in statuses if a.state == ALERT_FIRING]
+        pending = sum(1 for a in statuses if a.state == ALERT_PENDING)
+        text = f"⚠ {', '.join(firing)}" if firing else ""
+        if pending:
+            text += f"   ({pending} pending)"
+        self.lbl_alerts.setText(text)
+
+    def sync_remote_hosts(self):
+        """Relabel the host picker with each server's host name and connection state."""
+        for index, host in enumerate(self.sampler.hosts):
+            if index == self.host_picker.count():
+                self.host_picker.addItem(host.label)
+            else:
+                self.host_picker.setItemText(index, host.label)
+
+    def restart_series(self):
+        """Start the graphs and the process table over (another host, or a jump in a replay)."""
+        self.cpu_history = RingSeries(HISTORY_CAPACITY, window=GRAPH_WINDOW)
+        self.on_net_iface_changed(self.net_iface.currentIndex())
+        self.heat_data = None
+        self.proc_scanned_at = None
+
+    def on_remote_host_changed(self, index):
+        if index < 0:
+            return
+        # Another host is another set of series
+        self.restart_series()
+        self.sampler.select(index)
+
+    def add_replay_controls(self):
+        """Pause, speed and a scrub slider over the recording, in the status bar."""
+        self.replay_button = QPushButton("PAUSE")
+        self.replay_button.setCheckable(True)   # checked = paused
+        self.replay_button.toggled.connect(self.on_replay_paused)
+        self.replay_speed = QComboBox()
+        self.replay_speed.addItems([f"{speed}x" for speed in REPLAY_SPEEDS])
+        self.replay_speed.currentIndexChanged.connect(
+            lambda index: setattr(self.sampler, "speed", REPLAY_SPEEDS[index]))
+        self.replay_slider = QSlider(Qt.Orientation.Horizontal)
+        self.replay_slider.setRange(0, len(self.sampler.reader) - 1)
+        self.replay_slider.setMinimumWidth(240)
+        self.replay_slider.valueChanged.connect(self.on_replay_scrub)
+        self.lbl_replay_time = QLabel("")
+        for widget in (self.lbl_replay_time, self.replay_slider, self.replay_speed, self.replay_button):
+            self.statusBar().addPermanentWidget(widget)
+        self.sampler.position_changed.connect(self.on_replay_position)
+        self.sampler.finished.connect(lambda: self.replay_button.setChecked(True))
+
+    def on_replay_paused(self, paused):
+        self.replay_button.setText("PLAY" if paused else "PAUSE")
+        if not paused and self.sampler.reader.position == len(self.sampler.reader) - 1:
+            self.on_replay_scrub(0)   # play again from the start
+        self.sampler.playing = not paused
+
+    def on_replay_scrub(self, frame):
+        # A jump breaks the series; the graphs restart at the new position
+        self.restart_series()
+        self.sampler.seek(frame)
+
+    def on_replay_position(self, frame):
+        # Follow playback without feeding the position back as a scrub
+        self.replay_slider.blockSignals(True)
+        self.replay_slider.setValue(frame)
+        self.replay_slider.blockSignals(False)
+        timestamp = self.sampler.reader.timestamp
+        self.lbl_replay_time.setText(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))}   "
+                                     f"{frame + 1}/{len(self.sampler.reader)}")
+
+    def show_host_grid(self, shown):
+        self.pages.setCurrentWidget(self.host_grid if shown else self.pages.widget(0))
+
+    def on_grid_host_activated(self, index):
+        self.host_picker.setCurrentIndex(index)
+        self.grid_button.setChecked(False)
+
+    def update_overhead(self, timings, paint_ms, table_ms):
+        """Show the monitor's own CPU%/RSS and the average microseconds of each stage."""
+        cpu_percent, rss_bytes = self.self_usage.sample()
+        lines = [f"CPU {cpu_percent:.1f}%   RSS {rss_bytes / (1024 * 1024):.1f} MB"]
+        if timings is not None and timings.samples:
+            cells = [f"{name} {timings.total_us[i] / timings.runs[i] if timings.runs[i] else 0.0:.0f}"
+                     for i, name in enumerate(COLLECTOR_NAMES)]
+            lines.append("  ".join(cells[:5]))
+            lines.append("  ".join(cells[5:]))
+            lines.append(f"sample {timings.sample_total_us / timings.samples:.0f}   "
+                         f"paint {paint_ms * 1000.0:.0f}   table {table_ms * 1000.0:.0f}  (µs)")
+        else:
+            lines.append("collectors run in monitord, on the remote host or in the recording")
+            lines.append(f"paint {paint_ms * 1000.0:.0f}   table {table_ms * 1000.0:.0f}  (µs)")
+        self.lbl_overhead.setText("\n".join(lines))
+
+        if self.timings_file is not None:
+            self.dump_timings(timings, cpu_percent, rss_bytes, paint_ms, table_ms)
+
+    def open_timings_dump(self, path):
+        """Append one CSV row of stage timings per frame to `path` (for profiling sessions)."""
+        self.timings_file = open(path, "a", buffering=1)
+        if self.timings_file.tell() == 0:
+            columns = ["time", "cpu_percent", "rss_kb"] + [f"{name}_us" for name in COLLECTOR_NAMES]
+            self.timings_file.write(",".join(columns + ["sample_us", "paint_us", "table_us"]) + "\n")
+
+    def dump_timings(self, timings, cpu_percent, rss_bytes, paint_ms, table_ms):
+        """Write one CSV row; collectors that did not run in this sample are left empty."""
+        row = [f"{time.time():.3f}", f"{cpu_percent:.2f}", str(rss_bytes // 1024)]
+        if timings is not None:
+            for i in range(COLLECTOR_COUNT):
+                ran = timings.runs[i] != self.dumped_runs[i]
+                self.dumped_runs[i] = timings.runs[i]
+                row.append(f"{timings.last_us[i]:.1f}" if ran else "")
+            row.append(f"{timings.sample_last_us:.1f}")
+        else:
+            row += [""] * (COLLECTOR_COUNT + 1)
+        row += [f"{paint_ms * 1000.0:.1f}", f"{table_ms * 1000.0:.1f}"]
+        self.timings_file.write(",".join(row) + "\n")
 
     def create_panel(self, title, accent_color=ACCENT_BLUE):
         """Helper to create a styled card panel with a colored dot title."""
         panel = QWidget()
-        panel.setStyleSheet(f"""
-            QWidget {{
-                background-color: {BG_PANEL};
-                border-radius: 12px;
-                border: 1px solid {BORDER_GLOW};
-            }}
-        """)
+        panel.setObjectName("panel")
         layout = QVBoxLayout(panel)
         layout.setContentsMargins(14, 10, 14, 14)
         layout.setSpacing(8)
@@ -211,19 +1071,12 @@ class MainWindow(QMainWindow):
         # Title row: colored dot + uppercase label
         title_row = QHBoxLayout()
         dot = QLabel("●")
-        dot.setStyleSheet(f"color: {accent_color}; font-size: 10px; border: none; background: transparent;")
+        dot.setObjectName("panelDot")
+        dot.setProperty("tone", TONE_OF_COLOR[accent_color])
         dot.setFixedWidth(16)
 
         lbl_title = QLabel(title)
-        lbl_title.setStyleSheet(f"""
-            color: {TEXT_PRIMARY};
-            font-size: 14px;
-            font-weight: bold;
-            letter-spacing: 1.5px;
-            text-transform: uppercase;
-            border: none;
-            background: transparent;
-        """)
+        lbl_title.setObjectName("panelTitle")
 
         title_row.addWidget(dot)
         title_row.addWidget(lbl_title)
@@ -232,23 +1085,27 @@ class MainWindow(QMainWindow):
 
         # Thin separator line below the title
         sep = QWidget()
+        sep.setObjectName("separator")
         sep.setFixedHeight(1)
-        sep.setStyleSheet(f"background-color: {BORDER_GLOW}; border: none;")
         layout.addWidget(sep)
 
         return panel, layout
 
     def make_info_label(self, text="Loading...", color=TEXT_DIM, size=9):
-        """Helper to create a simple styled info label."""
+        """Helper to create a simple info label; color and size must be in LABEL_TONES / LABEL_SIZES."""
         lbl = QLabel(text)
-        lbl.setStyleSheet(f"""
-            color: {color};
-            font-size: {size}px;
-            background: transparent;
-            border: none;
-        """)
+        lbl.setProperty("tone", TONE_OF_COLOR[color])
+        lbl.setProperty("textSize", str(size))
         return lbl
 
+    def setup_scrollback(self, graph, lines):
+        """Show the last GRAPH_WINDOW samples; panning/zooming reveals the rest of the buffer."""
+        graph.setXRange(HISTORY_CAPACITY - GRAPH_WINDOW, HISTORY_CAPACITY - 1, padding=0)
+        graph.setMouseEnabled(x=True, y=False)
+        for line in lines:
+            line.setClipToView(True)
+            line.setDownsampling(auto=True, method="peak")
+
     def init_ui(self):
         # ═══ ROW 0 ═════════════════════════════════════════════════════════
 
@@ -257,23 +1114,18 @@ class MainWindow(QMainWindow):
         self.lbl_cpu_info = self.make_info_label(color=ACCENT_BLUE, size=12)
         cpu_layout.addWidget(self.lbl_cpu_info)
 
-        # CPU graph using pyqtgraph
-        self.cpu_graph = pg.PlotWidget()
-        self.cpu_graph.setBackground(BG_PANEL)
-        self.cpu_graph.showGrid(x=False, y=True, alpha=0.06)
-        self.cpu_graph.setYRange(0, 100)
-        self.cpu_graph.getAxis('bottom').setStyle(showValues=False)
-        self.cpu_graph.getAxis('left').setStyle(showValues=False)
-        self.cpu_graph.getAxis('bottom').setPen(pg.mkPen(color=BORDER_GLOW))
-        self.cpu_graph.getAxis('left').setPen(pg.mkPen(color=BORDER_GLOW))
-        self.cpu_graph.setStyleSheet("border: none;")
-
-        # Line plot with a blue filled area below
-        pen = pg.mkPen(color=ACCENT_BLUE, width=2)
-        self.cpu_line = self.cpu_graph.plot(pen=pen, antialias=True)
-        self.cpu_line.setFillLevel(0)
-        self.cpu_line.setBrush(pg.mkBrush(color=(30, 100, 200, 60)))
-        cpu_layout.addWidget(self.cpu_graph)
+        # CPU graph and per-core heatmap (pyqtgraph, built after the first frame)
+        self.cpu_graph = self.cpu_line = None
+        self.core_heatmap = self.heat_image = None
+        self.heat_data = None   # allocated once the core count is known
+        self.cpu_graph_slot = PlotSlot(self.build_cpu_graph)
+        self.core_heatmap_slot = PlotSlot(self.build_core_heatmap)
+
+        cpu_graphs = QHBoxLayout()
+        cpu_graphs.setSpacing(10)
+        cpu_graphs.addWidget(self.cpu_graph_slot, 3)
+        cpu_graphs.addWidget(self.core_heatmap_slot, 2)
+        cpu_layout.addLayout(cpu_graphs)
         self.main_layout.addWidget(self.cpu_panel, 0, 0, 1, 3)
 
         # 2. RAM Usage panel
@@ -299,123 +1151,129 @@ class MainWindow(QMainWindow):
 
         # 4. Active Processes panel - spans columns 0-2
         self.proc_panel, proc_layout = self.create_panel("ACTIVE PROCESSES", ACCENT_BLUE)
-        self.proc_table = QTableWidget(0, 5)
-        self.proc_table.setHorizontalHeaderLabels(["PID", "Name", "CPU %", "RAM %", "User"])
-        self.proc_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.proc_table.horizontalHeader().setStyleSheet(f"""
-            QHeaderView::section {{
-                background-color: {BG_PANEL2};
-                color: {ACCENT_BLUE};
-                border: none;
-                border-bottom: 1px solid {BORDER_GLOW};
-                padding: 5px;
-                font-size: 9px;
-                font-weight: bold;
-                letter-spacing: 1px;
-            }}
-        """)
-        self.proc_table.setStyleSheet(f"""
-            QTableWidget {{
-                background-color: {BG_PANEL};
-                color: {TEXT_PRIMARY};
-                border: none;
-                gridline-color: transparent;
-                font-size: 10px;
-                selection-background-color: {BORDER_GLOW};
-            }}
-            QTableWidget::item {{
-                padding: 5px 8px;
-                border-bottom: 1px solid {BORDER_GLOW};
-                background: transparent;
-            }}
-            QTableWidget::item:selected {{
-                background-color: {BORDER_GLOW};
-                color: {ACCENT_BLUE};
-            }}
-        """)
-        self.proc_table.verticalHeader().setVisible(False)
-        self.proc_table.setShowGrid(False)
-        self.proc_table.setAlternatingRowColors(False)
-        self.proc_table.verticalHeader().setDefaultSectionSize(28)  # compact row height ~28px fits 8-10 rows
-        proc_layout.addWidget(self.proc_table)
+        self.proc_filter = QLineEdit()
+        self.proc_filter.setPlaceholderText("Filter by name, user or PID")
+        self.proc_filter.setClearButtonEnabled(True)
+        self.lbl_proc_count = self.make_info_label(color=TEXT_DIM, size=9)
+        # Flat list, parent/child tree or per-user/per-cgroup totals; shown once sampling is local
+        self.proc_view = QComboBox()
+        self.proc_view.addItems(PROC_VIEWS)
+        self.proc_view.setVisible(False)
+        self.proc_view.currentIndexChanged.connect(self.on_proc_view_changed)
+        filter_row = QHBoxLayout()
+        filter_row.addWidget(self.proc_filter)
+        filter_row.addWidget(self.proc_view)
+        filter_row.addWidget(self.lbl_proc_count)
+        proc_layout.addLayout(filter_row)
+        self.proc_scanned_at = None
+
+        # The models keep rows across ticks; the proxies sort and filter without touching them
+        cpu_colors = [(20, ACCENT_BLUE), (5, ACCENT_VIOLET), (float("-inf"), TEXT_DIM)]
+        self.proc_model = ProcessTableModel(cpu_colors)
+        self.proc_proxy = ProcessFilterProxy(self)
+        self.proc_proxy.setSourceModel(self.proc_model)
+        self.tree_model = ProcessTreeModel(cpu_colors)
+        self.tree_proxy = ProcessFilterProxy(self)
+        self.tree_proxy.setRecursiveFilteringEnabled(True)
+        self.tree_proxy.setSourceModel(self.tree_model)
+        self.rollup_model = RollupTableModel(cpu_colors)
+        self.rollup_proxy = ProcessFilterProxy(self)
+        self.rollup_proxy.setSourceModel(self.rollup_model)
+        for proxy in (self.proc_proxy, self.tree_proxy, self.rollup_proxy):
+            self.proc_filter.textChanged.connect(proxy.set_filter_text)
+
+        self.proc_table = self.make_proc_table(self.proc_proxy, COL_CPU)
+        self.rollup_table = self.make_proc_table(self.rollup_proxy, ROLLUP_COL_CPU)
+
+        self.proc_tree = QTreeView()
+        self.proc_tree.setModel(self.tree_proxy)
+        self.proc_tree.setSortingEnabled(True)
+        self.proc_tree.sortByColumn(TREE_COL_CPU, Qt.SortOrder.DescendingOrder)
+        self.proc_tree.setUniformRowHeights(True)   # lets the view skip measuring every row
+        self.proc_tree.header().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+
+        self.proc_views = QStackedWidget()
+        for view in (self.proc_table, self.proc_tree, self.rollup_table):
+            self.proc_views.addWidget(view)
+        proc_layout.addWidget(self.proc_views)
         self.main_layout.addWidget(self.proc_panel, 1, 0, 1, 4)
 
         # 5. System Uptime panel - column 3, top half
         self.uptime_panel, uptime_layout = self.create_panel("SYSTEM UPTIME", ACCENT_BLUE)
         self.lbl_uptime = QLabel("Loading...")
-        self.lbl_uptime.setStyleSheet(f"""
-            font-size: 22px;
-            color: {ACCENT_BLUE};
-            font-weight: bold;
-            background: transparent;
-            border: none;
-            font-family: 'Consolas', monospace;
-        """)
+        self.lbl_uptime.setObjectName("uptime")
         self.lbl_uptime.setAlignment(Qt.AlignmentFlag.AlignCenter)
         uptime_layout.addStretch()
         uptime_layout.addWidget(self.lbl_uptime)
         uptime_layout.addStretch()
 
-        # 6. Kernel Version panel - column 3, bottom half
+        # 6. Kernel Version panel - column 3, middle
         self.kernel_panel, kernel_layout = self.create_panel("KERNEL VERSION", ACCENT_VIOLET)
         self.lbl_kernel = QLabel("Loading...")
-        self.lbl_kernel.setStyleSheet(f"""
-            font-size: 11px;
-            color: {TEXT_PRIMARY};
-            background: transparent;
-            border: none;
-            font-family: 'Consolas', monospace;
-        """)
+        self.lbl_kernel.setObjectName("kernel")
         self.lbl_kernel.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.lbl_kernel.setWordWrap(True)
         kernel_layout.addStretch()
         kernel_layout.addWidget(self.lbl_kernel)
         kernel_layout.addStretch()
 
-        # Stack both panels vertically inside a transparent container in column 3
+        # 7. Monitor Overhead panel - column 3, under the kernel version
+        self.overhead_panel, overhead_layout = self.create_panel("MONITOR OVERHEAD", ACCENT_GREEN)
+        self.lbl_overhead = self.make_info_label(color=TEXT_DIM, size=9)
+        overhead_layout.addWidget(self.lbl_overhead)
+
+        # Stack the three panels vertically inside a transparent container in column 3
         right_col_widget = QWidget()
-        right_col_widget.setStyleSheet("background: transparent; border: none;")
         right_col_layout = QVBoxLayout(right_col_widget)
         right_col_layout.setContentsMargins(0, 0, 0, 0)
         right_col_layout.setSpacing(12)
         right_col_layout.addWidget(self.uptime_panel)
         right_col_layout.addWidget(self.kernel_panel)
+        right_col_layout.addWidget(self.overhead_panel)
         self.main_layout.addWidget(right_col_widget, 1, 4)
 
         # ═══ ROW 2 ═════════════════════════════════════════════════════════
 
-        # 7. Storage panel - spans all 4 columns
-        self.disk_panel, disk_layout = self.create_panel("STORAGE (ROOT /)", ACCENT_GREEN)
+        # 8. Storage panel - spans all 4 columns
+        self.disk_panel, disk_layout = self.create_panel("STORAGE", ACCENT_GREEN)
         self.disk_gauge = CircularGauge(color=ACCENT_GREEN, label="DISK")
         self.lbl_disk_info = self.make_info_label(color=TEXT_DIM, size=10)
         self.lbl_disk_info.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-        self.lbl_disk_info.setStyleSheet(f"""
-            color: {TEXT_DIM};
-            font-size: 11px;
-            line-height: 1.8;
-            background: transparent;
-            border: none;
-            font-family: 'Consolas', monospace;
-        """)
+        self.lbl_disk_info.setObjectName("diskInfo")
+
+        # Every other block-backed mount, one line each
+        self.lbl_mounts = self.make_info_label("", color=TEXT_DIM, size=10)
+        self.lbl_mounts.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        self.lbl_mounts.setObjectName("diskInfo")
 
         disk_hz = QHBoxLayout()
         disk_hz.addStretch()
         disk_hz.addWidget(self.disk_gauge)
         disk_hz.addSpacing(30)
         disk_hz.addWidget(self.lbl_disk_info)
+        disk_hz.addSpacing(40)
+        disk_hz.addWidget(self.lbl_mounts)
         disk_hz.addStretch()
         disk_layout.addStretch()
         disk_layout.addLayout(disk_hz)
         disk_layout.addStretch()
         self.main_layout.addWidget(self.disk_panel, 2, 0, 1, 3)
 
-        # 8. Network Activity panel - row 2, column 3
+        # 9. Network Activity panel - row 2, column 3
         self.net_panel, net_layout = self.create_panel("NETWORK ACTIVITY", ACCENT_GREEN)
 
+        # Interface picker, filled from the per-interface rates in SystemMetrics
+        self.net_iface = QComboBox()
+        self.net_iface.addItem("All interfaces", None)
+        self.net_iface.currentIndexChanged.connect(self.on_net_iface_changed)
+        self.net_iface_names = ()
+        net_layout.addWidget(self.net_iface)
+
         # RX (download) row
         rx_row = QHBoxLayout()
         lbl_rx_icon = QLabel("▼")
-        lbl_rx_icon.setStyleSheet(f"color: {ACCENT_GREEN}; font-size: 14px; border: none; background: transparent;")
+        lbl_rx_icon.setProperty("tone", "green")
+        lbl_rx_icon.setProperty("textSize", "14")
         self.lbl_rx = self.make_info_label("0.0 KB/s", color=ACCENT_GREEN, size=11)
         lbl_rx_title = self.make_info_label("DOWN", color=TEXT_DIM, size=8)
         rx_col = QVBoxLayout()
@@ -429,7 +1287,8 @@ class MainWindow(QMainWindow):
         # TX (upload) row
         tx_row = QHBoxLayout()
         lbl_tx_icon = QLabel("▲")
-        lbl_tx_icon.setStyleSheet(f"color: {ACCENT_VIOLET}; font-size: 14px; border: none; background: transparent;")
+        lbl_tx_icon.setProperty("tone", "violet")
+        lbl_tx_icon.setProperty("textSize", "14")
         self.lbl_tx = self.make_info_label("0.0 KB/s", color=ACCENT_VIOLET, size=11)
         lbl_tx_title = self.make_info_label("UP", color=TEXT_DIM, size=8)
         tx_col = QVBoxLayout()
@@ -440,7 +1299,61 @@ class MainWindow(QMainWindow):
         tx_row.addLayout(tx_col)
         tx_row.addStretch()
 
-        # Network graph - RX in green, TX in violet
+        # Network graph - RX in green, TX in violet (built after the first frame)
+        self.net_graph = self.net_rx_line = self.net_tx_line = None
+        self.net_graph_slot = PlotSlot(self.build_net_graph)
+        self.net_graph_slot.setMinimumHeight(80)
+
+        self.lbl_net_detail = self.make_info_label("", color=TEXT_DIM, size=8)
+        self.lbl_net_detail.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        net_layout.addLayout(rx_row)
+        net_layout.addLayout(tx_row)
+        net_layout.addWidget(self.lbl_net_detail)
+        net_layout.addWidget(self.net_graph_slot)
+        self.main_layout.addWidget(self.net_panel, 2, 3, 1, 2)
+
+
+    def build_cpu_graph(self):
+        pg = pyqtgraph()
+        self.cpu_graph = pg.PlotWidget()
+        self.cpu_graph.setBackground(BG_PANEL)
+        self.cpu_graph.showGrid(x=False, y=True, alpha=0.06)
+        self.cpu_graph.setYRange(0, 100)
+        self.cpu_graph.getAxis('bottom').setStyle(showValues=False)
+        self.cpu_graph.getAxis('left').setStyle(showValues=False)
+        self.cpu_graph.getAxis('bottom').setPen(pg.mkPen(color=BORDER_GLOW))
+        self.cpu_graph.getAxis('left').setPen(pg.mkPen(color=BORDER_GLOW))
+
+        # Line plot with a blue filled area below
+        pen = pg.mkPen(color=ACCENT_BLUE, width=2)
+        self.cpu_line = self.cpu_graph.plot(pen=pen, antialias=True)
+        self.cpu_line.setFillLevel(0)
+        self.cpu_line.setBrush(pg.mkBrush(color=(30, 100, 200, 60)))
+        self.setup_scrollback(self.cpu_graph, [self.cpu_line])
+        self.cpu_line.setData(self.cpu_history.x, self.cpu_history.view())
+        return self.cpu_graph
+
+    def build_core_heatmap(self):
+        # One ImageItem over a (cores x time) array, not one plot per core
+        pg = pyqtgraph()
+        self.core_heatmap = pg.PlotWidget()
+        self.core_heatmap.setBackground(BG_PANEL)
+        self.core_heatmap.hideAxis('bottom')
+        self.core_heatmap.getAxis('left').setPen(pg.mkPen(color=BORDER_GLOW))
+        self.core_heatmap.getAxis('left').setTextPen(pg.mkPen(color=TEXT_DIM))
+        self.core_heatmap.setMouseEnabled(x=False, y=False)
+        self.core_heatmap.setMenuEnabled(False)
+        self.heat_image = pg.ImageItem(axisOrder='row-major')
+        heat_colors = pg.ColorMap([0.0, 0.5, 1.0], [BG_PANEL2, ACCENT_BLUE, ACCENT_VIOLET])
+        self.heat_image.setLookupTable(heat_colors.getLookupTable(0.0, 1.0, 256))
+        self.core_heatmap.addItem(self.heat_image)
+        if self.heat_data is not None:
+            self.show_heat_data(resized=True)
+        return self.core_heatmap
+
+    def build_net_graph(self):
+        pg = pyqtgraph()
         self.net_graph = pg.PlotWidget()
         self.net_graph.setBackground(BG_PANEL)
         self.net_graph.showGrid(x=False, y=True, alpha=0.06)
@@ -448,8 +1361,6 @@ class MainWindow(QMainWindow):
         self.net_graph.getAxis("left").setStyle(showValues=False)
         self.net_graph.getAxis("bottom").setPen(pg.mkPen(color=BORDER_GLOW))
         self.net_graph.getAxis("left").setPen(pg.mkPen(color=BORDER_GLOW))
-        self.net_graph.setStyleSheet("border: none;")
-        self.net_graph.setMinimumHeight(80)
 
         pen_rx = pg.mkPen(color=ACCENT_GREEN, width=2)
         pen_tx = pg.mkPen(color=ACCENT_VIOLET, width=2)
@@ -459,47 +1370,211 @@ class MainWindow(QMainWindow):
         self.net_tx_line = self.net_graph.plot(pen=pen_tx, antialias=True, name="UP")
         self.net_tx_line.setFillLevel(0)
         self.net_tx_line.setBrush(pg.mkBrush(color=(157, 127, 245, 35)))
-
-        net_layout.addLayout(rx_row)
-        net_layout.addLayout(tx_row)
-        net_layout.addWidget(self.net_graph)
-        self.main_layout.addWidget(self.net_panel, 2, 3, 1, 2)
-
-
-    def update_dashboard(self):
-        """Fetch fresh metrics from the C library and update all widgets."""
-        monitor_lib.get_system_metrics(ctypes.byref(self.metrics))
+        self.setup_scrollback(self.net_graph, [self.net_rx_line, self.net_tx_line])
+        self.show_net_history()
+        return self.net_graph
+
+    def update_core_heatmap(self):
+        """Scroll the (cores x time) heatmap one column left, in place, and add the new sample."""
+        cores = max(1, min(self.metrics.core_count, MAX_CORES))
+        resized = self.heat_data is None or self.heat_data.shape[0] != cores
+        if resized:
+            self.heat_data = np.zeros((cores, HEATMAP_WINDOW), dtype=np.float32)
+
+        # View over the ctypes array; the only copy is into the last column
+        usage = np.ctypeslib.as_array(self.metrics.cpu_cores_usage)
+        self.heat_data[:, :-1] = self.heat_data[:, 1:]
+        self.heat_data[:, -1] = usage[:cores]
+        if self.heat_image is not None:
+            self.show_heat_data(resized)
+
+    def show_heat_data(self, resized):
+        if resized:
+            cores = self.heat_data.shape[0]
+            self.heat_image.setRect(0, 0, HEATMAP_WINDOW, cores)
+            self.core_heatmap.setRange(xRange=(0, HEATMAP_WINDOW), yRange=(0, cores), padding=0)
+        self.heat_image.setImage(self.heat_data, autoLevels=False, levels=(0.0, 100.0))
+
+    def show_net_history(self):
+        # Sync Y axis so both lines share the same scale (running max of the visible window)
+        max_val = max(self.rx_history.max(), self.tx_history.max(), 1.0)
+        self.net_graph.setYRange(0, max_val * 1.2)
+        self.net_rx_line.setData(self.rx_history.x, self.rx_history.view())
+        self.net_tx_line.setData(self.tx_history.x, self.tx_history.view())
+
+    def sync_net_interfaces(self):
+        """Keep the interface picker in step with the interfaces the collector reports."""
+        names = tuple(self.metrics.net_interfaces[i].name.decode('utf-8')
+                      for i in range(self.metrics.net_interface_count))
+        if names == self.net_iface_names:
+            return
+
+        self.net_iface_names = names
+        selected = self.net_iface.currentData()
+        self.net_iface.blockSignals(True)
+        self.net_iface.clear()
+        self.net_iface.addItem("All interfaces", None)
+        for name in names:
+            self.net_iface.addItem(name, name)
+        index = self.net_iface.findData(selected) if selected in names else 0
+        self.net_iface.setCurrentIndex(index)
+        self.net_iface.blockSignals(False)
+        if index == 0 and selected is not None:
+            self.on_net_iface_changed(0)   # the picked interface went away
+
+    def selected_net_rates(self):
+        """(rx KB/s, tx KB/s, rx pkt/s, tx pkt/s, err/s, drop/s) for the picked interface."""
+        selected = self.net_iface.currentData()
+        rx_packets = tx_packets = errors = drops = 0.0
+        rx = tx = 0.0
+        for i in range(self.metrics.net_interface_count):
+            iface = self.metrics.net_interfaces[i]
+            name = iface.name.decode('utf-8')
+            if (selected is None and name == "lo") or (selected is not None and name != selected):
+                continue
+            rx += iface.rx_kbps
+            tx += iface.tx_kbps
+            rx_packets += iface.rx_packets
+            tx_packets += iface.tx_packets
+            errors += iface.rx_errors + iface.tx_errors
+            drops += iface.rx_drops + iface.tx_drops
+        if selected is None:
+            # The totals also cover interfaces beyond MAX_INTERFACES
+            rx, tx = self.metrics.net_rx_kbps, self.metrics.net_tx_kbps
+        return rx, tx, rx_packets, tx_packets, errors, drops
+
+    def on_net_iface_changed(self, index):
+        # A different interface is a different series: start the graph over
+        self.rx_history = RingSeries(HISTORY_CAPACITY, window=GRAPH_WINDOW)
+        self.tx_history = RingSeries(HISTORY_CAPACITY, window=GRAPH_WINDOW)
+
+    def cgroup_summary(self):
+        """Tooltip text for the CPU panel: the busiest cgroups of the last sample."""
+        if not self.metrics.cgroup_count:
+            return ""
+        lines = [f"Top cgroups ({self.metrics.cgroup_total} total)"]
+        for group in self.metrics.cgroups[:self.metrics.cgroup_count]:
+            limit = f" / {group.memory_limit_mb:.0f}" if group.memory_limit_mb else ""
+            lines.append(f"{group.path.decode('utf-8', 'replace')}   CPU {group.cpu_percent:.1f}%   "
+                         f"RAM {group.memory_mb:.0f}{limit} MB")
+        return "\n".join(lines)
+
+    @staticmethod
+    def make_proc_table(proxy, sort_column):
+        table = QTableView()
+        table.setModel(proxy)
+        table.setSortingEnabled(True)
+        table.sortByColumn(sort_column, Qt.SortOrder.DescendingOrder)
+        table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.verticalHeader().setVisible(False)
+        table.setShowGrid(False)
+        table.setAlternatingRowColors(False)
+        table.verticalHeader().setDefaultSectionSize(28)  # compact row height ~28px fits 8-10 rows
+        return table
+
+    def on_proc_view_changed(self, index):
+        self.proc_views.setCurrentIndex(min(index, PROC_VIEW_USERS))
+        self.sampler.want_tree = index == PROC_VIEW_TREE
+        self.sampler.want_rollups = PROC_VIEW_ROLLUPS.get(index)
+        self.rollup_model.clear()   # users and cgroups share the model
+        self.proc_scanned_at = None   # fill the new view from the next sample
+
+    def update_process_view(self, procs):
+        """Diff a full ProcessSnapshot into the model of the view on screen.
+
+        Returns False when the snapshot was taken before a view switch and
+        lacks the tree or the rollups the view needs.
+        """
+        view = self.proc_view.currentIndex()
+        if view == PROC_VIEW_TABLE:
+            self.proc_model.update_records(procs, procs.user_name)
+        elif view == PROC_VIEW_TREE:
+            if not procs.has_tree:
+                return False
+            self.tree_model.update_records(procs, procs.user_name)
+        else:
+            if procs.rollups is None or procs.rollups[0] != PROC_VIEW_ROLLUPS[view]:
+                return False
+            rollups = procs.rollups[1]
+            self.rollup_model.update_rollups(rollups)
+            self.lbl_proc_count.setText(f"{len(rollups)} {'users' if view == PROC_VIEW_USERS else 'cgroups'}")
+            return True
+        self.lbl_proc_count.setText(f"{procs.total} processes")
+        return True
+
+    def update_dashboard(self, metrics, procs=None):
+        """Update all widgets from a SystemMetrics sample (painting only, no sampling).
+
+        `procs` is the full ProcessSnapshot when sampling locally; without it the
+        table shows the top-N from `metrics.processes`.
+        """
+        self.metrics = metrics
 
         # Update CPU info label and graph history
         model = self.metrics.cpu_model.decode('utf-8').strip()
-        self.lbl_cpu_info.setText(
+        cpu_text = (
             f"Model: {model}   |   Freq: {self.metrics.cpu_freq_mhz:.0f} MHz   |   "
-            f"Usage: {self.metrics.cpu_usage_percent:.1f}%"
+            f"Usage: {self.metrics.cpu_usage_percent:.1f}%   |   "
+            f"Load: {self.metrics.load_avg_1:.2f} {self.metrics.load_avg_5:.2f} {self.metrics.load_avg_15:.2f}"
         )
+        if self.metrics.psi_available:
+            cpu_text += f"   |   Stall: {self.metrics.cpu_pressure.some_avg10:.1f}%"
+        self.lbl_cpu_info.setText(cpu_text)
+        self.lbl_cpu_info.setToolTip(self.cgroup_summary())
         self.cpu_history.append(self.metrics.cpu_usage_percent)
-        self.cpu_history.pop(0)
-        self.cpu_line.setData(self.cpu_history)
+        if self.cpu_line is not None:
+            self.cpu_line.setData(self.cpu_history.x, self.cpu_history.view())
+        self.update_core_heatmap()
 
         # Update RAM gauge and info label
         self.ram_gauge.set_value(self.metrics.ram_usage_percent)
-        self.lbl_ram_info.setText(
-            f"{self.metrics.ram_used_gb:.1f} GB  /  {self.metrics.ram_total_gb:.1f} GB"
-        )
+        ram_text = f"{self.metrics.ram_used_gb:.1f} GB  /  {self.metrics.ram_total_gb:.1f} GB"
+        if self.metrics.swap_total_gb > 0:
+            ram_text += f"\nSwap: {self.metrics.swap_used_gb:.1f} / {self.metrics.swap_total_gb:.1f} GB"
+        if self.metrics.psi_available:
+            ram_text += f"\nStall: {self.metrics.memory_pressure.some_avg10:.1f}%"
+        self.lbl_ram_info.setText(ram_text)
 
         # Update GPU gauge and VRAM info
         gpu_name = self.metrics.gpu_name.decode('utf-8').strip()
         self.gpu_gauge.set_value(self.metrics.gpu_usage_percent)
-        self.lbl_gpu_info.setText(
-            f"{gpu_name}\nVRAM: {self.metrics.gpu_memory_used_gb:.1f} / {self.metrics.gpu_memory_total_gb:.1f} GB"
-        )
-
-        # Update disk gauge and partition info
+        gpu_text = f"{gpu_name}\nVRAM: {self.metrics.gpu_memory_used_gb:.1f} / {self.metrics.gpu_memory_total_gb:.1f} GB"
+        # Extra GPUs get one compact line each under the gauge (GPU 0)
+        for i in range(1, self.metrics.gpu_count):
+            gpu = self.metrics.gpus[i]
+            gpu_text += (f"\nGPU{i}: {gpu.usage_percent:.0f}%  "
+                         f"{gpu.memory_used_mb / 1024.0:.1f} / {gpu.memory_total_mb / 1024.0:.1f} GB")
+        self.lbl_gpu_info.setText(gpu_text)
+
+        # Update disk gauge, root partition info and the other mounts
         self.disk_gauge.set_value(self.metrics.disk_usage_percent)
-        self.lbl_disk_info.setText(
-            f"Root Partition  (/)\n\n"
-            f"Used:   {self.metrics.disk_used_gb:.1f} GB\n"
-            f"Total:  {self.metrics.disk_total_gb:.1f} GB"
-        )
+        mounts = self.metrics.mounts[:self.metrics.mount_count]
+        io_by_device = {io.name: io for io in self.metrics.disk_io[:self.metrics.disk_io_count]}
+
+        root_device = mounts[0].device.decode('utf-8', 'replace') if mounts else ""
+        root_io = io_by_device.get(mounts[0].device) if mounts else None
+        root_text = (f"Root Partition  (/)  {root_device}\n\n"
+                     f"Used:   {self.metrics.disk_used_gb:.1f} GB\n"
+                     f"Total:  {self.metrics.disk_total_gb:.1f} GB")
+        if root_io is not None:
+            root_text += (f"\nR/W:    {fmt_bytes_rate(root_io.read_bytes_per_sec)} / "
+                          f"{fmt_bytes_rate(root_io.write_bytes_per_sec)}\n"
+                          f"IOPS:   {root_io.read_iops:.0f} / {root_io.write_iops:.0f}   "
+                          f"util {root_io.util_percent:.0f}%")
+        self.lbl_disk_info.setText(root_text)
+
+        mount_lines = []
+        for mount in mounts[1:]:
+            line = (f"{mount.mount_point.decode('utf-8', 'replace'):<18} "
+                    f"{mount.usage_percent:5.1f}%  of {mount.total_gb:.1f} GB")
+            io = io_by_device.get(mount.device)
+            if io is not None:
+                line += (f"   R {fmt_bytes_rate(io.read_bytes_per_sec)}"
+                         f"  W {fmt_bytes_rate(io.write_bytes_per_sec)}"
+                         f"  {io.util_percent:.0f}%")
+            mount_lines.append(line)
+        self.lbl_mounts.setText("\n".join(mount_lines))
 
         # Update uptime display (convert seconds to h/m/s)
         m, s = divmod(self.metrics.uptime_seconds, 60)
@@ -511,9 +1586,9 @@ class MainWindow(QMainWindow):
         self.lbl_kernel.setText(kernel)
 
 
-        # Update network speed labels and graph
-        rx = self.metrics.net_rx_kbps
-        tx = self.metrics.net_tx_kbps
+        # Update network speed labels and graph (all interfaces, or the picked one)
+        self.sync_net_interfaces()
+        rx, tx, rx_packets, tx_packets, errors, drops = self.selected_net_rates()
 
         def fmt_speed(kbps):
             if kbps >= 1024:
@@ -522,50 +1597,60 @@ class MainWindow(QMainWindow):
 
         self.lbl_rx.setText(fmt_speed(rx))
         self.lbl_tx.setText(fmt_speed(tx))
+        self.lbl_net_detail.setText(
+            f"pkts ▼{rx_packets:.0f}/s ▲{tx_packets:.0f}/s   err {errors:.0f}/s   drop {drops:.0f}/s"
+        )
 
         self.rx_history.append(rx)
-        self.rx_history.pop(0)
         self.tx_history.append(tx)
-        self.tx_history.pop(0)
-
-        # Sync Y axis so both lines share the same scale
-        max_val = max(max(self.rx_history), max(self.tx_history), 1.0)
-        self.net_graph.setYRange(0, max_val * 1.2)
-        self.net_rx_line.setData(self.rx_history)
-        self.net_tx_line.setData(self.tx_history)
-
-        # Update process table rows
-        self.proc_table.setRowCount(self.metrics.process_count)
-        for i in range(self.metrics.process_count):
-            proc = self.metrics.processes[i]
-
-            pid_item  = QTableWidgetItem(str(proc.pid))
-            name_item = QTableWidgetItem(proc.name.decode('utf-8').strip())
-            cpu_item  = QTableWidgetItem(f"{proc.cpu_percent:.1f}%")
-            ram_item  = QTableWidgetItem(f"{proc.ram_percent:.1f}%")
-            user_item = QTableWidgetItem(proc.user.decode('utf-8').strip())
-
-            # Color-code CPU% based on load level
-            if proc.cpu_percent > 20:
-                cpu_item.setForeground(QColor(ACCENT_BLUE))
-            elif proc.cpu_percent > 5:
-                cpu_item.setForeground(QColor(ACCENT_VIOLET))
+        if self.net_graph is not None:
+            self.show_net_history()
+
+        # Diff the process rows into the model (only when the scan ran); only changed cells repaint
+        table_start = time.perf_counter()
+        scanned_at = self.metrics.updated_at[COLLECTOR_PROCESSES]
+        if scanned_at != self.proc_scanned_at:
+            self.proc_scanned_at = scanned_at
+            if procs is not None:
+                if not self.update_process_view(procs):
+                    self.proc_scanned_at = None
             else:
-                cpu_item.setForeground(QColor(TEXT_DIM))
-
-            # Make all cells read-only
-            for item in [pid_item, name_item, cpu_item, ram_item, user_item]:
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-
-            self.proc_table.setItem(i, 0, pid_item)
-            self.proc_table.setItem(i, 1, name_item)
-            self.proc_table.setItem(i, 2, cpu_item)
-            self.proc_table.setItem(i, 3, ram_item)
-            self.proc_table.setItem(i, 4, user_item)
-
+                self.proc_model.update(self.metrics.processes, self.metrics.process_count)
+                self.lbl_proc_count.setText(f"top {self.metrics.process_count}")
+        self.table_ms = (time.perf_counter() - table_start) * 1000.0
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    parser = argparse.ArgumentParser(description="Linux System Monitor")
+    parser.add_argument("--ring", nargs="?", const=RING_DEFAULT_NAME, default=None, metavar="NAME",
+                        help="read samples from a running monitord (/dev/shm/NAME) instead of sampling locally")
+    parser.add_argument("--alerts", default=ALERT_RULES_PATH, metavar="RULES",
+                        help="alert rules file, evaluated on every local sample (default: %(default)s)")
+    parser.add_argument("--alert-sink", default=ALERT_LOG_PATH, metavar="SINK",
+                        help="where alert events go: a log file or unix:/path/to/socket (default: %(default)s)")
+    parser.add_argument("--dump-timings", default=None, metavar="CSV",
+                        help="append the per-stage timings of every frame to CSV (profiling sessions)")
+    parser.add_argument("--remote", nargs="+", default=None, metavar="ADDR",
+                        help="show samples from metrics_server.py instances (host:port or unix:/path)")
+    parser.add_argument("--grid", action="store_true",
+                        help="with --remote, start on the grid of all hosts instead of the dashboard")
+    parser.add_argument("--record", default=None, metavar="FILE",
+                        help="record every local sample and the full process list to FILE (and FILE.idx)")
+    parser.add_argument("--replay", default=None, metavar="FILE",
+                        help="play back a session recorded with --record instead of sampling")
+    args, qt_args = parser.parse_known_args()
+    local = args.ring is None and not args.remote and not args.replay
+    if args.record and not local:
+        parser.error("--record needs local sampling (not --ring, --remote or --replay)")
+    if args.replay:
+        try:
+            SessionReader(args.replay).close()
+        except (OSError, SessionError) as error:
+            parser.error(f"cannot replay {args.replay}: {error}")
+
+    app = QApplication([sys.argv[0]] + qt_args)
+    # With --ring or --remote the rules belong to the collector side (monitord -a), next to the samples
+    alerts = open_alerts(args.alerts, args.alert_sink) if local else None
+    window = MainWindow(ring_name=args.ring, alerts=alerts, timings_path=args.dump_timings, remote=args.remote,
+                        grid=args.grid, record=args.record, replay=args.replay)
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
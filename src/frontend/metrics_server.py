@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Serve SystemMetrics to any number of subscribers over TCP or Unix sockets.
+
+    metrics_server.py [--listen ADDR ...] [--ring [NAME]] [--interval-ms MS] [--keyframe-every N]
+
+One asyncio loop does everything: it takes a sample per interval (from
+libmonitor.so on a worker thread, or from a running monitord's ring with
+--ring), encodes it once as a SNAPSHOT and a DELTA (see remote.py), and
+queues the right one to every subscriber. Each subscriber only has a small
+frame queue and a writer coroutine, so hundreds of them cost no threads;
+one that cannot keep up has its queue dropped and resumes from a snapshot
+instead of holding the others back.
+
+ADDR is host:port (default 127.0.0.1:7411) or unix:/path. Nothing is
+authenticated: bind to localhost or a Unix socket and tunnel (ssh -L) across
+machines, or expose it only on a trusted network.
+"""
+import argparse
+import asyncio
+import ctypes
+import os
+import socket
+import sys
+import time
+
+from bridge import SystemMetrics, load_monitor_lib, first_sample_delay
+from remote import (FRAME_SNAPSHOT, FRAME_DELTA, DEFAULT_PORT, METRICS_SIZE,
+                    encode_frame, encode_hello, encode_delta, parse_address)
+from ring import RingReader, RING_DEFAULT_NAME
+
+QUEUE_FRAMES = 8           # frames a subscriber may lag behind before it is resynced
+KEYFRAME_EVERY = 30        # samples between forced snapshots
+LISTEN_BACKLOG = 1024      # a whole dashboard fleet reconnecting at once after a restart
+
+
+class LocalSource:
+    """Samples with libmonitor.so in this process (call `read` off the event loop)."""
+
+    def __init__(self):
+        self.lib = load_monitor_lib()
+        self.metrics = SystemMetrics()
+        self.started = False
+
+    def read(self):
+        if not self.started:
+            # Give the counters primed at load time a baseline, like the dashboard does
+            time.sleep(first_sample_delay())
+            self.started = True
+        start = time.perf_counter()
+        self.lib.get_system_metrics(ctypes.byref(self.metrics))
+        sample_ms = (time.perf_counter() - start) * 1000.0
+        return time.time(), sample_ms, bytes(self.metrics)
+
+
+class RingSource:
+    """Takes the newest sample from a monitord ring; None when there is nothing new."""
+
+    def __init__(self, name):
+        self.name = name
+        self.reader = RingReader(name)
+        self.last_index = None
+
+    def read(self):
+        sample = self.reader.latest()
+        if sample is None or sample.index == self.last_index:
+            if self.reader.replaced():
+                self.reattach()
+            return None
+        data = ctypes.string_at(ctypes.addressof(sample.metrics), METRICS_SIZE)
+        if not self.reader.is_valid(sample):
+            return None   # the writer lapped the slot while it was copied
+        self.last_index = sample.index
+        return sample.timestamp, sample.sample_ms, data
+
+    def reattach(self):
+        # monitord was restarted; samples are copied out, so the old mapping can go at once
+        try:
+            reader = RingReader(self.name)
+        except (OSError, ValueError):
+            return   # not ready yet, try again on the next read
+        self.reader.close()
+        self.reader = reader
+        self.last_index = None
+
+
+class Subscriber:
+    __slots__ = ("writer", "queue", "needs_snapshot", "name")
+
+    def __init__(self, writer, name):
+        self.writer = writer
+        self.queue = asyncio.Queue(QUEUE_FRAMES)
+        self.needs_snapshot = True
+        self.name = name
+
+
+class MetricsServer:
+    def __init__(self, source, interval_ms=1000, keyframe_every=KEYFRAME_EVERY):
+        self.source = source
+        self.interval = interval_ms / 1000.0
+        self.keyframe_every = max(1, keyframe_every)
+        self.hello = encode_hello(socket.gethostname())
+        self.subscribers = set()
+        self.seq = 0
+        self.previous = None
+        self.snapshot = None   # the last sample as a SNAPSHOT frame, for new subscribers
+        self.resyncs = 0
+
+    async def serve(self, addresses):
+        servers = []
+        for address in addresses:
+            kind, target = parse_address(address)
+            if kind == "unix":
+                if os.path.exists(target):
+                    os.unlink(target)   # left over from a previous run
+                servers.append(await asyncio.start_unix_server(self.handle_client, target, backlog=LISTEN_BACKLOG))
+            else:
+                servers.append(await asyncio.start_server(self.handle_client, *target, reuse_address=True,
+                                                          backlog=LISTEN_BACKLOG))
+            print(f"Serving samples on {address}", flush=True)
+
+        try:
+            await self.sample_loop()
+        finally:
+            for server in servers:
+                server.close()
+
+    async def sample_loop(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            # get_system_metrics drops the GIL; on a worker thread it never stalls the writers
+            sample = await loop.run_in_executor(None, self.source.read)
+            if sample is not None:
+                self.broadcast(*sample)
+
+            # Absolute deadlines, like monitord, so the period does not drift
+            deadline += self.interval
+            delay = deadline - loop.time()
+            if delay < -self.interval:
+                deadline = loop.time()   # far behind: skip ahead instead of bursting
+            await asyncio.sleep(max(0.0, delay))
+
+    def broadcast(self, timestamp, sample_ms, data):
+        self.seq += 1
+        self.snapshot = encode_frame(FRAME_SNAPSHOT, self.seq, timestamp, sample_ms, data)
+        if self.previous is not None and self.seq % self.keyframe_every:
+            delta = encode_frame(FRAME_DELTA, self.seq, timestamp, sample_ms, encode_delta(self.previous, data))
+        else:
+            delta = self.snapshot
+        self.previous = data
+
+        for subscriber in self.subscribers:
+            frame = self.snapshot if subscriber.needs_snapshot else delta
+            try:
+                subscriber.queue.put_nowait(frame)
+                subscriber.needs_snapshot = False
+            except asyncio.QueueFull:
+                # Too slow: the queued deltas are useless now, start it over from this sample
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait(self.snapshot)
+                self.resyncs += 1
+
+    async def handle_client(self, reader, writer):
+        peer = writer.get_extra_info("peername") or "unix"
+        subscriber = Subscriber(writer, str(peer))
+        writer.write(self.hello)
+        if self.snapshot is not None:
+            subscriber.queue.put_nowait(self.snapshot)   # something to paint right away
+            subscriber.needs_snapshot = False
+        self.subscribers.add(subscriber)
+
+        sender = asyncio.create_task(self.send_frames(subscriber))
+        try:
+            # Subscribers never talk; this only notices when they hang up
+            while await reader.read(4096):
+                pass
+        except (ConnectionError, asyncio.CancelledError):
+            pass   # hung up, or the server is shutting down
+        finally:
+            self.subscribers.discard(subscriber)
+            sender.cancel()
+            writer.close()
+
+    async def send_frames(self, subscriber):
+        try:
+            while True:
+                frame = await subscriber.queue.get()
+                subscriber.writer.write(frame)
+                await subscriber.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listen", action="append", metavar="ADDR",
+                        help=f"host:port or unix:/path, repeatable (default: 127.0.0.1:{DEFAULT_PORT})")
+    parser.add_argument("--ring", nargs="?", const=RING_DEFAULT_NAME, default=None, metavar="NAME",
+                        help="serve the samples of a running monitord instead of sampling here")
+    parser.add_argument("--interval-ms", type=int, default=1000)
+    parser.add_argument("--keyframe-every", type=int, default=KEYFRAME_EVERY, metavar="N",
+                        help="send a full snapshot every N samples (default: %(default)s)")
+    args = parser.parse_args()
+
+    source = RingSource(args.ring) if args.ring is not None else LocalSource()
+    server = MetricsServer(source, args.interval_ms, args.keyframe_every)
+    try:
+        asyncio.run(server.serve(args.listen or [f"127.0.0.1:{DEFAULT_PORT}"]))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,502 @@
+"""Item models for the process views, updated by diffing samples instead of rebuilding rows."""
+from PyQt6.QtCore import Qt, QAbstractTableModel, QAbstractItemModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QColor
+
+COL_PID, COL_NAME, COL_CPU, COL_RAM, COL_USER = range(5)
+HEADERS = ["PID", "Name", "CPU %", "RAM %", "User"]
+
+# Row layout: display values first, then the raw values they were rendered from
+# (the user key is the name bytes for ProcessData, the uid for ProcessRecord)
+_PID, _NAME, _CPU, _RAM, _USER, _NAME_RAW, _USER_RAW = range(7)
+
+TREE_COL_NAME, TREE_COL_PID, TREE_COL_PROCS, TREE_COL_CPU, TREE_COL_RAM, TREE_COL_USER = range(6)
+TREE_HEADERS = ["Name", "PID", "Procs", "CPU %", "RAM %", "User"]
+
+ROLLUP_COL_NAME, ROLLUP_COL_PROCS, ROLLUP_COL_CPU, ROLLUP_COL_RAM, ROLLUP_COL_RSS = range(5)
+ROLLUP_HEADERS = ["Name", "Procs", "CPU %", "RAM %", "RSS"]
+
+
+def _decode(raw):
+    return raw.decode('utf-8', 'replace').strip()
+
+
+def _emit_runs(model, changed, parent):
+    """Emit `dataChanged` for sorted (row, first column, last column) spans under `parent`.
+
+    Consecutive rows are merged into one rectangle per run.
+    """
+    run_start = None
+    for row, first, last in changed:
+        if run_start is not None and row == run_end + 1:
+            run_end = row
+            run_first, run_last = min(run_first, first), max(run_last, last)
+            continue
+        if run_start is not None:
+            model.dataChanged.emit(model.index(run_start, run_first, parent),
+                                   model.index(run_end, run_last, parent))
+        run_start = run_end = row
+        run_first, run_last = first, last
+    if run_start is not None:
+        model.dataChanged.emit(model.index(run_start, run_first, parent), model.index(run_end, run_last, parent))
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """Process rows kept in a flat list with a PID -> row index.
+
+    `update()` (top-N ProcessData) and `update_records()` (the full
+    ProcessSnapshot) touch the view only where the sample differs from what
+    is already shown: rows are removed when a process exits, appended when one
+    appears, and `dataChanged` is emitted for the runs of cells whose (rounded)
+    values changed. Row order is arrival order; sorting is left to a
+    ProcessFilterProxy on top.
+    """
+
+    headers = HEADERS
+    _key = _PID   # row slot that identifies a row across samples
+
+    def __init__(self, cpu_colors, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_of = {}   # pid -> index into _rows
+        # (threshold, QColor) pairs, highest threshold first; built once, not per cell
+        self._cpu_colors = [(limit, QColor(color)) for limit, color in cpu_colors]
+
+    # ── Qt model interface ───────────────────────────────────────────────
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == COL_CPU or column == COL_RAM:
+                return f"{row[column]:.1f}%"
+            return str(row[column])
+        if role == Qt.ItemDataRole.UserRole:
+            return row[column]   # raw value, used as the sort key
+        if role == Qt.ItemDataRole.ForegroundRole and column == COL_CPU:
+            for limit, color in self._cpu_colors:
+                if row[_CPU] > limit:
+                    return color
+            return self._cpu_colors[-1][1]
+        return None
+
+    def filter_keys(self, row, parent):
+        """Lower-case texts the filter box is matched against."""
+        row = self._rows[row]
+        return (row[_NAME].lower(), row[_USER].lower(), str(row[_PID]))
+
+    # ── Diff update ──────────────────────────────────────────────────────
+
+    def update(self, processes, count):
+        """Sync with the first `count` ProcessData entries (the top-N in SystemMetrics)."""
+        entries = {}
+        for i in range(count):
+            proc = processes[i]
+            entries[proc.pid] = (proc.name, proc.cpu_percent, proc.ram_percent, proc.user)
+        self._sync(entries, _decode)
+
+    def update_records(self, snapshot, user_name):
+        """Sync with every record of a ProcessSnapshot; `user_name(uid)` resolves the owner."""
+        entries = {}
+        records = snapshot.records
+        for i in range(snapshot.count):
+            record = records[i]
+            entries[record.pid] = (record.name, record.cpu_percent, record.ram_percent, record.uid)
+        self._sync(entries, user_name)
+
+    def _sync(self, entries, user_text):
+        """`entries` maps pid -> (raw name, cpu, ram, user key); `user_text(key)` renders the key."""
+        self._remove_exited(entries)
+
+        changed = []   # (row, first column, last column)
+        arrived = []
+        for pid, entry in entries.items():
+            row_index = self._row_of.get(pid)
+            if row_index is None:
+                arrived.append((pid, entry))
+                continue
+            first, last = self._apply(self._rows[row_index], entry, user_text)
+            if first is not None:
+                changed.append((row_index, first, last))
+        changed.sort()
+        self._emit_changed(changed)
+
+        self._append_rows([self._new_row(pid, entry, user_text) for pid, entry in arrived])
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows = []
+        self._row_of = {}
+        self.endResetModel()
+
+    def _append_rows(self, rows):
+        if not rows:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        for row in rows:
+            self._row_of[row[self._key]] = len(self._rows)
+            self._rows.append(row)
+        self.endInsertRows()
+
+    def _remove_exited(self, seen):
+        key = self._key
+        gone = [index for index, row in enumerate(self._rows) if row[key] not in seen]
+        if not gone:
+            return
+
+        # Remove contiguous runs from the bottom up so earlier indices stay valid
+        end = len(gone) - 1
+        while end >= 0:
+            start = end
+            while start > 0 and gone[start - 1] == gone[start] - 1:
+                start -= 1
+            self.beginRemoveRows(QModelIndex(), gone[start], gone[end])
+            del self._rows[gone[start]:gone[end] + 1]
+            self.endRemoveRows()
+            end = start - 1
+
+        self._row_of = {row[key]: index for index, row in enumerate(self._rows)}
+
+    @staticmethod
+    def _new_row(pid, entry, user_text):
+        name_raw, cpu, ram, user_key = entry
+        return [pid, _decode(name_raw), round(cpu, 1), round(ram, 1), user_text(user_key),
+                name_raw, user_key]
+
+    @staticmethod
+    def _apply(row, entry, user_text):
+        """Update `row` in place; return the changed column span or (None, None)."""
+        name_raw, cpu, ram, user_key = entry
+        first = last = None
+
+        # Names change only on exec, so compare the raw bytes before decoding anything
+        if name_raw != row[_NAME_RAW]:
+            row[_NAME_RAW] = name_raw
+            row[_NAME] = _decode(name_raw)
+            first = last = COL_NAME
+
+        # Compare at display precision so invisible jitter does not repaint the cell
+        cpu = round(cpu, 1)
+        if cpu != row[_CPU]:
+            row[_CPU] = cpu
+            first = COL_CPU if first is None else first
+            last = COL_CPU
+        ram = round(ram, 1)
+        if ram != row[_RAM]:
+            row[_RAM] = ram
+            first = COL_RAM if first is None else first
+            last = COL_RAM
+
+        if user_key != row[_USER_RAW]:
+            row[_USER_RAW] = user_key
+            row[_USER] = user_text(user_key)
+            first = COL_USER if first is None else first
+            last = COL_USER
+        return first, last
+
+    def _emit_changed(self, changed):
+        _emit_runs(self, changed, QModelIndex())
+
+
+class RollupTableModel(ProcessTableModel):
+    """Per-user or per-cgroup totals (bridge.process_rollups), one row per group name.
+
+    Same diffing as the process table, keyed by the group name instead of the PID.
+    """
+
+    headers = ROLLUP_HEADERS
+    _key = ROLLUP_COL_NAME
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == ROLLUP_COL_CPU or column == ROLLUP_COL_RAM:
+                return f"{row[column]:.1f}%"
+            if column == ROLLUP_COL_RSS:
+                return f"{row[column]} MB"
+            return str(row[column])
+        if role == Qt.ItemDataRole.UserRole:
+            return row[column]
+        if role == Qt.ItemDataRole.ForegroundRole and column == ROLLUP_COL_CPU:
+            for limit, color in self._cpu_colors:
+                if row[ROLLUP_COL_CPU] > limit:
+                    return color
+            return self._cpu_colors[-1][1]
+        return None
+
+    def filter_keys(self, row, parent):
+        return (self._rows[row][ROLLUP_COL_NAME].lower(),)
+
+    def update_rollups(self, rollups):
+        """Sync with a list of ProcessRollup (all of one kind)."""
+        entries = {}
+        for rollup in rollups:
+            entries[_decode(rollup.name)] = [rollup.process_count, round(rollup.cpu_percent, 1),
+                                             round(rollup.ram_percent, 1), rollup.rss_kb // 1024]
+        self._remove_exited(entries)
+
+        changed = []
+        arrived = []
+        for name, values in entries.items():
+            row_index = self._row_of.get(name)
+            if row_index is None:
+                arrived.append([name] + values)
+                continue
+            row = self._rows[row_index]
+            columns = [column for column, value in enumerate(values, 1) if value != row[column]]
+            if columns:
+                row[1:] = values
+                changed.append((row_index, columns[0], columns[-1]))
+        changed.sort()
+        self._emit_changed(changed)
+        self._append_rows(arrived)
+
+
+class _TreeNode:
+    __slots__ = ("pid", "parent", "row", "children", "values", "name_raw", "uid", "own")
+
+    def __init__(self, pid, parent):
+        self.pid = pid
+        self.parent = parent    # parent pid, 0 = top level
+        self.row = 0            # index in the parent's `children`
+        self.children = []      # child pids, in arrival order
+        self.values = None      # one value per tree column (rounded, as displayed)
+        self.name_raw = None
+        self.uid = None
+        self.own = (0.0, 0.0)   # the process's own CPU/RAM, for the tooltip
+
+
+class ProcessTreeModel(QAbstractItemModel):
+    """Parent/child process tree with CPU and RAM summed over each subtree.
+
+    Fed from a ProcessSnapshot after `fill_tree()`: the collector already
+    keeps the tree and its sums, so this only diffs. A subtree is removed when
+    its root exits or moves to another parent (its live descendants come back
+    as arrivals), new processes are inserted under their parent, and
+    `dataChanged` is emitted for the rows whose rounded values changed. An
+    index's internalId is its PID; PID 0 is the invisible root.
+    """
+
+    def __init__(self, cpu_colors, parent=None):
+        super().__init__(parent)
+        self._root = _TreeNode(0, None)
+        self._nodes = {0: self._root}
+        self._cpu_colors = [(limit, QColor(color)) for limit, color in cpu_colors]
+
+    # ── Qt model interface ───────────────────────────────────────────────
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self._nodes[parent.internalId()] if parent.isValid() else self._root
+        if not (0 <= row < len(node.children) and 0 <= column < len(TREE_HEADERS)):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(self._nodes[self._nodes[index.internalId()].parent])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self._nodes[parent.internalId()] if parent.isValid() else self._root
+        return len(node.children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(TREE_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return TREE_HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        node = self._nodes[index.internalId()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == TREE_COL_CPU or column == TREE_COL_RAM:
+                return f"{node.values[column]:.1f}%"
+            return str(node.values[column])
+        if role == Qt.ItemDataRole.UserRole:
+            return node.values[column]
+        if role == Qt.ItemDataRole.ForegroundRole and column == TREE_COL_CPU:
+            for limit, color in self._cpu_colors:
+                if node.values[TREE_COL_CPU] > limit:
+                    return color
+            return self._cpu_colors[-1][1]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            own_cpu, own_ram = node.own
+            return (f"{node.values[TREE_COL_NAME]} alone: CPU {own_cpu:.1f}%   RAM {own_ram:.1f}%\n"
+                    f"with {node.values[TREE_COL_PROCS] - 1} descendants: "
+                    f"CPU {node.values[TREE_COL_CPU]:.1f}%   RAM {node.values[TREE_COL_RAM]:.1f}%")
+        return None
+
+    def filter_keys(self, row, parent):
+        node = self._nodes[parent.internalId()] if parent.isValid() else self._root
+        values = self._nodes[node.children[row]].values
+        return (values[TREE_COL_NAME].lower(), values[TREE_COL_USER].lower(), str(values[TREE_COL_PID]))
+
+    def _index_of(self, node):
+        return QModelIndex() if node.pid == 0 else self.createIndex(node.row, 0, node.pid)
+
+    # ── Diff update ──────────────────────────────────────────────────────
+
+    def update_records(self, snapshot, user_name):
+        """Sync with a ProcessSnapshot whose `fill_tree()` ran; `user_name(uid)` resolves the owner."""
+        entries = {}
+        records, tree = snapshot.records, snapshot.tree
+        for i in range(snapshot.count):
+            record, node = records[i], tree[i]
+            entries[record.pid] = (node.parent_pid, record.name, node.descendants + 1,
+                                   node.subtree_cpu_percent, node.subtree_ram_percent, record.uid,
+                                   record.cpu_percent, record.ram_percent)
+
+        self._remove_gone(entries)
+
+        changed = {}   # parent pid -> [(row, first column, last column)]
+        for pid, node in self._nodes.items():
+            entry = entries.get(pid)
+            if entry is None:
+                continue   # the root
+            first, last = self._apply(node, entry, user_name)
+            if first is not None:
+                changed.setdefault(node.parent, []).append((node.row, first, last))
+        for parent_pid, spans in changed.items():
+            spans.sort()
+            _emit_runs(self, spans, self._index_of(self._nodes[parent_pid]))
+
+        self._insert_arrived(entries, user_name)
+
+    @staticmethod
+    def _parent_of(entry, entries):
+        # A parent outside the snapshot (or a partial snapshot) puts the process at the top
+        parent_pid = entry[0]
+        return parent_pid if parent_pid in entries else 0
+
+    def _remove_gone(self, entries):
+        gone = set()
+        for pid, node in self._nodes.items():
+            entry = entries.get(pid)
+            if pid != 0 and (entry is None or self._parent_of(entry, entries) != node.parent):
+                gone.add(pid)
+        if not gone:
+            return
+
+        # Only the topmost removed nodes get a removeRows; their subtrees go with them
+        rows_of = {}   # parent pid -> rows to remove
+        for pid in gone:
+            node = self._nodes[pid]
+            up = node.parent
+            while up != 0 and up not in gone:
+                up = self._nodes[up].parent
+            if up == 0:
+                rows_of.setdefault(node.parent, []).append(node.row)
+
+        dropped = []
+        for parent_pid, rows in rows_of.items():
+            # A parent's own row may have moved when its siblings were removed above,
+            # so its index is taken only now
+            parent = self._nodes[parent_pid]
+            parent_index = self._index_of(parent)
+            rows.sort()
+            end = len(rows) - 1
+            while end >= 0:
+                start = end
+                while start > 0 and rows[start - 1] == rows[start] - 1:
+                    start -= 1
+                first, last = rows[start], rows[end]
+                self.beginRemoveRows(parent_index, first, last)
+                dropped.extend(parent.children[first:last + 1])
+                del parent.children[first:last + 1]
+                for row in range(first, len(parent.children)):
+                    self._nodes[parent.children[row]].row = row
+                self.endRemoveRows()
+                end = start - 1
+
+        while dropped:
+            node = self._nodes.pop(dropped.pop())
+            dropped.extend(node.children)
+
+    def _insert_arrived(self, entries, user_name):
+        arrived = {}
+        for pid, entry in entries.items():
+            if pid not in self._nodes:
+                node = _TreeNode(pid, self._parent_of(entry, entries))
+                self._apply(node, entry, user_name)
+                arrived[pid] = node
+        if not arrived:
+            return
+
+        # A new process under a new parent is linked before the parent is shown
+        tops = {}   # existing parent pid -> new children
+        for node in arrived.values():
+            parent = arrived.get(node.parent)
+            if parent is None:
+                tops.setdefault(node.parent, []).append(node)
+            else:
+                node.row = len(parent.children)
+                parent.children.append(node.pid)
+        self._nodes.update(arrived)
+
+        for parent_pid, nodes in tops.items():
+            parent = self._nodes[parent_pid]
+            start = len(parent.children)
+            self.beginInsertRows(self._index_of(parent), start, start + len(nodes) - 1)
+            for node in nodes:
+                node.row = len(parent.children)
+                parent.children.append(node.pid)
+            self.endInsertRows()
+
+    @staticmethod
+    def _apply(node, entry, user_name):
+        """Update `node` from its entry; return the changed column span or (None, None)."""
+        _, name_raw, procs, cpu, ram, uid, own_cpu, own_ram = entry
+        old = node.values
+        name = old[TREE_COL_NAME] if name_raw == node.name_raw else _decode(name_raw)
+        user = old[TREE_COL_USER] if uid == node.uid else user_name(uid)
+        node.name_raw, node.uid, node.own = name_raw, uid, (own_cpu, own_ram)
+        node.values = [name, node.pid, procs, round(cpu, 1), round(ram, 1), user]
+        if old is None:
+            return None, None
+
+        columns = [column for column, value in enumerate(node.values) if value != old[column]]
+        return (columns[0], columns[-1]) if columns else (None, None)
+
+
+class ProcessFilterProxy(QSortFilterProxyModel):
+    """Sorts on the raw values (UserRole) and filters on the model's `filter_keys()`.
+
+    On the tree model, recursive filtering keeps the ancestors of every match.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(Qt.ItemDataRole.UserRole)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+        self._needle = ""
+
+    def set_filter_text(self, text):
+        self._needle = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        return any(self._needle in text
+                   for text in self.sourceModel().filter_keys(source_row, source_parent))
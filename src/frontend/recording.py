@@ -0,0 +1,394 @@
+"""Session recording: the raw sample stream in a compact file, replayed through an mmap'd index.
+
+A recording is two files, both append-only:
+
+    <path>        header, then one frame per sample
+    <path>.idx    one INDEX_DTYPE entry per frame (rebuilt from the frame
+                  headers when it is missing or behind, e.g. after a crash)
+
+    header    magic "SMSESS" | version u16 | sizeof(SystemMetrics) u32 |
+              sizeof(ProcessRecord) u32 | keyframe_every u32
+    frame     length u32 | kind u8 | reserved u8[3] | timestamp f64 | sample_ms f64 |
+              `length` bytes of zlib data, which inflate to
+                  metrics_length u32, then
+                      KEYFRAME  the raw SystemMetrics
+                      DELTA     remote.encode_delta() against the previous frame
+                  records_length u32, then the process list:
+                      KEYFRAME  count u32, every ProcessRecord (sorted by PID)
+                      DELTA     gone u32, their PIDs (i32), changed u32, the new or changed records
+                  and the owners' names: count u32, then uid u32 | length u8 | UTF-8 name
+                      KEYFRAME  every uid named so far
+                      DELTA     the uids first seen in this frame
+
+Every `keyframe_every` frames is a KEYFRAME, so a seek decodes one keyframe
+and at most that many small deltas. The reader maps both files and only
+inflates the frames it walks through. User names come from the recording
+host, so a replay never resolves uids (or loads libmonitor). Usable without Qt:
+
+    reader = SessionReader("incident.smrec")
+    reader.seek(reader.frame_at(reader.start + 60))
+    print(reader.metrics.cpu_usage_percent, reader.procs.count)
+"""
+import ctypes
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from bridge import SystemMetrics, ProcessRecord
+from remote import encode_delta, apply_delta, METRICS_SIZE
+
+SESSION_MAGIC = b"SMSESS"
+SESSION_VERSION = 2
+SESSION_HEADER = struct.Struct("<6sHIII")
+FRAME_HEADER = struct.Struct("<IB3xdd")
+COUNT = struct.Struct("<I")
+USER_ENTRY = struct.Struct("<IB")
+FRAME_KEYFRAME = 1
+FRAME_DELTA = 2
+KEYFRAME_EVERY = 60   # one a minute at 1 Hz
+INDEX_SUFFIX = ".idx"
+INDEX_DTYPE = np.dtype([("offset", "<u8"), ("timestamp", "<f8"), ("keyframe", "<u4"), ("kind", "<u4")])
+
+RECORD_SIZE = ctypes.sizeof(ProcessRecord)
+PID_OFFSET = ProcessRecord.pid.offset
+_NO_PIDS = np.empty(0, dtype="<i4")
+_NO_ROWS = np.empty((0, RECORD_SIZE), dtype=np.uint8)
+
+
+class SessionError(ValueError):
+    """Not a session file, or one recorded by a build with other struct layouts."""
+
+
+def _rows_pids(rows):
+    return np.ascontiguousarray(rows[:, PID_OFFSET:PID_OFFSET + 4]).view("<i4").ravel()
+
+
+def snapshot_rows(procs):
+    """(pids, rows) of a ProcessSnapshot, sorted by PID; rows is one uint8 row per record."""
+    if procs is None or procs.count == 0:
+        return _NO_PIDS, _NO_ROWS
+    rows = np.frombuffer(procs.records, dtype=np.uint8, count=procs.count * RECORD_SIZE)
+    rows = rows.reshape(procs.count, RECORD_SIZE)
+    pids = _rows_pids(rows)
+    order = np.argsort(pids, kind="stable")
+    return pids[order], rows[order]
+
+
+def encode_records(previous, current):
+    """Process part of a DELTA: the PIDs that are gone and the records that differ."""
+    old_pids, old_rows = previous
+    pids, rows = current
+    gone = old_pids[~np.isin(old_pids, pids, assume_unique=True)]
+
+    same = np.zeros(pids.size, dtype=bool)
+    if old_pids.size:
+        at = np.minimum(np.searchsorted(old_pids, pids), old_pids.size - 1)
+        known = old_pids[at] == pids
+        same[known] = (old_rows[at[known]] == rows[known]).all(axis=1)
+    changed = rows[~same]
+    return b"".join((COUNT.pack(gone.size), gone.astype("<i4").tobytes(),
+                     COUNT.pack(len(changed)), changed.tobytes()))
+
+
+def apply_records(previous, payload):
+    """Inverse of encode_records: (pids, rows) after the delta."""
+    old_pids, old_rows = previous
+    (gone_count,) = COUNT.unpack_from(payload, 0)
+    offset = COUNT.size
+    gone = np.frombuffer(payload, dtype="<i4", count=gone_count, offset=offset)
+    offset += gone_count * 4
+    (changed_count,) = COUNT.unpack_from(payload, offset)
+    offset += COUNT.size
+    if offset + changed_count * RECORD_SIZE > len(payload):
+        raise SessionError("process delta is truncated")
+    changed = np.frombuffer(payload, dtype=np.uint8, count=changed_count * RECORD_SIZE, offset=offset)
+    changed = changed.reshape(changed_count, RECORD_SIZE)
+    changed_pids = _rows_pids(changed)
+
+    keep = ~(np.isin(old_pids, gone) | np.isin(old_pids, changed_pids))
+    pids = np.concatenate((old_pids[keep], changed_pids))
+    rows = np.concatenate((old_rows[keep], changed))
+    order = np.argsort(pids, kind="stable")
+    return pids[order], rows[order]
+
+
+def encode_users(names):
+    """Users part of a frame: `names` maps uid -> name."""
+    parts = [COUNT.pack(len(names))]
+    for uid, name in names.items():
+        raw = name.encode("utf-8")[:255]
+        parts.append(USER_ENTRY.pack(uid, len(raw)))
+        parts.append(raw)
+    return b"".join(parts)
+
+
+def decode_users(payload, into):
+    """Inverse of encode_users: add the uid -> name entries of `payload` to `into`."""
+    (count,) = COUNT.unpack_from(payload, 0)
+    offset = COUNT.size
+    for _ in range(count):
+        if offset + USER_ENTRY.size > len(payload):
+            raise SessionError("user names are truncated")
+        uid, length = USER_ENTRY.unpack_from(payload, offset)
+        offset += USER_ENTRY.size
+        into[uid] = payload[offset:offset + length].decode("utf-8", "replace")
+        offset += length
+
+
+def _key_records(payload):
+    (count,) = COUNT.unpack_from(payload, 0)
+    if COUNT.size + count * RECORD_SIZE > len(payload):
+        raise SessionError("process keyframe is truncated")
+    rows = np.frombuffer(payload, dtype=np.uint8, count=count * RECORD_SIZE, offset=COUNT.size)
+    rows = rows.reshape(count, RECORD_SIZE)
+    return _rows_pids(rows), rows
+
+
+class RecordedSnapshot:
+    """The process list of one replayed frame, shaped like a ProcessSnapshot (no tree, no rollups).
+
+    `user_names` is the reader's uid -> name table, as recorded.
+    """
+
+    def __init__(self, rows, user_names=None):
+        self.count = self.total = len(rows)
+        self.records = (ProcessRecord * max(self.count, 1)).from_buffer_copy(
+            rows.tobytes() if self.count else bytes(RECORD_SIZE))
+        self.tree = None
+        self.has_tree = False
+        self.rollups = None
+        self.user_names = {} if user_names is None else user_names
+
+    def user_name(self, uid):
+        name = self.user_names.get(uid)
+        return str(uid) if name is None else name
+
+
+class SessionRecorder:
+    """Appends samples to a new session file (and its index).
+
+    Call `append()` from the thread that owns the samples; a keyframe also
+    flushes both files, so a crash loses at most the frames since the last one.
+    """
+
+    def __init__(self, path, keyframe_every=KEYFRAME_EVERY):
+        self.path = path
+        self.keyframe_every = keyframe_every
+        self.file = open(path, "wb")
+        self.index = open(path + INDEX_SUFFIX, "wb")
+        self.file.write(SESSION_HEADER.pack(SESSION_MAGIC, SESSION_VERSION, METRICS_SIZE,
+                                            RECORD_SIZE, keyframe_every))
+        self.frames = 0
+        self.keyframe = 0
+        self.previous = None           # SystemMetrics image of the last frame
+        self.previous_records = None   # (pids, rows) of the last frame
+        self.user_names = {}           # every uid -> name written so far
+        self.entry = np.zeros(1, dtype=INDEX_DTYPE)
+
+    def append(self, timestamp, sample_ms, metrics, procs=None):
+        image = ctypes.string_at(ctypes.addressof(metrics), METRICS_SIZE)
+        records = snapshot_rows(procs)
+        # Names as resolved on the recording host (ProcessSnapshot.fill)
+        names = procs.user_names if procs is not None else {}
+        new_names = {uid: name for uid, name in names.items() if uid not in self.user_names}
+        self.user_names.update(new_names)
+
+        if self.previous is None or self.frames - self.keyframe >= self.keyframe_every:
+            kind = FRAME_KEYFRAME
+            self.keyframe = self.frames
+            metrics_part = image
+            records_part = COUNT.pack(len(records[1])) + records[1].tobytes()
+            users_part = encode_users(self.user_names)
+        else:
+            kind = FRAME_DELTA
+            metrics_part = encode_delta(self.previous, image)
+            records_part = encode_records(self.previous_records, records)
+            users_part = encode_users(new_names)
+        payload = zlib.compress(b"".join((COUNT.pack(len(metrics_part)), metrics_part,
+                                          COUNT.pack(len(records_part)), records_part, users_part)), 1)
+
+        self.entry[0] = (self.file.tell(), timestamp, self.keyframe, kind)
+        self.file.write(FRAME_HEADER.pack(len(payload), kind, timestamp, sample_ms))
+        self.file.write(payload)
+        self.index.write(self.entry.tobytes())
+        if kind == FRAME_KEYFRAME:
+            # Data before index; between keyframes either file may be ahead on disk,
+            # which SessionReader repairs from the frame headers
+            self.file.flush()
+            self.index.flush()
+
+        self.previous = image
+        self.previous_records = records
+        self.frames += 1
+
+    def close(self):
+        self.file.close()
+        self.index.close()
+
+
+class SessionReader:
+    """Random access to a recorded session.
+
+    Both files are memory-mapped: the index is a NumPy view of the `.idx`
+    mapping and frames are inflated straight from the data mapping, so
+    opening a long recording reads neither file. `seek()` applies deltas
+    forward from the current frame, or from the closest keyframe when that is
+    shorter; `metrics` (a SystemMetrics over an internal buffer) and `procs`
+    then hold that frame. `user_names` collects the recorded uid -> name
+    entries of every frame decoded so far (a keyframe carries them all).
+    """
+
+    def __init__(self, path):
+        self._index_file = self._index_map = self._data = None
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < SESSION_HEADER.size:
+            self._file.close()
+            raise SessionError(f"{path} is not a session recording")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, metrics_size, record_size, self.keyframe_every = SESSION_HEADER.unpack_from(self._data, 0)
+        if magic != SESSION_MAGIC:
+            self.close()
+            raise SessionError(f"{path} is not a session recording")
+        if version != SESSION_VERSION:
+            self.close()
+            raise SessionError(f"{path} is a version {version} recording (this build reads {SESSION_VERSION})")
+        if metrics_size != METRICS_SIZE or record_size != RECORD_SIZE:
+            self.close()
+            raise SessionError(f"{path} was recorded by a build with another SystemMetrics/ProcessRecord")
+
+        self.index = self._open_index(path + INDEX_SUFFIX)
+        if len(self.index) == 0:
+            self.close()
+            raise SessionError(f"{path} holds no samples")
+        self.timestamps = self.index["timestamp"]
+
+        self.image = bytearray(METRICS_SIZE)
+        self.metrics = SystemMetrics.from_buffer(self.image)
+        self.records = (_NO_PIDS, _NO_ROWS)
+        self.user_names = {}
+        self.procs = RecordedSnapshot(_NO_ROWS, self.user_names)
+        self.position = -1
+        self.timestamp = 0.0
+        self.sample_ms = 0.0
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def start(self):
+        return float(self.timestamps[0])
+
+    @property
+    def end(self):
+        return float(self.timestamps[-1])
+
+    def frame_at(self, timestamp):
+        """The last frame recorded at or before `timestamp` (the first one before the start)."""
+        return max(int(np.searchsorted(self.timestamps, timestamp, side="right")) - 1, 0)
+
+    def seek(self, frame):
+        if frame == self.position:
+            return
+        keyframe = int(self.index["keyframe"][frame])
+        first = self.position + 1 if keyframe <= self.position < frame else keyframe
+        for n in range(first, frame + 1):
+            self._decode(n)
+        self.position = frame
+        self.procs = RecordedSnapshot(self.records[1], self.user_names)
+
+    def close(self):
+        # The NumPy views pin the mappings; drop them before unmapping
+        self.index = self.timestamps = None
+        for handle in (self._index_map, self._index_file, self._data, self._file):
+            if handle is not None:
+                handle.close()
+        self._index_map = self._index_file = self._data = self._file = None
+
+    # ── Internals ────────────────────────────────────────────────────────
+
+    def _frame_end(self, offset):
+        if offset + FRAME_HEADER.size > len(self._data):
+            return None
+        (length,) = COUNT.unpack_from(self._data, offset)
+        end = offset + FRAME_HEADER.size + length
+        return end if end <= len(self._data) else None
+
+    def _open_index(self, path):
+        """Map the index, first appending entries for the frames it does not cover yet."""
+        entry_size = INDEX_DTYPE.itemsize
+        try:
+            index_size = os.path.getsize(path)
+        except OSError:
+            index_size = 0
+        count = index_size // entry_size
+        if count == 0:
+            return self._rebuild_index(path, SESSION_HEADER.size, 0, 0, 0)
+
+        # The two files are flushed together only at keyframes, so after a crash the
+        # index may run past the data or stop short of it
+        last = np.fromfile(path, dtype=INDEX_DTYPE, count=1, offset=(count - 1) * entry_size)[0]
+        end = self._frame_end(int(last["offset"]))
+        if end is None:
+            return self._rebuild_index(path, SESSION_HEADER.size, 0, 0, 0)
+        if end < len(self._data) or count * entry_size != index_size:
+            return self._rebuild_index(path, end, count, int(last["keyframe"]), count)
+        return self._map_index(path, count)
+
+    def _rebuild_index(self, path, offset, frame, keyframe, keep):
+        extra = []
+        while True:
+            end = self._frame_end(offset)
+            if end is None:
+                break   # a frame cut short by a crash ends the recording
+            _, kind, timestamp, _ = FRAME_HEADER.unpack_from(self._data, offset)
+            if kind == FRAME_KEYFRAME:
+                keyframe = frame
+            extra.append((offset, timestamp, keyframe, kind))
+            offset, frame = end, frame + 1
+        extra = np.array(extra, dtype=INDEX_DTYPE)
+
+        try:
+            with open(path, "r+b" if os.path.exists(path) else "wb") as index:
+                index.truncate(keep * INDEX_DTYPE.itemsize)
+                index.seek(0, os.SEEK_END)
+                index.write(extra.tobytes())
+        except OSError:
+            # A recording on read-only media: keep the index in memory
+            head = np.fromfile(path, dtype=INDEX_DTYPE, count=keep) if keep else np.empty(0, dtype=INDEX_DTYPE)
+            return np.concatenate((head, extra))
+        return self._map_index(path, keep + len(extra))
+
+    def _map_index(self, path, count):
+        if count == 0:
+            return np.empty(0, dtype=INDEX_DTYPE)
+        self._index_file = open(path, "rb")
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return np.frombuffer(self._index_map, dtype=INDEX_DTYPE, count=count)
+
+    def _decode(self, frame):
+        offset = int(self.index["offset"][frame])
+        length, kind, timestamp, sample_ms = FRAME_HEADER.unpack_from(self._data, offset)
+        start = offset + FRAME_HEADER.size
+        payload = zlib.decompress(self._data[start:start + length])
+        (metrics_length,) = COUNT.unpack_from(payload, 0)
+        metrics_part = payload[COUNT.size:COUNT.size + metrics_length]
+        offset = COUNT.size + metrics_length
+        (records_length,) = COUNT.unpack_from(payload, offset)
+        offset += COUNT.size
+        records_part = payload[offset:offset + records_length]
+        decode_users(payload[offset + records_length:], self.user_names)
+
+        if kind == FRAME_KEYFRAME:
+            if metrics_length != METRICS_SIZE:
+                raise SessionError("keyframe size does not match SystemMetrics")
+            self.image[:] = metrics_part
+            self.records = _key_records(records_part)
+        else:
+            apply_delta(self.image, metrics_part)
+            self.records = apply_records(self.records, records_part)
+        self.timestamp = timestamp
+        self.sample_ms = sample_ms
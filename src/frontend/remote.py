@@ -0,0 +1,185 @@
+"""Compact binary framing for streaming SystemMetrics over TCP or Unix sockets.
+
+The server (metrics_server.py) sends a HELLO, then one frame per sample.
+Every frame is a fixed little-endian header followed by `length` bytes:
+
+    magic "SMON" | version u8 | kind u8 | reserved u16 | length u32 |
+    seq u64 | timestamp f64 (CLOCK_REALTIME) | sample_ms f64
+
+    HELLO     sizeof(SystemMetrics) u32, then the server's host name (utf-8)
+    SNAPSHOT  the raw SystemMetrics, in the native layout of the same build
+    DELTA     the 8-byte words that changed since frame seq-1:
+              run_count u32, then per run: first_word u32, word_count u32, words
+
+A subscriber gets a SNAPSHOT first, DELTAs after it (a few hundred bytes
+instead of ~21 KB) and a fresh SNAPSHOT every few seconds or whenever it fell
+behind. Usable without Qt:
+
+    async for decoder in subscribe("127.0.0.1:7411"):
+        print(decoder.host, decoder.metrics.cpu_usage_percent)
+"""
+import ctypes
+import struct
+
+import numpy as np
+
+from bridge import SystemMetrics
+
+FRAME_MAGIC = b"SMON"
+FRAME_VERSION = 1
+FRAME_HELLO    = 0
+FRAME_SNAPSHOT = 1
+FRAME_DELTA    = 2
+FRAME_HEADER = struct.Struct("<4sBBHIQdd")
+HELLO_HEADER = struct.Struct("<I")
+RUN_COUNT = struct.Struct("<I")
+RUN_HEADER = struct.Struct("<II")
+MAX_FRAME_BYTES = 1 << 20
+
+DEFAULT_PORT = 7411
+UNIX_PREFIX = "unix:"   # same spelling as the alert sinks
+METRICS_SIZE = ctypes.sizeof(SystemMetrics)
+
+
+class ProtocolError(ValueError):
+    """The peer is not a metrics server, or was built with another SystemMetrics."""
+
+
+def parse_address(address):
+    """"unix:/path" -> ("unix", path); "host:port", "host" or ":port" -> ("tcp", (host, port))."""
+    if address.startswith(UNIX_PREFIX):
+        return "unix", address[len(UNIX_PREFIX):]
+    host, _, port = address.rpartition(":") if ":" in address else (address, "", "")
+    return "tcp", (host.strip("[]") or "127.0.0.1", int(port) if port else DEFAULT_PORT)
+
+
+def encode_frame(kind, seq, timestamp, sample_ms, payload):
+    return FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, kind, 0, len(payload),
+                             seq, timestamp, sample_ms) + payload
+
+
+def encode_hello(host):
+    return encode_frame(FRAME_HELLO, 0, 0.0, 0.0, HELLO_HEADER.pack(METRICS_SIZE) + host.encode("utf-8"))
+
+
+def encode_delta(previous, current):
+    """Runs of changed 8-byte words between two SystemMetrics images."""
+    old = np.frombuffer(previous, dtype=np.uint64)
+    new = np.frombuffer(current, dtype=np.uint64)
+    changed = np.flatnonzero(old != new)
+    if changed.size == 0:
+        return RUN_COUNT.pack(0)
+
+    # A run header costs one word, so a single unchanged word is cheaper to resend than to split on
+    breaks = np.flatnonzero(np.diff(changed) > 2) + 1
+    starts = changed[np.r_[0, breaks]].tolist()
+    ends = (changed[np.r_[breaks - 1, changed.size - 1]] + 1).tolist()
+    parts = [RUN_COUNT.pack(len(starts))]
+    for start, end in zip(starts, ends):
+        parts.append(RUN_HEADER.pack(start, end - start))
+        parts.append(new[start:end].tobytes())
+    return b"".join(parts)
+
+
+def apply_delta(image, payload):
+    """Patch a SystemMetrics image (bytearray) in place with an encode_delta payload."""
+    words = np.frombuffer(image, dtype=np.uint64)
+    (run_count,) = RUN_COUNT.unpack_from(payload, 0)
+    offset = RUN_COUNT.size
+    for _ in range(run_count):
+        start, count = RUN_HEADER.unpack_from(payload, offset)
+        offset += RUN_HEADER.size
+        if start + count > words.size or offset + count * 8 > len(payload):
+            raise ProtocolError("delta run outside SystemMetrics")
+        words[start:start + count] = np.frombuffer(payload, dtype=np.uint64, count=count, offset=offset)
+        offset += count * 8
+
+
+class FrameDecoder:
+    """Reassembles frames from a byte stream and keeps the sender's latest sample.
+
+    `metrics` is a SystemMetrics view over an internal buffer that the next
+    frame patches in place (read it on the thread that calls `feed`). `feed()`
+    returns how many samples were completed by the bytes it was given; a DELTA
+    that does not follow the current sample is skipped until the next SNAPSHOT.
+    """
+
+    def __init__(self):
+        self.pending = bytearray()
+        self.image = bytearray(METRICS_SIZE)
+        self.metrics = None   # set by the first SNAPSHOT
+        self.host = None      # set by HELLO
+        self.seq = None
+        self.timestamp = 0.0
+        self.sample_ms = 0.0
+        self.bytes_received = 0
+
+    def feed(self, data):
+        self.pending += data
+        self.bytes_received += len(data)
+        samples = 0
+        while len(self.pending) >= FRAME_HEADER.size:
+            magic, version, kind, _, length, seq, timestamp, sample_ms = FRAME_HEADER.unpack_from(self.pending, 0)
+            if magic != FRAME_MAGIC or version != FRAME_VERSION:
+                raise ProtocolError("not a metrics server (bad frame magic or version)")
+            if length > MAX_FRAME_BYTES:
+                raise ProtocolError(f"frame of {length} bytes is too large")
+            end = FRAME_HEADER.size + length
+            if len(self.pending) < end:
+                break
+
+            payload = bytes(self.pending[FRAME_HEADER.size:end])
+            del self.pending[:end]
+            if self.handle(kind, seq, payload):
+                self.timestamp = timestamp
+                self.sample_ms = sample_ms
+                samples += 1
+        return samples
+
+    def handle(self, kind, seq, payload):
+        if kind == FRAME_HELLO:
+            (size,) = HELLO_HEADER.unpack_from(payload, 0)
+            if size != METRICS_SIZE:
+                raise ProtocolError(f"server SystemMetrics is {size} bytes, ours is {METRICS_SIZE}")
+            self.host = payload[HELLO_HEADER.size:].decode("utf-8", "replace")
+            return False
+
+        if kind == FRAME_SNAPSHOT:
+            if len(payload) != METRICS_SIZE:
+                raise ProtocolError("snapshot size does not match SystemMetrics")
+            self.image[:] = payload
+        elif kind == FRAME_DELTA:
+            if self.seq is None or seq != self.seq + 1:
+                return False   # missed a frame; the server follows up with a snapshot
+            apply_delta(self.image, payload)
+        else:
+            return False
+
+        self.seq = seq
+        if self.metrics is None:
+            self.metrics = SystemMetrics.from_buffer(self.image)
+        return True
+
+
+async def open_connection(address):
+    # Imported here: asyncio alone would add ~35 ms to the dashboard's startup, which only decodes
+    import asyncio
+    kind, target = parse_address(address)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(target)
+    return await asyncio.open_connection(*target)
+
+
+async def subscribe(address, read_size=65536):
+    """Yield the FrameDecoder after every sample received from `address`."""
+    reader, writer = await open_connection(address)
+    decoder = FrameDecoder()
+    try:
+        while True:
+            data = await reader.read(read_size)
+            if not data:
+                return
+            if decoder.feed(data):
+                yield decoder
+    finally:
+        writer.close()
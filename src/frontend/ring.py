@@ -0,0 +1,164 @@
+"""Zero-copy reader for the shared-memory sample ring written by monitord.
+
+The ring lives in /dev/shm/<name>. It is mapped read-only and the slots are
+exposed as ctypes views straight into the mapping, so readers never copy a
+SystemMetrics. Each slot is guarded by a seqlock (odd seq = write in progress),
+so the collector never waits for a reader; a reader that raced the writer just
+sees `is_valid()` turn False and retries on the next poll. A restarted collector
+renames a fresh ring over the old name instead of rewriting the file in place,
+so an attached reader keeps a consistent (if stale) mapping until `replaced()`
+tells it to open the new one.
+
+Usable without Qt:
+
+    reader = RingReader()
+    sample = reader.latest()
+    if sample is not None:
+        print(sample.metrics.cpu_usage_percent, reader.is_valid(sample))
+"""
+import ctypes
+import mmap
+import os
+
+from bridge import SystemMetrics
+
+RING_MAGIC = 0x474E5253   # "SRNG" - must match ring.h
+RING_VERSION = 1
+RING_DEFAULT_NAME = "system-monitor"
+RING_SHM_DIR = "/dev/shm/"
+
+
+class RingHeader(ctypes.Structure):
+    _fields_ = [
+        ("magic", ctypes.c_uint32),
+        ("version", ctypes.c_uint32),
+        ("slot_count", ctypes.c_uint32),
+        ("record_size", ctypes.c_uint32),
+        ("head", ctypes.c_uint64),
+        ("writer_pid", ctypes.c_uint64),
+        ("reserved", ctypes.c_uint64 * 4),
+    ]
+
+
+class RingSlot(ctypes.Structure):
+    _fields_ = [
+        ("seq", ctypes.c_uint64),
+        ("sample_index", ctypes.c_uint64),
+        ("timestamp", ctypes.c_double),
+        ("sample_ms", ctypes.c_double),
+        ("metrics", SystemMetrics),
+    ]
+
+
+class RingSample:
+    """A view of one slot plus the seq it had when it was picked."""
+
+    __slots__ = ("slot", "seq")
+
+    def __init__(self, slot, seq):
+        self.slot = slot
+        self.seq = seq
+
+    @property
+    def metrics(self):
+        return self.slot.metrics
+
+    @property
+    def index(self):
+        return self.slot.sample_index
+
+    @property
+    def timestamp(self):
+        return self.slot.timestamp
+
+    @property
+    def sample_ms(self):
+        return self.slot.sample_ms
+
+
+_libc = ctypes.CDLL(None, use_errno=True)
+_libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long]
+_libc.mmap.restype = ctypes.c_void_p
+_libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+_libc.munmap.restype = ctypes.c_int
+_MAP_FAILED = ctypes.c_void_p(-1).value
+
+
+class RingReader:
+    """Maps /dev/shm/<name> read-only and hands out views of the newest sample."""
+
+    def __init__(self, name=RING_DEFAULT_NAME):
+        self.path = RING_SHM_DIR + name
+        fd = os.open(self.path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            stat = os.fstat(fd)
+            self.size = stat.st_size
+            self.inode = (stat.st_dev, stat.st_ino)
+            if self.size < ctypes.sizeof(RingHeader):
+                raise ValueError(f"{self.path} is too small to be a sample ring")
+
+            # Python's mmap module only hands ctypes writable buffers, so map
+            # read-only through libc and build the views with from_address.
+            address = _libc.mmap(None, self.size, mmap.PROT_READ, mmap.MAP_SHARED, fd, 0)
+            if address is None or address == _MAP_FAILED:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), self.path)
+        finally:
+            os.close(fd)
+
+        self.address = address
+        self.header = RingHeader.from_address(address)
+        if self.header.magic != RING_MAGIC or self.header.version != RING_VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {RING_VERSION} sample ring")
+        if self.header.record_size != ctypes.sizeof(SystemMetrics):
+            self.close()
+            raise ValueError(f"{self.path} was written with a different SystemMetrics layout")
+
+        expected = ctypes.sizeof(RingHeader) + self.header.slot_count * ctypes.sizeof(RingSlot)
+        if self.size < expected:
+            self.close()
+            raise ValueError(f"{self.path} is truncated")
+
+        slots_type = RingSlot * self.header.slot_count
+        self.slots = slots_type.from_address(address + ctypes.sizeof(RingHeader))
+
+    def close(self):
+        if self.address is not None:
+            self.header = None
+            self.slots = None
+            _libc.munmap(self.address, self.size)
+            self.address = None
+
+    def __del__(self):
+        if getattr(self, "address", None) is not None:
+            self.close()
+
+    def replaced(self):
+        """True once a restarted collector has put another ring under this name."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self.inode
+
+    @property
+    def head(self):
+        """Number of samples the collector has written so far."""
+        return self.header.head
+
+    def latest(self):
+        """Return the newest complete sample as a RingSample view, or None."""
+        head = self.header.head
+        if head == 0:
+            return None
+
+        slot = self.slots[(head - 1) % self.header.slot_count]
+        seq = slot.seq
+        if seq & 1:
+            return None   # the writer is in this slot right now
+        return RingSample(slot, seq)
+
+    def is_valid(self, sample):
+        """True if the writer has not touched the sample's slot since it was picked."""
+        return sample.slot.seq == sample.seq
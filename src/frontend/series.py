@@ -0,0 +1,124 @@
+"""Preallocated NumPy ring buffers for the dashboard graph series."""
+import numpy as np
+
+
+class _MonotonicWindow:
+    """Sliding-window max (or min) over the last `window` pushes, O(1) amortized.
+
+    Keeps a monotonic queue of absolute sample indices in a preallocated
+    circular array; the extreme is always the value at the front.
+    """
+
+    def __init__(self, window, values, capacity, is_max):
+        self.window = window
+        self.values = values        # the owning RingSeries storage (first half)
+        self.capacity = capacity
+        self.is_max = is_max
+        self.queue = np.zeros(window + 1, dtype=np.int64)
+        self.front = 0
+        self.size = 0
+
+    def _value(self, index):
+        return self.values[index % self.capacity]
+
+    def push(self, index, value):
+        queue, slots = self.queue, len(self.queue)
+        # Drop entries the new value dominates, from the back
+        while self.size:
+            back = queue[(self.front + self.size - 1) % slots]
+            old = self._value(back)
+            if (old <= value) if self.is_max else (old >= value):
+                self.size -= 1
+            else:
+                break
+        queue[(self.front + self.size) % slots] = index
+        self.size += 1
+
+        # Drop entries that slid out of the window, from the front
+        while queue[self.front] <= index - self.window:
+            self.front = (self.front + 1) % slots
+            self.size -= 1
+
+    def current(self):
+        return self._value(self.queue[self.front]) if self.size else 0.0
+
+
+class RingSeries:
+    """Fixed-capacity circular buffer that hands pyqtgraph contiguous, zero-copy views.
+
+    Every value is written twice, at `head` and `head + capacity`, so the last
+    `capacity` samples are always the contiguous slice `[head, head + capacity)`.
+    Nothing is allocated per push. `max()`/`min()` track the last `window`
+    samples (the part of the graph that is on screen) without rescanning.
+    """
+
+    def __init__(self, capacity, window=None, fill=0.0):
+        self.capacity = capacity
+        self.window = min(window or capacity, capacity)
+        self.buffer = np.full(2 * capacity, fill, dtype=np.float64)
+        self.x = np.arange(capacity, dtype=np.float64)   # shared x axis, never rebuilt
+        self.head = 0
+        self.count = 0
+        self._max = _MonotonicWindow(self.window, self.buffer, capacity, is_max=True)
+        self._min = _MonotonicWindow(self.window, self.buffer, capacity, is_max=False)
+        # The prefill counts as history so the graph starts flat, like before
+        for _ in range(self.window):
+            self.append(fill)
+
+    def append(self, value):
+        slot = self.head
+        self.buffer[slot] = value
+        self.buffer[slot + self.capacity] = value
+        self._max.push(self.count, value)
+        self._min.push(self.count, value)
+        self.head = (slot + 1) % self.capacity
+        self.count += 1
+
+    def view(self):
+        """The last `capacity` samples, oldest first, as a view into the buffer."""
+        return self.buffer[self.head:self.head + self.capacity]
+
+    def max(self):
+        return self._max.current()
+
+    def min(self):
+        return self._min.current()
+
+    def __len__(self):
+        return self.capacity
+
+
+def decimate_minmax(values, buckets):
+    """Squeeze a series into `buckets` slices, keeping the min and max of each.
+
+    For a plot `buckets` pixels wide this draws the same envelope as the full
+    series (every spike survives) with two points per pixel, so pyqtgraph never
+    sees more points than it can show. Returns (x, y); x is in sample indices
+    of `values`. Series that already fit are returned as they are.
+    """
+    count = len(values)
+    if count <= 2 * buckets:
+        return _decimation_axis(count, 0)[0], values
+    x, starts = _decimation_axis(count, buckets)
+    y = np.empty(2 * buckets, dtype=np.float64)
+    y[0::2] = np.minimum.reduceat(values, starts)
+    y[1::2] = np.maximum.reduceat(values, starts)
+    return x, y
+
+
+_axes = {}
+
+
+def _decimation_axis(count, buckets):
+    """(x, bucket starts) for a length and width; every tile of a grid asks for the same few."""
+    axis = _axes.get((count, buckets))
+    if axis is None:
+        if buckets == 0:
+            axis = (np.arange(count, dtype=np.float64), None)
+        else:
+            starts = (np.arange(buckets) * count) // buckets
+            axis = (np.repeat(starts.astype(np.float64), 2), starts)
+        if len(_axes) >= 64:
+            _axes.clear()   # widths seen while the window was being resized
+        _axes[(count, buckets)] = axis
+    return axis